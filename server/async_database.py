@@ -0,0 +1,64 @@
+"""
+Async database access for the FastAPI handlers.
+
+The ORM layer (models, lead_management, excel_exporter, AnalyticsEngine) is
+synchronous and shared with the scraper threads and Celery workers. Calling it
+directly from an `async def` endpoint runs the query on the event loop, so one
+slow /leads or export query stalls every WebSocket progress stream on the worker.
+run_db() runs a unit of database work on a worker thread with its own session
+from the shared tuned engine, and the handler awaits the result. Writes go
+through run_db_write(), which queues them on the single database writer.
+"""
+
+import asyncio
+import queue
+from typing import Any, Callable, TypeVar
+
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+
+from database import SessionLocal
+from lead_writer import get_lead_writer, _write_directly, WRITE_TIMEOUT
+
+T = TypeVar("T")
+
+
+async def run_db(work: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Await work(db, *args, **kwargs) run off the event loop with a fresh session.
+
+    The session is closed when work returns, so work must build its response
+    (e.g. LeadResponse.from_orm) before returning rather than hand back ORM objects
+    that still need lazy loads.
+    """
+    def run():
+        db = SessionLocal()
+        try:
+            return work(db, *args, **kwargs)
+        finally:
+            db.close()
+
+    return await run_in_threadpool(run)
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Await a synchronous helper that opens its own session (lead_management, excel export)"""
+    return await run_in_threadpool(func, *args, **kwargs)
+
+
+async def run_db_write(write: Callable[[Any], T], timeout: float = WRITE_TIMEOUT) -> T:
+    """Await write(db) on the single database writer (see lead_writer), without holding a thread.
+
+    The writer commits the write's batch and rolls it back on error, so write must
+    not commit or roll back itself; it returns plain data like run_db's work.
+    Queueing happens on a worker thread because a full queue blocks; if it stays full
+    for timeout seconds the request fails with 503. Waiting for the commit is bounded
+    by timeout too (asyncio.TimeoutError), and a write still queued by then is dropped.
+    """
+    writer = get_lead_writer()
+    if writer is None:
+        return await run_in_threadpool(_write_directly, write)
+    try:
+        future = await run_in_threadpool(writer.submit, write, timeout)
+    except queue.Full:
+        raise HTTPException(status_code=503, detail="Database writer is busy, try again shortly")
+    return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
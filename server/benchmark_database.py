@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Concurrent lead-write benchmark: bare engine vs the tuned database_core pool.
+
+Simulates parallel scraping jobs against a throwaway SQLite file. Writer threads
+save leads one commit at a time (the unbatched save path) while reader threads
+run the queries the UI polls with. Both runs use identical workloads; the only
+difference is the engine configuration:
+
+  baseline  create_engine() defaults: rollback journal, synchronous=FULL, 5s busy wait
+  tuned     database.py's engine: DatabaseConfig.sqlite_pragmas (WAL, mmap, cache,
+            synchronous=NORMAL, busy_timeout) through ConnectionPool
+
+Usage:
+    python benchmark_database.py                          # 8 writers x 100 leads, 4 readers
+    python benchmark_database.py --writers 16 --leads 200 --readers 8
+"""
+
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Any, List
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+sys.path.append(str(Path(__file__).parent))
+
+from database import Base, db_config
+from database_core.config import DatabaseConfig
+from database_core.connection_pool import ConnectionPool
+from database_operations import _write_lead
+from models import Lead
+
+
+def baseline_engine(url: str):
+    """The engine database.py used to build"""
+    return create_engine(url, connect_args={"check_same_thread": False})
+
+
+def tuned_engine(url: str):
+    """Same profile as the shared engine in database.py, pointed at the benchmark file"""
+    config = DatabaseConfig(database_url=url, sqlite_pragmas=dict(db_config.sqlite_pragmas))
+    return ConnectionPool(config).get_engine()
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def run_workload(engine, writers: int, leads_per_writer: int, readers: int) -> Dict[str, Any]:
+    """Concurrent single-lead commits plus polling readers; returns throughput, latency and lock errors"""
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    lock = threading.Lock()
+    write_latencies: List[float] = []
+    errors = {"locked": 0, "other": 0}
+    reads = [0]
+    writing = threading.Event()
+    writing.set()
+
+    def record_error(e):
+        with lock:
+            errors["locked" if "locked" in str(e) else "other"] += 1
+
+    def writer(index):
+        for n in range(leads_per_writer):
+            details = {"name": f"Benchmark Painter {index}-{n}", "location": f"City {index}",
+                       "industry": "painter", "rating": 4.5, "reviews": 10}
+            db = factory()
+            started = time.perf_counter()
+            try:
+                _write_lead(db, details)
+                db.commit()
+                with lock:
+                    write_latencies.append(time.perf_counter() - started)
+            except OperationalError as e:
+                db.rollback()
+                record_error(e)
+            finally:
+                db.close()
+
+    def reader():
+        while writing.is_set():
+            db = factory()
+            try:
+                db.query(func.count(Lead.id)).scalar()
+                db.query(Lead).order_by(Lead.created_at.desc()).limit(50).all()
+                with lock:
+                    reads[0] += 1
+            except OperationalError as e:
+                record_error(e)
+            finally:
+                db.close()
+
+    reader_threads = [threading.Thread(target=reader) for _ in range(readers)]
+    writer_threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    started = time.perf_counter()
+    for thread in reader_threads + writer_threads:
+        thread.start()
+    for thread in writer_threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    writing.clear()
+    for thread in reader_threads:
+        thread.join()
+
+    db = factory()
+    saved = db.query(Lead).count()
+    db.close()
+    engine.dispose()
+    return {
+        "saved": saved,
+        "expected": writers * leads_per_writer,
+        "seconds": round(elapsed, 3),
+        "leads_per_sec": round(saved / elapsed, 1) if elapsed else 0.0,
+        "write_p50_ms": round(percentile(write_latencies, 0.5) * 1000, 2),
+        "write_p95_ms": round(percentile(write_latencies, 0.95) * 1000, 2),
+        "reads": reads[0],
+        "locked_errors": errors["locked"],
+        "other_errors": errors["other"],
+    }
+
+
+def run_benchmark(writers: int = 8, leads_per_writer: int = 100, readers: int = 4) -> Dict[str, Dict[str, Any]]:
+    """Run the workload against both configurations, each on a fresh database file"""
+    workdir = Path(tempfile.mkdtemp(prefix="leadloq-db-bench-"))
+    try:
+        reports = {}
+        for name, make_engine in (("baseline", baseline_engine), ("tuned", tuned_engine)):
+            url = f"sqlite:///{workdir / f'{name}.db'}"
+            reports[name] = run_workload(make_engine(url), writers, leads_per_writer, readers)
+        return reports
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def print_reports(reports: Dict[str, Dict[str, Any]]):
+    print(f"{'config':<10} {'saved':>11} {'leads/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'reads':>7} {'locked':>7}")
+    for name, report in reports.items():
+        saved = f"{report['saved']}/{report['expected']}"
+        print(f"{name:<10} {saved:>11} {report['leads_per_sec']:>9} {report['write_p50_ms']:>8} "
+              f"{report['write_p95_ms']:>8} {report['reads']:>7} {report['locked_errors']:>7}")
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Benchmark concurrent lead writes on both engine configurations")
+    arg_parser.add_argument("--writers", type=int, default=8, help="Concurrent writer threads (scraping jobs)")
+    arg_parser.add_argument("--leads", type=int, default=100, help="Leads saved per writer")
+    arg_parser.add_argument("--readers", type=int, default=4, help="Concurrent reader threads (UI polling)")
+    args = arg_parser.parse_args()
+
+    print(f"🏁 {args.writers} writers x {args.leads} leads, {args.readers} readers")
+    print_reports(run_benchmark(args.writers, args.leads, args.readers))
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Offline extractor benchmark driven by the google-maps-reference fixtures.
+
+Loads every fixture into an offline DOM, runs the full extract_business_details
+strategy chain, the feed snapshot parser and the feed script extractor against
+each card, and reports cards/sec, WebDriver calls per card and correctness
+against golden JSON. Script mode's in-page payload is rebuilt from the fixture
+DOM with the script's selectors, so its row covers the Python normalization.
+
+Usage:
+    python benchmark_extraction.py                 # benchmark with 20 iterations
+    python benchmark_extraction.py --iterations 50
+    python benchmark_extraction.py --write-golden  # refresh golden JSON from the snapshot parser
+"""
+
+import io
+import re
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from contextlib import redirect_stdout
+from typing import Dict, List, Any
+
+from bs4 import BeautifulSoup
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import NoSuchElementException
+
+sys.path.append(str(Path(__file__).parent))
+
+from business_extractor import extract_business_details
+from business_extractor_utils import BusinessExtractorUtils
+from feed_snapshot_extractor import FeedSnapshotExtractor
+from feed_script_extractor import FeedScriptExtractor, FEED_EXTRACTION_SCRIPT
+
+REFERENCE_DIR = Path(__file__).parent / "google-maps-reference"
+GOLDEN_FILE = REFERENCE_DIR / "golden-extraction.json"
+COMPARED_FIELDS = ['name', 'rating', 'reviews', 'phone', 'has_website', 'website']
+MODES = ("element", "snapshot", "script")
+PHONE_TEXT_PATTERN = re.compile(r'\(\d{3}\)\s?\d{3}-\d{4}|\d{3}-\d{3}-\d{4}')
+
+
+class CallCounter:
+    """Counts operations that would each be a WebDriver round-trip on a live session"""
+
+    def __init__(self):
+        self.calls = 0
+
+
+class OfflineElement:
+    """Minimal WebElement stand-in over a BeautifulSoup tag that counts remote calls"""
+
+    def __init__(self, tag, counter: CallCounter):
+        self._tag = tag
+        self._counter = counter
+
+    def find_element(self, by, selector):
+        self._counter.calls += 1
+        match = self._select(by, selector, first=True)
+        if match is None:
+            raise NoSuchElementException(f"No element found for selector: {selector}")
+        return OfflineElement(match, self._counter)
+
+    def find_elements(self, by, selector):
+        self._counter.calls += 1
+        return [OfflineElement(tag, self._counter) for tag in self._select(by, selector, first=False)]
+
+    def get_attribute(self, name):
+        self._counter.calls += 1
+        if name == 'innerHTML':
+            return self._tag.decode_contents()
+        if name == 'outerHTML':
+            return str(self._tag)
+        value = self._tag.get(name)
+        if isinstance(value, list):
+            return " ".join(value)
+        return value
+
+    @property
+    def text(self):
+        self._counter.calls += 1
+        return self._tag.get_text("\n", strip=True)
+
+    def is_displayed(self):
+        self._counter.calls += 1
+        return True
+
+    def _select(self, by, selector, first):
+        if by == By.XPATH and selector == "..":
+            parent = self._tag.parent
+            return parent if first else ([parent] if parent else [])
+        if by != By.CSS_SELECTOR:
+            raise NoSuchElementException(f"Unsupported locator for offline DOM: {by}")
+        if first:
+            return self._tag.select_one(selector)
+        return self._tag.select(selector)
+
+
+class OfflineScriptDriver:
+    """Driver stand-in that answers FEED_EXTRACTION_SCRIPT with a prebuilt payload, one call per batch"""
+
+    def __init__(self, payload: List[Dict[str, Any]], counter: CallCounter):
+        self._payload = payload
+        self._counter = counter
+
+    def execute_script(self, script, *args):
+        self._counter.calls += 1
+        if script != FEED_EXTRACTION_SCRIPT:
+            raise ValueError("Unexpected script for the offline driver")
+        return self._payload
+
+
+def script_payload(cards) -> List[Dict[str, Any]]:
+    """What FEED_EXTRACTION_SCRIPT returns for these cards, built with the same selectors"""
+    def text_of(tag):
+        return tag.get_text(" ", strip=True) if tag else None
+
+    payload = []
+    for card in cards:
+        link = card.select_one("a.hfpxzc[href*='/maps/place/']") or card.select_one("a[href*='/maps/place/']")
+        rating = card.select_one("[role='img'][aria-label]")
+        website = card.select_one("a[data-value='Website']")
+        phone = text_of(card.select_one("span.UsdlK"))
+        texts = []
+        for span in card.select("span"):
+            text = text_of(span)
+            if not phone and text and PHONE_TEXT_PATTERN.search(text):
+                phone = text
+            if text and len(text) > 10 and text not in texts and len(texts) < 3:
+                texts.append(text)
+        payload.append({
+            "element": card,
+            "url": link.get("href"),
+            "aria_label": link.get("aria-label"),
+            "headline": text_of(card.select_one("div.qBF1Pd, div[class*='fontHeadline'], [role='heading']")),
+            "rating_label": rating.get("aria-label") if rating else None,
+            "rating_text": text_of(card.select_one(".MW4etd")),
+            "reviews_text": text_of(card.select_one(".UY7F9")),
+            "phone": phone,
+            "website": website.get("href") if website else None,
+            "action_buttons": [button.get("data-value") for button in card.select("a[data-value], button[data-value]")],
+            "photo_count": len(card.select("img[src*='googleusercontent']")),
+            "description_parts": texts,
+        })
+    return payload
+
+
+def load_fixture_cards(path: Path):
+    """Return (html, unique card tags) for a fixture, keyed by place the same way the engine tracks cards"""
+    html = path.read_text(encoding="utf-8")
+    soup = BeautifulSoup(html, "html.parser")
+    cards = []
+    seen_keys = set()
+    for link in soup.select("a[href*='/maps/place/']"):
+        key = BusinessExtractorUtils.get_place_key(link.get("href"))
+        if not key or key in seen_keys:
+            continue
+        seen_keys.add(key)
+        cards.append(link.find_parent(class_="Nv2PK") or link.parent)
+    return html, cards
+
+
+def compare_with_golden(extracted: List[Dict[str, Any]], expected: List[Dict[str, Any]]) -> List[str]:
+    """Field-level differences between extracted businesses and the golden records"""
+    errors = []
+    if len(extracted) != len(expected):
+        errors.append(f"expected {len(expected)} cards, got {len(extracted)}")
+    for index, (actual, golden) in enumerate(zip(extracted, expected)):
+        for field in COMPARED_FIELDS:
+            if field not in golden:
+                continue
+            actual_value = actual.get(field)
+            golden_value = golden[field]
+            if field in ('rating', 'reviews'):
+                actual_value = float(actual_value or 0)
+                golden_value = float(golden_value or 0)
+            if actual_value != golden_value:
+                errors.append(f"card {index + 1} {field}: expected {golden_value!r}, got {actual_value!r}")
+    return errors
+
+
+def benchmark_fixture(path: Path, golden: List[Dict[str, Any]], iterations: int) -> Dict[str, Any]:
+    """Benchmark every extraction mode against one fixture"""
+    html, cards = load_fixture_cards(path)
+    report = {"fixture": path.name, "cards": len(cards)}
+
+    # Strategy chain via the offline DOM (what the element extraction mode does per card)
+    counter = CallCounter()
+    extracted = []
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        for iteration in range(iterations):
+            results = [
+                extract_business_details(OfflineElement(card, counter), driver=None, enable_click_through=False)
+                for card in cards
+            ]
+            if iteration == 0:
+                extracted = results
+    elapsed = time.perf_counter() - start
+    processed = len(cards) * iterations
+    report["element"] = {
+        "cards_per_sec": round(processed / elapsed, 1) if elapsed else None,
+        "webdriver_calls_per_card": round(counter.calls / processed, 1) if processed else 0,
+        "errors": compare_with_golden(extracted, golden),
+    }
+
+    # Feed snapshot parser (one outerHTML pull per batch)
+    parser = FeedSnapshotExtractor()
+    start = time.perf_counter()
+    for iteration in range(iterations):
+        snapshot = parser.parse(html)
+    elapsed = time.perf_counter() - start
+    report["snapshot"] = {
+        "cards_per_sec": round(processed / elapsed, 1) if elapsed and processed else None,
+        "webdriver_calls_per_card": round(1 / len(cards), 2) if cards else 0,
+        "errors": compare_with_golden(snapshot, golden),
+    }
+
+    # Feed script extractor (one execute_script per batch, payload rebuilt offline)
+    counter = CallCounter()
+    driver = OfflineScriptDriver(script_payload(cards), counter)
+    extractor = FeedScriptExtractor()
+    start = time.perf_counter()
+    for iteration in range(iterations):
+        scripted = extractor.extract(driver)
+    elapsed = time.perf_counter() - start
+    report["script"] = {
+        "cards_per_sec": round(processed / elapsed, 1) if elapsed and processed else None,
+        "webdriver_calls_per_card": round(counter.calls / processed, 2) if processed else 0,
+        "errors": compare_with_golden(scripted, golden),
+    }
+    return report
+
+
+def write_golden():
+    """Regenerate golden JSON from the snapshot parser; review the diff before committing"""
+    golden = {}
+    for path in sorted(REFERENCE_DIR.glob("*.html")):
+        _, cards = load_fixture_cards(path)
+        if not cards:
+            continue
+        businesses = FeedSnapshotExtractor().parse(path.read_text(encoding="utf-8"))
+        golden[path.name] = [{field: b.get(field) for field in COMPARED_FIELDS} for b in businesses]
+    GOLDEN_FILE.write_text(json.dumps(golden, indent=2) + "\n", encoding="utf-8")
+    print(f"✅ Wrote golden extraction results to {GOLDEN_FILE}")
+
+
+def run_benchmark(iterations: int = 20) -> List[Dict[str, Any]]:
+    """Benchmark every fixture that contains result cards"""
+    golden = json.loads(GOLDEN_FILE.read_text(encoding="utf-8"))
+    reports = []
+    for path in sorted(REFERENCE_DIR.glob("*.html")):
+        if path.name not in golden:
+            continue
+        reports.append(benchmark_fixture(path, golden[path.name], iterations))
+    return reports
+
+
+def print_reports(reports: List[Dict[str, Any]]):
+    """Print a summary table of the benchmark results"""
+    print(f"{'fixture':<58} {'cards':>5} {'mode':<9} {'cards/s':>10} {'calls/card':>10}  status")
+    print("─" * 105)
+    for report in reports:
+        for mode in MODES:
+            result = report[mode]
+            status = "✅ ok" if not result["errors"] else f"❌ {len(result['errors'])} mismatches"
+            print(f"{report['fixture']:<58} {report['cards']:>5} {mode:<9} "
+                  f"{result['cards_per_sec']:>10} {result['webdriver_calls_per_card']:>10}  {status}")
+            for error in result["errors"]:
+                print(f"    - {error}")
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Benchmark listing extraction against reference fixtures")
+    arg_parser.add_argument("--iterations", type=int, default=20, help="Passes over each fixture")
+    arg_parser.add_argument("--write-golden", action="store_true", help="Regenerate golden JSON")
+    arg_parser.add_argument("--json", action="store_true", help="Print raw JSON report")
+    args = arg_parser.parse_args()
+
+    if args.write_golden:
+        write_golden()
+        sys.exit(0)
+
+    reports = run_benchmark(args.iterations)
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        print_reports(reports)
+    sys.exit(1 if any(r[mode]["errors"] for r in reports for mode in MODES) else 0)
@@ -3,9 +3,13 @@ Blacklist Manager Module
 Manages blacklisted businesses to prevent scraping known franchises and big companies.
 """
 
-from typing import List, Optional
+import re
+import time
+import threading
+from typing import List, Optional, Dict, Tuple
 from sqlalchemy.orm import Session
 from models import BlacklistedBusiness
+from lead_names import normalize_business_name
 from datetime import datetime, timezone
 import logging
 
@@ -18,7 +22,7 @@ class BlacklistManager:
     def __init__(self, db_session: Session):
         self.session = db_session
     
-    def add_to_blacklist(self, business_name: str, reason: str = 'too_big', notes: str = None) -> bool:
+    def add_to_blacklist(self, business_name: str, reason: str = 'too_big', notes: str = None, commit: bool = True) -> bool:
         """
         Add exact business name to blacklist.
         
@@ -26,6 +30,9 @@ class BlacklistManager:
             business_name: Exact name of business to blacklist
             reason: Reason for blacklisting ('too_big', 'franchise', 'did_not_convert')
             notes: Optional notes about why business was blacklisted
+            commit: False to only flush into the caller's transaction; the caller then commits
+                and invalidates the blacklist index. Errors are then re-raised, never rolled back
+                here, since the transaction (e.g. the shared writer's batch) belongs to the caller
             
         Returns:
             True if added successfully, False if already exists
@@ -47,13 +54,19 @@ class BlacklistManager:
                 notes=notes
             )
             self.session.add(blacklisted)
+            if not commit:
+                self.session.flush()
+                return True
             self.session.commit()
+            get_blacklist_index().invalidate()
             
             logger.info(f"Added '{business_name}' to blacklist (reason: {reason})")
             return True
             
         except Exception as e:
             logger.error(f"Error adding '{business_name}' to blacklist: {str(e)}")
+            if not commit:
+                raise
             self.session.rollback()
             return False
     
@@ -81,12 +94,14 @@ class BlacklistManager:
             logger.error(f"Error checking blacklist for '{business_name}': {str(e)}")
             return False
     
-    def remove_from_blacklist(self, business_name: str) -> bool:
+    def remove_from_blacklist(self, business_name: str, commit: bool = True) -> bool:
         """
         Remove exact business name from blacklist.
         
         Args:
             business_name: Exact name of business to remove
+            commit: False to leave the delete in the caller's transaction (same contract
+                as add_to_blacklist)
             
         Returns:
             True if removed successfully, False otherwise
@@ -97,7 +112,9 @@ class BlacklistManager:
             ).delete()
             
             if deleted:
-                self.session.commit()
+                if commit:
+                    self.session.commit()
+                    get_blacklist_index().invalidate()
                 logger.info(f"Removed '{business_name}' from blacklist")
                 return True
             else:
@@ -106,6 +123,8 @@ class BlacklistManager:
                 
         except Exception as e:
             logger.error(f"Error removing '{business_name}' from blacklist: {str(e)}")
+            if not commit:
+                raise
             self.session.rollback()
             return False
     
@@ -137,12 +156,13 @@ class BlacklistManager:
             logger.error(f"Error counting blacklist: {str(e)}")
             return 0
     
-    def bulk_add_to_blacklist(self, businesses: List[dict]) -> int:
+    def bulk_add_to_blacklist(self, businesses: List[dict], commit: bool = True) -> int:
         """
         Add multiple businesses to blacklist.
         
         Args:
             businesses: List of dicts with 'name', 'reason', and optional 'notes'
+            commit: Passed through to add_to_blacklist
             
         Returns:
             Number of businesses successfully added
@@ -154,12 +174,147 @@ class BlacklistManager:
             reason = business.get('reason', 'franchise')
             notes = business.get('notes')
             
-            if name and self.add_to_blacklist(name, reason, notes):
+            if name and self.add_to_blacklist(name, reason, notes, commit=commit):
                 added_count += 1
         
         return added_count
 
 
+# Listing suffixes that still name the same multi-word chain, e.g. "Burger King Restaurant", "Home Depot Tool Rental"
+CHAIN_DESCRIPTOR_WORDS = {
+    "supercenter", "neighborhood", "market", "pharmacy", "store", "express", "gas", "station",
+    "car", "wash", "auto", "care", "center", "service", "services", "tire", "tires", "restaurant",
+    "drive", "thru", "cafe", "coffee", "pizza", "grill", "fitness", "gym", "inn", "suites", "hotel",
+    "by", "outlet", "grocery", "photo", "optical", "deli", "bakery", "fuel", "tool", "rental",
+    "office", "salon", "hilton", "marriott", "wyndham", "ihg",
+}
+
+# A one-word chain name ("Shell", "Target") is also a common first word of unrelated local
+# businesses, so it only takes the suffixes listed for it here (e.g. "Walmart Supercenter")
+SINGLE_WORD_CHAIN_SUFFIXES = {
+    "walmart": {"supercenter", "neighborhood", "market", "pharmacy", "fuel", "station", "auto", "care", "center", "vision"},
+    "target": {"optical", "pharmacy"},
+    "costco": {"wholesale", "business", "center", "gas", "station", "pharmacy", "optical", "tire"},
+    "cvs": {"pharmacy"},
+    "walgreens": {"pharmacy"},
+    "lowes": {"home", "improvement"},
+    "starbucks": {"coffee", "reserve"},
+    "firestone": {"complete", "auto", "care"},
+    "midas": {"auto", "service", "experts"},
+    "meineke": {"car", "care", "center"},
+    "valvoline": {"instant", "oil", "change"},
+    "shell": {"gas", "station"},
+    "exxon": {"gas", "station"},
+    "mobil": {"gas", "station"},
+    "chevron": {"gas", "station"},
+    "bp": {"gas", "station"},
+    "texaco": {"gas", "station"},
+}
+
+# Location separators Google appends to branch names, e.g. "Walgreens - 72nd St", "Great Clips (Papillion)"
+BRANCH_SEPARATOR_PATTERN = re.compile(r"\s[-–—|@]\s|\s#|\(|,|:")
+
+
+class BlacklistIndex:
+    """
+    Process-wide in-memory blacklist shared by all scraper threads.
+    
+    Exact lookups hit a set of normalized names; franchise/too_big entries are
+    also matched as token prefixes (indexed by first token) followed only by
+    chain descriptor words, so branch variants like "Walmart Supercenter" match.
+    One-word chains only take their own SINGLE_WORD_CHAIN_SUFFIXES.
+    Reloads lazily after BlacklistManager writes or when older than max_age_seconds.
+    """
+    
+    def __init__(self, max_age_seconds: int = 300):
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        self._names = set()
+        self._chain_patterns: Dict[str, List[Tuple[str, ...]]] = {}
+        self._loaded_at = None
+    
+    def load(self, entries: Optional[List[Tuple[str, Optional[str]]]] = None) -> int:
+        """Rebuild from (business_name, reason) pairs, read from the database when not given"""
+        if entries is None:
+            entries = self._load_entries()
+        names = set()
+        chain_patterns = {}
+        for business_name, reason in entries:
+            normalized = normalize_business_name(business_name)
+            if not normalized:
+                continue
+            names.add(normalized)
+            if reason in ("franchise", "too_big"):
+                tokens = tuple(normalized.split())
+                chain_patterns.setdefault(tokens[0], []).append(tokens)
+        with self._lock:
+            self._names = names
+            self._chain_patterns = chain_patterns
+            self._loaded_at = time.time()
+        logger.info(f"Blacklist index loaded with {len(names)} names")
+        return len(names)
+    
+    def _load_entries(self) -> List[Tuple[str, Optional[str]]]:
+        from database import SessionLocal
+        db = SessionLocal()
+        try:
+            return db.query(BlacklistedBusiness.business_name, BlacklistedBusiness.reason).all()
+        finally:
+            db.close()
+    
+    def invalidate(self):
+        """Force a reload on the next lookup"""
+        with self._lock:
+            self._loaded_at = None
+    
+    def _ensure_loaded(self):
+        loaded_at = self._loaded_at
+        if loaded_at is None or time.time() - loaded_at > self.max_age_seconds:
+            try:
+                self.load()
+            except Exception as e:
+                logger.error(f"Error loading blacklist index: {str(e)}")
+    
+    def is_blacklisted(self, business_name: str) -> bool:
+        """Check a scraped business name against the blacklist without a database round-trip"""
+        self._ensure_loaded()
+        normalized = normalize_business_name(business_name)
+        if not normalized:
+            return False
+        with self._lock:
+            names = self._names
+            chain_patterns = self._chain_patterns
+        
+        if normalized in names:
+            return True
+        
+        branch_name = normalize_business_name(BRANCH_SEPARATOR_PATTERN.split(business_name)[0])
+        if branch_name and branch_name in names:
+            return True
+        
+        tokens = normalized.split()
+        for pattern in chain_patterns.get(tokens[0], ()):
+            descriptors = CHAIN_DESCRIPTOR_WORDS if len(pattern) > 1 else SINGLE_WORD_CHAIN_SUFFIXES.get(pattern[0], ())
+            if tuple(tokens[:len(pattern)]) == pattern and all(
+                token in descriptors for token in tokens[len(pattern):]
+            ):
+                return True
+        return False
+
+
+_blacklist_index: Optional[BlacklistIndex] = None
+_blacklist_index_lock = threading.Lock()
+
+
+def get_blacklist_index() -> BlacklistIndex:
+    """Shared blacklist index for all scraper threads"""
+    global _blacklist_index
+    with _blacklist_index_lock:
+        if _blacklist_index is None:
+            _blacklist_index = BlacklistIndex()
+        return _blacklist_index
+
+
 # Pre-defined list of known franchises and big companies
 KNOWN_FRANCHISES = [
     # Fast Food
@@ -254,17 +409,18 @@ KNOWN_FRANCHISES = [
 ]
 
 
-def initialize_blacklist(db_session: Session) -> int:
+def initialize_blacklist(db_session: Session, commit: bool = True) -> int:
     """
     Initialize blacklist with known franchises.
     
     Args:
         db_session: Database session
+        commit: Passed through to add_to_blacklist
         
     Returns:
         Number of businesses added to blacklist
     """
     manager = BlacklistManager(db_session)
-    added_count = manager.bulk_add_to_blacklist(KNOWN_FRANCHISES)
+    added_count = manager.bulk_add_to_blacklist(KNOWN_FRANCHISES, commit=commit)
     logger.info(f"Initialized blacklist with {added_count} known franchises")
     return added_count
\ No newline at end of file
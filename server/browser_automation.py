@@ -7,16 +7,27 @@ from browser_setup import BrowserSetup
 from screenshot_manager import ScreenshotManager
 from search_area_manager import SearchAreaManager
 from maps_search_engine import MapsSearchEngine
+from page_waits import PageWaiter
+from job_management import add_job_log, job_statuses
+from search_checkpoint import get_checkpoint_store
+from browser_recycling import RecyclePolicy, MAX_RECYCLES_PER_SEARCH
 
 
 class BrowserAutomation:
     """Main browser automation orchestrator"""
     
-    def __init__(self, use_profile=False, headless=False, job_id=None):
+    def __init__(self, use_profile=False, headless=False, job_id=None, browser_pool=None, tab_group=None):
         self.use_profile = use_profile
         self.headless = headless
         self.job_id = job_id
         self.cancel_flag = False
+        self.browser_pool = browser_pool  # Lease a pre-warmed session instead of starting Chrome
+        self.pooled_session = None
+        self.tab_group = tab_group  # Run in a tab of a shared Chrome session (tab_multiplexer)
+        self.tabbed_browser = None
+        self.tab_handle = None
+        self.recycle_policy = RecyclePolicy.from_env()  # Restart Chrome mid-job after N businesses / high renderer memory
+        self.recycles = 0
         
         # Initialize components
         self.browser_setup = BrowserSetup(use_profile, headless)
@@ -24,6 +35,9 @@ class BrowserAutomation:
         self.screenshot_manager = None
         self.search_area_manager = None
         self.search_engine = None
+        self.page_waiter = None
+        self.network_blocker = None
+        self.log_collector = None  # Blocker whose performance log the engine drains (the browser's shared one for tabs)
 
     def is_cancelled(self):
         """Check if automation is cancelled"""
@@ -32,18 +46,41 @@ class BrowserAutomation:
     def setup_browser(self):
         """Setup browser and initialize components"""
         try:
-            self.driver = self.browser_setup.setup_browser()
+            if self.tab_group:
+                self.tabbed_browser, self.tab_handle = self.tab_group.acquire_tab()
+                self.driver = self.tabbed_browser.driver
+            elif self.browser_pool:
+                self.pooled_session = self.browser_pool.lease()
+                self.driver = self.pooled_session.driver
+            else:
+                self.driver = self.browser_setup.setup_browser()
             if not self.driver:
                 return False
             
-            # Initialize component managers
-            self.screenshot_manager = ScreenshotManager(self.driver, self.job_id)
-            self.search_area_manager = SearchAreaManager(self.driver, self.job_id)
+            # Start this job's network savings from zero (pooled sessions carry earlier traffic)
+            setup = self.pooled_session.browser_setup if self.pooled_session else self.browser_setup
+            # Tabs share one blocker and performance log, so per-job savings are only reported without tabs;
+            # every tab's engine still drains the shared log, at most once per interval for the browser
+            if self.tab_group:
+                self.network_blocker = None
+                self.log_collector = getattr(self.tabbed_browser.browser_setup, "network_blocker", None)
+            else:
+                self.network_blocker = getattr(setup, "network_blocker", None)
+                self.log_collector = self.network_blocker
+            if self.network_blocker:
+                self.network_blocker.collect()
+                self.network_blocker.reset_stats()
+            
+            # Initialize component managers (sharing one waiter so wait metrics cover the whole job)
+            self.page_waiter = PageWaiter(self.driver)
+            self.screenshot_manager = ScreenshotManager(self.driver, self.job_id, self.page_waiter)
+            self.search_area_manager = SearchAreaManager(self.driver, self.job_id, self.page_waiter)
             self.search_engine = MapsSearchEngine(
                 self.driver, 
                 self.screenshot_manager, 
                 self.search_area_manager, 
-                self.job_id
+                self.job_id,
+                self.page_waiter
             )
             
             return True
@@ -55,28 +92,121 @@ class BrowserAutomation:
                           requires_website=None, recent_review_months=None,
                           min_photos=None, min_description_length=None, 
                           enable_click_through=True, enable_pagespeed=False, max_pagespeed_score=None,
-                          max_runtime_minutes=None):
+                          max_runtime_minutes=None, extraction_mode="element", recording_dir=None,
+                          incremental_feed=False, wait_ceilings=None, blocking_profile=None,
+                          skip_known_places=True, tiled_search=False, tile_planner=None, checkpoint=True,
+                          website_discovery="click", pipelined_scroll=False, prune_feed=False,
+                          recycle_after_businesses=None, recycle_memory_mb=None):
         """Search Google Maps using the search engine"""
         if not self.search_engine:
             print("❌ Browser not properly initialized")
             return []
         
-        if self.cancel_flag:
-            self.search_engine.set_cancel_flag()
+        if recycle_after_businesses or recycle_memory_mb:
+            self.recycle_policy = RecyclePolicy(recycle_after_businesses, recycle_memory_mb)
+        # A tab cannot restart the Chrome session it shares, and tiled searches are not checkpointed
+        recycle_policy = self.recycle_policy if self.recycle_policy.enabled and self.job_id and not self.tab_group and not tiled_search else None
         
-        # Pass enable_pagespeed and max_pagespeed_score to the search engine
-        self.search_engine.enable_pagespeed = enable_pagespeed
-        self.search_engine.max_pagespeed_score = max_pagespeed_score
-        
-        return self.search_engine.search_google_maps(
+        # Recycling resumes from a checkpoint, so it needs the store even when checkpointing was not requested
+        engine_settings = dict(
+            enable_pagespeed=enable_pagespeed,
+            max_pagespeed_score=max_pagespeed_score,
+            extraction_mode=extraction_mode,
+            website_discovery=website_discovery,
+            recording_dir=recording_dir,
+            incremental_feed=incremental_feed,
+            pipelined_scroll=pipelined_scroll,
+            prune_feed=prune_feed,
+            skip_known_places=skip_known_places,
+            tiled_search=tiled_search,
+            tile_planner=tile_planner,
+            checkpoint_store=get_checkpoint_store() if (checkpoint or recycle_policy) and self.job_id else None,
+            recycle_policy=recycle_policy,
+        )
+        search_args = (
             query, limit, min_rating, min_reviews, requires_website,
             recent_review_months, min_photos, min_description_length,
             enable_click_through, max_runtime_minutes
         )
+        
+        self._configure_engine(engine_settings, wait_ceilings, blocking_profile)
+        results = self.search_engine.search_google_maps(*search_args)
+        
+        # The engine checkpointed and stopped so a fresh browser can take over from the same position
+        while self.search_engine.recycle_reason and not self.cancel_flag and self.recycles < MAX_RECYCLES_PER_SEARCH:
+            if not self._recycle_browser(self.search_engine.recycle_reason):
+                break
+            self._configure_engine(engine_settings, wait_ceilings, blocking_profile)
+            results = self.search_engine.search_google_maps(*search_args)
+        
+        self._report_network_savings()
+        return results
+
+    def _configure_engine(self, engine_settings, wait_ceilings, blocking_profile):
+        """Apply per-search settings to the current search engine"""
+        if self.cancel_flag:
+            self.search_engine.set_cancel_flag()
+        for name, value in engine_settings.items():
+            setattr(self.search_engine, name, value)
+        # Per browser, not per search: a recycled browser brings its own blocker
+        self.search_engine.network_blocker = self.log_collector
+        self.search_engine.waiter.configure(wait_ceilings)
+        if self.network_blocker and blocking_profile and blocking_profile != self.network_blocker.profile:
+            self.network_blocker.apply(blocking_profile)
+
+    def _recycle_browser(self, reason):
+        """Replace the browser with a fresh one; the next search resumes from the engine's checkpoint"""
+        self.recycles += 1
+        message = f"♻️ Recycling browser ({reason}) - restarting and resuming ({self.recycles}/{MAX_RECYCLES_PER_SEARCH})"
+        print(message)
+        if self.job_id:
+            add_job_log(self.job_id, message)
+        self._report_network_savings()
+        
+        # A bloated session is closed rather than handed back to the pool
+        if self.pooled_session:
+            self.pooled_session.close()
+            self.pooled_session = None
+        else:
+            self.browser_setup.close()
+            self.browser_setup = BrowserSetup(self.use_profile, self.headless)
+        if self.setup_browser():
+            return True
+        if self.job_id:
+            add_job_log(self.job_id, "❌ Could not start a fresh browser - search progress is kept in its checkpoint")
+        return False
+
+    @property
+    def session_lost(self):
+        """True when the last search stopped because the browser died (its checkpoint allows a resume)"""
+        return bool(self.search_engine and self.search_engine.session_lost)
+
+    def _report_network_savings(self):
+        """Log requests/bytes saved by the blocking profile and attach them to the job status"""
+        if not self.network_blocker:
+            return
+        self.network_blocker.collect()
+        stats = self.network_blocker.get_stats()
+        message = (f"🚫 Network blocking ({stats['profile']}): {stats['requests_blocked']} requests blocked, "
+                   f"~{round(stats['estimated_bytes_saved'] / 1024)} KB saved, "
+                   f"{round(stats['bytes_loaded'] / 1024)} KB loaded")
+        print(message)
+        if self.job_id:
+            add_job_log(self.job_id, message)
+            if self.job_id in job_statuses:
+                job_statuses[self.job_id]["network_savings"] = stats
 
     def close(self):
         """Clean up and close browser"""
-        if self.browser_setup:
+        if self.tabbed_browser:
+            self.tab_group.release_tab(self.tabbed_browser, self.tab_handle)
+            self.tabbed_browser = None
+            print("🗂️ Browser tab closed")
+        elif self.pooled_session:
+            self.browser_pool.release(self.pooled_session)
+            self.pooled_session = None
+            print("♻️ Browser session returned to pool")
+        elif self.browser_setup:
             self.browser_setup.close()
         print("✅ Browser automation cleanup complete")
 
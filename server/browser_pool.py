@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Pre-warmed browser session pool shared across scrape jobs.
+Keeps N health-checked Remote Chrome sessions parked on Google Maps so a job
+can lease one instead of paying Chrome startup plus the first Maps load.
+Sessions are reset and returned to the pool when the job finishes.
+"""
+
+import os
+import time
+import threading
+from typing import Optional, Dict, Any
+
+from browser_setup import BrowserSetup
+
+
+MAPS_URL = "https://www.google.com/maps"
+
+
+class PooledSession:
+    """A warmed BrowserSetup plus bookkeeping for the pool"""
+
+    def __init__(self, browser_setup: BrowserSetup):
+        self.browser_setup = browser_setup
+        self.created_at = time.time()
+        self.leases = 0
+
+    @property
+    def driver(self):
+        return self.browser_setup.driver
+
+    def close(self):
+        self.browser_setup.close()
+
+
+class BrowserPool:
+    """Keeps `size` warm sessions ready; leases beyond that fall back to cold sessions"""
+
+    def __init__(self, size: int = 2, headless: bool = True, warm_url: str = MAPS_URL):
+        self.size = size
+        self.headless = headless
+        self.warm_url = warm_url
+        self._idle = []
+        self._lock = threading.Lock()
+        self._warming = 0
+        self._closed = False
+        self.stats = {"created": 0, "warm_leases": 0, "cold_leases": 0, "released": 0, "discarded": 0}
+
+    def _create_session(self) -> PooledSession:
+        """Start a Chrome session and park it on Google Maps"""
+        browser_setup = BrowserSetup(use_profile=False, headless=self.headless)
+        browser_setup.setup_browser()
+        session = PooledSession(browser_setup)
+        try:
+            session.driver.get(self.warm_url)
+        except Exception:
+            session.close()
+            raise
+        with self._lock:
+            self.stats["created"] += 1
+        return session
+
+    def _is_healthy(self, session: PooledSession) -> bool:
+        """Cheap liveness check - one round-trip to the browser"""
+        try:
+            return session.driver.execute_script("return document.readyState") is not None
+        except Exception:
+            return False
+
+    def _reset(self, session: PooledSession) -> bool:
+        """Return a used session to a clean Maps landing page"""
+        driver = session.driver
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            # Undo any per-job blocking profile override
+            blocker = getattr(session.browser_setup, "network_blocker", None)
+            if blocker and blocker.profile != session.browser_setup.blocking_profile:
+                blocker.apply(session.browser_setup.blocking_profile)
+            driver.get(self.warm_url)
+            return True
+        except Exception as e:
+            print(f"⚠️ Browser pool: could not reset session: {str(e)}")
+            return False
+
+    def _warm_one(self):
+        try:
+            session = self._create_session()
+        except Exception as e:
+            print(f"❌ Browser pool: failed to pre-warm session: {str(e)}")
+            with self._lock:
+                self._warming -= 1
+            return
+        with self._lock:
+            self._warming -= 1
+            if not self._closed and len(self._idle) < self.size:
+                self._idle.append(session)
+                session = None
+        if session:
+            self._discard(session)
+
+    def replenish(self):
+        """Start background warm-ups until idle + warming sessions reach the pool size"""
+        with self._lock:
+            if self._closed:
+                return
+            missing = self.size - len(self._idle) - self._warming
+            self._warming += max(missing, 0)
+        for _ in range(max(missing, 0)):
+            threading.Thread(target=self._warm_one, daemon=True).start()
+
+    def start(self) -> "BrowserPool":
+        print(f"🔥 Browser pool: pre-warming {self.size} session(s) on {self.warm_url}")
+        self.replenish()
+        return self
+
+    def lease(self) -> PooledSession:
+        """Take a warm session if one is ready, otherwise start a cold one"""
+        while True:
+            with self._lock:
+                session = self._idle.pop() if self._idle else None
+            if session is None:
+                break
+            if self._is_healthy(session):
+                session.leases += 1
+                with self._lock:
+                    self.stats["warm_leases"] += 1
+                self.replenish()
+                return session
+            self._discard(session)
+
+        self.replenish()
+        session = self._create_session()
+        session.leases += 1
+        with self._lock:
+            self.stats["cold_leases"] += 1
+        return session
+
+    def release(self, session: PooledSession):
+        """Reset a session and park it, or close it if the pool is full or it is unhealthy"""
+        if self._closed or not self._reset(session):
+            self._discard(session)
+            return
+        with self._lock:
+            self.stats["released"] += 1
+            if len(self._idle) < self.size:
+                self._idle.append(session)
+                return
+        session.close()
+
+    def _discard(self, session: PooledSession):
+        with self._lock:
+            self.stats["discarded"] += 1
+        session.close()
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": self.size,
+                "idle": len(self._idle),
+                "warming": self._warming,
+                **self.stats,
+            }
+
+    def shutdown(self):
+        """Close every idle session; leased sessions are closed when released"""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for session in idle:
+            session.close()
+
+
+_browser_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> Optional[BrowserPool]:
+    """Global pool sized by BROWSER_POOL_SIZE (0 disables pooling)"""
+    global _browser_pool
+    size = int(os.environ.get("BROWSER_POOL_SIZE", "2"))
+    if size <= 0:
+        return None
+    with _pool_lock:
+        if _browser_pool is None:
+            _browser_pool = BrowserPool(size=size, headless=True)
+        return _browser_pool
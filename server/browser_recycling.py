@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Browser recycling for long jobs.
+Maps keeps accumulating renderer memory as a search scrolls, so long jobs
+slow down over time. A RecyclePolicy asks the search engine to stop after N
+businesses, or once the renderer's memory crosses a threshold. The engine
+checkpoints its position, BrowserAutomation starts a fresh browser, and the
+search resumes from the checkpoint with the same query.
+
+request_recycle() also reaches searches in other processes: with REDIS_URL set
+it bumps a shared counter in Redis (Celery's prefork children and the beat-driven
+memory check never share module state), which running searches poll.
+"""
+
+import os
+import time
+import logging
+import threading
+from typing import Optional, Tuple
+
+from network_blocking import execute_cdp
+
+
+MB = 1024 * 1024
+MAX_RECYCLES_PER_SEARCH = 10  # Guards against a threshold set below a fresh browser's footprint
+
+
+def _local_renderer_rss_mb(driver) -> Optional[float]:
+    """Summed RSS of Chrome renderer processes, when ChromeDriver runs on this machine"""
+    process = getattr(getattr(driver, "service", None), "process", None)
+    if process is None:
+        return None
+    try:
+        import psutil
+        total = 0
+        for child in psutil.Process(process.pid).children(recursive=True):
+            try:
+                if "--type=renderer" in " ".join(child.cmdline()):
+                    total += child.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return total / MB
+    except Exception:
+        return None
+
+
+def renderer_memory_mb(driver) -> Optional[float]:
+    """Renderer memory in MB: process RSS for a local Chrome, otherwise the page's JS heap over CDP.
+
+    Chrome behind the Selenium hub runs in another container, so its processes are not
+    visible here; the renderer's JS heap (JSHeapTotalSize) is what grows as Maps scrolls.
+    """
+    rss = _local_renderer_rss_mb(driver)
+    if rss is not None:
+        return rss
+    try:
+        execute_cdp(driver, "Performance.enable")
+        metrics = execute_cdp(driver, "Performance.getMetrics")["metrics"]
+        heap = next((m["value"] for m in metrics if m["name"] == "JSHeapTotalSize"), None)
+        return heap / MB if heap is not None else None
+    except Exception:
+        return None
+
+
+class RecyclePolicy:
+    """When a running search should hand over to a fresh browser"""
+
+    def __init__(self, max_businesses: Optional[int] = None, max_renderer_mb: Optional[float] = None):
+        self.max_businesses = max_businesses or None
+        self.max_renderer_mb = max_renderer_mb or None
+
+    @classmethod
+    def from_env(cls) -> "RecyclePolicy":
+        """BROWSER_RECYCLE_BUSINESSES / BROWSER_RECYCLE_MEMORY_MB (unset or 0 = never)"""
+        return cls(
+            int(os.environ.get("BROWSER_RECYCLE_BUSINESSES", "0")),
+            float(os.environ.get("BROWSER_RECYCLE_MEMORY_MB", "0")),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.max_businesses or self.max_renderer_mb)
+
+    def memory_over_limit(self, driver) -> Optional[float]:
+        """Renderer memory in MB when it is at or over max_renderer_mb, else None"""
+        if not self.max_renderer_mb:
+            return None
+        memory_mb = renderer_memory_mb(driver)
+        if memory_mb is not None and memory_mb >= self.max_renderer_mb:
+            return memory_mb
+        return None
+
+    def check(self, driver, businesses: int, generation: int, check_memory: bool = True) -> Optional[str]:
+        """Reason to recycle now, or None. `businesses` counts those evaluated in this browser.
+
+        check_memory=False skips the memory threshold, for a browser that was already over
+        it right after resuming (another recycle would replay the same scroll depth).
+        """
+        if self.max_businesses and businesses >= self.max_businesses:
+            return f"{businesses} businesses evaluated in this browser"
+        if generation < recycle_generation():
+            return recycle_reason() or "recycle requested"
+        memory_mb = self.memory_over_limit(driver) if check_memory else None
+        if memory_mb is not None:
+            return f"renderer memory {memory_mb:.0f} MB >= {self.max_renderer_mb:.0f} MB"
+        return None
+
+
+logger = logging.getLogger(__name__)
+
+SHARED_GENERATION_KEY = "leadloq:browser_recycle:generation"
+SHARED_REASON_KEY = "leadloq:browser_recycle:reason"
+SHARED_COOLDOWN_KEY = "leadloq:browser_recycle:cooldown"
+SHARED_POLL_SECONDS = 5.0  # Searches check Redis at most this often
+PRESSURE_RECYCLE_COOLDOWN_SECONDS = 600  # Memory pressure asks for a recycle at most this often
+
+_generation = 0
+_pressure_reason: Optional[str] = None
+_generation_lock = threading.Lock()
+_shared = {"generation": 0, "reason": None, "read_at": 0.0}
+_cooldown_until = 0.0
+_redis_client = None
+
+
+def _get_redis():
+    """Redis client for the shared recycle signal, or None without REDIS_URL"""
+    global _redis_client
+    url = os.environ.get("REDIS_URL")
+    if not url:
+        return None
+    if _redis_client is None:
+        import redis
+        _redis_client = redis.Redis.from_url(url, socket_timeout=1, socket_connect_timeout=1)
+    return _redis_client
+
+
+def _shared_state() -> Tuple[int, Optional[str]]:
+    """(generation, reason) last published in Redis, re-read at most every SHARED_POLL_SECONDS"""
+    client = _get_redis()
+    if client is None:
+        return 0, None
+    with _generation_lock:
+        if time.monotonic() - _shared["read_at"] >= SHARED_POLL_SECONDS:
+            _shared["read_at"] = time.monotonic()
+            try:
+                generation, reason = client.mget(SHARED_GENERATION_KEY, SHARED_REASON_KEY)
+                _shared["generation"] = int(generation or 0)
+                _shared["reason"] = reason.decode() if reason else None
+            except Exception as e:
+                logger.debug(f"Could not read the shared recycle signal: {e}")
+        return _shared["generation"], _shared["reason"]
+
+
+def recycle_generation() -> int:
+    """Recycle requests so far: this process's plus the shared ones (both only ever grow)"""
+    return _generation + _shared_state()[0]
+
+
+def recycle_reason() -> Optional[str]:
+    return _pressure_reason or _shared_state()[1]
+
+
+def _claim_cooldown(client, reason: str, cooldown: float) -> bool:
+    """True (and a new cooldown starts) unless a recycle was requested in the last cooldown seconds"""
+    global _cooldown_until
+    if client is not None:
+        try:
+            return bool(client.set(SHARED_COOLDOWN_KEY, reason, nx=True, ex=max(1, int(cooldown))))
+        except Exception as e:
+            logger.warning(f"Could not check the shared recycle cooldown: {e}")
+    now = time.monotonic()
+    with _generation_lock:
+        if now < _cooldown_until:
+            return False
+        _cooldown_until = now + cooldown
+        return True
+
+
+def request_recycle(reason: str, cooldown: float = 0) -> bool:
+    """Ask every search running with recycling enabled to restart its browser.
+
+    Searches in this process see it at their next iteration; with REDIS_URL set, the
+    request is also published for searches in every other worker process. With a
+    cooldown the request is dropped (returns False) when one already went out in the
+    last cooldown seconds, from any process when Redis is shared.
+    """
+    global _generation, _pressure_reason
+    client = _get_redis()
+    if cooldown and not _claim_cooldown(client, reason, cooldown):
+        return False
+    with _generation_lock:
+        _generation += 1
+        _pressure_reason = reason
+    if client is None:
+        return True
+    try:
+        pipe = client.pipeline()
+        pipe.incr(SHARED_GENERATION_KEY)
+        pipe.set(SHARED_REASON_KEY, reason)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Could not publish the recycle request to other workers: {e}")
+    return True
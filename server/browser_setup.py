@@ -7,13 +7,16 @@ import os
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
+from network_blocking import NetworkBlocker, DEFAULT_PROFILE
 
 
 class BrowserSetup:
-    def __init__(self, use_profile=False, headless=False):
+    def __init__(self, use_profile=False, headless=False, blocking_profile=None):
         self.use_profile = use_profile
         self.headless = headless
+        self.blocking_profile = blocking_profile or os.environ.get('BROWSER_BLOCKING_PROFILE', DEFAULT_PROFILE)
         self.driver = None
+        self.network_blocker = None
 
     def setup_browser(self):
         """Setup Chrome browser - let ChromeDriver manage temp profiles"""
@@ -36,6 +39,15 @@ class BrowserSetup:
         options.add_argument("--remote-allow-origins=*")
         options.add_argument("--window-size=1920,1080")
         
+        # Keep background tabs running at full speed when several jobs share this session
+        options.add_argument("--disable-background-timer-throttling")
+        options.add_argument("--disable-renderer-backgrounding")
+        options.add_argument("--disable-backgrounding-occluded-windows")
+        
+        # Network events in the performance log let NetworkBlocker report requests/bytes saved
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+        
         # Hub URL for Selenium 4 (no /wd/hub needed)
         hub_url = os.environ.get('SELENIUM_HUB_URL', 'http://selenium-chrome:4444')
         print(f"🐳 Connecting to Selenium Hub at: {hub_url}")
@@ -48,6 +60,10 @@ class BrowserSetup:
             )
             self.wait = WebDriverWait(self.driver, 10)
             print("✅ Remote browser initialized successfully!")
+            
+            # Block map tiles, fonts, trackers etc. over CDP before the first page load
+            self.network_blocker = NetworkBlocker(self.driver, self.blocking_profile)
+            self.network_blocker.apply()
             return self.driver
         except Exception as e:
             print(f"❌ Failed to initialize Remote Chrome: {e}")
@@ -13,6 +13,10 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import re
 import time
 
+from stage_timing import span
+from job_logger import DEBUG, current_logger
+from selector_stats import get_selector_stats
+
 
 class BusinessExtractor(ABC):
     """Abstract base class for business extraction strategies"""
@@ -36,26 +40,26 @@ class StandardListingExtractor(BusinessExtractor):
         try:
             # Primary check: Look for Website button with data-value attribute (most stable)
             website_btn = element.find_element(By.CSS_SELECTOR, "a[data-value='Website']")
-            print(f"    🔍 StandardListingExtractor: Found Website button - STANDARD LISTING")
+            current_logger().debug("    🔍 StandardListingExtractor: Found Website button - STANDARD LISTING")
             return True
         except:
             # Secondary check: Look for Directions button (also stable data-value attribute)
             try:
                 directions_btn = element.find_element(By.CSS_SELECTOR, "[data-value='Directions']")
-                print(f"    🔍 StandardListingExtractor: Found Directions button - STANDARD LISTING")
+                current_logger().debug("    🔍 StandardListingExtractor: Found Directions button - STANDARD LISTING")
                 return True
             except:
                 # Tertiary check: Look for any action buttons with data-value
                 try:
                     action_buttons = element.find_elements(By.CSS_SELECTOR, "a[data-value], button[data-value]")
                     if action_buttons:
-                        print(f"    🔍 StandardListingExtractor: Found {len(action_buttons)} action buttons - STANDARD LISTING")
+                        current_logger().debug("    🔍 StandardListingExtractor: Found %s action buttons - STANDARD LISTING", len(action_buttons))
                         return True
                     
-                    print(f"    🔍 StandardListingExtractor: No action buttons found - NOT STANDARD")
+                    current_logger().debug("    🔍 StandardListingExtractor: No action buttons found - NOT STANDARD")
                     return False
                 except:
-                    print(f"    🔍 StandardListingExtractor: No action buttons found - NOT STANDARD")
+                    current_logger().debug("    🔍 StandardListingExtractor: No action buttons found - NOT STANDARD")
                     return False
     
     def extract(self, element, driver=None) -> Dict[str, Any]:
@@ -68,25 +72,27 @@ class StandardListingExtractor(BusinessExtractor):
             details['website'] = website_elem.get_attribute("href")
             details['has_website'] = True
             business_name = details.get('name', 'Unknown Business')
-            print(f"    🌐 Found website for {business_name}: {details['website'][:50]}...")
+            current_logger().debug("    🌐 Found website for %s: %s...", business_name, details['website'][:50])
         except:
             details['website'] = None
             details['has_website'] = False
             business_name = details.get('name', 'Unknown Business')
-            print(f"    ❌ No website button found for {business_name}")
+            current_logger().debug("    ❌ No website button found for %s", business_name)
         
         return details
     
-    def _extract_basic_info(self, element) -> Dict[str, Any]:
+    def _extract_basic_info(self, element, listing_type: str = "standard") -> Dict[str, Any]:
         """Extract common business information"""
         details = {}
+        selector_stats = get_selector_stats()
         
-        # DEBUG: Print actual HTML structure to understand what we're working with
-        try:
-            element_html = element.get_attribute('innerHTML')[:500]  # First 500 chars
-            print(f"    🔍 DEBUG HTML: {element_html}...")
-        except:
-            print("    🔍 DEBUG: Could not get element HTML")
+        # DEBUG: HTML structure dump - only fetched when DEBUG is on (innerHTML is a remote call per card)
+        logger = current_logger()
+        if logger.is_enabled_for(DEBUG):
+            try:
+                logger.debug("    🔍 DEBUG HTML: %s...", element.get_attribute('innerHTML')[:500])
+            except:
+                logger.debug("    🔍 DEBUG: Could not get element HTML")
         
         # Business name - using semantic HTML structure patterns (avoid generated class names)
         business_name = None
@@ -109,7 +115,10 @@ class StandardListingExtractor(BusinessExtractor):
             "div", "span"                                   # Any div/span (filtered by content)
         ]
         
-        for selector in name_selectors:
+        # Previous winners first; the div/span scans stay last
+        tried_selectors = []
+        for selector in selector_stats.ordered("name", listing_type, name_selectors, fixed_tail=2):
+            tried_selectors.append(selector)
             try:
                 if "href*=" in selector and "/maps/place/" in selector:
                     # Special handling for business link - try aria-label first, then text
@@ -122,14 +131,14 @@ class StandardListingExtractor(BusinessExtractor):
                                 candidate_name = aria_label.split("·")[0].strip()
                                 if self._is_valid_business_name(candidate_name) and len(candidate_name) > 3:
                                     business_name = candidate_name
-                                    print(f"    🏷️ Found name via aria-label {selector}: '{business_name}'")
+                                    current_logger().debug("    🏷️ Found name via aria-label %s: '%s'", selector, business_name)
                                     break
                             
                             # Try text content only for Maps place links
                             text_content = link_elem.text.strip()
                             if text_content and self._is_valid_business_name(text_content) and len(text_content) > 3:
                                 business_name = text_content
-                                print(f"    🏷️ Found name via text {selector}: '{business_name}'")
+                                current_logger().debug("    🏷️ Found name via text %s: '%s'", selector, business_name)
                                 break
                     if business_name:
                         break
@@ -142,17 +151,18 @@ class StandardListingExtractor(BusinessExtractor):
                             # Additional check: business names should be substantial
                             if len(candidate_name) >= 3 and not candidate_name.lower() in ['div', 'span', 'click', 'view', 'more']:
                                 business_name = candidate_name
-                                print(f"    🏷️ Found name via {selector}: '{business_name}'")
+                                current_logger().debug("    🏷️ Found name via %s: '%s'", selector, business_name)
                                 break
                     if business_name:
                         break
             except Exception as e:
-                print(f"    🔍 Selector {selector} failed: {str(e)[:100]}...")
+                current_logger().debug("    🔍 Selector %s failed: %s...", selector, str(e)[:100])
                 continue
         
+        selector_stats.record_chain("name", listing_type, tried_selectors, tried_selectors[-1] if business_name else None)
         details['name'] = business_name if business_name else "Unknown Business"
         if not business_name:
-            print(f"    ❌ No business name found with any selector!")
+            current_logger().debug("    ❌ No business name found with any selector!")
         
         # Rating and Reviews - semantic patterns avoiding generated class names
         rating_selectors = [
@@ -181,13 +191,15 @@ class StandardListingExtractor(BusinessExtractor):
         ]
         
         rating_found = False
-        for rating_selector in rating_selectors:
+        tried_selectors = []
+        for rating_selector in selector_stats.ordered("rating", listing_type, rating_selectors, fixed_tail=2):
+            tried_selectors.append(rating_selector)
             try:
                 rating_containers = element.find_elements(By.CSS_SELECTOR, rating_selector)
                 for rating_container in rating_containers:
                     aria_label = rating_container.get_attribute("aria-label")
                     if aria_label:
-                        print(f"    ⭐ Found rating aria-label via {rating_selector}: '{aria_label}'")
+                        current_logger().debug("    ⭐ Found rating aria-label via %s: '%s'", rating_selector, aria_label)
                         
                         # Try multiple rating patterns
                         rating_patterns = [
@@ -203,7 +215,7 @@ class StandardListingExtractor(BusinessExtractor):
                                 potential_rating = float(rating_match.group(1))
                                 if 0 <= potential_rating <= 5:  # Valid rating range
                                     details['rating'] = potential_rating
-                                    print(f"    ⭐ Extracted rating: {details['rating']}")
+                                    current_logger().debug("    ⭐ Extracted rating: %s", details['rating'])
                                     rating_found = True
                                     break
                         
@@ -211,7 +223,7 @@ class StandardListingExtractor(BusinessExtractor):
                         review_match = re.search(r'(\d+)\s*reviews?', aria_label.lower())
                         if review_match:
                             details['reviews'] = int(review_match.group(1))
-                            print(f"    📝 Extracted reviews: {details['reviews']}")
+                            current_logger().debug("    📝 Extracted reviews: %s", details['reviews'])
                         
                         if rating_found:
                             break
@@ -224,20 +236,21 @@ class StandardListingExtractor(BusinessExtractor):
                             potential_rating = float(rating_match.group(1))
                             if 0 <= potential_rating <= 5:
                                 details['rating'] = potential_rating
-                                print(f"    ⭐ Extracted rating from text: {details['rating']}")
+                                current_logger().debug("    ⭐ Extracted rating from text: %s", details['rating'])
                                 rating_found = True
                                 break
                 
                 if rating_found:
                     break
             except Exception as e:
-                print(f"    🔍 Rating selector {rating_selector} failed: {str(e)[:100]}...")
+                current_logger().debug("    🔍 Rating selector %s failed: %s...", rating_selector, str(e)[:100])
                 continue
         
+        selector_stats.record_chain("rating", listing_type, tried_selectors, tried_selectors[-1] if rating_found else None)
         if not rating_found:
             details['rating'] = "0"
             details['reviews'] = "0"
-            print(f"    ❌ No rating found with any selector")
+            current_logger().debug("    ❌ No rating found with any selector")
         
         # Phone
         try:
@@ -350,7 +363,7 @@ class CompactListingExtractor(BusinessExtractor):
             
             # Standard listing has visible Website or Directions buttons
             if has_website_button or has_directions_button:
-                print(f"    🔍 CompactListingExtractor: Found action buttons (Website: {has_website_button}, Directions: {has_directions_button}) - NOT COMPACT")
+                current_logger().debug("    🔍 CompactListingExtractor: Found action buttons (Website: %s, Directions: %s) - NOT COMPACT", has_website_button, has_directions_button)
                 return False
             
             # Check if it's a valid business listing (has business link and name)
@@ -379,44 +392,45 @@ class CompactListingExtractor(BusinessExtractor):
             # 2. Has business name
             # 3. NO visible Website/Directions buttons
             if business_links and has_business_name:
-                print(f"    🔍 CompactListingExtractor: Business listing without action buttons = COMPACT LISTING")
+                current_logger().debug("    🔍 CompactListingExtractor: Business listing without action buttons = COMPACT LISTING")
                 return True
             else:
-                print(f"    🔍 CompactListingExtractor: Not a valid compact listing (links: {bool(business_links)}, name: {has_business_name})")
+                current_logger().debug("    🔍 CompactListingExtractor: Not a valid compact listing (links: %s, name: %s)", bool(business_links), has_business_name)
                 return False
                 
         except Exception as e:
-            print(f"    🔍 CompactListingExtractor: Error in can_handle: {e} - NOT COMPACT")
+            current_logger().debug("    🔍 CompactListingExtractor: Error in can_handle: %s - NOT COMPACT", e)
             return False
     
     def extract(self, element, driver=None) -> Dict[str, Any]:
         """Extract business details from compact listing, including click-through for website"""
-        details = StandardListingExtractor()._extract_basic_info(element)
+        details = StandardListingExtractor()._extract_basic_info(element, listing_type="compact")
         
         # For compact listings, we need to click to check for website
         if driver:
-            website_url = self._check_website_via_click(element, driver, details.get('name', 'Unknown'))
+            with span("click_through"):
+                website_url = self._check_website_via_click(element, driver, details.get('name', 'Unknown'))
             if website_url:
                 details['website'] = website_url
                 details['has_website'] = True
-                print(f"    🌐 Found website via click-through: {website_url}")
+                current_logger().debug("    🌐 Found website via click-through: %s", website_url)
             else:
                 details['website'] = None
                 details['has_website'] = False
-                print(f"    ❌ No website found after click-through")
+                current_logger().debug("    ❌ No website found after click-through")
         else:
             # Without driver, we can't click to check
             details['website'] = None
             details['has_website'] = False
             details['_needs_click_check'] = True
-            print(f"    ⚠️ Compact listing - website check requires click-through")
+            current_logger().debug("    ⚠️ Compact listing - website check requires click-through")
         
         return details
     
     def _check_website_via_click(self, element, driver, business_name: str) -> Optional[str]:
         """Click into the business to check for website information using stable selectors"""
         try:
-            print(f"    🖱️ Clicking into {business_name} to check for website...")
+            current_logger().debug("    🖱️ Clicking into %s to check for website...", business_name)
             
             # Find business link using more stable selector
             link_elem = element.find_element(By.CSS_SELECTOR, "a[href*='/maps/place/']")
@@ -435,7 +449,7 @@ class CompactListingExtractor(BusinessExtractor):
                 href = website_btn.get_attribute("href")
                 if href and not href.startswith("https://www.google.com"):
                     website_url = href
-                    print(f"    ✅ Found website via data-value Website button: {website_url}")
+                    current_logger().debug("    ✅ Found website via data-value Website button: %s", website_url)
             except:
                 pass
             
@@ -462,7 +476,7 @@ class CompactListingExtractor(BusinessExtractor):
                                 link_text.endswith('.org') or
                                 (len(link_text) > 0 and '.' in link_text)):
                                 website_url = href
-                                print(f"    ✅ Found website via external link: {website_url}")
+                                current_logger().debug("    ✅ Found website via external link: %s", website_url)
                                 break
                 except:
                     pass
@@ -486,7 +500,7 @@ class CompactListingExtractor(BusinessExtractor):
                                 if not any(social in domain.lower() for social in 
                                     ['facebook', 'instagram', 'twitter', 'youtube', 'yelp', 'tripadvisor']):
                                     website_url = domain
-                                    print(f"    ✅ Found website via text content: {website_url}")
+                                    current_logger().debug("    ✅ Found website via text content: %s", website_url)
                                     break
                 except:
                     pass
@@ -504,13 +518,13 @@ class CompactListingExtractor(BusinessExtractor):
                             parent_text = link.find_element(By.XPATH, "..").text.lower()
                             if 'website' in parent_text or 'site' in parent_text:
                                 website_url = href
-                                print(f"    ✅ Found website via target=_blank link: {website_url}")
+                                current_logger().debug("    ✅ Found website via target=_blank link: %s", website_url)
                                 break
                 except:
                     pass
             
             # Navigate back to the list
-            print(f"    🔙 Navigating back to search results...")
+            current_logger().debug("    🔙 Navigating back to search results...")
             driver.back()
             time.sleep(2)  # Wait for page to reload
             
@@ -520,12 +534,12 @@ class CompactListingExtractor(BusinessExtractor):
                     EC.presence_of_element_located((By.CSS_SELECTOR, "[role='feed'], [role='main'], [role='article']"))
                 )
             except:
-                print(f"    ⚠️ Timeout waiting for search results, but continuing...")
+                current_logger().debug("    ⚠️ Timeout waiting for search results, but continuing...")
             
             return website_url
             
         except Exception as e:
-            print(f"    ❌ Error checking website via click: {e}")
+            current_logger().warning("    ❌ Error checking website via click: %s", e)
             # Try to recover by going back
             try:
                 driver.back()
@@ -551,13 +565,13 @@ class BusinessExtractorFactory:
         for extractor in self.extractors:
             if extractor.can_handle(element):
                 extractor_name = type(extractor).__name__
-                print(f"    🔍 Using {extractor_name}")
-                print(f"    {'─'*40}")
+                current_logger().debug("    🔍 Using %s", extractor_name)
+                current_logger().debug("    %s", '─'*40)
                 return extractor.extract(element, self.driver)
         
         # Fallback to StandardListingExtractor if no extractor matches
-        print(f"    🔍 No specific extractor matched, using StandardListingExtractor as fallback")
-        print(f"    {'─'*40}")
+        current_logger().debug("    🔍 No specific extractor matched, using StandardListingExtractor as fallback")
+        current_logger().debug("    %s", '─'*40)
         return self.extractors[0].extract(element, self.driver)
 
 
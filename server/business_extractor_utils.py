@@ -5,6 +5,54 @@ Business extraction utilities
 
 import re
 from datetime import datetime, timedelta
+from typing import Callable, Dict, Any, Iterable, Optional
+
+
+# Star aria-label on result cards, e.g. "4.8 stars 1,204 Reviews"
+RATING_PATTERN = re.compile(r'(\d+\.?\d*)\s*stars?')
+REVIEWS_PATTERN = re.compile(r'(\d[\d,]*)\s*reviews?')
+
+
+def card_name(aria_label: Optional[str], headlines: Iterable[Optional[str]],
+              is_valid_name: Callable[[str], bool]) -> Optional[str]:
+    """Business name from a card's place-link aria-label, falling back to its headline texts in order.
+
+    Shared by the snapshot and script extractors so both modes clean names the same way.
+    """
+    if aria_label:
+        candidate = aria_label.split("·")[0].strip()
+        if is_valid_name(candidate) and len(candidate) > 3:
+            return candidate
+    for headline in headlines:
+        candidate = (headline or '').strip()
+        if candidate and is_valid_name(candidate):
+            return candidate
+    return None
+
+
+def card_rating(rating_labels: Iterable[Optional[str]], rating_text: Optional[str] = None,
+                reviews_text: Optional[str] = None) -> Dict[str, Any]:
+    """Rating and review count from a card's star aria-labels, falling back to the visible rating text"""
+    for label in rating_labels:
+        label = (label or '').lower()
+        rating_match = RATING_PATTERN.search(label)
+        if rating_match and 0 <= float(rating_match.group(1)) <= 5:
+            result = {'rating': float(rating_match.group(1))}
+            review_match = REVIEWS_PATTERN.search(label)
+            if review_match:
+                result['reviews'] = int(review_match.group(1).replace(',', ''))
+            return result
+
+    if rating_text:
+        try:
+            result = {'rating': float(rating_text)}
+            if reviews_text:
+                result['reviews'] = int(reviews_text.strip('()').replace(',', ''))
+            return result
+        except ValueError:
+            pass
+
+    return {'rating': "0", 'reviews': "0"}
 
 
 class BusinessExtractorUtils:
@@ -58,6 +106,26 @@ class BusinessExtractorUtils:
         # Fallback: assume last words are location
         return ' '.join(location_words[-2:]).strip() if len(location_words) >= 2 else 'Unknown'
 
+    @staticmethod
+    def get_place_key(href):
+        """Get the stable element identifier used to track a listing from its Maps place URL"""
+        if not href or "/maps/place/" not in href:
+            return None
+        return href.split("/maps/place/")[1].split("?")[0].split("/")[0] or None
+
+    @staticmethod
+    def get_place_id(href):
+        """Get the canonical Google place ID (feature ID, else ChIJ place ID) from a Maps place URL"""
+        if not href or "/maps/place/" not in href:
+            return None
+        feature_match = re.search(r'!1s(0x[0-9a-f]+:0x[0-9a-f]+)', href)
+        if feature_match:
+            return feature_match.group(1)
+        place_match = re.search(r'!19s(ChIJ[\w-]+)', href)
+        if place_match:
+            return place_match.group(1)
+        return None
+
     @staticmethod
     def check_recent_reviews_profile(business_element, months_threshold):
         """Check if business has reviews within the specified months threshold"""
@@ -110,24 +110,41 @@ celery_app.Task = ResilientTask
 @celery_app.task(bind=True, name='celery_app.browser_automation_task')
 def browser_automation_task(self, job_params):
     """
-    Resilient browser automation task
+    Resilient browser automation task.
+    Retries keep the task ID, so a retry resumes from the search checkpoint
+    written by the failed attempt instead of starting over. Checkpoints are on
+    the shared /app/db volume, so the retry may land on any worker replica.
     """
     from resilience_manager import resilience
     from browser_automation import BrowserAutomation
-    import json
+    from schemas import BrowserAutomationRequest
     
     try:
         logger.info(f"Starting browser automation job: {self.request.id}")
+        params = BrowserAutomationRequest(**job_params)
+        job_id = job_params.get("job_id") or self.request.id
+        if self.request.retries:
+            logger.info(f"Retry {self.request.retries} of job {job_id} - resuming from checkpoint if present")
         
         # Apply resilience patterns
         @resilience.with_resilience("browser_automation")
         def run_automation():
-            automation = BrowserAutomation()
+            automation = BrowserAutomation(use_profile=params.use_profile, headless=params.headless, job_id=job_id)
             try:
-                result = automation.run_scraping_job(job_params)
-                return result
+                if not automation.setup_browser():
+                    raise Exception("Failed to setup browser")
+                query = params.query or f"{params.industry} {params.location}"
+                if params.tiled_search and params.tile_workers > 1:
+                    from parallel_job_executor import parallel_executor
+                    results = parallel_executor.execute_tiled_search(job_id, params, query, automation)
+                else:
+                    results = automation.search_google_maps(**params.search_kwargs(query, job_id))
+                if automation.session_lost:
+                    # Raising hands the job to ResilientTask's retry, which resumes from the checkpoint
+                    raise Exception(f"Browser session lost after {len(results)} results")
+                return {"job_id": job_id, "leads_found": len(results)}
             finally:
-                automation.cleanup()
+                automation.close()
         
         result = run_automation()
         logger.info(f"Browser automation job completed: {self.request.id}")
@@ -214,8 +231,12 @@ def cleanup_stale_jobs():
                     cancel_job(job_id)
                     stale_count += 1
         
-        logger.info(f"Cleaned up {stale_count} stale jobs")
-        return {"cleaned": stale_count}
+        # Checkpoints of jobs that were never resumed
+        from search_checkpoint import get_checkpoint_store
+        pruned = get_checkpoint_store().prune()
+        
+        logger.info(f"Cleaned up {stale_count} stale jobs, {pruned} old search checkpoints")
+        return {"cleaned": stale_count, "checkpoints_pruned": pruned}
         
     finally:
         db.close()
@@ -238,6 +259,12 @@ def check_memory_usage():
         # Force garbage collection
         gc.collect()
         
+        # Searches with a recycle policy, in every worker process, restart their browser (shared via Redis);
+        # the cooldown keeps a sustained high reading from restarting them again on every beat
+        from browser_recycling import request_recycle, PRESSURE_RECYCLE_COOLDOWN_SECONDS
+        if not request_recycle(f"system memory at {memory_percent}%", cooldown=PRESSURE_RECYCLE_COOLDOWN_SECONDS):
+            logger.info("Browser recycle already requested recently - waiting for the cooldown")
+        
         # Restart workers if memory is critically high
         if memory_percent > 90:
             logger.error("Critical memory usage - restarting workers")
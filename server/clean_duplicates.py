@@ -1,16 +1,21 @@
 #!/usr/bin/env python3
 """
 Clean up duplicate leads from the database
-Keeps the oldest (first created) lead and removes newer duplicates
+Keeps the oldest (first created) lead and removes newer duplicates.
+Leads are duplicates when their normalized_name (see lead_names.lead_name_key) and location match.
 """
 
 from sqlalchemy import text
-from database import SessionLocal
+from database import SessionLocal, engine
+from migrate_normalized_names import migrate_database as migrate_normalized_names
 import sys
 
 def clean_duplicate_leads():
     """Remove duplicate leads, keeping the oldest one"""
     
+    # Make sure every lead has its normalized name before grouping on it
+    migrate_normalized_names(engine.url.database)
+    
     session = SessionLocal()
     
     try:
@@ -19,7 +24,7 @@ def clean_duplicate_leads():
         # First, get statistics on duplicates
         duplicates_query = text("""
             SELECT 
-                LOWER(business_name) as name, 
+                normalized_name as name, 
                 LOWER(location) as loc, 
                 COUNT(*) as count,
                 GROUP_CONCAT(id, '|') as ids,
@@ -27,7 +32,7 @@ def clean_duplicate_leads():
                 MIN(created_at) as first_created,
                 MAX(created_at) as last_created
             FROM leads
-            GROUP BY LOWER(business_name), LOWER(location)
+            GROUP BY normalized_name, LOWER(location)
             HAVING COUNT(*) > 1
             ORDER BY count DESC
         """)
@@ -69,7 +74,7 @@ def clean_duplicate_leads():
                     SELECT 
                         id,
                         ROW_NUMBER() OVER (
-                            PARTITION BY LOWER(business_name), LOWER(location) 
+                            PARTITION BY normalized_name, LOWER(location) 
                             ORDER BY created_at ASC
                         ) as rn
                     FROM leads
@@ -90,7 +95,7 @@ def clean_duplicate_leads():
                     SELECT 
                         id,
                         ROW_NUMBER() OVER (
-                            PARTITION BY LOWER(business_name), LOWER(location) 
+                            PARTITION BY normalized_name, LOWER(location) 
                             ORDER BY created_at ASC
                         ) as rn
                     FROM leads
@@ -111,11 +116,11 @@ def clean_duplicate_leads():
         remaining = session.execute(text("""
             SELECT COUNT(*) FROM (
                 SELECT 
-                    LOWER(business_name), 
+                    normalized_name, 
                     LOWER(location), 
                     COUNT(*) as cnt
                 FROM leads
-                GROUP BY LOWER(business_name), LOWER(location)
+                GROUP BY normalized_name, LOWER(location)
                 HAVING COUNT(*) > 1
             )
         """)).scalar()
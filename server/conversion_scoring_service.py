@@ -15,6 +15,7 @@ import hashlib
 
 from models import Lead, LeadStatus, ConversionModel, LeadTimelineEntry
 from database import SessionLocal
+from lead_writer import run_write
 
 logger = logging.getLogger(__name__)
 
@@ -75,21 +76,28 @@ class ConversionScoringService:
         offset = 0
         while offset < total_leads:
             leads = self.db.query(Lead).offset(offset).limit(batch_size).all()
+            updates = []
             
             for lead in leads:
                 try:
                     score, factors = self.calculate_lead_score(lead)
-                    lead.conversion_score = score
-                    lead.conversion_score_calculated_at = datetime.utcnow()
-                    lead.conversion_score_factors = json.dumps(factors)
+                    updates.append({
+                        'id': lead.id,
+                        'conversion_score': score,
+                        'conversion_score_calculated_at': datetime.utcnow(),
+                        'conversion_score_factors': json.dumps(factors),
+                    })
                     scores_updated += 1
                 except Exception as e:
                     logger.error(f"Error scoring lead {lead.id}: {e}")
                     errors.append(f"Lead {lead.id}: {str(e)}")
                 
                 processed += 1
-                
-            self.db.commit()
+            
+            # End this batch's read transaction, then write the scores on the single database writer
+            self.db.rollback()
+            if updates:
+                run_write(lambda db: db.bulk_update_mappings(Lead, updates))
             offset += batch_size
             
             if processed % 500 == 0:
@@ -276,29 +284,34 @@ class ConversionScoringService:
             f"{datetime.utcnow().isoformat()}_{total_samples}".encode()
         ).hexdigest()[:8]
         
-        # Deactivate old models
-        self.db.query(ConversionModel).update({'is_active': False})
-        
-        # Save new model
         feature_names = list(self._extract_features(converted_leads[0] if converted_leads else non_converted_leads[0]).keys())
         feature_weights = dict(zip(feature_names, weights))
         
-        new_model = ConversionModel(
-            model_version=f"v1.0_{version_hash}",
-            feature_weights=json.dumps(feature_weights),
-            model_accuracy=accuracy,
-            training_samples=total_samples,
-            total_conversions=len(converted_leads),
-            total_leads=total_samples,
-            baseline_conversion_rate=len(converted_leads) / total_samples,
-            precision_score=precision,
-            recall_score=recall,
-            f1_score=f1,
-            is_active=True
-        )
-        
-        self.db.add(new_model)
-        self.db.commit()
+        def save_model(db):
+            # Deactivate old models
+            db.query(ConversionModel).update({'is_active': False})
+            
+            # Save new model
+            model = ConversionModel(
+                model_version=f"v1.0_{version_hash}",
+                feature_weights=json.dumps(feature_weights),
+                model_accuracy=accuracy,
+                training_samples=total_samples,
+                total_conversions=len(converted_leads),
+                total_leads=total_samples,
+                baseline_conversion_rate=len(converted_leads) / total_samples,
+                precision_score=precision,
+                recall_score=recall,
+                f1_score=f1,
+                is_active=True
+            )
+            db.add(model)
+            db.flush()
+            return model.id
+        
+        # End the training read transaction, commit on the single database writer, then load the saved model
+        self.db.rollback()
+        new_model = self.db.get(ConversionModel, run_write(save_model))
         
         logger.info(f"Model trained successfully: accuracy={accuracy:.3f}, f1={f1:.3f}")
         return new_model
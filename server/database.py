@@ -1,16 +1,20 @@
-from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from pathlib import Path
 
+from database_core.config import DatabaseConfig
+from database_core.connection_pool import get_connection_pool
+
 Path("db").mkdir(exist_ok=True)
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///./db/leadloq.db"
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, 
-    connect_args={"check_same_thread": False}
-)
+# One tuned engine for every code path: WAL, mmap, cache and busy_timeout pragmas on each connection
+db_config = DatabaseConfig(database_url=SQLALCHEMY_DATABASE_URL)
+# Bulk lead deletes (admin cleanup) don't remove timeline entries first, so FK enforcement stays off
+db_config.sqlite_pragmas["foreign_keys"] = 0
+connection_pool = get_connection_pool(db_config)
+engine = connection_pool.get_engine()
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -25,6 +29,11 @@ def get_db():
         db.close()
 
 
+def get_pool_status():
+    """Connection pool usage of the shared engine."""
+    return connection_pool.get_pool_status()
+
+
 def init_db():
     from models import User, Lead, CallLog, LeadTimelineEntry
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    Base.metadata.create_all(bind=engine)
@@ -33,13 +33,14 @@ class DatabaseConfig:
         """Initialize SQLite pragmas for performance."""
         if self.sqlite_pragmas is None:
             self.sqlite_pragmas = {
+                "page_size": 4096,       # Optimal page size (only takes effect before WAL on a new database)
                 "journal_mode": "WAL",  # Write-Ahead Logging for better concurrency
+                "busy_timeout": int(os.getenv("DB_BUSY_TIMEOUT_MS", "30000")),  # Wait for locks instead of "database is locked"
                 "cache_size": -64000,    # 64MB cache
                 "foreign_keys": 1,       # Enable foreign key constraints
                 "synchronous": "NORMAL", # Balance between safety and speed
                 "temp_store": "MEMORY",  # Use memory for temp tables
                 "mmap_size": 268435456,  # 256MB memory-mapped I/O
-                "page_size": 4096,       # Optimal page size
                 "optimize": True         # Run ANALYZE periodically
             }
     
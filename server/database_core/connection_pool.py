@@ -81,6 +81,7 @@ class ConnectionPool:
         return {
             "size": pool.size(),
             "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
             "overflow": pool.overflow(),
             "total": pool.size() + pool.overflow()
         }
@@ -88,9 +89,9 @@ class ConnectionPool:
 # Global connection pool instance
 _connection_pool = None
 
-def get_connection_pool() -> ConnectionPool:
-    """Get or create the global connection pool."""
+def get_connection_pool(config: DatabaseConfig = None) -> ConnectionPool:
+    """Get or create the global connection pool (config only applies on first creation)."""
     global _connection_pool
     if _connection_pool is None:
-        _connection_pool = ConnectionPool()
+        _connection_pool = ConnectionPool(config)
     return _connection_pool
\ No newline at end of file
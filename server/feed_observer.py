@@ -0,0 +1,97 @@
+"""
+Feed Observer Module
+Tracks newly inserted result cards with an in-page MutationObserver so the
+engine only fetches cards it has not seen, instead of re-scanning the whole
+feed after every scroll.
+"""
+
+from typing import List, Tuple, Any
+
+from business_extractor_utils import BusinessExtractorUtils
+
+
+INSTALL_OBSERVER_SCRIPT = """
+if (window.__leadloqFeedQueue) {
+    return false;
+}
+window.__leadloqFeedQueue = [];
+window.__leadloqSeenCards = new WeakSet();
+var queueCards = function(root) {
+    if (!root || root.nodeType !== 1) {
+        return;
+    }
+    var links = [];
+    if (root.matches && root.matches("a[href*='/maps/place/']")) {
+        links.push(root);
+    }
+    var found = root.querySelectorAll ? root.querySelectorAll("a[href*='/maps/place/']") : [];
+    for (var i = 0; i < found.length; i++) {
+        links.push(found[i]);
+    }
+    for (var j = 0; j < links.length; j++) {
+        var link = links[j];
+        if (!link.closest("[role='feed']")) {
+            continue;
+        }
+        var card = link.closest('.Nv2PK') || link.parentElement;
+        if (!card || window.__leadloqSeenCards.has(card)) {
+            continue;
+        }
+        window.__leadloqSeenCards.add(card);
+        window.__leadloqFeedQueue.push({element: card, url: link.href});
+    }
+};
+queueCards(document.body);
+window.__leadloqFeedObserver = new MutationObserver(function(mutations) {
+    for (var m = 0; m < mutations.length; m++) {
+        var added = mutations[m].addedNodes;
+        for (var n = 0; n < added.length; n++) {
+            queueCards(added[n]);
+        }
+    }
+});
+window.__leadloqFeedObserver.observe(document.body, {childList: true, subtree: true});
+return true;
+"""
+
+DRAIN_QUEUE_SCRIPT = """
+if (!window.__leadloqFeedQueue) {
+    return null;
+}
+var queued = window.__leadloqFeedQueue;
+window.__leadloqFeedQueue = [];
+return queued.filter(function(item) {
+    return item.element.isConnected && item.element.getClientRects().length;
+});
+"""
+
+
+class FeedObserver:
+    """Drains result cards queued by the in-page MutationObserver"""
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def install(self) -> bool:
+        """Install the observer and queue the cards already in the feed; False if already installed"""
+        return bool(self.driver.execute_script(INSTALL_OBSERVER_SCRIPT))
+
+    def drain(self) -> List[Tuple[Any, str, str]]:
+        """
+        Return (element, element_id, href) tuples for cards inserted since the last drain.
+
+        Reinstalls the observer if the page was reloaded (e.g. after navigating
+        back from a detail view), in which case every card currently in the
+        feed is queued again and de-duplicated by the caller's processed IDs.
+        """
+        queued = self.driver.execute_script(DRAIN_QUEUE_SCRIPT)
+        if queued is None:
+            self.install()
+            queued = self.driver.execute_script(DRAIN_QUEUE_SCRIPT) or []
+
+        cards = []
+        for item in queued:
+            element_id = BusinessExtractorUtils.get_place_key(item.get('url'))
+            if element_id and item.get('element') is not None:
+                cards.append((item['element'], element_id, item['url']))
+        return cards
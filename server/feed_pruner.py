@@ -0,0 +1,78 @@
+"""
+Feed Pruner Module
+Removes result cards that have already been processed from the results feed
+so the DOM stays small during long scrolls. Removed cards are replaced by a
+single spacer of the same total height at the top of the feed: the scroll
+position and scrollHeight are unchanged, and Google's lazy loader at the
+bottom of the feed keeps working.
+"""
+
+from typing import List, Any
+
+
+# The spacer is a <span>, so the "[role='feed'] > div" card selectors never pick it up
+PRUNE_CARDS_SCRIPT = """
+var feed = document.querySelector("[role='feed']");
+if (!feed) {
+    return 0;
+}
+var spacer = feed.querySelector(':scope > span[data-leadloq-pruned]');
+if (!spacer) {
+    spacer = document.createElement('span');
+    spacer.setAttribute('data-leadloq-pruned', '0');
+    spacer.style.display = 'block';
+    spacer.style.height = '0px';
+    feed.insertBefore(spacer, feed.firstChild);
+}
+var removedHeight = 0;
+var removed = 0;
+var cards = arguments[0] || [];
+for (var i = 0; i < cards.length; i++) {
+    var card = cards[i];
+    if (!card || !card.isConnected || !feed.contains(card)) {
+        continue;
+    }
+    // Remove the feed-level wrapper so no empty container is left behind
+    while (card.parentElement && card.parentElement !== feed) {
+        card = card.parentElement;
+    }
+    if (card === spacer || !(card.matches("a[href*='/maps/place/']") || card.querySelector("a[href*='/maps/place/']"))) {
+        continue;
+    }
+    removedHeight += card.getBoundingClientRect().height;
+    card.remove();
+    removed++;
+}
+spacer.style.height = (parseFloat(spacer.style.height) + removedHeight) + 'px';
+spacer.setAttribute('data-leadloq-pruned', String(parseInt(spacer.getAttribute('data-leadloq-pruned')) + removed));
+return removed;
+"""
+
+
+DEFAULT_KEEP_RECENT = 3  # Newest processed cards left in place as an anchor above the lazy loader
+
+
+class FeedPruner:
+    """Detaches processed cards from the results feed, one execute_script per batch"""
+
+    def __init__(self, driver, keep_recent: int = DEFAULT_KEEP_RECENT):
+        self.driver = driver
+        self.keep_recent = keep_recent
+        self.pending: List[Any] = []  # Processed cards held back this round; pruned with the next batch
+        self.pruned = 0
+
+    def prune(self, elements: List[Any]) -> int:
+        """Remove processed card elements from the feed, except the newest few; returns how many were removed"""
+        pending_ids = {getattr(e, 'id', None) for e in self.pending}
+        candidates = self.pending + [e for e in elements if getattr(e, 'id', None) not in pending_ids]
+        split = max(0, len(candidates) - self.keep_recent)
+        to_prune, self.pending = candidates[:split], candidates[split:]
+        if not to_prune:
+            return 0
+        removed = int(self.driver.execute_script(PRUNE_CARDS_SCRIPT, to_prune) or 0)
+        self.pruned += removed
+        return removed
+
+    def reset(self):
+        """Forget held-back cards (after navigating to a new feed)"""
+        self.pending = []
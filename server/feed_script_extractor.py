@@ -0,0 +1,155 @@
+"""
+Feed Script Extractor Module
+Extracts every visible business card with a single driver.execute_script call.
+The card WebElements come back in the same payload, so element lookup,
+identification and extraction cost one round-trip per scroll batch.
+"""
+
+from typing import Dict, List, Any, Optional
+
+from business_extractor import StandardListingExtractor
+from business_extractor_utils import BusinessExtractorUtils, card_name, card_rating
+
+
+FEED_EXTRACTION_SCRIPT = """
+var given = arguments.length ? arguments[0] : null;
+var pairs = [];
+if (given) {
+    for (var g = 0; g < given.length; g++) {
+        var givenLink = given[g].querySelector("a.hfpxzc[href*='/maps/place/']") || given[g].querySelector("a[href*='/maps/place/']");
+        if (givenLink) {
+            pairs.push([givenLink, given[g]]);
+        }
+    }
+} else {
+    var root = document.querySelector("[role='feed']") || document;
+    var links = root.querySelectorAll("a.hfpxzc[href*='/maps/place/']");
+    if (!links.length) {
+        links = root.querySelectorAll("a[href*='/maps/place/']");
+    }
+    for (var l = 0; l < links.length; l++) {
+        pairs.push([links[l], links[l].closest('.Nv2PK') || links[l].parentElement]);
+    }
+}
+var phonePattern = /\\(\\d{3}\\)\\s?\\d{3}-\\d{4}|\\d{3}-\\d{3}-\\d{4}/;
+var cards = [];
+for (var i = 0; i < pairs.length; i++) {
+    var link = pairs[i][0];
+    var card = pairs[i][1];
+    if (!card || !card.getClientRects().length) {
+        continue;
+    }
+    var textOf = function(el) { return el ? (el.innerText || el.textContent || '').trim() : null; };
+    var ratingEl = card.querySelector("[role='img'][aria-label]");
+    var websiteEl = card.querySelector("a[data-value='Website']");
+    var phone = textOf(card.querySelector('span.UsdlK'));
+    var actions = [];
+    var buttons = card.querySelectorAll('a[data-value], button[data-value]');
+    for (var b = 0; b < buttons.length; b++) {
+        actions.push(buttons[b].getAttribute('data-value'));
+    }
+    var texts = [];
+    var spans = card.querySelectorAll('span');
+    for (var s = 0; s < spans.length; s++) {
+        var text = textOf(spans[s]);
+        if (!phone && text && phonePattern.test(text)) {
+            phone = text;
+        }
+        if (text && text.length > 10 && texts.indexOf(text) < 0 && texts.length < 3) {
+            texts.push(text);
+        }
+    }
+    cards.push({
+        element: card,
+        url: link.href,
+        aria_label: link.getAttribute('aria-label'),
+        headline: textOf(card.querySelector("div.qBF1Pd, div[class*='fontHeadline'], [role='heading']")),
+        rating_label: ratingEl ? ratingEl.getAttribute('aria-label') : null,
+        rating_text: textOf(card.querySelector('.MW4etd')),
+        reviews_text: textOf(card.querySelector('.UY7F9')),
+        phone: phone,
+        website: websiteEl ? websiteEl.href : null,
+        action_buttons: actions,
+        photo_count: card.querySelectorAll("img[src*='googleusercontent']").length,
+        description_parts: texts
+    });
+}
+return cards;
+"""
+
+
+class FeedScriptExtractor:
+    """Runs the in-page extraction script and normalizes its output to business detail dicts"""
+
+    def __init__(self):
+        self._name_validator = StandardListingExtractor()
+
+    def extract(self, driver, cards=None) -> List[Dict[str, Any]]:
+        """
+        Extract all visible cards in one remote call.
+
+        Args:
+            driver: Selenium driver positioned on a Maps results page
+            cards: Optional card WebElements to restrict extraction to (e.g. newly inserted cards)
+
+        Returns:
+            List of business detail dicts in feed order, each carrying its
+            card WebElement under 'element' and its identifier under 'element_id'
+        """
+        if cards is None:
+            raw_cards = driver.execute_script(FEED_EXTRACTION_SCRIPT) or []
+        else:
+            raw_cards = driver.execute_script(FEED_EXTRACTION_SCRIPT, cards) or []
+        businesses = []
+        seen_keys = set()
+
+        for raw in raw_cards:
+            key = BusinessExtractorUtils.get_place_key(raw.get('url'))
+            if not key or key in seen_keys:
+                continue
+            seen_keys.add(key)
+
+            details = self.normalize(raw)
+            details['element_id'] = key
+            businesses.append(details)
+
+        return businesses
+
+    def normalize(self, raw: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert one raw script result into the StandardListingExtractor detail shape"""
+        details = {'element': raw.get('element')}
+
+        details['name'] = self._extract_name(raw) or "Unknown Business"
+        details.update(self._extract_rating(raw))
+        details['phone'] = raw.get('phone') or None
+        details['url'] = raw.get('url')
+        details['photo_count'] = raw.get('photo_count') or 0
+
+        desc_parts = raw.get('description_parts') or []
+        details['description'] = '\n'.join(desc_parts[:3]) if desc_parts else ""
+        details['description_length'] = len(details['description'])
+
+        details['has_recent_reviews'] = True
+        details['last_review_date'] = None
+
+        details['action_buttons'] = list(raw.get('action_buttons') or [])
+        details['listing_type'] = 'standard' if details['action_buttons'] else 'compact'
+
+        if raw.get('website'):
+            details['website'] = raw['website']
+            details['has_website'] = True
+        else:
+            details['website'] = None
+            details['has_website'] = False
+            if details['listing_type'] == 'compact':
+                details['_needs_click_check'] = True
+
+        return details
+
+    def _extract_name(self, raw: Dict[str, Any]) -> Optional[str]:
+        """Business name from the place link aria-label, falling back to headline text"""
+        return card_name(raw.get('aria_label'), [raw.get('headline')], self._name_validator._is_valid_business_name)
+
+    def _extract_rating(self, raw: Dict[str, Any]) -> Dict[str, Any]:
+        """Rating and review count from the star aria-label, falling back to visible text"""
+        return card_rating([raw.get('rating_label')], raw.get('rating_text'), raw.get('reviews_text'))
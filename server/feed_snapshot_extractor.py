@@ -0,0 +1,162 @@
+"""
+Feed Snapshot Extractor Module
+Parses a captured [role='feed'] outerHTML snapshot into business details offline.
+One WebDriver round-trip per feed batch instead of dozens per card.
+"""
+
+import re
+from typing import Dict, List, Any, Optional, Tuple
+from bs4 import BeautifulSoup
+
+from business_extractor import StandardListingExtractor
+from business_extractor_utils import BusinessExtractorUtils, card_name, card_rating
+
+
+PHONE_PATTERN = re.compile(r'\(\d{3}\)\s?\d{3}-\d{4}|\d{3}-\d{3}-\d{4}|\+?1?\s?\(\d{3}\)\s?\d{3}-\d{4}')
+
+# Returns the feed's outerHTML together with each card element and its place link, so one
+# round-trip both snapshots the feed and keys the live elements the way parse() keys cards
+FEED_SNAPSHOT_SCRIPT = """
+var feed = document.querySelector("[role='feed']");
+if (!feed) {
+    return null;
+}
+var cards = [];
+var seenCards = new Set();
+var links = feed.querySelectorAll("a[href*='/maps/place/']");
+for (var i = 0; i < links.length; i++) {
+    var card = links[i].closest('.Nv2PK') || links[i].parentElement;
+    if (!card || seenCards.has(card)) {
+        continue;
+    }
+    seenCards.add(card);
+    cards.push({element: card, url: links[i].href});
+}
+return {html: feed.outerHTML, cards: cards};
+"""
+
+
+class FeedSnapshotExtractor:
+    """Extracts all business cards from a feed HTML snapshot using the same rules as the live extractors"""
+
+    def __init__(self):
+        # Reuse the live extractor's name validation so both modes agree on names
+        self._name_validator = StandardListingExtractor()
+
+    def parse(self, html: str) -> List[Dict[str, Any]]:
+        """
+        Parse every business card in the snapshot.
+
+        Args:
+            html: outerHTML of the results feed (or any fragment containing cards)
+
+        Returns:
+            List of business detail dicts in feed order, one per unique place
+        """
+        soup = BeautifulSoup(html or "", "html.parser")
+        businesses = []
+        seen_keys = set()
+
+        for link in soup.select("a[href*='/maps/place/']"):
+            key = BusinessExtractorUtils.get_place_key(link.get("href"))
+            if not key or key in seen_keys:
+                continue
+            seen_keys.add(key)
+
+            card = link.find_parent(class_="Nv2PK") or link.parent
+            details = self._extract_card(card, link)
+            details['element_id'] = key
+            businesses.append(details)
+
+        return businesses
+
+    def parse_by_id(self, html: str) -> Dict[str, Dict[str, Any]]:
+        """Parse the snapshot and index business details by element identifier"""
+        return {details['element_id']: details for details in self.parse(html)}
+
+    def capture(self, driver) -> Tuple[List[Tuple[Any, str, str]], Dict[str, Dict[str, Any]]]:
+        """
+        Snapshot the live feed and key its card elements with a single execute_script call.
+
+        Returns:
+            ([(element, element_id, place_url)] in feed order, business details by element_id)
+        """
+        captured = driver.execute_script(FEED_SNAPSHOT_SCRIPT)
+        if not captured:
+            return [], {}
+        cards = []
+        seen_keys = set()
+        for card in captured.get('cards') or []:
+            key = BusinessExtractorUtils.get_place_key(card.get('url'))
+            if not key or key in seen_keys:
+                continue
+            seen_keys.add(key)
+            cards.append((card['element'], key, card['url']))
+        return cards, self.parse_by_id(captured.get('html'))
+
+    def _extract_card(self, card, link) -> Dict[str, Any]:
+        """Extract the fields produced by StandardListingExtractor._extract_basic_info plus website"""
+        details = {}
+
+        details['name'] = self._extract_name(card, link) or "Unknown Business"
+        details.update(self._extract_rating(card))
+        details['phone'] = self._extract_phone(card)
+        details['url'] = link.get("href")
+        details['photo_count'] = len(card.select("img[src*='googleusercontent']"))
+
+        desc_parts = []
+        for span in card.select("span"):
+            text = span.get_text(" ", strip=True)
+            if text and text not in desc_parts and len(text) > 10:
+                desc_parts.append(text)
+        details['description'] = '\n'.join(desc_parts[:3]) if desc_parts else ""
+        details['description_length'] = len(details['description'])
+
+        details['has_recent_reviews'] = True
+        details['last_review_date'] = None
+
+        # Listing type mirrors StandardListingExtractor.can_handle: any action button means standard
+        action_buttons = card.select("a[data-value], button[data-value]")
+        details['listing_type'] = 'standard' if action_buttons else 'compact'
+
+        website_elem = card.select_one("a[data-value='Website']")
+        if website_elem and website_elem.get("href"):
+            details['website'] = website_elem.get("href")
+            details['has_website'] = True
+        else:
+            details['website'] = None
+            details['has_website'] = False
+            if details['listing_type'] == 'compact':
+                details['_needs_click_check'] = True
+
+        return details
+
+    def _extract_name(self, card, link) -> Optional[str]:
+        """Business name from the place link aria-label, falling back to headline text"""
+        headlines = (
+            elem.get_text(strip=True)
+            for elem in (card.select_one(selector) for selector in ["div.qBF1Pd", "div[class*='fontHeadline']", "[role='heading']"])
+            if elem
+        )
+        return card_name(link.get("aria-label"), headlines, self._name_validator._is_valid_business_name)
+
+    def _extract_rating(self, card) -> Dict[str, Any]:
+        """Rating and review count from the star aria-label, falling back to visible text"""
+        rating_elem = card.select_one(".MW4etd")
+        reviews_elem = card.select_one(".UY7F9")
+        return card_rating(
+            (elem.get("aria-label", "") for elem in card.select("[role='img'][aria-label]")),
+            rating_elem.get_text(strip=True) if rating_elem else None,
+            reviews_elem.get_text(strip=True) if reviews_elem else None,
+        )
+
+    def _extract_phone(self, card) -> Optional[str]:
+        """Phone from the dedicated phone span, falling back to pattern matching"""
+        phone_elem = card.select_one("span.UsdlK")
+        if phone_elem:
+            return phone_elem.get_text(strip=True)
+        for span in card.select("span"):
+            text = span.get_text(strip=True)
+            if PHONE_PATTERN.search(text):
+                return text
+        return None
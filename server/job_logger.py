@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Structured, level-gated job logging.
+Each job keeps its log entries in a fixed-size deque ring buffer with
+sequence numbers, so readers fetch "everything after seq N" and appends
+never re-slice a list. Messages below the job log level are dropped before
+they are formatted (%-style arguments are only applied when kept), and the
+console echo can be switched off with JOB_LOG_ECHO=0 in production.
+"""
+
+import os
+import logging
+import threading
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Optional, Dict, Any, List
+
+
+DEBUG = logging.DEBUG
+INFO = logging.INFO
+WARNING = logging.WARNING
+ERROR = logging.ERROR
+
+LEVELS = {"DEBUG": DEBUG, "INFO": INFO, "WARNING": WARNING, "ERROR": ERROR}
+
+DEFAULT_BUFFER_SIZE = 500
+MAX_TRACKED_JOBS = 200
+
+
+def level_from_env() -> int:
+    """JOB_LOG_LEVEL: DEBUG, INFO (default), WARNING or ERROR"""
+    return LEVELS.get(os.environ.get("JOB_LOG_LEVEL", "INFO").upper(), INFO)
+
+
+def echo_from_env() -> bool:
+    """JOB_LOG_ECHO: print kept entries to stdout (default on; set 0 in production)"""
+    return os.environ.get("JOB_LOG_ECHO", "1") not in ("0", "false", "False")
+
+
+class JobLogBuffer:
+    """Ring buffer of log entries with monotonically increasing sequence numbers"""
+
+    def __init__(self, maxlen: int = DEFAULT_BUFFER_SIZE):
+        self.entries = deque(maxlen=maxlen)
+        self.last_seq = 0
+        self._lock = threading.Lock()
+
+    def append(self, level: int, message: str) -> Dict[str, Any]:
+        with self._lock:
+            self.last_seq += 1
+            entry = {
+                "seq": self.last_seq,
+                "level": logging.getLevelName(level),
+                "message": message,
+                "timestamp": datetime.utcnow().isoformat(),
+            }
+            self.entries.append(entry)
+            return entry
+
+    def since(self, seq: int = 0) -> List[Dict[str, Any]]:
+        """Entries newer than `seq` that are still in the buffer"""
+        with self._lock:
+            if seq >= self.last_seq:
+                return []
+            # Sequence numbers are contiguous, so the newest (last_seq - seq) entries are the new ones
+            count = min(self.last_seq - seq, len(self.entries))
+            return list(self.entries)[-count:]
+
+    def tail(self, count: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self.entries)[-count:] if count > 0 else []
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class JobLogger:
+    """Level-gated logger writing to one job's ring buffer (or only the console when job_id is None)"""
+
+    def __init__(self, job_id: Optional[str] = None, level: Optional[int] = None, echo: Optional[bool] = None,
+                 buffer: Optional[JobLogBuffer] = None):
+        self.job_id = job_id
+        self.level = level_from_env() if level is None else level
+        self.echo = echo_from_env() if echo is None else echo
+        self.buffer = buffer if buffer is not None else (JobLogBuffer() if job_id else None)
+
+    def is_enabled_for(self, level: int) -> bool:
+        return level >= self.level
+
+    def log(self, level: int, message: str, *args):
+        if level < self.level:
+            return
+        if args:
+            message = message % args
+        if self.buffer is not None:
+            self.buffer.append(level, message)
+        if self.echo:
+            print(f"[JOB {self.job_id}] {message}" if self.job_id else message)
+
+    def debug(self, message: str, *args):
+        self.log(DEBUG, message, *args)
+
+    def info(self, message: str, *args):
+        self.log(INFO, message, *args)
+
+    def warning(self, message: str, *args):
+        self.log(WARNING, message, *args)
+
+    def error(self, message: str, *args):
+        self.log(ERROR, message, *args)
+
+
+_job_loggers: "OrderedDict[str, JobLogger]" = OrderedDict()
+_loggers_lock = threading.Lock()
+_console_logger = JobLogger()
+_active = threading.local()
+
+
+def get_job_logger(job_id: Optional[str]) -> JobLogger:
+    """Logger for a job, created on first use; the oldest jobs' buffers are dropped past MAX_TRACKED_JOBS"""
+    if not job_id:
+        return _console_logger
+    with _loggers_lock:
+        logger = _job_loggers.get(job_id)
+        if logger is None:
+            logger = _job_loggers[job_id] = JobLogger(job_id)
+            while len(_job_loggers) > MAX_TRACKED_JOBS:
+                _job_loggers.popitem(last=False)
+        return logger
+
+
+def get_job_logs(job_id: str, since_seq: int = 0, tail: Optional[int] = None) -> List[Dict[str, Any]]:
+    with _loggers_lock:
+        logger = _job_loggers.get(job_id)
+    if logger is None:
+        return []
+    return logger.buffer.tail(tail) if tail is not None else logger.buffer.since(since_seq)
+
+
+def set_thread_logger(logger: Optional[JobLogger]):
+    """Bind a job logger to the current thread for helpers that have no job context (e.g. extractors)"""
+    _active.logger = logger
+
+
+def current_logger() -> JobLogger:
+    return getattr(_active, "logger", None) or _console_logger
@@ -10,6 +10,8 @@ from pathlib import Path
 from datetime import datetime
 from typing import Dict, Optional, List
 
+from job_logger import INFO, get_job_logger
+
 
 # Global job status tracking (matches original implementation)
 job_statuses: Dict[str, Dict] = {}
@@ -83,27 +85,11 @@ def cleanup_old_jobs(max_jobs=3):
         print(f"❌ Error during cleanup: {e}")
 
 
-def add_job_log(job_id: str, log_message: str):
-    """Add a log entry for a specific job and store in job status"""
-    print(f"[JOB {job_id}] {log_message}")
-    
-    # Store logs in the job status object for retrieval
+def add_job_log(job_id: str, log_message: str, level: int = INFO):
+    """Add a log entry to the job's ring buffer (read back with job_logger.get_job_logs)"""
     if job_id not in job_statuses:
         job_statuses[job_id] = {}
-    
-    if 'logs' not in job_statuses[job_id]:
-        job_statuses[job_id]['logs'] = []
-    
-    # Add log entry with timestamp
-    log_entry = {
-        "message": log_message,
-        "timestamp": datetime.utcnow().isoformat()
-    }
-    job_statuses[job_id]['logs'].append(log_entry)
-    
-    # Keep only last 100 logs to prevent memory issues
-    if len(job_statuses[job_id]['logs']) > 100:
-        job_statuses[job_id]['logs'] = job_statuses[job_id]['logs'][-100:]
+    get_job_logger(job_id).log(level, log_message)
 
 
 def create_job(params) -> str:
@@ -1,15 +1,17 @@
 #!/usr/bin/env python3
 """
 Lead management operations and CRUD
+Writes go through the single database writer (lead_writer.run_write)
 """
 
 from typing import List, Optional
 from datetime import datetime
 from sqlalchemy.orm import selectinload
 from database import SessionLocal
+from lead_writer import run_write
 from models import Lead, LeadStatus, LeadTimelineEntry, TimelineEntryType
 from schemas import LeadResponse, LeadUpdate, LeadTimelineEntryUpdate
-from blacklist_manager import BlacklistManager
+from blacklist_manager import BlacklistManager, get_blacklist_index
 import uuid
 
 
@@ -42,42 +44,50 @@ def get_lead_by_id(lead_id: str) -> Optional[Lead]:
         return None
 
 
-def delete_lead_by_id(lead_id: str) -> bool:
-    """Delete a specific lead by ID"""
+def _delete_screenshot_files(screenshots: List[tuple]):
+    """Remove (Google Maps screenshot, website screenshot) files of deleted leads"""
     import os
     from pathlib import Path
     
-    try:
-        db = SessionLocal()
-        lead = db.query(Lead).filter(Lead.id == lead_id).first()
-        
-        if not lead:
-            db.close()
-            return False
-        
-        # Delete associated screenshot files
-        if lead.screenshot_path:
-            screenshot_file = Path("screenshots") / lead.screenshot_path
+    for screenshot_path, website_screenshot_path in screenshots:
+        # Delete Google Maps screenshot
+        if screenshot_path:
+            screenshot_file = Path("screenshots") / screenshot_path
             if screenshot_file.exists():
                 try:
                     os.remove(screenshot_file)
-                    print(f"🗑️ Deleted Google Maps screenshot: {lead.screenshot_path}")
+                    print(f"🗑️ Deleted Google Maps screenshot: {screenshot_path}")
                 except Exception as e:
                     print(f"⚠️ Failed to delete Google Maps screenshot: {e}")
         
-        # Delete website screenshot if it exists
-        if lead.website_screenshot_path:
-            website_screenshot_file = Path("website_screenshots") / lead.website_screenshot_path
+        # Delete website screenshot
+        if website_screenshot_path:
+            website_screenshot_file = Path("website_screenshots") / website_screenshot_path
             if website_screenshot_file.exists():
                 try:
                     os.remove(website_screenshot_file)
-                    print(f"🗑️ Deleted website screenshot: {lead.website_screenshot_path}")
+                    print(f"🗑️ Deleted website screenshot: {website_screenshot_path}")
                 except Exception as e:
                     print(f"⚠️ Failed to delete website screenshot: {e}")
-        
+
+
+def delete_lead_by_id(lead_id: str) -> bool:
+    """Delete a specific lead by ID"""
+    def delete(db):
+        lead = db.query(Lead).filter(Lead.id == lead_id).first()
+        if not lead:
+            return None
+        screenshots = [(lead.screenshot_path, lead.website_screenshot_path)]
         db.delete(lead)
-        db.commit()
-        db.close()
+        return screenshots
+    
+    try:
+        screenshots = run_write(delete)
+        if screenshots is None:
+            return False
+        
+        # Delete associated screenshot files once the delete has committed
+        _delete_screenshot_files(screenshots)
         return True
         
     except Exception as e:
@@ -87,46 +97,24 @@ def delete_lead_by_id(lead_id: str) -> bool:
 
 def delete_all_leads() -> bool:
     """Delete all leads from database"""
-    import os
-    from pathlib import Path
-    
-    try:
-        db = SessionLocal()
-        
+    def delete(db):
         # Get all leads to delete their screenshots
-        all_leads = db.query(Lead).all()
-        
-        # Delete screenshots for each lead
-        for lead in all_leads:
-            # Delete Google Maps screenshot
-            if lead.screenshot_path:
-                screenshot_file = Path("screenshots") / lead.screenshot_path
-                if screenshot_file.exists():
-                    try:
-                        os.remove(screenshot_file)
-                        print(f"🗑️ Deleted Google Maps screenshot: {lead.screenshot_path}")
-                    except Exception as e:
-                        print(f"⚠️ Failed to delete Google Maps screenshot: {e}")
-            
-            # Delete website screenshot
-            if lead.website_screenshot_path:
-                website_screenshot_file = Path("website_screenshots") / lead.website_screenshot_path
-                if website_screenshot_file.exists():
-                    try:
-                        os.remove(website_screenshot_file)
-                        print(f"🗑️ Deleted website screenshot: {lead.website_screenshot_path}")
-                    except Exception as e:
-                        print(f"⚠️ Failed to delete website screenshot: {e}")
+        screenshots = db.query(Lead.screenshot_path, Lead.website_screenshot_path).all()
         
         # Delete all timeline entries first (due to foreign key constraints)
         db.query(LeadTimelineEntry).delete()
         
         # Then delete all leads
         deleted_count = db.query(Lead).delete()
-        db.commit()
+        return deleted_count, screenshots
+    
+    try:
+        deleted_count, screenshots = run_write(delete)
+        
+        # Delete screenshots for each lead
+        _delete_screenshot_files(screenshots)
         
         print(f"Deleted {deleted_count} leads and their associated screenshots")
-        db.close()
         return True
         
     except Exception as e:
@@ -136,48 +124,27 @@ def delete_all_leads() -> bool:
 
 def delete_mock_leads() -> bool:
     """Delete leads with 'Mock' in the name"""
-    import os
-    from pathlib import Path
-    
-    try:
-        db = SessionLocal()
-        
+    def delete(db):
         # Find mock leads
         mock_leads = db.query(Lead).filter(Lead.business_name.ilike('%Mock%')).all()
         mock_lead_ids = [lead.id for lead in mock_leads]
-        
-        # Delete screenshots for each mock lead
-        for lead in mock_leads:
-            # Delete Google Maps screenshot
-            if lead.screenshot_path:
-                screenshot_file = Path("screenshots") / lead.screenshot_path
-                if screenshot_file.exists():
-                    try:
-                        os.remove(screenshot_file)
-                        print(f"🗑️ Deleted Google Maps screenshot: {lead.screenshot_path}")
-                    except Exception as e:
-                        print(f"⚠️ Failed to delete Google Maps screenshot: {e}")
-            
-            # Delete website screenshot
-            if lead.website_screenshot_path:
-                website_screenshot_file = Path("website_screenshots") / lead.website_screenshot_path
-                if website_screenshot_file.exists():
-                    try:
-                        os.remove(website_screenshot_file)
-                        print(f"🗑️ Deleted website screenshot: {lead.website_screenshot_path}")
-                    except Exception as e:
-                        print(f"⚠️ Failed to delete website screenshot: {e}")
+        screenshots = [(lead.screenshot_path, lead.website_screenshot_path) for lead in mock_leads]
         
         # Delete timeline entries for mock leads
         if mock_lead_ids:
             db.query(LeadTimelineEntry).filter(LeadTimelineEntry.lead_id.in_(mock_lead_ids)).delete()
         
         # Delete mock leads
-        deleted_count = db.query(Lead).filter(Lead.business_name.ilike('%Mock%')).delete()
-        db.commit()
+        deleted_count = db.query(Lead).filter(Lead.business_name.ilike('%Mock%')).delete(synchronize_session=False)
+        return deleted_count, screenshots
+    
+    try:
+        deleted_count, screenshots = run_write(delete)
+        
+        # Delete screenshots for each mock lead
+        _delete_screenshot_files(screenshots)
         
         print(f"Deleted {deleted_count} mock leads and their associated screenshots")
-        db.close()
         return True
         
     except Exception as e:
@@ -185,16 +152,21 @@ def delete_mock_leads() -> bool:
         return False
 
 
-def update_lead(lead_id: str, update_data: LeadUpdate) -> Optional[Lead]:
+def _lead_response(db, lead: Lead) -> LeadResponse:
+    """Serialize a lead inside the write's session, including entries added in this transaction"""
+    db.flush()
+    db.refresh(lead)
+    return LeadResponse.from_orm(lead)
+
+
+def update_lead(lead_id: str, update_data: LeadUpdate) -> Optional[LeadResponse]:
     """Update a lead with new data"""
-    try:
-        db = SessionLocal()
+    def update(db):
         lead = db.query(Lead).options(
             selectinload(Lead.timeline_entries)
         ).filter(Lead.id == lead_id).first()
         
         if not lead:
-            db.close()
             return None
         
         # Check if we're changing status to didNotConvert and need to blacklist
@@ -208,7 +180,8 @@ def update_lead(lead_id: str, update_data: LeadUpdate) -> Optional[Lead]:
             blacklist_manager.add_to_blacklist(
                 lead.business_name,
                 reason=blacklist_reason,
-                notes=f"Marked as did not convert on {datetime.utcnow().isoformat()}"
+                notes=f"Marked as did not convert on {datetime.utcnow().isoformat()}",
+                commit=False  # Part of this write's transaction on the shared writer
             )
             
             # Add timeline entry about blacklisting
@@ -260,30 +233,26 @@ def update_lead(lead_id: str, update_data: LeadUpdate) -> Optional[Lead]:
                 pass
         
         lead.updated_at = datetime.utcnow()
-        db.commit()
-        db.refresh(lead)
-        db.close()
-        
+        return _lead_response(db, lead)
+    
+    try:
+        lead = run_write(update)
+        if update_data.add_to_blacklist:
+            get_blacklist_index().invalidate()
         return lead
-        
     except Exception as e:
         print(f"Error updating lead {lead_id}: {e}")
-        if 'db' in locals():
-            db.rollback()
-            db.close()
         return None
 
 
-def update_lead_timeline_entry(lead_id: str, entry_id: str, update_data: LeadTimelineEntryUpdate) -> Optional[Lead]:
+def update_lead_timeline_entry(lead_id: str, entry_id: str, update_data: LeadTimelineEntryUpdate) -> Optional[LeadResponse]:
     """Update a specific timeline entry for a lead"""
-    try:
-        db = SessionLocal()
+    def update(db):
         lead = db.query(Lead).options(
             selectinload(Lead.timeline_entries)
         ).filter(Lead.id == lead_id).first()
         
         if not lead:
-            db.close()
             return None
         
         # Find the timeline entry
@@ -293,7 +262,6 @@ def update_lead_timeline_entry(lead_id: str, entry_id: str, update_data: LeadTim
         ).first()
         
         if not entry:
-            db.close()
             return None
         
         # Update the entry
@@ -303,12 +271,10 @@ def update_lead_timeline_entry(lead_id: str, entry_id: str, update_data: LeadTim
                 setattr(entry, field, value)
         
         entry.updated_at = datetime.utcnow()
-        db.commit()
-        db.refresh(lead)
-        db.close()
-        
-        return lead
-        
+        return _lead_response(db, lead)
+    
+    try:
+        return run_write(update)
     except Exception as e:
         print(f"Error updating timeline entry {entry_id} for lead {lead_id}: {e}")
         return None
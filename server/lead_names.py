@@ -0,0 +1,42 @@
+"""
+Business name normalization shared by lead dedupe and the blacklist.
+lead_name_key() is the value stored in leads.normalized_name: an indexed,
+exact-match key. Names that differ only in case, punctuation, accents or a
+trailing legal-entity suffix ("LLC", "Inc.", ...) get the same key.
+"""
+
+import re
+import unicodedata
+from typing import Optional
+
+
+# Trailing legal-entity words dropped from the dedupe key ("Bob's Painting, LLC" == "Bobs Painting")
+LEGAL_SUFFIXES = {
+    "llc", "l l c", "inc", "incorporated", "corp", "corporation", "co", "company", "ltd", "limited",
+    "pllc", "lp", "llp", "plc",
+}
+MAX_SUFFIX_WORDS = 3  # "l l c" is the longest suffix once punctuation is stripped
+
+
+def normalize_business_name(name: Optional[str]) -> str:
+    """Lowercase, accent/punctuation-free, single-spaced name used for blacklist matching"""
+    if not name:
+        return ""
+    name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii").lower()
+    name = name.replace("'", "").replace("&", " and ")
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", name).split())
+
+
+def lead_name_key(name: Optional[str]) -> str:
+    """Normalized name without trailing legal suffixes; the key stored in leads.normalized_name"""
+    words = normalize_business_name(name).split()
+    stripped = True
+    while stripped:
+        stripped = False
+        for size in range(MAX_SUFFIX_WORDS, 0, -1):
+            # Never strip a name down to nothing ("Company" alone stays "company")
+            if len(words) > size and " ".join(words[-size:]) in LEGAL_SUFFIXES:
+                words = words[:-size]
+                stripped = True
+                break
+    return " ".join(words)
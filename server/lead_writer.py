@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Single-writer queue for the SQLite database.
+Scraper threads, PageSpeed workers, conversion scoring and API edits hand their
+writes to one background thread through a bounded queue and wait on a Future.
+That thread is the only one writing, so writers never contend for SQLite's lock
+(no "database is locked" timeouts or retry storms). It coalesces whatever is
+queued into one transaction per batch_size writes or flush_interval_ms, so
+parallel jobs share one commit (and one fsync) instead of one each.
+Login bookkeeping (users, sessions, tokens in auth/ and its routers) is rare and
+latency-sensitive, so it still commits on the request's own session.
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Any, Optional, List, Tuple
+
+
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_FLUSH_INTERVAL_MS = 50
+DEFAULT_MAX_QUEUE = 1000
+WRITE_TIMEOUT = 60  # Seconds a caller waits for its write to commit
+
+
+class LeadWriter:
+    """Single background thread running queued write callables in shared transactions.
+
+    A write is a callable taking the batch's session. It adds/updates rows and
+    returns its result (flush first if it needs generated IDs); the Future
+    resolves with that result once the batch has committed.
+    """
+
+    def __init__(self, session_factory: Callable = None, batch_size: int = DEFAULT_BATCH_SIZE,
+                 flush_interval_ms: int = DEFAULT_FLUSH_INTERVAL_MS, max_queue: int = DEFAULT_MAX_QUEUE):
+        if session_factory is None:
+            from database import SessionLocal
+            session_factory = SessionLocal
+        self.session_factory = session_factory
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval_ms / 1000
+        self._queue: "queue.Queue[Optional[Tuple[Callable, Future, float]]]" = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self.stats = {"writes": 0, "batches": 0, "failed_writes": 0, "fallback_batches": 0, "largest_batch": 0,
+                      "peak_queue_depth": 0, "wait_ms_total": 0.0, "max_wait_ms": 0.0}
+        self._thread = threading.Thread(target=self._run, name="lead-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, write: Callable[[Any], Any], timeout: Optional[float] = None) -> Future:
+        """Queue a write; blocks while the queue is full (backpressure on the scrapers)"""
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("A queued write cannot queue another write (it would wait on itself)")
+        future = Future()
+        self._queue.put((write, future, time.monotonic()), timeout=timeout)
+        depth = self._queue.qsize()
+        if depth > self.stats["peak_queue_depth"]:
+            with self._lock:
+                self.stats["peak_queue_depth"] = max(self.stats["peak_queue_depth"], depth)
+        return future
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            stop = False
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._write_batch(batch)
+            if stop:
+                return
+
+    def _record_waits(self, batch: List[Tuple[Callable, Future, float]]):
+        """Time each write spent queued before the writer picked it up"""
+        now = time.monotonic()
+        waits = [(now - enqueued_at) * 1000 for _, _, enqueued_at in batch]
+        with self._lock:
+            self.stats["wait_ms_total"] += sum(waits)
+            self.stats["max_wait_ms"] = max(self.stats["max_wait_ms"], max(waits))
+
+    def _write_batch(self, batch: List[Tuple[Callable, Future, float]]):
+        """One transaction for the batch; if it fails, each write gets its own so one bad row cannot sink the rest"""
+        # Skip writes whose caller gave up (cancelled the Future) while they were queued
+        batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        self._record_waits(batch)
+        db = self.session_factory()
+        error = None
+        try:
+            results = [write(db) for write, _, _ in batch]
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            error = e
+        finally:
+            db.close()
+
+        if error is not None:
+            print(f"    ⚠️ Batched lead write failed ({str(error)[:100]}), retrying {len(batch)} writes individually")
+            with self._lock:
+                self.stats["fallback_batches"] += 1
+            for write, future, _ in batch:
+                self._write_one(write, future)
+            return
+        with self._lock:
+            self.stats["batches"] += 1
+            self.stats["writes"] += len(batch)
+            self.stats["largest_batch"] = max(self.stats["largest_batch"], len(batch))
+        for (_, future, _), result in zip(batch, results):
+            future.set_result(result)
+
+    def _write_one(self, write: Callable, future: Future):
+        db = self.session_factory()
+        try:
+            result = write(db)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            with self._lock:
+                self.stats["failed_writes"] += 1
+            future.set_exception(e)
+            return
+        finally:
+            db.close()
+        with self._lock:
+            self.stats["batches"] += 1
+            self.stats["writes"] += 1
+        future.set_result(result)
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+        stats["queue_depth"] = self._queue.qsize()
+        stats["avg_batch_size"] = round(stats["writes"] / stats["batches"], 2) if stats["batches"] else 0.0
+        attempted = stats["writes"] + stats["failed_writes"]
+        stats["avg_wait_ms"] = round(stats.pop("wait_ms_total") / attempted, 2) if attempted else 0.0
+        stats["max_wait_ms"] = round(stats["max_wait_ms"], 2)
+        return stats
+
+    def close(self, timeout: float = 10.0):
+        """Flush everything queued so far, then stop the writer thread"""
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+
+_lead_writer: Optional[LeadWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_lead_writer() -> Optional[LeadWriter]:
+    """Shared writer, or None when LEAD_WRITER=0 (every save then commits on its own)"""
+    global _lead_writer
+    if os.environ.get("LEAD_WRITER", "1") in ("0", "false", "False"):
+        return None
+    with _writer_lock:
+        if _lead_writer is None:
+            _lead_writer = LeadWriter(
+                batch_size=int(os.environ.get("LEAD_WRITE_BATCH_SIZE", DEFAULT_BATCH_SIZE)),
+                flush_interval_ms=int(os.environ.get("LEAD_WRITE_FLUSH_MS", DEFAULT_FLUSH_INTERVAL_MS)),
+            )
+        return _lead_writer
+
+
+def _write_directly(write: Callable[[Any], Any]):
+    """Run one write in its own transaction (LEAD_WRITER=0)"""
+    from database import SessionLocal
+    
+    db = SessionLocal()
+    try:
+        result = write(db)
+        db.commit()
+        return result
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def submit_write(write: Callable[[Any], Any]) -> Future:
+    """Queue a write on the shared writer; with the writer disabled it runs right away"""
+    writer = get_lead_writer()
+    if writer:
+        return writer.submit(write, timeout=WRITE_TIMEOUT)
+    future = Future()
+    try:
+        future.set_result(_write_directly(write))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def run_write(write: Callable[[Any], Any], timeout: float = WRITE_TIMEOUT):
+    """Run write(db) on the shared writer and return its result once committed (raises its error)"""
+    return submit_write(write).result(timeout)
+
+
+def get_lead_writer_stats() -> Optional[dict]:
+    """Stats of the shared writer, without starting one"""
+    return _lead_writer.get_stats() if _lead_writer else None
+
+
+def shutdown_lead_writer():
+    """Commit whatever is still queued (called on server shutdown)"""
+    global _lead_writer
+    with _writer_lock:
+        writer, _lead_writer = _lead_writer, None
+    if writer:
+        writer.close()
@@ -11,7 +11,7 @@ import subprocess
 import time
 import uuid
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Literal
 from datetime import datetime, timezone, timedelta
 
 from fastapi import FastAPI, HTTPException, BackgroundTasks, WebSocket, WebSocketDisconnect, Request
@@ -24,9 +24,11 @@ from sqlalchemy import func
 
 # Local imports
 from database import SessionLocal, init_db
+from async_database import run_db, run_blocking, run_db_write
+from lead_writer import run_write
 from sqlalchemy.orm import selectinload
 from models import Lead, LeadStatus, SalesPitch, LeadTimelineEntry, TimelineEntryType, EmailTemplate
-from blacklist_manager import BlacklistManager, initialize_blacklist
+from blacklist_manager import BlacklistManager, initialize_blacklist, get_blacklist_index
 from schemas import (BrowserAutomationRequest, JobResponse, LeadResponse, LeadUpdate, 
                     LeadTimelineEntryUpdate, LeadTimelineEntryCreate, ConversionModelResponse, ConversionScoringResponse,
                     SalesPitchResponse, SalesPitchCreate, SalesPitchUpdate, LeadUpdateRequest,
@@ -45,6 +47,8 @@ from scraper_runner import run_scraper, _scrape_prerequisites
 from websocket_manager import job_websocket_manager, log_websocket_manager, pagespeed_websocket_manager
 from analytics_engine import AnalyticsEngine
 from parallel_job_executor import parallel_executor
+from stage_timing import get_job_profile, get_job_flame_summary
+from job_logger import get_job_logs as read_job_logs
 
 
 # Simple in-memory cache for statistics
@@ -184,7 +188,32 @@ async def startup_event():
     except Exception as e:
         logger.error(f"Migration error (non-fatal): {e}")
     
+    # Add/backfill the normalized business-name key used for lead dedupe
+    try:
+        from database import engine
+        from migrate_normalized_names import migrate_database as migrate_normalized_names
+        migrate_normalized_names(engine.url.database)
+    except Exception as e:
+        logger.error(f"Normalized name migration error (non-fatal): {e}")
+    
     cleanup_old_jobs()
+    
+    # Pre-warm pooled browser sessions in the background (BROWSER_POOL_SIZE=0 disables)
+    from browser_pool import get_browser_pool
+    browser_pool = get_browser_pool()
+    if browser_pool:
+        browser_pool.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close pooled browser sessions and flush queued lead writes"""
+    from browser_pool import get_browser_pool
+    from lead_writer import shutdown_lead_writer
+    browser_pool = get_browser_pool()
+    if browser_pool:
+        browser_pool.shutdown()
+    shutdown_lead_writer()
 
 
 # Health check endpoint
@@ -192,10 +221,8 @@ async def startup_event():
 async def health_check():
     """Health check endpoint"""
     try:
-        db = SessionLocal()
         from sqlalchemy import text
-        db.execute(text("SELECT 1"))
-        db.close()
+        await run_db(lambda db: db.execute(text("SELECT 1")))
         return {"status": "healthy", "database": "connected"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database connection failed: {str(e)}")
@@ -206,10 +233,8 @@ async def health_check():
 async def get_diagnostics():
     """Get system diagnostics"""
     try:
-        db = SessionLocal()
-        
         # Database stats
-        lead_count = db.query(Lead).count()
+        lead_count = await run_db(lambda db: db.query(Lead).count())
         job_count = len(job_statuses)  # Use in-memory job tracking
         
         # File system stats
@@ -219,12 +244,15 @@ async def get_diagnostics():
         # Memory stats
         active_jobs = len([s for s in job_statuses.values() if s.get("status") == "running"])
         
-        db.close()
+        from lead_writer import get_lead_writer_stats
+        from database import get_pool_status
         
         return {
             "database": {
                 "leads": lead_count,
-                "jobs": job_count
+                "jobs": job_count,
+                "pool": get_pool_status(),
+                "lead_writer": get_lead_writer_stats()
             },
             "filesystem": {
                 "screenshots": screenshot_count
@@ -283,7 +311,21 @@ async def get_job(job_id: str):
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    return job  # Job is already a dictionary in the in-memory system
+    # Job is already a dictionary in the in-memory system; add where its time went so far
+    stage_timings = get_job_flame_summary(job_id)
+    if stage_timings:
+        return {**job, "stage_timings": stage_timings}
+    return job
+
+
+@app.get("/jobs/{job_id}/profile")
+async def get_job_profile_endpoint(job_id: str):
+    """Per-stage timing profile (count, self/inclusive seconds, p50/p95) for a job"""
+    if not get_job_by_id(job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    profile = get_job_profile(job_id) or {"wall_seconds": 0, "instrumented_seconds": 0, "stages": {}}
+    return {"job_id": job_id, **profile}
 
 
 @app.post("/jobs/{job_id}/cancel")
@@ -306,10 +348,13 @@ async def get_job_logs(job_id: str, tail: int = 500):
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    # Since we're using in-memory job management, job logs are printed to console
-    # For now, return an empty lines array as the logs are handled by console output
     tail = max(1, min(tail, 5000))
-    return {"job_id": job_id, "lines": []}
+    entries = read_job_logs(job_id, tail=tail)
+    return {
+        "job_id": job_id,
+        "lines": [entry["message"] for entry in entries],
+        "last_seq": entries[-1]["seq"] if entries else 0
+    }
 
 
 @app.get("/jobs/{job_id}/screenshots")
@@ -363,8 +408,9 @@ async def export_leads_excel(
     from fastapi.responses import Response
     
     try:
-        # Generate Excel file with filters
-        excel_content = export_leads_to_excel(
+        # Generate Excel file with filters (off the event loop)
+        excel_content = await run_blocking(
+            export_leads_to_excel,
             status=status,
             industry=industry,
             location=location,
@@ -403,8 +449,7 @@ async def get_leads_called_today(
     per_page: int = 20
 ):
     """Get leads that were called today - optimized with pagination and efficient queries"""
-    db = SessionLocal()
-    try:
+    def handle(db):
         from datetime import date
         from sqlalchemy import func, and_, or_, text
         import time
@@ -459,8 +504,8 @@ async def get_leads_called_today(
             "total_pages": (total + per_page - 1) // per_page,
             "query_time_ms": round(query_time * 1000, 2)
         }
-    finally:
-        db.close()
+
+    return await run_db(handle)
 
 
 @app.get("/leads")
@@ -487,12 +532,11 @@ async def get_leads(
     logger.info(f"🔄 BACKEND SORT: sort_by={sort_by}, ascending={sort_ascending}")
     logger.info(f"📊 BACKEND FILTERS: status={status}, statuses={statuses}, search={search}, candidates_only={candidates_only}")
     
-    db = SessionLocal()
-    try:
-        # Limit per_page to prevent abuse
-        per_page = min(per_page, 500)
-        page = max(page, 1)
-        
+    # Limit per_page to prevent abuse
+    per_page = min(per_page, 500)
+    page = max(page, 1)
+    
+    def handle(db):
         query = db.query(Lead).options(
             selectinload(Lead.timeline_entries),
             selectinload(Lead.sales_pitch)
@@ -617,8 +661,8 @@ async def get_leads(
             "has_next": page < total_pages,
             "has_prev": page > 1
         }
-    finally:
-        db.close()
+
+    return await run_db(handle)
 
 
 @app.get("/leads/statistics/all", response_model=LeadStatisticsResponse)
@@ -634,8 +678,7 @@ async def get_lead_statistics():
         return statistics_cache["data"]
     
     logger.info("Cache miss, fetching fresh statistics")
-    db = SessionLocal()
-    try:
+    def handle(db):
         # Use a single query with GROUP BY for better performance
         from sqlalchemy import func
         
@@ -677,8 +720,8 @@ async def get_lead_statistics():
         statistics_cache["timestamp"] = now
         
         return response
-    finally:
-        db.close()
+
+    return await run_db(handle)
 
 
 # Cache for today's statistics with TTL
@@ -707,8 +750,7 @@ async def get_today_statistics():
         return today_stats_cache["data"]
     
     logger.info("Fetching fresh today's statistics")
-    db = SessionLocal()
-    try:
+    def handle(db):
         import time
         start_time = time.time()
         
@@ -776,8 +818,8 @@ async def get_today_statistics():
         today_stats_cache["date"] = today_date
         
         return response
-    finally:
-        db.close()
+
+    return await run_db(handle)
 
 
 @app.get("/leads/call-statistics")
@@ -786,55 +828,55 @@ async def get_call_statistics():
     from datetime import timedelta
     from sqlalchemy import func, text
     
-    db = SessionLocal()
-    try:
-        # Get call statistics for the last 90 days
-        end_date = datetime.now(timezone.utc).date()
-        start_date = end_date - timedelta(days=90)
-        
-        # Query to get call counts grouped by date
-        # Includes phone_call entries and status changes to called/interested/converted
-        query = text("""
-            SELECT 
-                DATE(created_at) as call_date,
-                COUNT(DISTINCT lead_id) as call_count
-            FROM lead_timeline_entries
-            WHERE (
-                UPPER(type) = 'PHONE_CALL'
-                OR (UPPER(type) = 'STATUS_CHANGE' AND UPPER(title) IN ('STATUS CHANGED TO CALLED', 'STATUS CHANGED TO INTERESTED', 'STATUS CHANGED TO CONVERTED'))
-            )
-            AND DATE(created_at) >= :start_date
-            AND DATE(created_at) <= :end_date
-            GROUP BY DATE(created_at)
-            ORDER BY call_date DESC
-        """)
-        
-        result = db.execute(query, {
-            'start_date': start_date,
-            'end_date': end_date
-        })
-        
-        # Convert to dictionary with date strings as keys
-        statistics = {}
-        for row in result:
-            # call_date is already a string from SQLite DATE() function
-            date_str = row.call_date
-            if date_str:
-                statistics[date_str] = row.call_count
-        
-        return statistics
-        
-    except Exception as e:
-        logger.error(f"Error fetching call statistics: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to fetch call statistics: {str(e)}")
-    finally:
-        db.close()
+    def handle(db):
+        try:
+            # Get call statistics for the last 90 days
+            end_date = datetime.now(timezone.utc).date()
+            start_date = end_date - timedelta(days=90)
+            
+            # Query to get call counts grouped by date
+            # Includes phone_call entries and status changes to called/interested/converted
+            query = text("""
+                SELECT 
+                    DATE(created_at) as call_date,
+                    COUNT(DISTINCT lead_id) as call_count
+                FROM lead_timeline_entries
+                WHERE (
+                    UPPER(type) = 'PHONE_CALL'
+                    OR (UPPER(type) = 'STATUS_CHANGE' AND UPPER(title) IN ('STATUS CHANGED TO CALLED', 'STATUS CHANGED TO INTERESTED', 'STATUS CHANGED TO CONVERTED'))
+                )
+                AND DATE(created_at) >= :start_date
+                AND DATE(created_at) <= :end_date
+                GROUP BY DATE(created_at)
+                ORDER BY call_date DESC
+            """)
+            
+            result = db.execute(query, {
+                'start_date': start_date,
+                'end_date': end_date
+            })
+            
+            # Convert to dictionary with date strings as keys
+            statistics = {}
+            for row in result:
+                # call_date is already a string from SQLite DATE() function
+                date_str = row.call_date
+                if date_str:
+                    statistics[date_str] = row.call_count
+            
+            return statistics
+            
+        except Exception as e:
+            logger.error(f"Error fetching call statistics: {e}")
+            raise HTTPException(status_code=500, detail=f"Failed to fetch call statistics: {str(e)}")
+
+    return await run_db(handle)
 
 
 @app.get("/leads/{lead_id}", response_model=LeadResponse)
 async def get_lead(lead_id: str):
     """Get specific lead"""
-    lead = get_lead_by_id(lead_id)
+    lead = await run_blocking(get_lead_by_id, lead_id)
     if not lead:
         raise HTTPException(status_code=404, detail="Lead not found")
     return LeadResponse.from_orm(lead)
@@ -843,7 +885,7 @@ async def get_lead(lead_id: str):
 @app.delete("/leads/{lead_id}")
 async def delete_lead(lead_id: str):
     """Delete a specific lead"""
-    success = delete_lead_by_id(lead_id)
+    success = await run_blocking(delete_lead_by_id, lead_id)
     if success:
         return {"message": "Lead deleted successfully"}
     else:
@@ -853,7 +895,7 @@ async def delete_lead(lead_id: str):
 @app.put("/leads/{lead_id}", response_model=LeadResponse)
 async def update_lead_endpoint(lead_id: str, update_data: LeadUpdate):
     """Update a lead"""
-    lead = update_lead(lead_id, update_data)
+    lead = await run_blocking(update_lead, lead_id, update_data)
     if not lead:
         raise HTTPException(status_code=404, detail="Lead not found")
     return lead
@@ -862,7 +904,7 @@ async def update_lead_endpoint(lead_id: str, update_data: LeadUpdate):
 @app.put("/leads/{lead_id}/timeline/{entry_id}", response_model=LeadResponse)
 async def update_timeline_entry(lead_id: str, entry_id: str, update_data: LeadTimelineEntryUpdate):
     """Update a timeline entry"""
-    lead = update_lead_timeline_entry(lead_id, entry_id, update_data)
+    lead = await run_blocking(update_lead_timeline_entry, lead_id, entry_id, update_data)
     if not lead:
         raise HTTPException(status_code=404, detail="Lead or timeline entry not found")
     return lead
@@ -871,11 +913,10 @@ async def update_timeline_entry(lead_id: str, entry_id: str, update_data: LeadTi
 @app.post("/leads/{lead_id}/timeline", response_model=LeadResponse)
 async def add_timeline_entry_endpoint(lead_id: str, entry_data: LeadTimelineEntryCreate):
     """Add a new timeline entry to a lead"""
-    db = SessionLocal()
-    try:
+    def handle(db):
         lead = db.query(Lead).options(selectinload(Lead.timeline_entries)).filter(Lead.id == lead_id).first()
         if not lead:
-            raise HTTPException(status_code=404, detail="Lead not found")
+            return None
         
         # Create new timeline entry
         # Convert type to lowercase to match enum values
@@ -907,22 +948,28 @@ async def add_timeline_entry_endpoint(lead_id: str, entry_data: LeadTimelineEntr
         # Update lead's updated_at timestamp
         lead.updated_at = datetime.utcnow()
         
-        db.commit()
+        db.flush()
         db.refresh(lead)
         
         return LeadResponse.from_orm(lead)
+    
+    # Committed by the single database writer
+    try:
+        lead = await run_db_write(handle)
+    except HTTPException:
+        raise
     except Exception as e:
-        db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to add timeline entry: {str(e)}")
-    finally:
-        db.close()
+    if not lead:
+        raise HTTPException(status_code=404, detail="Lead not found")
+    return lead
 
 
 # Admin Endpoints
 @app.delete("/admin/leads")
 async def delete_all_leads_endpoint():
     """Delete all leads"""
-    success = delete_all_leads()
+    success = await run_blocking(delete_all_leads)
     if success:
         return {"message": "All leads deleted successfully"}
     else:
@@ -932,7 +979,7 @@ async def delete_all_leads_endpoint():
 @app.delete("/admin/leads/mock")
 async def delete_mock_leads_endpoint():
     """Delete mock leads"""
-    success = delete_mock_leads()
+    success = await run_blocking(delete_mock_leads)
     if success:
         return {"message": "Mock leads deleted successfully"}
     else:
@@ -1011,6 +1058,17 @@ class ParallelJobRequest(BaseModel):
     enable_pagespeed: bool = False
     max_pagespeed_score: Optional[int] = None  # Maximum acceptable PageSpeed score (required if enable_pagespeed is True)
     max_runtime_minutes: Optional[int] = 30  # Maximum runtime in minutes before job auto-stops (default 30 minutes)
+    extraction_mode: Literal["element", "snapshot", "script"] = "element"  # Listing extraction: "element", "snapshot" or "script"
+    website_discovery: Literal["click", "http"] = "click"  # Compact-listing websites: "click" or "http"
+    incremental_feed: bool = False  # Only fetch cards added since the last scroll
+    pipelined_scroll: bool = False  # Prefetch the next page of results while the current batch is processed
+    prune_feed: bool = False  # Remove processed result cards from the page during long scrolls
+    recycle_after_businesses: Optional[int] = None  # Restart the browser after this many businesses (resumes from a checkpoint)
+    recycle_memory_mb: Optional[int] = None  # Restart the browser once renderer memory crosses this many MB
+    wait_ceilings: Optional[Dict[str, float]] = None  # Override page wait ceilings in seconds
+    blocking_profile: Optional[str] = None  # Network request blocking profile (see network_blocking.BLOCKING_PROFILES); None = BROWSER_BLOCKING_PROFILE env (default "tracking")
+    skip_known_places: bool = True  # Skip businesses already stored as leads before extraction
+    tiled_search: bool = False  # Cover each location tile by tile instead of zooming out
 
 @app.post("/jobs/parallel", response_model=Dict[str, Any])
 async def create_parallel_jobs(
@@ -1073,7 +1131,18 @@ async def create_parallel_jobs(
             "recent_review_months": recent_review_months,
             "enable_pagespeed": enable_pagespeed,
             "max_pagespeed_score": max_pagespeed_score,
-            "max_runtime_minutes": max_runtime_minutes
+            "max_runtime_minutes": max_runtime_minutes,
+            "extraction_mode": job_request.extraction_mode,
+            "website_discovery": job_request.website_discovery,
+            "incremental_feed": job_request.incremental_feed,
+            "pipelined_scroll": job_request.pipelined_scroll,
+            "prune_feed": job_request.prune_feed,
+            "recycle_after_businesses": job_request.recycle_after_businesses,
+            "recycle_memory_mb": job_request.recycle_memory_mb,
+            "wait_ceilings": job_request.wait_ceilings,
+            "blocking_profile": job_request.blocking_profile,
+            "skip_known_places": job_request.skip_known_places,
+            "tiled_search": job_request.tiled_search
         }
         
         job_matrix = parallel_executor.create_multi_location_jobs(
@@ -1164,6 +1233,24 @@ async def get_selenium_grid_status():
     return await get_container_infrastructure_status()
 
 
+@app.get("/grid/pool")
+async def get_browser_pool_status():
+    """Get pre-warmed browser session pool and shared-tab status"""
+    from browser_pool import get_browser_pool
+    browser_pool = get_browser_pool()
+    tabs = parallel_executor.tab_group.get_status() if parallel_executor.tab_group else None
+    if not browser_pool:
+        return {"enabled": False, "tabs": tabs}
+    return {"enabled": True, **browser_pool.get_status(), "tabs": tabs}
+
+
+@app.get("/extraction/selectors")
+async def get_selector_statistics():
+    """Get adaptive selector scores (which selector wins per field and listing type)"""
+    from selector_stats import get_selector_stats
+    return get_selector_stats().get_stats()
+
+
 @app.post("/grid/scale")
 async def scale_selenium_grid(target_nodes: int):
     """This endpoint is deprecated - containers now scale automatically"""
@@ -1180,9 +1267,7 @@ async def scale_selenium_grid(target_nodes: int):
 async def get_analytics_overview():
     """Get conversion overview metrics"""
     try:
-        db = SessionLocal()
-        overview = AnalyticsEngine.get_conversion_overview(db)
-        db.close()
+        overview = await run_db(AnalyticsEngine.get_conversion_overview)
         return overview
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get analytics overview: {str(e)}")
@@ -1192,9 +1277,7 @@ async def get_analytics_overview():
 async def get_top_segments(limit: int = 10):
     """Get top converting segments"""
     try:
-        db = SessionLocal()
-        segments = AnalyticsEngine.get_top_converting_segments(db, limit)
-        db.close()
+        segments = await run_db(AnalyticsEngine.get_top_converting_segments, limit)
         return segments
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get segments: {str(e)}")
@@ -1204,9 +1287,7 @@ async def get_top_segments(limit: int = 10):
 async def get_conversion_timeline(days: int = 30):
     """Get conversion timeline data"""
     try:
-        db = SessionLocal()
-        timeline = AnalyticsEngine.get_conversion_timeline(db, days)
-        db.close()
+        timeline = await run_db(AnalyticsEngine.get_conversion_timeline, days)
         return {"timeline": timeline}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get timeline: {str(e)}")
@@ -1216,9 +1297,7 @@ async def get_conversion_timeline(days: int = 30):
 async def get_insights():
     """Get actionable insights"""
     try:
-        db = SessionLocal()
-        insights = AnalyticsEngine.get_actionable_insights(db)
-        db.close()
+        insights = await run_db(AnalyticsEngine.get_actionable_insights)
         return {"insights": insights}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get insights: {str(e)}")
@@ -1230,34 +1309,34 @@ async def test_lead_pagespeed(lead_id: str, background_tasks: BackgroundTasks):
     """Test PageSpeed for a single lead"""
     from pagespeed_service import PageSpeedService
     
-    db = SessionLocal()
-    try:
-        lead = db.query(Lead).filter(Lead.id == lead_id).first()
-        if not lead:
-            raise HTTPException(status_code=404, detail="Lead not found")
-        
-        if not lead.website_url:
-            raise HTTPException(status_code=400, detail="Lead has no website")
-        
-        print(f"Starting PageSpeed test for {lead.business_name} - {lead.website_url}")
-        
-        # Run PageSpeed test in background
-        service = PageSpeedService()
-        
-        # Add to background task to run async
-        background_tasks.add_task(
-            service.test_lead_website,
-            lead_id
-        )
-        
-        return {"message": f"PageSpeed test started for {lead.business_name}. Results will appear in 1-2 minutes."}
-    except Exception as e:
-        print(f"Error in PageSpeed test: {e}")
-        import traceback
-        traceback.print_exc()
-        raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        db.close()
+    def handle(db):
+        try:
+            lead = db.query(Lead).filter(Lead.id == lead_id).first()
+            if not lead:
+                raise HTTPException(status_code=404, detail="Lead not found")
+            
+            if not lead.website_url:
+                raise HTTPException(status_code=400, detail="Lead has no website")
+            
+            print(f"Starting PageSpeed test for {lead.business_name} - {lead.website_url}")
+            
+            # Run PageSpeed test in background
+            service = PageSpeedService()
+            
+            # Add to background task to run async
+            background_tasks.add_task(
+                service.test_lead_website,
+                lead_id
+            )
+            
+            return {"message": f"PageSpeed test started for {lead.business_name}. Results will appear in 1-2 minutes."}
+        except Exception as e:
+            print(f"Error in PageSpeed test: {e}")
+            import traceback
+            traceback.print_exc()
+            raise HTTPException(status_code=500, detail=str(e))
+
+    return await run_db(handle)
 
 
 @app.post("/leads/pagespeed/bulk")
@@ -1265,8 +1344,7 @@ async def test_bulk_pagespeed(lead_ids: List[str], background_tasks: BackgroundT
     """Test PageSpeed for multiple leads"""
     from pagespeed_service import PageSpeedService
     
-    db = SessionLocal()
-    try:
+    def handle(db):
         leads = db.query(Lead).filter(Lead.id.in_(lead_ids)).all()
         if not leads:
             raise HTTPException(status_code=404, detail="No leads found")
@@ -1287,8 +1365,8 @@ async def test_bulk_pagespeed(lead_ids: List[str], background_tasks: BackgroundT
             "message": f"PageSpeed tests started for {len(leads_with_websites)} leads",
             "lead_count": len(leads_with_websites)
         }
-    finally:
-        db.close()
+
+    return await run_db(handle)
 
 
 @app.get("/leads/pagespeed/status")
@@ -1305,8 +1383,7 @@ async def count_missing_pagespeed():
     Count leads that have a website but no PageSpeed score.
     This excludes leads with pagespeed_error = true (those that already failed).
     """
-    db = SessionLocal()
-    try:
+    def handle(db):
         # Count leads with website_url but no PageSpeed scores
         eligible_count = db.query(Lead).filter(
             Lead.website_url.isnot(None),
@@ -1337,8 +1414,8 @@ async def count_missing_pagespeed():
             "previous_errors": error_count,
             "total_with_websites": eligible_count + scored_count + error_count
         }
-    finally:
-        db.close()
+
+    return await run_db(handle)
 
 @app.post("/leads/pagespeed/process-missing")
 async def process_missing_pagespeed(background_tasks: BackgroundTasks, limit: int = None):
@@ -1349,56 +1426,56 @@ async def process_missing_pagespeed(background_tasks: BackgroundTasks, limit: in
     """
     from pagespeed_service import PageSpeedService
     
-    db = SessionLocal()
-    try:
-        # Find leads with website_url but no PageSpeed scores
-        # Exclude leads that have pagespeed_error = true
-        query = db.query(Lead).filter(
-            Lead.website_url.isnot(None),
-            Lead.website_url != '',
-            Lead.pagespeed_mobile_score.is_(None),
-            Lead.pagespeed_desktop_score.is_(None),
-            # Exclude leads that already have errors
-            (Lead.pagespeed_test_error.is_(None) | (Lead.pagespeed_test_error == False))
-        )
-        
-        # Apply limit only if specified
-        if limit:
-            eligible_leads = query.limit(limit).all()
-        else:
-            eligible_leads = query.all()
-        
-        if not eligible_leads:
+    def handle(db):
+        try:
+            # Find leads with website_url but no PageSpeed scores
+            # Exclude leads that have pagespeed_error = true
+            query = db.query(Lead).filter(
+                Lead.website_url.isnot(None),
+                Lead.website_url != '',
+                Lead.pagespeed_mobile_score.is_(None),
+                Lead.pagespeed_desktop_score.is_(None),
+                # Exclude leads that already have errors
+                (Lead.pagespeed_test_error.is_(None) | (Lead.pagespeed_test_error == False))
+            )
+            
+            # Apply limit only if specified
+            if limit:
+                eligible_leads = query.limit(limit).all()
+            else:
+                eligible_leads = query.all()
+            
+            if not eligible_leads:
+                return {
+                    "message": "No eligible leads found",
+                    "criteria": "Has website_url, no PageSpeed scores, no previous errors",
+                    "processed": 0
+                }
+            
+            # Start PageSpeed tests in background
+            service = PageSpeedService()
+            lead_data = [(lead.id, lead.website_url) for lead in eligible_leads]
+            background_tasks.add_task(service.test_multiple_leads_async, lead_data)
+            
+            # Log the action
+            logger.info(f"Starting PageSpeed tests for {len(eligible_leads)} leads without scores")
+            
             return {
-                "message": "No eligible leads found",
-                "criteria": "Has website_url, no PageSpeed scores, no previous errors",
-                "processed": 0
+                "message": f"PageSpeed tests started for {len(eligible_leads)} leads",
+                "processed": len(eligible_leads),
+                "leads": [
+                    {
+                        "id": lead.id,
+                        "business_name": lead.business_name,
+                        "website_url": lead.website_url
+                    } for lead in eligible_leads[:10]  # Return first 10 for visibility
+                ]
             }
-        
-        # Start PageSpeed tests in background
-        service = PageSpeedService()
-        lead_data = [(lead.id, lead.website_url) for lead in eligible_leads]
-        background_tasks.add_task(service.test_multiple_leads_async, lead_data)
-        
-        # Log the action
-        logger.info(f"Starting PageSpeed tests for {len(eligible_leads)} leads without scores")
-        
-        return {
-            "message": f"PageSpeed tests started for {len(eligible_leads)} leads",
-            "processed": len(eligible_leads),
-            "leads": [
-                {
-                    "id": lead.id,
-                    "business_name": lead.business_name,
-                    "website_url": lead.website_url
-                } for lead in eligible_leads[:10]  # Return first 10 for visibility
-            ]
-        }
-    except Exception as e:
-        logger.error(f"Error processing missing PageSpeed scores: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        db.close()
+        except Exception as e:
+            logger.error(f"Error processing missing PageSpeed scores: {str(e)}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+    return await run_db(handle)
 
 
 @app.post("/jobs/{job_id}/pagespeed")
@@ -1424,36 +1501,36 @@ async def train_conversion_model(background_tasks: BackgroundTasks):
     """Train a new conversion scoring model based on historical data"""
     from conversion_scoring_service import ConversionScoringService
     
-    db = SessionLocal()
-    try:
-        service = ConversionScoringService(db)
-        model = service.train_model()
-        
-        if not model:
-            raise HTTPException(
-                status_code=400, 
-                detail="Not enough data to train model. Need at least 100 samples with conversions."
+    def handle(db):
+        try:
+            service = ConversionScoringService(db)
+            model = service.train_model()
+            
+            if not model:
+                raise HTTPException(
+                    status_code=400, 
+                    detail="Not enough data to train model. Need at least 100 samples with conversions."
+                )
+            
+            # Schedule background recalculation of all scores with new model
+            background_tasks.add_task(service.calculate_all_scores)
+            
+            return ConversionModelResponse(
+                model_version=model.model_version,
+                accuracy=model.model_accuracy,
+                f1_score=model.f1_score,
+                precision=model.precision_score,
+                recall=model.recall_score,
+                training_samples=model.training_samples,
+                baseline_conversion_rate=model.baseline_conversion_rate,
+                created_at=model.created_at,
+                is_active=model.is_active
             )
-        
-        # Schedule background recalculation of all scores with new model
-        background_tasks.add_task(service.calculate_all_scores)
-        
-        return ConversionModelResponse(
-            model_version=model.model_version,
-            accuracy=model.model_accuracy,
-            f1_score=model.f1_score,
-            precision=model.precision_score,
-            recall=model.recall_score,
-            training_samples=model.training_samples,
-            baseline_conversion_rate=model.baseline_conversion_rate,
-            created_at=model.created_at,
-            is_active=model.is_active
-        )
-    except Exception as e:
-        logger.error(f"Error training conversion model: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        db.close()
+        except Exception as e:
+            logger.error(f"Error training conversion model: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+    return await run_db(handle)
 
 
 @app.post("/conversion/calculate", response_model=ConversionScoringResponse)
@@ -1461,26 +1538,26 @@ async def calculate_conversion_scores(background_tasks: BackgroundTasks):
     """Calculate conversion scores for all leads"""
     from conversion_scoring_service import ConversionScoringService
     
-    db = SessionLocal()
-    try:
-        service = ConversionScoringService(db)
-        
-        # Run calculation in background
-        background_tasks.add_task(service.calculate_all_scores)
-        
-        # Get current stats
-        total_leads = db.query(func.count(Lead.id)).scalar()
-        
-        return ConversionScoringResponse(
-            status="started",
-            total_leads=total_leads,
-            message="Conversion scoring started in background"
-        )
-    except Exception as e:
-        logger.error(f"Error calculating conversion scores: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        db.close()
+    def handle(db):
+        try:
+            service = ConversionScoringService(db)
+            
+            # Run calculation in background
+            background_tasks.add_task(service.calculate_all_scores)
+            
+            # Get current stats
+            total_leads = db.query(func.count(Lead.id)).scalar()
+            
+            return ConversionScoringResponse(
+                status="started",
+                total_leads=total_leads,
+                message="Conversion scoring started in background"
+            )
+        except Exception as e:
+            logger.error(f"Error calculating conversion scores: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+    return await run_db(handle)
 
 
 @app.get("/conversion/stats", response_model=ConversionModelResponse)
@@ -1488,32 +1565,32 @@ async def get_conversion_model_stats():
     """Get statistics about the current conversion model"""
     from conversion_scoring_service import ConversionScoringService
     
-    db = SessionLocal()
-    try:
-        service = ConversionScoringService(db)
-        stats = service.get_model_stats()
-        
-        if 'status' in stats and stats['status'] == 'No model trained':
-            raise HTTPException(status_code=404, detail="No conversion model has been trained yet")
-        
-        return ConversionModelResponse(
-            model_version=stats['model_version'],
-            accuracy=stats['accuracy'],
-            f1_score=stats['f1_score'],
-            precision=stats['precision'],
-            recall=stats['recall'],
-            training_samples=stats['training_samples'],
-            baseline_conversion_rate=stats['baseline_conversion_rate'],
-            created_at=stats['created_at'],
-            is_active=True
-        )
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error getting conversion model stats: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        db.close()
+    def handle(db):
+        try:
+            service = ConversionScoringService(db)
+            stats = service.get_model_stats()
+            
+            if 'status' in stats and stats['status'] == 'No model trained':
+                raise HTTPException(status_code=404, detail="No conversion model has been trained yet")
+            
+            return ConversionModelResponse(
+                model_version=stats['model_version'],
+                accuracy=stats['accuracy'],
+                f1_score=stats['f1_score'],
+                precision=stats['precision'],
+                recall=stats['recall'],
+                training_samples=stats['training_samples'],
+                baseline_conversion_rate=stats['baseline_conversion_rate'],
+                created_at=stats['created_at'],
+                is_active=True
+            )
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Error getting conversion model stats: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+    return await run_db(handle)
 
 
 @app.get("/leads/top-converting")
@@ -1524,24 +1601,36 @@ async def get_top_converting_leads(
     """Get leads with highest conversion probability"""
     from conversion_scoring_service import ConversionScoringService
     
-    db = SessionLocal()
-    try:
-        # Get leads sorted by conversion score
-        leads = db.query(Lead).filter(
-            Lead.conversion_score.isnot(None),
-            Lead.conversion_score >= min_score,
-            Lead.status.notin_([LeadStatus.converted, LeadStatus.doNotCall])
-        ).order_by(Lead.conversion_score.desc()).limit(limit).all()
-        
-        return [LeadResponse.from_orm(lead) for lead in leads]
-    except Exception as e:
-        logger.error(f"Error getting top converting leads: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        db.close()
+    def handle(db):
+        try:
+            # Get leads sorted by conversion score
+            leads = db.query(Lead).filter(
+                Lead.conversion_score.isnot(None),
+                Lead.conversion_score >= min_score,
+                Lead.status.notin_([LeadStatus.converted, LeadStatus.doNotCall])
+            ).order_by(Lead.conversion_score.desc()).limit(limit).all()
+            
+            return [LeadResponse.from_orm(lead) for lead in leads]
+        except Exception as e:
+            logger.error(f"Error getting top converting leads: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+    return await run_db(handle)
 
 
 # Sales Pitch Management Endpoints
+def _run_api_write(write):
+    """Run an endpoint's write(db) on the single database writer and return its result.
+
+    A write rejects the request by returning (not raising) an HTTPException before
+    it changes anything, so a bad request never rolls back the writer's shared batch.
+    """
+    result = run_write(write)
+    if isinstance(result, HTTPException):
+        raise result
+    return result
+
+
 @app.get("/sales-pitches", response_model=List[SalesPitchResponse])
 def get_sales_pitches(active_only: bool = True):
     """Get all sales pitches"""
@@ -1559,82 +1648,78 @@ def get_sales_pitches(active_only: bool = True):
 @app.post("/sales-pitches", response_model=SalesPitchResponse)
 def create_sales_pitch(pitch: SalesPitchCreate):
     """Create a new sales pitch"""
-    db = SessionLocal()
-    try:
+    def write(db):
         db_pitch = SalesPitch(**pitch.dict())
         db.add(db_pitch)
-        db.commit()
+        db.flush()
         db.refresh(db_pitch)
-        return db_pitch
-    finally:
-        db.close()
+        return SalesPitchResponse.model_validate(db_pitch, from_attributes=True)
+    
+    return _run_api_write(write)
 
 
 @app.put("/sales-pitches/{pitch_id}", response_model=SalesPitchResponse)
 def update_sales_pitch(pitch_id: str, pitch_update: SalesPitchUpdate):
     """Update an existing sales pitch"""
-    db = SessionLocal()
-    try:
+    def write(db):
         db_pitch = db.query(SalesPitch).filter(SalesPitch.id == pitch_id).first()
         if not db_pitch:
-            raise HTTPException(status_code=404, detail="Sales pitch not found")
+            return HTTPException(status_code=404, detail="Sales pitch not found")
         
         update_data = pitch_update.dict(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_pitch, field, value)
         
         db_pitch.updated_at = datetime.utcnow()
-        db.commit()
+        db.flush()
         db.refresh(db_pitch)
-        return db_pitch
-    finally:
-        db.close()
+        return SalesPitchResponse.model_validate(db_pitch, from_attributes=True)
+    
+    return _run_api_write(write)
 
 
 @app.delete("/sales-pitches/{pitch_id}")
 def delete_sales_pitch(pitch_id: str):
     """Delete a sales pitch (soft delete by setting inactive)"""
-    db = SessionLocal()
-    try:
+    def write(db):
         db_pitch = db.query(SalesPitch).filter(SalesPitch.id == pitch_id).first()
         if not db_pitch:
-            raise HTTPException(status_code=404, detail="Sales pitch not found")
+            return HTTPException(status_code=404, detail="Sales pitch not found")
         
         # Check if there are at least 2 active pitches before deactivating
         active_count = db.query(SalesPitch).filter(SalesPitch.is_active == True).count()
         if active_count <= 2 and db_pitch.is_active:
-            raise HTTPException(
+            return HTTPException(
                 status_code=400, 
                 detail="Cannot deactivate pitch. At least 2 active pitches are required."
             )
         
         db_pitch.is_active = False
         db_pitch.updated_at = datetime.utcnow()
-        db.commit()
         return {"status": "success", "message": "Sales pitch deactivated"}
-    finally:
-        db.close()
+    
+    return _run_api_write(write)
 
 
 @app.post("/leads/{lead_id}/assign-pitch")
 def assign_pitch_to_lead(lead_id: str, request: LeadUpdateRequest):
     """Assign a sales pitch to a lead"""
-    db = SessionLocal()
-    try:
+    pitch_id = request.sales_pitch_id
+    
+    def write(db):
         lead = db.query(Lead).filter(Lead.id == lead_id).first()
         if not lead:
-            raise HTTPException(status_code=404, detail="Lead not found")
+            return HTTPException(status_code=404, detail="Lead not found")
         
-        pitch_id = request.sales_pitch_id
         if not pitch_id:
-            raise HTTPException(status_code=400, detail="sales_pitch_id is required")
+            return HTTPException(status_code=400, detail="sales_pitch_id is required")
             
         pitch = db.query(SalesPitch).filter(
             SalesPitch.id == pitch_id,
             SalesPitch.is_active == True
         ).first()
         if not pitch:
-            raise HTTPException(status_code=404, detail="Sales pitch not found or inactive")
+            return HTTPException(status_code=404, detail="Sales pitch not found or inactive")
         
         lead.sales_pitch_id = pitch_id
         
@@ -1652,18 +1737,17 @@ def assign_pitch_to_lead(lead_id: str, request: LeadUpdateRequest):
         )
         db.add(timeline_entry)
         
-        db.commit()
+        db.flush()
         db.refresh(lead)
         return LeadResponse.from_orm(lead)
-    finally:
-        db.close()
+    
+    return _run_api_write(write)
 
 
 @app.get("/sales-pitches/analytics")
 def get_pitch_analytics():
     """Get A/B testing analytics for all sales pitches"""
-    db = SessionLocal()
-    try:
+    def refresh_metrics(db):
         pitches = db.query(SalesPitch).all()
         
         analytics = []
@@ -1687,33 +1771,33 @@ def get_pitch_analytics():
                 "conversion_rate": pitch.conversion_rate,
                 "is_active": pitch.is_active
             })
-        
-        db.commit()
-        
-        # Calculate statistical significance if we have 2 active pitches
-        active_pitches = [p for p in analytics if p["is_active"]]
-        if len(active_pitches) >= 2:
-            # Simple chi-square test placeholder
-            total_attempts = sum(p["attempts"] for p in active_pitches)
-            total_conversions = sum(p["conversions"] for p in active_pitches)
-            
-            if total_attempts > 0:
-                baseline_rate = total_conversions / total_attempts
-                for pitch in analytics:
-                    if pitch["attempts"] > 0:
-                        expected = pitch["attempts"] * baseline_rate
-                        pitch["expected_conversions"] = expected
-                        pitch["performance"] = "above" if pitch["conversions"] > expected else "below"
-        
-        return {
-            "pitches": analytics,
-            "total_attempts": sum(p["attempts"] for p in analytics),
-            "total_conversions": sum(p["conversions"] for p in analytics),
-            "overall_conversion_rate": (sum(p["conversions"] for p in analytics) / 
-                                       max(sum(p["attempts"] for p in analytics), 1)) * 100
-        }
-    finally:
-        db.close()
+        return analytics
+    
+    # The refreshed conversion metrics are committed by the single database writer
+    analytics = run_write(refresh_metrics)
+    
+    # Calculate statistical significance if we have 2 active pitches
+    active_pitches = [p for p in analytics if p["is_active"]]
+    if len(active_pitches) >= 2:
+        # Simple chi-square test placeholder
+        total_attempts = sum(p["attempts"] for p in active_pitches)
+        total_conversions = sum(p["conversions"] for p in active_pitches)
+        
+        if total_attempts > 0:
+            baseline_rate = total_conversions / total_attempts
+            for pitch in analytics:
+                if pitch["attempts"] > 0:
+                    expected = pitch["attempts"] * baseline_rate
+                    pitch["expected_conversions"] = expected
+                    pitch["performance"] = "above" if pitch["conversions"] > expected else "below"
+    
+    return {
+        "pitches": analytics,
+        "total_attempts": sum(p["attempts"] for p in analytics),
+        "total_conversions": sum(p["conversions"] for p in analytics),
+        "overall_conversion_rate": (sum(p["conversions"] for p in analytics) / 
+                                   max(sum(p["attempts"] for p in analytics), 1)) * 100
+    }
 
 
 # Blacklist Management Endpoints
@@ -1740,31 +1824,25 @@ def get_blacklist():
 @app.post("/blacklist")
 def add_to_blacklist(business_name: str, reason: str = "too_big", notes: str = None):
     """Add a business to the blacklist"""
-    db = SessionLocal()
-    try:
-        blacklist_manager = BlacklistManager(db)
-        success = blacklist_manager.add_to_blacklist(business_name, reason, notes)
-        if success:
-            return {"success": True, "message": f"Added '{business_name}' to blacklist"}
-        else:
-            return {"success": False, "message": f"'{business_name}' is already blacklisted"}
-    finally:
-        db.close()
+    success = run_write(
+        lambda db: BlacklistManager(db).add_to_blacklist(business_name, reason, notes, commit=False)
+    )
+    if success:
+        get_blacklist_index().invalidate()
+        return {"success": True, "message": f"Added '{business_name}' to blacklist"}
+    else:
+        return {"success": False, "message": f"'{business_name}' is already blacklisted"}
 
 
 @app.delete("/blacklist/{business_name}")
 def remove_from_blacklist(business_name: str):
     """Remove a business from the blacklist"""
-    db = SessionLocal()
-    try:
-        blacklist_manager = BlacklistManager(db)
-        success = blacklist_manager.remove_from_blacklist(business_name)
-        if success:
-            return {"success": True, "message": f"Removed '{business_name}' from blacklist"}
-        else:
-            return {"success": False, "message": f"'{business_name}' not found in blacklist"}
-    finally:
-        db.close()
+    success = run_write(lambda db: BlacklistManager(db).remove_from_blacklist(business_name, commit=False))
+    if success:
+        get_blacklist_index().invalidate()
+        return {"success": True, "message": f"Removed '{business_name}' from blacklist"}
+    else:
+        return {"success": False, "message": f"'{business_name}' not found in blacklist"}
 
 
 @app.get("/blacklist/count")
@@ -1782,12 +1860,9 @@ def get_blacklist_count():
 @app.post("/blacklist/initialize")
 def initialize_blacklist_with_franchises():
     """Initialize blacklist with known franchises"""
-    db = SessionLocal()
-    try:
-        count = initialize_blacklist(db)
-        return {"success": True, "message": f"Initialized blacklist with {count} known franchises"}
-    finally:
-        db.close()
+    count = run_write(lambda db: initialize_blacklist(db, commit=False))
+    get_blacklist_index().invalidate()
+    return {"success": True, "message": f"Initialized blacklist with {count} known franchises"}
 
 
 # Email Template endpoints
@@ -1821,12 +1896,11 @@ def get_email_template(template_id: str):
 @app.post("/email-templates", response_model=EmailTemplateResponse)
 def create_email_template(template: EmailTemplateCreate):
     """Create a new email template"""
-    db = SessionLocal()
-    try:
+    def write(db):
         # Check if template name already exists
         existing = db.query(EmailTemplate).filter(EmailTemplate.name == template.name).first()
         if existing:
-            raise HTTPException(status_code=400, detail="Template with this name already exists")
+            return HTTPException(status_code=400, detail="Template with this name already exists")
         
         db_template = EmailTemplate(
             id=str(uuid.uuid4()),
@@ -1837,21 +1911,20 @@ def create_email_template(template: EmailTemplateCreate):
             is_active=template.is_active
         )
         db.add(db_template)
-        db.commit()
+        db.flush()
         db.refresh(db_template)
-        return db_template
-    finally:
-        db.close()
+        return EmailTemplateResponse.model_validate(db_template, from_attributes=True)
+    
+    return _run_api_write(write)
 
 
 @app.put("/email-templates/{template_id}", response_model=EmailTemplateResponse)
 def update_email_template(template_id: str, template: EmailTemplateUpdate):
     """Update an email template"""
-    db = SessionLocal()
-    try:
+    def write(db):
         db_template = db.query(EmailTemplate).filter(EmailTemplate.id == template_id).first()
         if not db_template:
-            raise HTTPException(status_code=404, detail="Template not found")
+            return HTTPException(status_code=404, detail="Template not found")
         
         # Check if new name conflicts with existing template
         if template.name and template.name != db_template.name:
@@ -1860,41 +1933,38 @@ def update_email_template(template_id: str, template: EmailTemplateUpdate):
                 EmailTemplate.id != template_id
             ).first()
             if existing:
-                raise HTTPException(status_code=400, detail="Template with this name already exists")
+                return HTTPException(status_code=400, detail="Template with this name already exists")
         
         update_data = template.dict(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_template, field, value)
         
         db_template.updated_at = datetime.utcnow()
-        db.commit()
+        db.flush()
         db.refresh(db_template)
-        return db_template
-    finally:
-        db.close()
+        return EmailTemplateResponse.model_validate(db_template, from_attributes=True)
+    
+    return _run_api_write(write)
 
 
 @app.delete("/email-templates/{template_id}")
 def delete_email_template(template_id: str):
     """Delete an email template"""
-    db = SessionLocal()
-    try:
+    def write(db):
         template = db.query(EmailTemplate).filter(EmailTemplate.id == template_id).first()
         if not template:
-            raise HTTPException(status_code=404, detail="Template not found")
+            return HTTPException(status_code=404, detail="Template not found")
         
         db.delete(template)
-        db.commit()
         return {"message": "Template deleted successfully"}
-    finally:
-        db.close()
+    
+    return _run_api_write(write)
 
 
 @app.post("/email-templates/initialize-defaults")
 def initialize_default_templates():
     """Initialize default email templates if none exist"""
-    db = SessionLocal()
-    try:
+    def write(db):
         # Check if any templates exist
         existing_count = db.query(EmailTemplate).count()
         if existing_count > 0:
@@ -2017,10 +2087,9 @@ Best regards""",
             db.add(db_template)
             created_count += 1
         
-        db.commit()
         return {"message": f"Default templates created successfully", "created": created_count}
-    finally:
-        db.close()
+    
+    return run_write(write)
 
 
 if __name__ == "__main__":
@@ -12,29 +12,75 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from business_extractor_utils import BusinessExtractorUtils
 from database_operations import save_lead_to_database
 from job_management import add_job_log, update_job_status, job_statuses
-from blacklist_manager import BlacklistManager
-from database import SessionLocal
+from blacklist_manager import get_blacklist_index
+from page_waits import PageWaiter
+from place_seen_set import get_place_seen_set
+from search_tiling import TilePlanner
+from stage_timing import StageTimer, get_job_timer, set_active_timer
+from search_checkpoint import DEFAULT_CHECKPOINT_INTERVAL
+from website_discovery import WebsiteResolver
+from job_logger import DEBUG, INFO, get_job_logger, set_thread_logger
+from browser_recycling import recycle_generation
 
 
 class MapsSearchEngine:
-    def __init__(self, driver, screenshot_manager, search_area_manager, job_id=None):
+    def __init__(self, driver, screenshot_manager, search_area_manager, job_id=None, page_waiter=None):
         self.driver = driver
         self.wait = WebDriverWait(driver, 10)
+        self.waiter = page_waiter or PageWaiter(driver)  # Condition-driven waits shared with the screenshot/search area managers
         self.screenshot_manager = screenshot_manager
         self.search_area_manager = search_area_manager
         self.job_id = job_id
+        self.logger = get_job_logger(job_id)  # Level-gated ring buffer (console only without a job)
         self.cancel_flag = False
         self.business_counter = 0  # Track businesses across all iterations
         self.last_processed_element_id = None  # Track where we left off after scrolling
         self.processed_element_ids = set()  # Track all processed element IDs
         self.enable_pagespeed = False  # Enable PageSpeed testing for new leads
         self.max_pagespeed_score = None  # Maximum acceptable PageSpeed score (set when PageSpeed is enabled)
+        self.extraction_mode = "element"  # "element" = per-card WebDriver calls, "snapshot" = one feed outerHTML per iteration, "script" = one execute_script per iteration
+        self.feed_snapshot = {}  # Business details parsed from the latest feed snapshot, keyed by element ID
+        self.element_identifiers = {}  # WebElement.id -> element ID, filled by script extraction to skip remote lookups
+        self.maps_url = "https://www.google.com/maps"  # Overridden by scrape_replay to point at a local replay server
+        self.save_lead = None  # Replaces save_lead_to_database when set (scrape_replay keeps replayed leads out of the leads table)
+        self.recording_dir = None  # When set, each iteration's feed state is saved for scrape_replay
+        self.incremental_feed = False  # Drain only newly inserted cards from an in-page MutationObserver
+        self.pipelined_scroll = False  # Scroll for the next page as soon as a batch is captured, then process the batch
+        self.prune_feed = False  # Remove processed cards from the feed DOM so long scrolls stay fast
+        self.feed_pruner = None  # FeedPruner, created on the first pruned batch
+        self.feed_observer = None  # FeedObserver, created on first drain when incremental_feed is enabled
+        self.skip_known_places = True  # Skip cards whose place ID is already a lead, before extraction
+        self.place_ids = {}  # Element ID -> canonical Google place ID
+        self.seen_places = None  # Shared PlaceSeenSet, attached when a search starts
+        self.known_places_skipped = 0
+        self.tiled_search = False  # Cover the area tile by tile instead of zoom-out expansion
+        self.tile_planner = None  # TilePlanner, shared when several workers search one job
+        self.current_tile = None
+        self.timer = get_job_timer(job_id) if job_id else StageTimer()  # Per-stage spans, shared by engines of the same job
+        self.checkpoint_store = None  # CheckpointStore; when set, traversal state is saved for resume after a crash/retry
+        self.checkpoint_interval = DEFAULT_CHECKPOINT_INTERVAL
+        self.last_checkpoint_at = 0
+        self.search_started_at = None
+        self.resume_position = (0, 0)  # (scroll depth, expansions) restored from a checkpoint
+        self.scroll_depth = 0
+        self.expansions_done = 0
+        self.session_lost = False  # Browser died mid-search; the checkpoint is kept for a retry
+        self.recycle_policy = None  # RecyclePolicy; when it fires the search checkpoints and stops for a fresh browser
+        self.recycle_reason = None  # Why the last search stopped to recycle the browser (None = it did not)
+        self.recycle_businesses_start = 0  # business_counter when this browser took over
+        self.recycle_generation = 0
+        self.network_blocker = None  # NetworkBlocker of this browser; its performance log is drained as the search runs
+        self.memory_recycle = True  # False once a resumed browser is already over the memory limit
+        self.website_discovery = "click"  # "click" = serial click-through per compact listing, "http" = concurrent place-page fetches per batch
+        self.website_resolver = None  # WebsiteResolver, created on first "http" batch
+        self.discovered_websites = {}  # Element ID -> website (or None) resolved for compact listings
     
-    def _log(self, message):
-        """Log message to both console and job logs for WebSocket"""
-        print(message)  # Keep console output for debugging
-        if self.job_id:
-            add_job_log(self.job_id, message)
+    def _log(self, message, *args, level=INFO):
+        """Log to the job's ring buffer for WebSocket/log readers (echoed to console unless JOB_LOG_ECHO=0).
+
+        Pass %-style args on hot paths: they are only formatted when the level is kept.
+        """
+        self.logger.log(level, message, *args)
 
     def set_cancel_flag(self):
         """Set cancel flag to stop search"""
@@ -54,11 +100,13 @@ class MapsSearchEngine:
         
         # Track start time for runtime limit
         start_time = time.time()
+        self.search_started_at = start_time
         max_runtime_seconds = (max_runtime_minutes * 60) if max_runtime_minutes else None
         
         results = []
         processed_names = set()
         evaluated_businesses = set()
+        self.recycle_reason = None
         
         self._log_search_criteria(query, limit, min_rating, min_reviews, 
                                  requires_website, recent_review_months, 
@@ -67,11 +115,29 @@ class MapsSearchEngine:
         if max_runtime_minutes:
             self._log(f"⏱️ Maximum runtime: {max_runtime_minutes} minutes")
         
+        self.seen_places = get_place_seen_set() if self.skip_known_places else None
+        if self.seen_places is not None:
+            self.seen_places.refresh_if_stale()
+        
+        # Lets helpers outside the engine (e.g. compact-listing click-through) add spans to this job
+        set_active_timer(self.timer)
+        set_thread_logger(self.logger)
+        
         try:
             # Navigate to Google Maps and perform search
-            if not self._perform_initial_search(query):
+            with self.timer.span("search"):
+                if self.tiled_search:
+                    search_started = self._start_tiled_search(query, limit)
+                else:
+                    search_started = self._perform_initial_search(query)
+            if not search_started:
                 return results
             
+            # Pick up where a crashed, retried or recycled run of this job left off
+            start_time = self._resume_from_checkpoint(query, results, processed_names, evaluated_businesses, start_time)
+            self.recycle_businesses_start = self.business_counter
+            self.recycle_generation = recycle_generation()
+            
             # Main search iteration loop
             results = self._iterate_through_results(
                 results, processed_names, evaluated_businesses, query, limit,
@@ -81,10 +147,18 @@ class MapsSearchEngine:
             )
             
             self._log(f"✅ Search completed! Found {len(results)} qualifying businesses")
+            self._report_tile_coverage()
+            if self.known_places_skipped:
+                self._log(f"⏭️ Skipped {self.known_places_skipped} businesses already stored as leads")
+            self._report_wait_metrics()
+            self._report_website_discovery()
+            self._finish_checkpoint(query, results, processed_names, evaluated_businesses)
             return results
             
         except Exception as e:
             self._log(f"❌ Error in Google Maps search: {str(e)}")
+            self._report_website_discovery()
+            self._finish_checkpoint(query, results, processed_names, evaluated_businesses)
             return results
 
     def _log_search_criteria(self, query, limit, min_rating, min_reviews, 
@@ -120,9 +194,12 @@ class MapsSearchEngine:
     def _perform_initial_search(self, query):
         """Navigate to Google Maps and perform initial search"""
         try:
-            self._log(f"\n📍 Opening Google Maps...")
-            self.driver.get("https://www.google.com/maps")
-            time.sleep(2)
+            if self._on_maps_landing_page():
+                self._log(f"\n♻️ Reusing warm Google Maps session")
+            else:
+                self._log(f"\n📍 Opening Google Maps...")
+                self.driver.get(self.maps_url)
+                self.waiter.wait_for_page_ready()
             
             self._log(f"🔍 Searching for: {query}")
             search_box = self.wait.until(
@@ -132,7 +209,7 @@ class MapsSearchEngine:
             search_box.send_keys(query)
             search_box.send_keys(Keys.RETURN)
             
-            time.sleep(3)
+            self.waiter.wait_for_results()
             
             # Verify results panel exists
             try:
@@ -149,19 +226,29 @@ class MapsSearchEngine:
             self._log(f"❌ Error performing initial search: {str(e)}")
             return False
 
+    def _on_maps_landing_page(self):
+        """True when a pooled session is already parked on the Maps landing page"""
+        try:
+            current_url = self.driver.current_url
+        except Exception:
+            return False
+        if not isinstance(current_url, str) or not current_url.startswith(self.maps_url):
+            return False
+        return "/place/" not in current_url and "/search/" not in current_url
+
     def _iterate_through_results(self, results, processed_names, evaluated_businesses,
                                 query, limit, min_rating, min_reviews, requires_website,
                                 recent_review_months, min_photos, min_description_length,
                                 enable_click_through, start_time=None, max_runtime_seconds=None):
         """Main iteration loop through search results"""
-        scroll_attempts = 0
+        scroll_attempts, expansions_performed = self.resume_position
         max_scroll_attempts = 20
-        expansions_performed = 0
         max_expansions = 3
         no_new_results_count = 0
         max_no_new_results = 3
         
         while len(results) < limit and scroll_attempts < max_scroll_attempts:
+            prefetch_length = None  # Feed length when the next page was prefetched (None = not prefetched)
             # Check runtime limit
             if max_runtime_seconds and start_time:
                 elapsed_time = time.time() - start_time
@@ -180,28 +267,70 @@ class MapsSearchEngine:
             
             self._log(f"\n📋 Iteration {scroll_attempts + 1}: Found {len(results)} qualifying businesses so far")
             
+            if self.recording_dir:
+                self._record_feed_state(scroll_attempts + 1, query)
+            
             # Take debug screenshot before processing
             if self.screenshot_manager:
                 debug_screenshot = f"debug_iteration_{scroll_attempts + 1}_before_processing"
-                self.screenshot_manager.take_screenshot(debug_screenshot)
+                with self.timer.span("screenshot"):
+                    self.screenshot_manager.take_screenshot(debug_screenshot)
                 self._log(f"📸 Debug screenshot: {debug_screenshot}")
             
             # Get current business elements
-            business_elements = self._get_business_elements()
+            with self.timer.span("extract"):
+                if self.incremental_feed:
+                    business_elements = self._drain_new_business_elements()
+                elif self.extraction_mode == "script":
+                    business_elements = self._get_business_elements_via_script()
+                elif self.extraction_mode == "snapshot":
+                    business_elements = self._get_business_elements_via_snapshot()
+                else:
+                    business_elements = self._get_business_elements()
             
-            if not business_elements:
+            # With incremental tracking an empty drain after a scroll just means nothing new loaded yet
+            if not business_elements and (not self.incremental_feed or scroll_attempts == 0):
+                if self.current_tile and self._move_to_next_tile():
+                    scroll_attempts = 0
+                    no_new_results_count = 0
+                    continue
                 self._log("❌ No business elements found")
                 break
             
-            self._log(f"📊 Found {len(business_elements)} business elements on page")
+            evaluated_before = len(evaluated_businesses)
             
-            # Process each business element
-            new_results_found = self._process_business_elements(
-                business_elements, results, processed_names, evaluated_businesses,
-                query, limit, min_rating, min_reviews, requires_website,
-                recent_review_months, min_photos, min_description_length,
-                enable_click_through, start_time, max_runtime_seconds
-            )
+            if business_elements:
+                self._log(f"📊 Found {len(business_elements)} business elements on page")
+                
+                # Snapshot mode with incremental tracking: the drained cards are keyed already, pull the feed to parse them
+                if self.extraction_mode == "snapshot" and self.incremental_feed:
+                    with self.timer.span("extract"):
+                        self.feed_snapshot = self._capture_feed_snapshot()
+                
+                # Pipelined scroll: Maps loads the next page while this batch is filtered and saved
+                if self.pipelined_scroll:
+                    prefetch_length = self.search_area_manager.prefetch_next_page()
+                
+                # Resolve the batch's compact-listing websites concurrently instead of clicking into each
+                if self.website_discovery == "http" and enable_click_through:
+                    self._discover_websites()
+                
+                # Process each business element
+                new_results_found = self._process_business_elements(
+                    business_elements, results, processed_names, evaluated_businesses,
+                    query, limit, min_rating, min_reviews, requires_website,
+                    recent_review_months, min_photos, min_description_length,
+                    enable_click_through, start_time, max_runtime_seconds
+                )
+                
+                if self.prune_feed:
+                    removed = self._prune_processed_cards(business_elements)
+                    # The prefetch counted the cards just removed; growth is measured against what is left
+                    if prefetch_length is not None:
+                        prefetch_length = max(0, prefetch_length - removed)
+            else:
+                self._log("⏳ No new business cards since last scroll")
+                new_results_found = 0
             
             if new_results_found == 0:
                 no_new_results_count += 1
@@ -209,21 +338,37 @@ class MapsSearchEngine:
             else:
                 no_new_results_count = 0
             
+            if self.current_tile:
+                self.tile_planner.record(self.current_tile, len(evaluated_businesses) - evaluated_before, new_results_found)
+            
             # Break if we have enough results
-            if len(results) >= limit:
+            if len(results) >= limit or (self.current_tile and self.tile_planner.limit_reached()):
                 break
             
             # Try scrolling first
-            if self.search_area_manager.scroll_results_panel():
-                self._log("✅ Scrolled results panel")
-                time.sleep(2)
+            with self.timer.span("scroll"):
+                if prefetch_length is not None and self.waiter.wait_for_feed_growth(prefetch_length):
+                    self._log("✅ Next page of results already loaded (prefetched)")
+                elif self.search_area_manager.scroll_results_panel():
+                    self._log("✅ Scrolled results panel")
+                    self.waiter.wait_for_network_idle()
             
+            # Tiled search: move to the next tile once this one is exhausted instead of zooming out
+            if self.current_tile:
+                if no_new_results_count >= max_no_new_results or self.waiter.is_end_of_list():
+                    if not self._move_to_next_tile():
+                        break
+                    scroll_attempts = 0
+                    no_new_results_count = 0
+                    continue
             # If no new results for several attempts, try expanding search area
-            if (no_new_results_count >= max_no_new_results and 
+            elif (no_new_results_count >= max_no_new_results and 
                 expansions_performed < max_expansions):
                 
                 expansions_performed += 1
-                if self.search_area_manager.expand_search_area(expansions_performed, evaluated_businesses, query):
+                with self.timer.span("search"):
+                    expanded = self.search_area_manager.expand_search_area(expansions_performed, evaluated_businesses, query)
+                if expanded:
                     no_new_results_count = 0
                     self._log(f"✅ Successfully expanded search area #{expansions_performed}")
                 else:
@@ -233,9 +378,208 @@ class MapsSearchEngine:
                 break
             
             scroll_attempts += 1
+            if self.current_tile and scroll_attempts >= max_scroll_attempts and self._move_to_next_tile():
+                scroll_attempts = 0
+                no_new_results_count = 0
+            
+            self.scroll_depth, self.expansions_done = scroll_attempts, expansions_performed
+            self._maybe_checkpoint(query, results, processed_names, evaluated_businesses)
+            if self.network_blocker:
+                self.network_blocker.collect_if_due()
+            if self._should_recycle():
+                break
         
         return results
 
+    def _start_tiled_search(self, query, limit):
+        """Locate the search area and claim a tile; secondary workers go straight to an open tile"""
+        if self.tile_planner is None:
+            self.tile_planner = TilePlanner(query, self.maps_url, lead_limit=limit)
+        if self.tile_planner.has_origin():
+            return self._move_to_next_tile()
+        
+        if not self._perform_initial_search(query):
+            self.tile_planner.stop("initial search failed")
+            return False
+        self.current_tile = self.tile_planner.set_origin_from_url(self.driver.current_url)
+        if self.current_tile:
+            self._log(f"🧭 Tiled search: {len(self.tile_planner.tiles)} tiles around {self.current_tile.lat:.4f},{self.current_tile.lng:.4f}")
+        elif self.tile_planner.has_origin():
+            # Another worker located the area first
+            return self._move_to_next_tile()
+        else:
+            self._log("⚠️ Could not read the map viewport - falling back to zoom-out expansion")
+            self.tile_planner.stop("map viewport unavailable")
+            self.tiled_search = False
+        return True
+
+    def _move_to_next_tile(self):
+        """Finish the current tile and navigate to the next one the planner schedules"""
+        if self.current_tile:
+            self.tile_planner.complete(self.current_tile)
+            self._log(f"🧭 Tile ({self.current_tile.row},{self.current_tile.col}) done: "
+                      f"{self.current_tile.new_leads} new leads from {self.current_tile.evaluated} evaluated")
+        self.current_tile = self.tile_planner.next_tile()
+        if self.current_tile is None:
+            self._log(f"🛑 Tiled search finished: {self.tile_planner.stop_reason}")
+            return False
+        
+        tile = self.current_tile
+        self._log(f"🧭 Searching tile ({tile.row},{tile.col}) ring {tile.ring} at {tile.lat:.4f},{tile.lng:.4f}")
+        with self.timer.span("search"):
+            self.driver.get(self.tile_planner.tile_url(tile))
+            self.waiter.wait_for_results()
+        self.last_processed_element_id = None
+        self.feed_observer = None
+        if self.feed_pruner:
+            self.feed_pruner.reset()
+        return True
+
+    def _resume_from_checkpoint(self, query, results, processed_names, evaluated_businesses, start_time):
+        """Restore traversal state saved by an earlier run of this job; returns the adjusted start time"""
+        self.resume_position = (0, 0)
+        self.memory_recycle = True
+        if not self.checkpoint_store or not self.job_id or self.tiled_search:
+            return start_time
+        checkpoint = self.checkpoint_store.load(self.job_id)
+        if not checkpoint or checkpoint.get("query") != query:
+            return start_time
+        
+        results.extend(checkpoint["results"])
+        processed_names.update(checkpoint["processed_names"])
+        evaluated_businesses.update(checkpoint["evaluated_businesses"])
+        self.processed_element_ids.update(checkpoint["processed_element_ids"])
+        self.last_processed_element_id = checkpoint["last_processed_element_id"]
+        self.business_counter = checkpoint["business_counter"]
+        self.resume_position = (checkpoint["scroll_depth"], checkpoint["expansions"])
+        self._log(f"♻️ Resuming from checkpoint: {len(results)} results, {len(self.processed_element_ids)} businesses "
+                  f"already processed, scroll depth {checkpoint['scroll_depth']}, {checkpoint['expansions']} expansions")
+        
+        self._fast_forward(query, evaluated_businesses, *self.resume_position)
+        # Replaying the scroll depth brings the feed's memory back; if that alone crosses the
+        # limit, each fresh browser would recycle right away and replay it again
+        if self.recycle_policy:
+            memory_mb = self.recycle_policy.memory_over_limit(self.driver)
+            if memory_mb is not None:
+                self.memory_recycle = False
+                self._log(f"♻️ Renderer memory is {memory_mb:.0f} MB right after resuming - "
+                          f"memory-triggered recycling is off for the rest of this search")
+        # Time spent before the crash still counts against max_runtime_minutes
+        self.search_started_at = start_time - checkpoint.get("elapsed_seconds", 0)
+        return self.search_started_at
+
+    def _fast_forward(self, query, evaluated_businesses, scroll_depth, expansions):
+        """Re-apply expansions and scroll the feed back to the checkpointed depth without extracting"""
+        with self.timer.span("search"):
+            for expansion_number in range(1, expansions + 1):
+                self.search_area_manager.expand_search_area(expansion_number, evaluated_businesses, query)
+        with self.timer.span("scroll"):
+            for _ in range(scroll_depth):
+                if self.is_cancelled() or not self.search_area_manager.scroll_results_panel():
+                    break
+
+    def _save_checkpoint(self, query, results, processed_names, evaluated_businesses):
+        if not self.checkpoint_store or not self.job_id or self.tiled_search:
+            return
+        try:
+            self.checkpoint_store.save(self.job_id, {
+                "query": query,
+                "results": results,
+                "processed_names": sorted(processed_names),
+                "evaluated_businesses": sorted(evaluated_businesses),
+                "processed_element_ids": sorted(self.processed_element_ids),
+                "last_processed_element_id": self.last_processed_element_id,
+                "business_counter": self.business_counter,
+                "scroll_depth": self.scroll_depth,
+                "expansions": self.expansions_done,
+                "elapsed_seconds": time.time() - self.search_started_at,
+            })
+            self.last_checkpoint_at = time.time()
+        except Exception as e:
+            self._log(f"⚠️ Could not write search checkpoint: {str(e)}")
+
+    def _maybe_checkpoint(self, query, results, processed_names, evaluated_businesses):
+        if self.checkpoint_store and time.time() - self.last_checkpoint_at >= self.checkpoint_interval:
+            self._save_checkpoint(query, results, processed_names, evaluated_businesses)
+
+    def _finish_checkpoint(self, query, results, processed_names, evaluated_businesses):
+        """Drop the checkpoint after a clean finish; keep a fresh one if the browser session died"""
+        if not self.checkpoint_store or not self.job_id:
+            return
+        self.session_lost = not self._session_alive()
+        if self.recycle_reason and not self.session_lost:
+            self._save_checkpoint(query, results, processed_names, evaluated_businesses)
+            self._log("💾 Progress checkpointed - resuming in a fresh browser")
+        elif self.session_lost:
+            self._save_checkpoint(query, results, processed_names, evaluated_businesses)
+            self._log("💾 Browser session lost - progress checkpointed for resume")
+        else:
+            self.checkpoint_store.delete(self.job_id)
+
+    def _should_recycle(self):
+        """True when the recycle policy wants a fresh browser (progress must be checkpointable to resume)"""
+        if not self.recycle_policy or not self.checkpoint_store or self.tiled_search:
+            return False
+        reason = self.recycle_policy.check(
+            self.driver, self.business_counter - self.recycle_businesses_start, self.recycle_generation,
+            check_memory=self.memory_recycle
+        )
+        if reason:
+            self.recycle_reason = reason
+            self._log(f"♻️ Browser recycle triggered: {reason}")
+        return bool(reason)
+
+    def _session_alive(self):
+        try:
+            self.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def _report_tile_coverage(self):
+        """Close the current tile and attach per-tile coverage to the job status"""
+        if not self.tile_planner:
+            return
+        if self.current_tile:
+            self.tile_planner.complete(self.current_tile)
+            self.current_tile = None
+        coverage = self.tile_planner.get_coverage()
+        self._log(f"🧭 Tile coverage: {coverage['tiles_searched']}/{coverage['tiles_total']} tiles, "
+                  f"{coverage['new_leads']} new leads")
+        if self.job_id and self.job_id in job_statuses:
+            job_statuses[self.job_id]["tile_coverage"] = coverage
+
+    def _report_wait_metrics(self):
+        """Log time spent in page waits and attach the per-wait metrics to the job status"""
+        metrics = self.waiter.get_metrics()
+        if not metrics:
+            return
+        summary = ", ".join(f"{name} {stats['total_seconds']}s/{stats['count']}" for name, stats in metrics.items())
+        self._log(f"⏱️ Page waits: {self.waiter.total_wait_seconds()}s total ({summary})")
+        if self.job_id and self.job_id in job_statuses:
+            job_statuses[self.job_id]["wait_metrics"] = metrics
+
+    def _record_feed_state(self, iteration, query):
+        """Save the current feed outerHTML so the session can be replayed by scrape_replay"""
+        try:
+            import json
+            from pathlib import Path
+            recording_dir = Path(self.recording_dir)
+            recording_dir.mkdir(parents=True, exist_ok=True)
+            
+            feed = self.driver.find_element(By.CSS_SELECTOR, "[role='feed']")
+            state_name = f"feed_{iteration:02d}.html"
+            (recording_dir / state_name).write_text(feed.get_attribute("outerHTML"), encoding="utf-8")
+            
+            manifest_path = recording_dir / "manifest.json"
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8")) if manifest_path.exists() else {"query": query, "feed_states": []}
+            if state_name not in manifest["feed_states"]:
+                manifest["feed_states"].append(state_name)
+            manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+            self._log(f"🎞️ Recorded feed state {state_name}")
+        except Exception as e:
+            self._log(f"⚠️ Could not record feed state: {str(e)}")
+
     def _get_business_elements(self):
         """Get all business elements from the current page"""
         try:
@@ -261,16 +605,106 @@ class MapsSearchEngine:
             self._log(f"❌ Error getting business elements: {str(e)}")
             return []
     
+    def _drain_new_business_elements(self):
+        """Get only the business elements inserted since the last drain, via the in-page MutationObserver"""
+        try:
+            if self.feed_observer is None:
+                from feed_observer import FeedObserver
+                self.feed_observer = FeedObserver(self.driver)
+            cards = self.feed_observer.drain()
+        except Exception as e:
+            self._log(f"⚠️ Feed observer failed, falling back to full feed scan: {str(e)}")
+            self.incremental_feed = False
+            return self._get_business_elements()
+        
+        business_elements = []
+        for element, element_id, href in cards:
+            self.element_identifiers[element.id] = element_id
+            self.place_ids[element_id] = BusinessExtractorUtils.get_place_id(href)
+            business_elements.append(element)
+        
+        self._log(f"🆕 {len(business_elements)} new business cards since last scroll")
+        if self.extraction_mode == "script" and business_elements:
+            return self._get_business_elements_via_script(business_elements)
+        return business_elements
+
+    def _get_business_elements_via_script(self, cards=None):
+        """Get all visible business elements (or just the given cards) and their details with a single execute_script call"""
+        try:
+            from feed_script_extractor import FeedScriptExtractor
+            businesses = FeedScriptExtractor().extract(self.driver, cards)
+        except Exception as e:
+            self._log(f"⚠️ Script extraction failed, falling back to per-element extraction: {str(e)}")
+            self.feed_snapshot = {}
+            return cards if cards is not None else self._get_business_elements()
+        
+        business_elements = []
+        self.feed_snapshot = {}
+        for business in businesses:
+            element = business.pop('element', None)
+            if element is None:
+                continue
+            self.element_identifiers[element.id] = business['element_id']
+            self.feed_snapshot[business['element_id']] = business
+            business_elements.append(element)
+        
+        self._log(f"📜 Script extraction returned {len(business_elements)} businesses")
+        return business_elements
+
+    def _get_business_elements_via_snapshot(self):
+        """Get the feed's cards, keyed by their place links, and parse every card offline - one execute_script call"""
+        try:
+            from feed_snapshot_extractor import FeedSnapshotExtractor
+            cards, self.feed_snapshot = FeedSnapshotExtractor().capture(self.driver)
+        except Exception as e:
+            self._log(f"⚠️ Feed snapshot failed, falling back to per-element extraction: {str(e)}")
+            self.feed_snapshot = {}
+            return self._get_business_elements()
+        
+        business_elements = []
+        for element, element_id, href in cards:
+            self.element_identifiers[element.id] = element_id
+            self.place_ids[element_id] = BusinessExtractorUtils.get_place_id(href)
+            business_elements.append(element)
+        
+        self._log(f"📸 Parsed {len(self.feed_snapshot)} businesses from feed snapshot")
+        return business_elements
+
+    def _prune_processed_cards(self, business_elements):
+        """Detach the batch's cards from the feed DOM; the engine keeps their data, Maps keeps loading below.
+
+        Returns how many cards were removed (0 when pruning failed and was switched off).
+        """
+        try:
+            if self.feed_pruner is None:
+                from feed_pruner import FeedPruner
+                self.feed_pruner = FeedPruner(self.driver)
+            with self.timer.span("scroll"):
+                removed = self.feed_pruner.prune(business_elements)
+        except Exception as e:
+            self._log(f"⚠️ Feed pruning failed, keeping processed cards in the DOM: {str(e)}")
+            self.prune_feed = False
+            return 0
+        if removed:
+            self._log("✂️ Pruned %s processed cards from the feed (%s total)", removed, self.feed_pruner.pruned, level=DEBUG)
+        return removed
+
     def _get_element_identifier(self, element):
         """Get a stable identifier for a business element"""
+        cached_id = self.element_identifiers.get(getattr(element, 'id', None))
+        if cached_id:
+            return cached_id
+        
         try:
             # Try to find a Maps place link which should be stable
             link = element.find_element(By.CSS_SELECTOR, "a[href*='/maps/place/']")
             href = link.get_attribute("href")
             if href:
                 # Extract the place ID or coordinates from the URL
-                if "/maps/place/" in href:
-                    return href.split("/maps/place/")[1].split("?")[0].split("/")[0]
+                place_key = BusinessExtractorUtils.get_place_key(href)
+                if place_key:
+                    self.place_ids[place_key] = BusinessExtractorUtils.get_place_id(href)
+                    return place_key
             
             # Fallback: use element position and parent info
             location = element.location
@@ -280,6 +714,22 @@ class MapsSearchEngine:
         except:
             return None
     
+    def _get_place_id(self, element_id):
+        """Canonical place ID for an element, from the identifier lookup or the feed snapshot"""
+        place_id = self.place_ids.get(element_id)
+        if place_id:
+            return place_id
+        snapshot = self.feed_snapshot.get(element_id)
+        if snapshot:
+            return BusinessExtractorUtils.get_place_id(snapshot.get('url'))
+        return None
+
+    def _is_known_place(self, element_id):
+        """True when the card's place ID is already stored as a lead"""
+        if not self.skip_known_places or self.seen_places is None:
+            return False
+        return self.seen_places.contains(self._get_place_id(element_id))
+
     def _get_all_business_elements(self):
         """Get all business elements without filtering (for debugging)"""
         try:
@@ -317,8 +767,12 @@ class MapsSearchEngine:
         if self.last_processed_element_id is None:
             start_processing = True
             self._log("🔄 First iteration - processing from beginning")
+        elif self.incremental_feed:
+            # The observer only hands us cards we have not seen, so there is nothing to skip
+            start_processing = True
+            self._log("🔄 Processing newly inserted cards")
         else:
-            self._log(f"🔄 Continuing from last processed element ID: {self.last_processed_element_id}")
+            self._log("🔄 Continuing from last processed element ID: %s", self.last_processed_element_id)
         
         # Check if we can find the last processed element in current elements
         found_last_processed = False
@@ -341,7 +795,7 @@ class MapsSearchEngine:
             if max_runtime_seconds and start_time:
                 elapsed_time = time.time() - start_time
                 if elapsed_time > max_runtime_seconds:
-                    self._log(f"⏱️ Runtime limit reached ({round(elapsed_time/60, 1)} minutes) during business processing. Stopping search.")
+                    self._log("⏱️ Runtime limit reached (%s minutes) during business processing. Stopping search.", round(elapsed_time/60, 1))
                     if self.job_id:
                         add_job_log(self.job_id, f"⏱️ Maximum runtime of {round(max_runtime_seconds/60)} minutes reached. Returning {len(results)} leads found so far.")
                     return new_results_count  # Return count to preserve behavior
@@ -355,7 +809,7 @@ class MapsSearchEngine:
                 # If we haven't started processing yet, check if this is where we left off
                 if not start_processing:
                     if element_id == self.last_processed_element_id:
-                        self._log(f"📍 Found where we left off! Resuming from next element...")
+                        self._log("📍 Found where we left off! Resuming from next element...")
                         start_processing = True
                     continue  # Skip until we find our starting point
                 
@@ -367,33 +821,40 @@ class MapsSearchEngine:
                 # Mark this element as processed by ID
                 self.processed_element_ids.add(element_id)
                 
-                # Extract FULL business details
-                try:
-                    from business_extractor import extract_business_details
-                    business_details = extract_business_details(business_element, driver=self.driver, enable_click_through=enable_click_through)
-                except Exception as e:
-                    self._log(f"    ⚠️ Full extraction failed, trying basic extraction: {e}")
-                    business_details = self._extract_business_from_element(business_element)
+                # Skip businesses that are already leads before spending any extraction work on them
+                if self._is_known_place(element_id):
+                    self.known_places_skipped += 1
+                    self.last_processed_element_id = element_id
+                    self._log("⏭️ Already a lead, skipping: %s", element_id)
+                    continue
+                
+                # Extract FULL business details (from the feed snapshot when available)
+                with self.timer.span("extract"):
+                    business_details = self._get_snapshot_details(element_id, enable_click_through)
+                    if business_details is None:
+                        try:
+                            from business_extractor import extract_business_details
+                            business_details = extract_business_details(business_element, driver=self.driver, enable_click_through=enable_click_through)
+                        except Exception as e:
+                            self._log("    ⚠️ Full extraction failed, trying basic extraction: %s", e)
+                            business_details = self._extract_business_from_element(business_element)
                 
                 if not business_details or not business_details.get('name'):
-                    self._log(f"❌ No business name found for element {i+1}")
+                    self._log("❌ No business name found for element %s", i+1)
                     # Update last processed even for failed extractions to avoid getting stuck
                     self.last_processed_element_id = element_id
                     continue
                 
                 business_name = business_details['name']
                 
-                # Check blacklist BEFORE any further processing
-                db_session = SessionLocal()
-                try:
-                    blacklist_manager = BlacklistManager(db_session)
-                    if blacklist_manager.is_blacklisted(business_name):
-                        self._log(f"⛔ Skipping blacklisted business: {business_name}")
-                        evaluated_businesses.add(business_name)
-                        self.last_processed_element_id = element_id
-                        continue
-                finally:
-                    db_session.close()
+                # Check blacklist BEFORE any further processing (shared in-memory index, no DB round-trip)
+                with self.timer.span("blacklist_check"):
+                    blacklisted = get_blacklist_index().is_blacklisted(business_name)
+                if blacklisted:
+                    self._log("⛔ Skipping blacklisted business: %s", business_name)
+                    evaluated_businesses.add(business_name)
+                    self.last_processed_element_id = element_id
+                    continue
                 
                 # Skip if already processed by business name (final safeguard)
                 if business_name in evaluated_businesses:
@@ -405,9 +866,9 @@ class MapsSearchEngine:
                 self.business_counter += 1
                 elements_processed_this_iteration += 1
                 
-                self._log(f"\n{'='*60}")
-                self._log(f"🏢 [{self.business_counter}] Evaluating: {business_name}")
-                self._log(f"{'='*60}")
+                self._log("\n" + "=" * 60, level=DEBUG)
+                self._log("🏢 [%s] Evaluating: %s", self.business_counter, business_name)
+                self._log("=" * 60, level=DEBUG)
                 
                 # Update last processed element ID
                 self.last_processed_element_id = element_id
@@ -427,41 +888,51 @@ class MapsSearchEngine:
                         if requires_website is not None:
                             final_has_website = business_details.get('has_website', False)
                             if requires_website and not final_has_website:
-                                self._log(f"❌ Business filtered out after full extraction: {business_name}")
-                                self._log(f"    Reason: Missing required website (discovered after full extraction)")
+                                self._log("❌ Business filtered out after full extraction: %s", business_name)
+                                self._log("    Reason: Missing required website (discovered after full extraction)")
                                 continue
                             if not requires_website and final_has_website:
-                                self._log(f"❌ Business filtered out after full extraction: {business_name}")
-                                self._log(f"    Reason: Has website (looking for businesses without websites)")
+                                self._log("❌ Business filtered out after full extraction: %s", business_name)
+                                self._log("    Reason: Has website (looking for businesses without websites)")
                                 continue
                         
                         # Take business screenshot (handle stale element after click-through)
-                        try:
-                            screenshot_filename = self.screenshot_manager.take_business_screenshot(
-                                business_name, business_element
-                            )
-                            business_details['screenshot_filename'] = screenshot_filename
-                        except Exception as screenshot_error:
-                            if "stale element" in str(screenshot_error).lower():
-                                self._log(f"    ⚠️ Business element became stale after click-through, taking general screenshot instead")
-                                screenshot_filename = self.screenshot_manager.take_screenshot(f"business_{business_name.lower().replace(' ', '_')}")
+                        with self.timer.span("screenshot"):
+                            try:
+                                screenshot_filename = self.screenshot_manager.take_business_screenshot(
+                                    business_name, business_element
+                                )
                                 business_details['screenshot_filename'] = screenshot_filename
-                            else:
-                                self._log(f"    ❌ Screenshot error: {screenshot_error}")
-                                business_details['screenshot_filename'] = None
+                            except Exception as screenshot_error:
+                                if "stale element" in str(screenshot_error).lower():
+                                    self._log("    ⚠️ Business element became stale after click-through, taking general screenshot instead")
+                                    screenshot_filename = self.screenshot_manager.take_screenshot(f"business_{business_name.lower().replace(' ', '_')}")
+                                    business_details['screenshot_filename'] = screenshot_filename
+                                else:
+                                    self._log("    ❌ Screenshot error: %s", screenshot_error)
+                                    business_details['screenshot_filename'] = None
                         
                         # Extract additional details
                         business_details['industry'] = BusinessExtractorUtils.extract_industry_from_query(query)
                         business_details['location'] = BusinessExtractorUtils.extract_location_from_query(query)
                         
+                        # Tile workers share one quota; claim a slot before saving
+                        if self.current_tile and not self.tile_planner.reserve_lead():
+                            self._log("🛑 Lead limit reached by tile workers, skipping: %s", business_name)
+                            break
+
                         # Save to database and add to results
-                        lead_id = save_lead_to_database(business_details, self.job_id, self.enable_pagespeed, self.max_pagespeed_score)
+                        with self.timer.span("save"):
+                            lead_id = (self.save_lead or save_lead_to_database)(business_details, self.job_id, self.enable_pagespeed, self.max_pagespeed_score)
+                        if not lead_id and self.current_tile:
+                            self.tile_planner.release_lead()
                         if lead_id:
                             business_details['lead_id'] = lead_id
                             results.append(business_details)
                             processed_names.add(business_name)
                             new_results_count += 1
-                            self._log(f"✅ Added qualifying business #{len(results)}: {business_name}")
+                            self._log("✅ Added qualifying business #%s: %s", len(results), business_name)
+                            self._maybe_checkpoint(query, results, processed_names, evaluated_businesses)
                             
                             # Update job status with current leads count
                             if self.job_id and self.job_id in job_statuses:
@@ -477,24 +948,87 @@ class MapsSearchEngine:
                                     total_requested=total_requested
                                 )
                     else:
-                        self._log(f"⚠️ Duplicate business skipped: {business_name}")
+                        self._log("⚠️ Duplicate business skipped: %s", business_name)
                 else:
-                    self._log(f"❌ Business filtered out: {business_name}")
-                    self._log(f"    Reason: {filter_result['reason']}")
+                    self._log("❌ Business filtered out: %s", business_name)
+                    self._log("    Reason: %s", filter_result['reason'])
                 
             except Exception as e:
-                self._log(f"❌ Error processing business element: {str(e)}")
+                self._log("❌ Error processing business element: %s", str(e))
                 continue
         
         # Log iteration summary
-        self._log(f"\n📊 Iteration Summary:")
-        self._log(f"   - Total elements found: {len(business_elements)}")
-        self._log(f"   - Elements processed: {elements_processed_this_iteration}")
-        self._log(f"   - Elements skipped (duplicates): {elements_skipped_as_duplicates}")
-        self._log(f"   - New qualifying results: {new_results_count}")
+        self._log("\n📊 Iteration Summary:")
+        self._log("   - Total elements found: %s", len(business_elements))
+        self._log("   - Elements processed: %s", elements_processed_this_iteration)
+        self._log("   - Elements skipped (duplicates): %s", elements_skipped_as_duplicates)
+        self._log("   - New qualifying results: %s", new_results_count)
         
         return new_results_count
 
+    def _capture_feed_snapshot(self):
+        """Fetch the results feed outerHTML in one call and parse all cards offline"""
+        try:
+            from feed_snapshot_extractor import FeedSnapshotExtractor
+            feed = self.driver.find_element(By.CSS_SELECTOR, "[role='feed']")
+            html = feed.get_attribute("outerHTML")
+            snapshot = FeedSnapshotExtractor().parse_by_id(html)
+            self._log(f"📸 Parsed {len(snapshot)} businesses from feed snapshot")
+            return snapshot
+        except Exception as e:
+            self._log(f"⚠️ Feed snapshot failed, falling back to per-element extraction: {str(e)}")
+            return {}
+
+    def _get_snapshot_details(self, element_id, enable_click_through):
+        """Get business details for an element from the current feed snapshot, if usable"""
+        snapshot_details = self.feed_snapshot.get(element_id)
+        if not snapshot_details:
+            return None
+        
+        # Compact listings hide the website behind a click, so they still need the live extractor
+        # unless their place page was already resolved for this batch
+        if snapshot_details.get('listing_type') == 'compact' and enable_click_through:
+            if element_id not in self.discovered_websites:
+                return None
+            website = self.discovered_websites.pop(element_id)
+            snapshot_details = dict(snapshot_details, website=website, has_website=bool(website))
+            snapshot_details.pop('_needs_click_check', None)
+        
+        business_details = dict(snapshot_details)
+        for internal_key in ('listing_type', 'element_id', 'action_buttons'):
+            business_details.pop(internal_key, None)
+        return business_details
+
+    def _discover_websites(self):
+        """Fetch place pages for the snapshot's unprocessed compact listings in parallel"""
+        pending = {
+            element_id: details.get('url')
+            for element_id, details in self.feed_snapshot.items()
+            if details.get('listing_type') == 'compact' and not details.get('website')
+            and element_id not in self.processed_element_ids and element_id not in self.discovered_websites
+        }
+        if not pending:
+            return
+        if self.website_resolver is None:
+            self.website_resolver = WebsiteResolver()
+        
+        with self.timer.span("click_through"):
+            resolved = self.website_resolver.resolve_many(pending)
+        self.discovered_websites.update(resolved)
+        found = sum(1 for website in resolved.values() if website)
+        self._log(f"🌐 Resolved {len(resolved)}/{len(pending)} compact listings via place pages ({found} with websites)")
+
+    def _report_website_discovery(self):
+        if self.website_resolver is None:
+            return
+        stats = self.website_resolver.get_stats()
+        self.website_resolver.close()
+        self.website_resolver = None
+        self._log(f"🌐 Website discovery: {stats['fetched']} place pages, {stats['websites_found']} websites, "
+                  f"{stats['unresolved']} fell back to click-through")
+        if self.job_id and self.job_id in job_statuses:
+            job_statuses[self.job_id]["website_discovery"] = stats
+
     def _extract_business_from_element(self, element):
         """Extract basic business details for screening (name, rating, etc.)"""
         # Only extract minimal info needed for filtering - no website detection yet
@@ -574,24 +1108,25 @@ class MapsSearchEngine:
             
             # Recent reviews filter - use proper click-through checking
             if recent_review_months is not None:
-                # First try quick check from list view
-                from business_extractor_utils import BusinessExtractorUtils
-                quick_check = BusinessExtractorUtils.check_recent_reviews_profile(
-                    business_element, recent_review_months
-                )
-                
-                # If quick check finds recent reviews, we're good
-                if quick_check:
-                    self._log(f"    ✅ Quick check found recent reviews")
-                else:
-                    # Need to click into business for detailed check
-                    self._log(f"    🔍 Quick check inconclusive, performing detailed check...")
-                    from review_date_checker import ReviewDateChecker
-                    has_recent_reviews, most_recent = ReviewDateChecker.check_reviews_with_click(
-                        self.driver, business_element, recent_review_months
+                with self.timer.span("review_check"):
+                    # First try quick check from list view
+                    from business_extractor_utils import BusinessExtractorUtils
+                    quick_check = BusinessExtractorUtils.check_recent_reviews_profile(
+                        business_element, recent_review_months
                     )
-                    if not has_recent_reviews:
-                        return {"passes": False, "reason": f"No reviews within last {recent_review_months} months"}
+                    
+                    # If quick check finds recent reviews, we're good
+                    if quick_check:
+                        self._log(f"    ✅ Quick check found recent reviews")
+                    else:
+                        # Need to click into business for detailed check
+                        self._log(f"    🔍 Quick check inconclusive, performing detailed check...")
+                        from review_date_checker import ReviewDateChecker
+                        has_recent_reviews, most_recent = ReviewDateChecker.check_reviews_with_click(
+                            self.driver, business_element, recent_review_months
+                        )
+                        if not has_recent_reviews:
+                            return {"passes": False, "reason": f"No reviews within last {recent_review_months} months"}
             
             return {"passes": True, "reason": ""}
             
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Migration script to add the indexed normalized_name column to the leads table
+and backfill it for existing leads (see lead_names.lead_name_key)
+"""
+
+import sqlite3
+import os
+
+from lead_names import lead_name_key
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def migrate_database(db_path=None):
+    """Add normalized_name, backfill it and index it. Safe to run repeatedly."""
+
+    # Get database path
+    if db_path is None:
+        db_path = '/app/db/leadloq.db' if os.getenv('USE_DOCKER') else './db/leadloq.db'
+
+    if not os.path.exists(db_path):
+        print(f"Database not found at {db_path}")
+        return
+
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='leads'")
+        if not cursor.fetchone():
+            print("ℹ️ No leads table found, skipping normalized_name migration")
+            return
+
+        # Check if column already exists
+        cursor.execute("PRAGMA table_info(leads)")
+        columns = [column[1] for column in cursor.fetchall()]
+
+        if 'normalized_name' not in columns:
+            cursor.execute("ALTER TABLE leads ADD COLUMN normalized_name VARCHAR")
+            print("✅ Added normalized_name column to leads table")
+
+        # Backfill leads saved before the column existed (or written outside the ORM)
+        backfilled = 0
+        while True:
+            cursor.execute(
+                "SELECT id, business_name FROM leads WHERE normalized_name IS NULL LIMIT ?",
+                (BACKFILL_BATCH_SIZE,)
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            cursor.executemany(
+                "UPDATE leads SET normalized_name = ? WHERE id = ?",
+                [(lead_name_key(name), lead_id) for lead_id, name in rows]
+            )
+            conn.commit()
+            backfilled += len(rows)
+        if backfilled:
+            print(f"✅ Backfilled normalized_name for {backfilled} leads")
+
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS ix_leads_normalized_name_location ON leads(normalized_name, location)"
+        )
+        conn.commit()
+
+    except Exception as e:
+        print(f"❌ Error during migration: {str(e)}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    migrate_database()
@@ -1,10 +1,11 @@
-from sqlalchemy import Column, String, Float, Integer, Boolean, DateTime, Text, ForeignKey, Enum as SQLEnum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Float, Integer, Boolean, DateTime, Text, ForeignKey, Index, Enum as SQLEnum
+from sqlalchemy.orm import relationship, validates
 from datetime import datetime, timezone
 import enum
 import uuid
 
 from database import Base
+from lead_names import lead_name_key
 
 
 class User(Base):
@@ -63,10 +64,15 @@ class TimelineEntryType(str, enum.Enum):
 
 class Lead(Base):
     __tablename__ = "leads"
+    __table_args__ = (
+        # Duplicate detection: exact lookups on the normalized name (optionally per location)
+        Index("ix_leads_normalized_name_location", "normalized_name", "location"),
+    )
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     # user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)  # TODO: Enable when auth is fully implemented
     business_name = Column(String, nullable=False, index=True)
+    normalized_name = Column(String, nullable=True)  # lead_name_key(business_name), kept in sync by set_business_name
     phone = Column(String, nullable=False, index=True)
     website_url = Column(String, nullable=True)
     profile_url = Column(String, nullable=True)
@@ -126,6 +132,11 @@ class Lead(Base):
     timeline_entries = relationship("LeadTimelineEntry", back_populates="lead", cascade="all, delete-orphan", order_by="desc(LeadTimelineEntry.created_at)")
     sales_pitch = relationship("SalesPitch", back_populates="leads")
 
+    @validates("business_name")
+    def set_business_name(self, key, business_name):
+        self.normalized_name = lead_name_key(business_name)
+        return business_name
+
 
 class CallLog(Base):
     __tablename__ = "call_logs"
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Condition-driven page waits with per-wait timing metrics.
+Each wait polls a page condition (feed length, network idle, end-of-list
+sentinel, element in view) and returns as soon as it holds, up to a
+configurable ceiling, instead of sleeping for a fixed time.
+"""
+
+import time
+from typing import Dict, Optional, Callable
+
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+
+
+# Maximum seconds each named wait may block before giving up
+WAIT_CEILINGS = {
+    'page_ready': 5.0,  # Maps shell loaded and search box present
+    'results': 6.0,  # First result cards rendered after submitting a search
+    'feed_growth': 4.0,  # New cards appended after scrolling the results panel
+    'network_idle': 2.0,  # No resource responses for NETWORK_IDLE_MS
+    'map_update': 2.0,  # Map tiles/results settled after a zoom
+    'element_in_view': 1.0,  # Card scrolled into the viewport for a screenshot
+}
+
+POLL_INTERVAL = 0.1
+NETWORK_IDLE_MS = 500
+
+FEED_LENGTH_SCRIPT = """
+var feed = document.querySelector("[role='feed']");
+return feed ? feed.querySelectorAll("a[href*='/maps/place/']").length : 0;
+"""
+
+# Identifies what the feed currently shows, so a wait can tell a replaced feed from the old one
+FEED_STATE_SCRIPT = """
+var feed = document.querySelector("[role='feed']");
+if (!feed) { return ''; }
+var links = feed.querySelectorAll("a[href*='/maps/place/']");
+return links.length ? links.length + '|' + links[0].href + '|' + links[links.length - 1].href : '';
+"""
+
+END_OF_LIST_SCRIPT = """
+var feed = document.querySelector("[role='feed']");
+var pane = feed ? (feed.closest("[role='main']") || feed.parentElement) : document.body;
+if (pane.querySelector('span.HlvSq')) {
+    return true;
+}
+var text = pane.innerText || '';
+return text.indexOf("reached the end of the list") >= 0;
+"""
+
+# The resource timing buffer holds 250 entries by default and then silently drops new ones,
+# which would freeze the last response time and make a busy page look idle. Each poll folds
+# the entries into a running maximum and clears the buffer (also when it fills between polls).
+NETWORK_IDLE_SCRIPT = """
+if (document.readyState !== 'complete' && document.readyState !== 'interactive') {
+    return 0;
+}
+var state = window.__leadloqNetworkIdle;
+if (!state) {
+    state = window.__leadloqNetworkIdle = {lastResponse: 0};
+    state.drain = function () {
+        var entries = performance.getEntriesByType('resource');
+        for (var i = 0; i < entries.length; i++) {
+            state.lastResponse = Math.max(state.lastResponse, entries[i].responseEnd);
+        }
+        performance.clearResourceTimings();
+    };
+    performance.addEventListener('resourcetimingbufferfull', state.drain);
+}
+state.drain();
+return performance.now() - state.lastResponse;
+"""
+
+ELEMENT_IN_VIEW_SCRIPT = """
+var rect = arguments[0].getBoundingClientRect();
+return rect.top >= 0 && rect.bottom <= (window.innerHeight || document.documentElement.clientHeight);
+"""
+
+
+class PageWaiter:
+    """Polls page conditions with per-wait ceilings and records how long each wait took"""
+
+    def __init__(self, driver, ceilings: Optional[Dict[str, float]] = None):
+        self.driver = driver
+        self.ceilings = dict(WAIT_CEILINGS)
+        self.metrics = {}
+        self.configure(ceilings)
+
+    def configure(self, ceilings: Optional[Dict[str, float]]):
+        """Override ceilings for some or all named waits"""
+        if ceilings:
+            self.ceilings.update({name: float(seconds) for name, seconds in ceilings.items()})
+
+    def wait_for(self, name: str, condition: Callable, ceiling: Optional[float] = None) -> bool:
+        """
+        Poll condition(driver) until it is truthy or the ceiling for name is hit.
+
+        Returns:
+            True if the condition held, False if the wait timed out
+        """
+        timeout = ceiling if ceiling is not None else self.ceilings.get(name, WAIT_CEILINGS['network_idle'])
+        start = time.perf_counter()
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=POLL_INTERVAL).until(condition)
+            satisfied = True
+        except TimeoutException:
+            satisfied = False
+        self._record(name, time.perf_counter() - start, satisfied)
+        return satisfied
+
+    def _record(self, name: str, elapsed: float, satisfied: bool):
+        stats = self.metrics.setdefault(name, {'count': 0, 'timeouts': 0, 'total_seconds': 0.0, 'max_seconds': 0.0})
+        stats['count'] += 1
+        stats['total_seconds'] += elapsed
+        stats['max_seconds'] = max(stats['max_seconds'], elapsed)
+        if not satisfied:
+            stats['timeouts'] += 1
+
+    def get_metrics(self) -> Dict[str, Dict[str, float]]:
+        """Per-wait count, timeouts, total/avg/max seconds"""
+        return {
+            name: {
+                'count': stats['count'],
+                'timeouts': stats['timeouts'],
+                'total_seconds': round(stats['total_seconds'], 3),
+                'avg_seconds': round(stats['total_seconds'] / stats['count'], 3),
+                'max_seconds': round(stats['max_seconds'], 3),
+            }
+            for name, stats in self.metrics.items()
+        }
+
+    def total_wait_seconds(self) -> float:
+        return round(sum(stats['total_seconds'] for stats in self.metrics.values()), 3)
+
+    # Page conditions
+
+    def feed_length(self) -> int:
+        """Number of place links currently in the results feed"""
+        try:
+            return int(self.driver.execute_script(FEED_LENGTH_SCRIPT) or 0)
+        except Exception:
+            return 0
+
+    def feed_state(self) -> str:
+        """Card count plus first and last place link of the feed ('' when there is none)"""
+        try:
+            return self.driver.execute_script(FEED_STATE_SCRIPT) or ""
+        except Exception:
+            return ""
+
+    def is_end_of_list(self) -> bool:
+        """True once Maps shows the "You've reached the end of the list" sentinel"""
+        try:
+            return bool(self.driver.execute_script(END_OF_LIST_SCRIPT))
+        except Exception:
+            return False
+
+    def is_network_idle(self) -> bool:
+        """True when no resource has finished loading for NETWORK_IDLE_MS"""
+        try:
+            return (self.driver.execute_script(NETWORK_IDLE_SCRIPT) or 0) >= NETWORK_IDLE_MS
+        except Exception:
+            return True
+
+    # Named waits
+
+    def wait_for_page_ready(self) -> bool:
+        """Wait for the Maps shell and its search box after navigation"""
+        return self.wait_for('page_ready', lambda d: d.execute_script(
+            "return document.readyState !== 'loading' && !!document.getElementById('searchboxinput');"
+        ))
+
+    def wait_for_results(self, name: str = 'results', previous_state: Optional[str] = None) -> bool:
+        """Wait for at least one result card (or a single-place page / end sentinel) after a search.
+
+        When the search replaces a feed that is already on screen (e.g. an expansion), pass the
+        old feed_state() so the wait holds only once the feed has changed.
+        """
+        def results_loaded(driver):
+            if previous_state is not None and self.feed_state() == previous_state:
+                return False
+            return self.feed_length() > 0 or self.is_end_of_list()
+        
+        return self.wait_for(name, results_loaded)
+
+    def wait_for_feed_growth(self, previous_length: int) -> bool:
+        """Wait for the feed to grow past previous_length, or for the end-of-list sentinel"""
+        return self.wait_for('feed_growth', lambda d: self.feed_length() > previous_length or self.is_end_of_list())
+
+    def wait_for_network_idle(self, name: str = 'network_idle') -> bool:
+        """Wait until the page stops loading resources"""
+        return self.wait_for(name, lambda d: self.is_network_idle())
+
+    def wait_for_element_in_view(self, element) -> bool:
+        """Wait for a smooth scrollIntoView to bring element fully into the viewport"""
+        return self.wait_for('element_in_view', lambda d: d.execute_script(ELEMENT_IN_VIEW_SCRIPT, element))
@@ -144,77 +144,46 @@ class PageSpeedService:
         print(f"test_lead_website called for lead_id: {lead_id}")
         logger.info(f"test_lead_website called for lead_id: {lead_id}")
         
-        db = SessionLocal()
         try:
-            lead = db.query(Lead).filter(Lead.id == lead_id).first()
+            # Read what the test needs, then release the session: the API calls take up to a minute
+            db = SessionLocal()
+            try:
+                lead = db.query(Lead).filter(Lead.id == lead_id).first()
+                website_url = lead.website_url if lead else None
+                business_name = lead.business_name if lead else None
+            finally:
+                db.close()
+            
             if not lead:
                 logger.error(f"Lead {lead_id} not found")
                 return {'error': 'Lead not found'}
             
-            if not lead.website_url:
+            if not website_url:
                 logger.error(f"Lead {lead_id} has no website")
                 return {'error': 'Lead has no website'}
             
-            logger.info(f"Testing website: {lead.website_url}")
-            print(f"Testing website: {lead.website_url}")
+            logger.info(f"Testing website: {website_url}")
+            print(f"Testing website: {website_url}")
             
             # Run both mobile and desktop tests in parallel
-            mobile_task = asyncio.create_task(self.test_website(lead.website_url, 'mobile'))
-            desktop_task = asyncio.create_task(self.test_website(lead.website_url, 'desktop'))
+            mobile_task = asyncio.create_task(self.test_website(website_url, 'mobile'))
+            desktop_task = asyncio.create_task(self.test_website(website_url, 'desktop'))
             
             mobile_results, desktop_results = await asyncio.gather(mobile_task, desktop_task)
             
-            # Update lead with results
-            has_error = False
-            error_messages = []
-            
-            if 'error' not in mobile_results:
-                lead.pagespeed_mobile_score = mobile_results['performance_score']
-                lead.pagespeed_mobile_performance = mobile_results['performance_score'] / 100.0
-                lead.pagespeed_accessibility_score = mobile_results['accessibility_score']
-                lead.pagespeed_best_practices_score = mobile_results['best_practices_score']
-                lead.pagespeed_seo_score = mobile_results['seo_score']
-                
-                # Store detailed metrics
-                metrics = mobile_results['metrics']
-                lead.pagespeed_first_contentful_paint = metrics['first_contentful_paint']
-                lead.pagespeed_largest_contentful_paint = metrics['largest_contentful_paint']
-                lead.pagespeed_total_blocking_time = metrics['total_blocking_time']
-                lead.pagespeed_cumulative_layout_shift = metrics['cumulative_layout_shift']
-                lead.pagespeed_speed_index = metrics['speed_index']
-                lead.pagespeed_time_to_interactive = metrics['time_to_interactive']
-            else:
-                has_error = True
-                error_messages.append(f"Mobile: {mobile_results.get('error', 'Unknown error')}")
-            
-            if 'error' not in desktop_results:
-                lead.pagespeed_desktop_score = desktop_results['performance_score']
-                lead.pagespeed_desktop_performance = desktop_results['performance_score'] / 100.0
-            else:
-                has_error = True
-                error_messages.append(f"Desktop: {desktop_results.get('error', 'Unknown error')}")
-            
-            # Store error if any tests failed
-            if has_error:
-                lead.pagespeed_test_error = " | ".join(error_messages)
-                logger.warning(f"PageSpeed test had errors for {lead_id}: {lead.pagespeed_test_error}")
-            else:
-                lead.pagespeed_test_error = None  # Clear any previous error
-            
             # Save screenshot if available
-            screenshot_path = None
+            screenshot_filename = None
             screenshot_data = mobile_results.get('screenshot_data') or desktop_results.get('screenshot_data')
             if screenshot_data:
                 try:
                     import base64
-                    import os
                     
                     # Create screenshots directory if it doesn't exist
                     screenshots_dir = '/app/website_screenshots' if os.getenv('USE_DOCKER') else './website_screenshots'
                     os.makedirs(screenshots_dir, exist_ok=True)
                     
                     # Generate filename
-                    safe_name = "".join(c for c in lead.business_name if c.isalnum() or c in (' ', '-', '_')).rstrip()[:20]
+                    safe_name = "".join(c for c in business_name if c.isalnum() or c in (' ', '-', '_')).rstrip()[:20]
                     screenshot_filename = f"website_{lead_id}_{safe_name}.png"
                     screenshot_path = os.path.join(screenshots_dir, screenshot_filename)
                     
@@ -222,38 +191,74 @@ class PageSpeedService:
                     image_data = base64.b64decode(screenshot_data.split(',')[1] if ',' in screenshot_data else screenshot_data)
                     with open(screenshot_path, 'wb') as f:
                         f.write(image_data)
-                    
-                    # Store relative path in database
-                    lead.website_screenshot_path = screenshot_filename
                     logger.info(f"✅ Saved website screenshot: {screenshot_filename}")
                 except Exception as e:
+                    screenshot_filename = None
                     logger.error(f"Failed to save screenshot: {str(e)}")
             
-            # Set test timestamp
-            lead.pagespeed_tested_at = datetime.utcnow()
-            
-            # Handle errors
-            if 'error' in mobile_results and 'error' in desktop_results:
-                lead.pagespeed_test_error = f"Mobile: {mobile_results['error']}, Desktop: {desktop_results['error']}"
-            elif 'error' in mobile_results:
-                lead.pagespeed_test_error = f"Mobile: {mobile_results['error']}"
-            elif 'error' in desktop_results:
-                lead.pagespeed_test_error = f"Desktop: {desktop_results['error']}"
-            else:
-                lead.pagespeed_test_error = None
-            
-            # Add timeline entry
-            timeline_entry = LeadTimelineEntry(
-                id=f"{lead_id}_{datetime.utcnow().timestamp()}",
-                lead_id=lead_id,
-                type=TimelineEntryType.NOTE,
-                title="PageSpeed Test Completed",
-                description=f"Mobile Score: {mobile_results.get('performance_score', 'N/A')}, Desktop Score: {desktop_results.get('performance_score', 'N/A')}",
-                created_at=datetime.utcnow()
-            )
-            db.add(timeline_entry)
+            def save_results(db):
+                """Store the scores on the lead; runs on the single database writer"""
+                lead = db.query(Lead).filter(Lead.id == lead_id).first()
+                if not lead:
+                    return None
+                
+                # Update lead with results
+                if 'error' not in mobile_results:
+                    lead.pagespeed_mobile_score = mobile_results['performance_score']
+                    lead.pagespeed_mobile_performance = mobile_results['performance_score'] / 100.0
+                    lead.pagespeed_accessibility_score = mobile_results['accessibility_score']
+                    lead.pagespeed_best_practices_score = mobile_results['best_practices_score']
+                    lead.pagespeed_seo_score = mobile_results['seo_score']
+                    
+                    # Store detailed metrics
+                    metrics = mobile_results['metrics']
+                    lead.pagespeed_first_contentful_paint = metrics['first_contentful_paint']
+                    lead.pagespeed_largest_contentful_paint = metrics['largest_contentful_paint']
+                    lead.pagespeed_total_blocking_time = metrics['total_blocking_time']
+                    lead.pagespeed_cumulative_layout_shift = metrics['cumulative_layout_shift']
+                    lead.pagespeed_speed_index = metrics['speed_index']
+                    lead.pagespeed_time_to_interactive = metrics['time_to_interactive']
+                
+                if 'error' not in desktop_results:
+                    lead.pagespeed_desktop_score = desktop_results['performance_score']
+                    lead.pagespeed_desktop_performance = desktop_results['performance_score'] / 100.0
+                
+                # Store relative path in database
+                if screenshot_filename:
+                    lead.website_screenshot_path = screenshot_filename
+                
+                # Set test timestamp
+                lead.pagespeed_tested_at = datetime.utcnow()
+                
+                # Handle errors
+                if 'error' in mobile_results and 'error' in desktop_results:
+                    lead.pagespeed_test_error = f"Mobile: {mobile_results['error']}, Desktop: {desktop_results['error']}"
+                elif 'error' in mobile_results:
+                    lead.pagespeed_test_error = f"Mobile: {mobile_results['error']}"
+                elif 'error' in desktop_results:
+                    lead.pagespeed_test_error = f"Desktop: {desktop_results['error']}"
+                else:
+                    lead.pagespeed_test_error = None
+                
+                # Add timeline entry
+                timeline_entry = LeadTimelineEntry(
+                    id=f"{lead_id}_{datetime.utcnow().timestamp()}",
+                    lead_id=lead_id,
+                    type=TimelineEntryType.NOTE,
+                    title="PageSpeed Test Completed",
+                    description=f"Mobile Score: {mobile_results.get('performance_score', 'N/A')}, Desktop Score: {desktop_results.get('performance_score', 'N/A')}",
+                    created_at=datetime.utcnow()
+                )
+                db.add(timeline_entry)
+                return {'test_error': lead.pagespeed_test_error}
             
-            db.commit()
+            from async_database import run_db_write
+            saved = await run_db_write(save_results)
+            if saved is None:
+                logger.error(f"Lead {lead_id} was deleted during its PageSpeed test")
+                return {'error': 'Lead not found'}
+            if saved['test_error']:
+                logger.warning(f"PageSpeed test had errors for {lead_id}: {saved['test_error']}")
             
             # Broadcast PageSpeed update via WebSocket
             try:
@@ -264,7 +269,7 @@ class PageSpeedService:
                     data={
                         "mobile_score": mobile_results.get('performance_score'),
                         "desktop_score": desktop_results.get('performance_score'),
-                        "has_error": bool(lead.pagespeed_test_error)
+                        "has_error": bool(saved['test_error'])
                     }
                 ))
             except Exception as e:
@@ -280,8 +285,6 @@ class PageSpeedService:
         except Exception as e:
             logger.error(f"Error testing lead {lead_id}: {str(e)}")
             return {'error': str(e)}
-        finally:
-            db.close()
     
     async def test_multiple_leads(self, lead_ids: List[str], max_concurrent: int = 5) -> List[Dict[str, Any]]:
         """Test multiple leads with rate limiting"""
@@ -345,9 +348,10 @@ class PageSpeedService:
                                     description=f"Lead automatically deleted due to PageSpeed score ({lead.pagespeed_mobile_score}) exceeding threshold ({max_pagespeed_score})",
                                     created_at=datetime.now()
                                 )
-                                db.add(timeline_entry)
-                                db.commit()
-                                db.close()  # Close the current session before calling delete_lead_by_id
+                                db.close()  # Close the read session; writes go through the single database writer
+                                lead_deleted = True  # Mark that we've already closed the db
+                                from lead_writer import run_write
+                                run_write(lambda write_db: write_db.add(timeline_entry))
                                 
                                 # Broadcast deletion via WebSocket BEFORE deleting
                                 try:
@@ -18,6 +18,9 @@ from selenium.webdriver.chrome.options import Options
 from schemas import BrowserAutomationRequest
 from job_management import update_job_status, add_job_log, job_statuses
 from browser_automation import BrowserAutomation
+from browser_pool import get_browser_pool
+from search_tiling import TilePlanner
+from tab_multiplexer import TabbedBrowserGroup, tabs_per_browser_from_env
 
 
 class ParallelJobExecutor:
@@ -29,7 +32,10 @@ class ParallelJobExecutor:
         self.active_jobs = {}
         self.job_queue = queue.Queue()
         self.selenium_hub_url = os.getenv('SELENIUM_HUB_URL', 'http://selenium-hub:4444/wd/hub')
-        print(f"🔧 ParallelJobExecutor initialized with max_workers={max_workers}")
+        # Child jobs share Chrome sessions tab by tab instead of one ~300-500 MB Chrome each
+        self.tabs_per_browser = tabs_per_browser_from_env()
+        self.tab_group = TabbedBrowserGroup(self.tabs_per_browser, get_browser_pool()) if self.tabs_per_browser > 1 else None
+        print(f"🔧 ParallelJobExecutor initialized with max_workers={max_workers}, tabs_per_browser={self.tabs_per_browser}")
         
     def create_multi_location_jobs(self, 
                                  industries: List[str], 
@@ -76,7 +82,18 @@ class ParallelJobExecutor:
                     recent_review_months=base_params.get('recent_review_months', 24),
                     enable_pagespeed=enable_pagespeed_value,
                     max_pagespeed_score=max_pagespeed_score_value,
-                    max_runtime_minutes=base_params.get('max_runtime_minutes', 30)
+                    max_runtime_minutes=base_params.get('max_runtime_minutes', 30),
+                    extraction_mode=base_params.get('extraction_mode', 'element'),
+                    website_discovery=base_params.get('website_discovery', 'click'),
+                    incremental_feed=base_params.get('incremental_feed', False),
+                    pipelined_scroll=base_params.get('pipelined_scroll', False),
+                    prune_feed=base_params.get('prune_feed', False),
+                    recycle_after_businesses=base_params.get('recycle_after_businesses'),
+                    recycle_memory_mb=base_params.get('recycle_memory_mb'),
+                    wait_ceilings=base_params.get('wait_ceilings'),
+                    blocking_profile=base_params.get('blocking_profile'),
+                    skip_known_places=base_params.get('skip_known_places', True),
+                    tiled_search=base_params.get('tiled_search', False)
                 )
                 
                 # Log the parameters for this job
@@ -188,7 +205,8 @@ class ParallelJobExecutor:
                             leads_found=0)
             
             # Create browser automation instance - always use headless for parallel jobs
-            automation = BrowserAutomation(job_id=job_id, headless=True)
+            automation = BrowserAutomation(job_id=job_id, headless=True, browser_pool=get_browser_pool(),
+                                           tab_group=self.tab_group)
             
             # Connect to the shared Selenium Grid (no container spawning)
             if not automation.setup_browser():
@@ -197,17 +215,7 @@ class ParallelJobExecutor:
             add_job_log(job_id, "✅ Connected to Selenium Grid browser session")
             
             # Perform the search
-            results = automation.search_google_maps(
-                query=params.query,
-                limit=params.limit,
-                min_rating=params.min_rating,
-                min_reviews=params.min_reviews,
-                requires_website=params.requires_website,
-                recent_review_months=params.recent_review_months,
-                enable_pagespeed=params.enable_pagespeed,
-                max_pagespeed_score=params.max_pagespeed_score,
-                max_runtime_minutes=params.max_runtime_minutes
-            )
+            results = automation.search_google_maps(**params.search_kwargs(params.query, job_id))
             
             # Clean up browser session
             automation.close()
@@ -242,6 +250,55 @@ class ParallelJobExecutor:
                 "error": str(e)
             }
     
+    def execute_tiled_search(self, job_id: str, params: BrowserAutomationRequest, query: str,
+                             automation: BrowserAutomation) -> List[Dict[str, Any]]:
+        """Search one location with several browsers pulling tiles from a shared planner"""
+        planner = TilePlanner(query, lead_limit=params.limit)
+        workers = max(1, params.tile_workers)
+        add_job_log(job_id, f"🧩 Tiled search with {workers} browser sessions")
+
+        def run_worker(index: int) -> List[Dict[str, Any]]:
+            worker_automation = automation
+            if index > 0:
+                # Secondary workers start once worker 0 has laid out the tiles
+                if not planner.wait_for_origin() or planner.stop_reason:
+                    return []
+                worker_automation = BrowserAutomation(job_id=job_id, headless=True, browser_pool=get_browser_pool())
+                if not worker_automation.setup_browser():
+                    add_job_log(job_id, f"⚠️ Tile worker {index} could not start a browser session")
+                    return []
+            try:
+                search_kwargs = dict(params.search_kwargs(query, job_id), tiled_search=True, tile_planner=planner)
+                if index > 0 and search_kwargs["recording_dir"]:
+                    # Each worker records its own feed states
+                    search_kwargs["recording_dir"] += f"/worker_{index}"
+                return worker_automation.search_google_maps(**search_kwargs)
+            except Exception as e:
+                add_job_log(job_id, f"❌ Tile worker {index} failed: {str(e)}")
+                if index == 0:
+                    planner.stop("first tile worker failed")
+                return []
+            finally:
+                # Worker 0 borrows the caller's session; the caller closes it
+                if index > 0:
+                    worker_automation.close()
+
+        # Dedicated threads so tile workers never wait behind queued parallel jobs
+        with ThreadPoolExecutor(max_workers=workers) as tile_executor:
+            futures = [tile_executor.submit(run_worker, index) for index in range(workers)]
+            worker_results = [future.result() for future in futures]
+
+        results, seen = [], set()
+        for business in (business for batch in worker_results for business in batch):
+            key = business.get("url") or business.get("name")
+            if key in seen:
+                continue
+            seen.add(key)
+            results.append(business)
+        coverage = planner.get_coverage()
+        add_job_log(job_id, f"🧩 Tiled search finished: {coverage['tiles_searched']}/{coverage['tiles_total']} tiles, "
+                            f"{len(results)} businesses ({coverage['stop_reason']})")
+        return results[:params.limit]
     
     def get_grid_status(self) -> Dict[str, Any]:
         """Get status of Selenium Grid"""
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Process-wide seen-set of Google place IDs already stored as leads.
+A bloom filter answers "definitely new" without touching the exact set; hits
+are confirmed against an exact set loaded from leads.profile_url, so a known
+business can be skipped before any extraction work is done on its card.
+"""
+
+import math
+import time
+import hashlib
+import threading
+from typing import Optional, Iterable
+
+from business_extractor_utils import BusinessExtractorUtils
+
+
+class BloomFilter:
+    """Fixed-size bloom filter over strings (double hashing on blake2b)"""
+
+    def __init__(self, capacity: int = 200_000, error_rate: float = 0.01):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, value: str):
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, value: str):
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+class PlaceSeenSet:
+    """Bloom filter plus exact set of place IDs, loaded from the leads table"""
+
+    def __init__(self, max_age_seconds: int = 600):
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        self._bloom = BloomFilter()
+        self._exact = set()
+        self.loaded_at = None
+        self.stats = {"checks": 0, "bloom_negatives": 0, "known": 0}
+
+    def load(self, profile_urls: Optional[Iterable[str]] = None) -> int:
+        """(Re)build from leads.profile_url, or from the given URLs; returns the number of place IDs"""
+        if profile_urls is None:
+            profile_urls = self._load_profile_urls()
+        place_ids = {BusinessExtractorUtils.get_place_id(url) for url in profile_urls}
+        place_ids.discard(None)
+
+        # Size the filter with headroom so leads added between reloads keep the error rate down
+        bloom = BloomFilter(capacity=max(200_000, len(place_ids) * 2))
+        for place_id in place_ids:
+            bloom.add(place_id)
+
+        with self._lock:
+            self._bloom = bloom
+            self._exact = place_ids
+            self.loaded_at = time.time()
+        print(f"🧠 Place seen-set loaded: {len(place_ids)} known place IDs")
+        return len(place_ids)
+
+    def _load_profile_urls(self):
+        from database import SessionLocal
+        from models import Lead
+        db = SessionLocal()
+        try:
+            rows = db.query(Lead.profile_url).filter(Lead.profile_url.isnot(None)).yield_per(5000)
+            return [row[0] for row in rows]
+        finally:
+            db.close()
+
+    def refresh_if_stale(self):
+        """Reload when never loaded or older than max_age_seconds (picks up deletes and other writers)"""
+        if self.loaded_at is None or time.time() - self.loaded_at > self.max_age_seconds:
+            try:
+                self.load()
+            except Exception as e:
+                print(f"⚠️ Could not load place seen-set: {str(e)}")
+
+    def add(self, place_id: Optional[str]):
+        if not place_id:
+            return
+        with self._lock:
+            if place_id not in self._exact:
+                self._exact.add(place_id)
+                self._bloom.add(place_id)
+
+    def add_url(self, profile_url: Optional[str]):
+        self.add(BusinessExtractorUtils.get_place_id(profile_url))
+
+    def contains(self, place_id: Optional[str]) -> bool:
+        """True only if the place is known; bloom misses never touch the exact set"""
+        if not place_id:
+            return False
+        with self._lock:
+            self.stats["checks"] += 1
+            if place_id not in self._bloom:
+                self.stats["bloom_negatives"] += 1
+                return False
+            known = place_id in self._exact
+            if known:
+                self.stats["known"] += 1
+            return known
+
+    def __len__(self):
+        return len(self._exact)
+
+
+_place_seen_set: Optional[PlaceSeenSet] = None
+_seen_set_lock = threading.Lock()
+
+
+def get_place_seen_set() -> PlaceSeenSet:
+    """Shared seen-set for all scraper threads"""
+    global _place_seen_set
+    with _seen_set_lock:
+        if _place_seen_set is None:
+            _place_seen_set = PlaceSeenSet()
+        return _place_seen_set
@@ -10,6 +10,10 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selector_stats import get_selector_stats
+
+
+MAX_TIMESTAMPS_CHECKED = 10
 
 
 class ReviewDateChecker:
@@ -208,8 +212,10 @@ class ReviewDateChecker:
             ]
             
             timestamps = []
+            selector_stats = get_selector_stats()
             
-            for selector in timestamp_selectors:
+            # Selectors that found timestamps before go first; stop once there are enough to check
+            for selector in selector_stats.ordered("review_timestamp", "place_page", timestamp_selectors):
                 try:
                     if selector.startswith("//") or "contains" in selector:
                         elements = driver.find_elements(By.XPATH, selector.replace(":contains", "[contains(text()"))
@@ -217,7 +223,10 @@ class ReviewDateChecker:
                         elements = driver.find_elements(By.CSS_SELECTOR, selector)
                     timestamps.extend(elements)
                 except:
-                    continue
+                    elements = []
+                selector_stats.record("review_timestamp", "place_page", selector, bool(elements))
+                if len(timestamps) >= MAX_TIMESTAMPS_CHECKED:
+                    break
             
             if not timestamps:
                 print(f"    ⚠️ No review timestamps found")
@@ -228,7 +237,7 @@ class ReviewDateChecker:
             cutoff_date = datetime.now() - timedelta(days=months_threshold * 30)
             most_recent_date = None
             
-            for element in timestamps[:10]:  # Check first 10
+            for element in timestamps[:MAX_TIMESTAMPS_CHECKED]:
                 try:
                     text = element.text.lower().strip()
                     if not text:
@@ -11,6 +11,7 @@ import uuid
 from ..schemas import BrowserAutomationRequest, JobResponse
 from ..services.job_service import JobService
 from ..job_management import job_statuses, get_all_jobs, get_job_by_id, cancel_job
+from ..job_logger import get_job_logs as read_job_logs
 from ..auth.dependencies import get_current_user
 from ..models import User
 
@@ -64,11 +65,11 @@ async def cancel_job_endpoint(job_id: str, current_user: User = Depends(get_curr
 
 
 @router.get("/{job_id}/logs")
-async def get_job_logs(job_id: str, current_user: User = Depends(get_current_user)):
-    """Get logs for a specific job."""
+async def get_job_logs(job_id: str, since_seq: int = 0, current_user: User = Depends(get_current_user)):
+    """Get logs for a specific job (entries after since_seq)."""
     if job_id not in job_statuses:
         raise HTTPException(status_code=404, detail="Job not found")
-    return {"logs": job_statuses[job_id].get("logs", [])}
+    return {"logs": read_job_logs(job_id, since_seq=since_seq)}
 
 
 @router.get("/{job_id}/screenshots")
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, field_serializer, ConfigDict
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal
 from datetime import datetime, timezone
 
 
@@ -26,6 +26,49 @@ class BrowserAutomationRequest(BaseModel):
     enable_pagespeed: bool = False  # Enable automatic PageSpeed testing for leads with websites
     max_pagespeed_score: Optional[int] = None  # Maximum acceptable PageSpeed score (leads above this are filtered out, required if enable_pagespeed is True)
     max_runtime_minutes: Optional[int] = 30  # Maximum runtime in minutes before job auto-stops (default 30 minutes)
+    extraction_mode: Literal["element", "snapshot", "script"] = "element"  # Listing extraction: "element" = per-card WebDriver calls, "snapshot" = parse feed HTML offline, "script" = one execute_script per batch
+    website_discovery: Literal["click", "http"] = "click"  # Compact-listing websites: "click" = click into each card, "http" = fetch the batch's place pages concurrently (snapshot/script modes)
+    incremental_feed: bool = False  # Only fetch cards added since the last scroll (in-page MutationObserver)
+    pipelined_scroll: bool = False  # Start loading the next page of results while the current batch is processed
+    prune_feed: bool = False  # Remove processed result cards from the page so long scrolls keep a small DOM
+    recycle_after_businesses: Optional[int] = None  # Restart the browser mid-job (resuming from a checkpoint) after this many businesses; None = BROWSER_RECYCLE_BUSINESSES
+    recycle_memory_mb: Optional[int] = None  # ...or once renderer memory crosses this many MB; None = BROWSER_RECYCLE_MEMORY_MB
+    wait_ceilings: Optional[Dict[str, float]] = None  # Override page wait ceilings in seconds, e.g. {"feed_growth": 2.5} (see page_waits.WAIT_CEILINGS)
+    blocking_profile: Optional[str] = None  # Network request blocking: "none", "tracking", "standard" (+fonts, map tiles) or "lean" (+images); None = BROWSER_BLOCKING_PROFILE env (default "tracking")
+    skip_known_places: bool = True  # Skip businesses whose Google place ID is already a lead, before extracting them
+    tiled_search: bool = False  # Cover the location tile by tile (search_tiling) instead of zooming out
+    tile_workers: int = 1  # Browsers searching tiles of the same location concurrently (tiled_search only)
+    checkpoint: bool = True  # Periodically save search progress so a crashed or retried job resumes instead of restarting
+    record_session: bool = False  # Save each feed state under recordings/<job_id> for offline replay (scrape_replay.py)
+
+    def search_kwargs(self, query: str, job_id: Optional[str] = None) -> Dict[str, Any]:
+        """Keyword arguments for BrowserAutomation.search_google_maps, so every job runner forwards the same options"""
+        return dict(
+            query=query,
+            limit=self.limit,
+            min_rating=self.min_rating,
+            min_reviews=self.min_reviews,
+            requires_website=self.requires_website,
+            recent_review_months=self.recent_review_months,
+            min_photos=self.min_photos,
+            min_description_length=self.min_description_length,
+            enable_pagespeed=self.enable_pagespeed,
+            max_pagespeed_score=self.max_pagespeed_score,
+            max_runtime_minutes=self.max_runtime_minutes,
+            extraction_mode=self.extraction_mode,
+            website_discovery=self.website_discovery,
+            incremental_feed=self.incremental_feed,
+            pipelined_scroll=self.pipelined_scroll,
+            prune_feed=self.prune_feed,
+            recycle_after_businesses=self.recycle_after_businesses,
+            recycle_memory_mb=self.recycle_memory_mb,
+            wait_ceilings=self.wait_ceilings,
+            blocking_profile=self.blocking_profile,
+            skip_known_places=self.skip_known_places,
+            tiled_search=self.tiled_search,
+            checkpoint=self.checkpoint,
+            recording_dir=f"recordings/{job_id}" if self.record_session and job_id else None,
+        )
 
 
 class JobResponse(BaseModel):
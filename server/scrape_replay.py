@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+End-to-end scrape replay against recorded Maps sessions.
+
+A recording is a directory of feed states captured by MapsSearchEngine
+(recording_dir) - feed_01.html is the initial results feed, each later file
+is the feed after another scroll. ReplayServer serves a Maps-like page from
+those states over local HTTP: pressing Enter in #searchboxinput loads the
+first state and scrolling the results pane appends the cards added in the
+next one, so search_google_maps runs its normal scroll, filter, screenshot
+and save path without network access. Replayed leads are saved to a throwaway
+ReplayDatabase instead of the leads table, so a replay never adds leads or
+queues PageSpeed tests.
+
+The server binds to 127.0.0.1 unless a host is given. When Selenium runs in
+another container (docker-compose), pass --host 0.0.0.0 so the node can reach
+it on the container IP (or REPLAY_PUBLIC_HOST).
+
+Usage:
+    python scrape_replay.py recordings/plumbers-omaha --limit 20
+    python scrape_replay.py --fixtures --limit 5    # replay google-maps-reference as one session
+    python scrape_replay.py --fixtures --host 0.0.0.0   # Selenium node in another container
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import socket
+import argparse
+import tempfile
+import threading
+from pathlib import Path
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import List, Dict, Any, Optional
+
+from bs4 import BeautifulSoup
+
+sys.path.append(str(Path(__file__).parent))
+
+REFERENCE_DIR = Path(__file__).parent / "google-maps-reference"
+FIXTURE_STATES = [
+    "standard-business-listing-with-website.html",
+    "standard-business-listing-without-website.html",
+    "compact-business-listing.html",
+    "standard-businesses_website-nowebsite-website.html",
+]
+
+SHELL_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Maps Replay</title>
+<style>
+  body { margin: 0; font-family: sans-serif; }
+  #searchboxinput { width: 400px; margin: 8px; }
+  #pane { height: 900px; width: 420px; overflow-y: auto; }
+  [role='feed'] > div { min-height: 140px; border-bottom: 1px solid #ddd; }
+</style>
+</head>
+<body>
+<input id="searchboxinput" aria-label="Search Google Maps" role="combobox">
+<div id="pane" role="main">
+  <div role="feed" aria-label="Results"></div>
+  <div id="end-sentinel"></div>
+</div>
+<script>
+  var totalStates = __TOTAL_STATES__;
+  var nextState = 1;
+  var loading = false;
+  var pane = document.getElementById('pane');
+  var feed = document.querySelector("[role='feed']");
+  var sentinel = document.getElementById('end-sentinel');
+  function loadNextState() {
+    if (loading || nextState > totalStates) { return; }
+    loading = true;
+    fetch('/feed/' + nextState).then(function(response) { return response.text(); }).then(function(html) {
+      feed.insertAdjacentHTML('beforeend', html);
+      nextState++;
+      loading = false;
+      if (nextState > totalStates) { sentinel.textContent = "You've reached the end of the list."; }
+    });
+  }
+  document.getElementById('searchboxinput').addEventListener('keydown', function(event) {
+    if (event.key === 'Enter') { feed.innerHTML = ''; nextState = 1; loadNextState(); }
+  });
+  pane.addEventListener('scroll', function() {
+    if (pane.scrollTop + pane.clientHeight >= pane.scrollHeight - 200) { loadNextState(); }
+  });
+</script>
+</body>
+</html>
+"""
+
+
+def _feed_children(html: str) -> List[str]:
+    """Top-level cards of a recorded feed state, in feed order"""
+    soup = BeautifulSoup(html, "html.parser")
+    container = soup.select_one("[role='feed']") or soup
+    return [str(child) for child in container.find_all(recursive=False)]
+
+
+class ReplaySession:
+    """Recorded feed states for one search, converted to per-scroll card deltas"""
+
+    def __init__(self, feed_states: List[str], query: Optional[str] = None):
+        self.query = query
+        self.deltas = []
+        cards = []
+        for html in feed_states:
+            children = _feed_children(html)
+            # Recorded states are cumulative (Google appends to the feed); serve only the new cards
+            if cards and children[:len(cards)] == cards:
+                delta = children[len(cards):]
+            else:
+                delta = children
+            self.deltas.append(delta)
+            cards.extend(delta)
+
+    @classmethod
+    def from_directory(cls, recording_dir) -> "ReplaySession":
+        """Load a recording written by MapsSearchEngine.recording_dir"""
+        recording_dir = Path(recording_dir)
+        manifest_path = recording_dir / "manifest.json"
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8")) if manifest_path.exists() else {}
+        state_files = manifest.get("feed_states") or sorted(p.name for p in recording_dir.glob("feed_*.html"))
+        if not state_files:
+            raise ValueError(f"No feed states found in {recording_dir}")
+        states = [(recording_dir / name).read_text(encoding="utf-8") for name in state_files]
+        return cls(states, manifest.get("query"))
+
+    @classmethod
+    def from_fixtures(cls) -> "ReplaySession":
+        """Build a session from the google-maps-reference fixtures, one scroll per fixture"""
+        states = [(REFERENCE_DIR / name).read_text(encoding="utf-8") for name in FIXTURE_STATES]
+        return cls(states, "painters in Omaha, NE")
+
+
+LOOPBACK_HOST = "127.0.0.1"
+
+
+class ReplayDatabase:
+    """Throwaway SQLite database that replayed leads are saved to.
+
+    Saves run the production path (save_lead_to_database through a LeadWriter:
+    dedupe, normalized names, batched commits) against a temporary file, so a
+    replay exercises it without touching the leads table or queueing PageSpeed.
+    """
+
+    def __init__(self):
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+        from database import Base
+        from lead_writer import LeadWriter
+
+        self._directory = tempfile.mkdtemp(prefix="leadloq-replay-")
+        self.engine = create_engine(f"sqlite:///{Path(self._directory) / 'replay.db'}",
+                                    connect_args={"check_same_thread": False})
+        Base.metadata.create_all(self.engine)
+        self.session_factory = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.writer = LeadWriter(self.session_factory)
+
+    def save_lead(self, business_details, job_id=None, enable_pagespeed=False, max_pagespeed_score=None):
+        """Engine save hook: save_lead_to_database on this database's writer"""
+        from database_operations import save_lead_to_database
+        return save_lead_to_database(business_details, job_id, enable_pagespeed, max_pagespeed_score,
+                                     writer=self.writer)
+
+    def leads(self) -> List[Dict[str, Any]]:
+        """Saved lead rows, oldest first"""
+        from models import Lead
+
+        db = self.session_factory()
+        try:
+            return [
+                {"id": lead.id, "business_name": lead.business_name, "normalized_name": lead.normalized_name,
+                 "location": lead.location, "has_website": lead.has_website, "timeline_entries": len(lead.timeline_entries)}
+                for lead in db.query(Lead).order_by(Lead.created_at)
+            ]
+        finally:
+            db.close()
+
+    def close(self):
+        self.writer.close()
+        self.engine.dispose()
+        shutil.rmtree(self._directory, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class ReplayServer:
+    """Serves a ReplaySession over local HTTP in a background thread"""
+
+    def __init__(self, session: ReplaySession, host: str = LOOPBACK_HOST, port: int = 0, public_host: Optional[str] = None):
+        self.session = session
+        self.requests_served = 0
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._thread = None
+        if host == LOOPBACK_HOST:
+            self.public_host = public_host or LOOPBACK_HOST
+        else:
+            self.public_host = public_host or os.environ.get("REPLAY_PUBLIC_HOST") or self._default_public_host()
+
+    @staticmethod
+    def _default_public_host() -> str:
+        """Address the Selenium node can reach this process on (container IP under Docker)"""
+        try:
+            return socket.gethostbyname(socket.gethostname())
+        except OSError:
+            return "127.0.0.1"
+
+    @property
+    def port(self) -> int:
+        return self._httpd.server_address[1]
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.public_host}:{self.port}/maps"
+
+    def _make_handler(self):
+        server = self
+
+        class ReplayRequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests_served += 1
+                if self.path.startswith("/maps"):
+                    body = SHELL_PAGE.replace("__TOTAL_STATES__", str(len(server.session.deltas)))
+                    return self._send(200, body)
+                if self.path.startswith("/feed/"):
+                    try:
+                        index = int(self.path.split("/")[2]) - 1
+                        cards = server.session.deltas[index]
+                    except (ValueError, IndexError):
+                        return self._send(404, "")
+                    return self._send(200, "\n".join(cards))
+                return self._send(404, "")
+
+            def _send(self, status, body):
+                payload = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass  # Keep replay runs quiet
+
+        return ReplayRequestHandler
+
+    def start(self) -> "ReplayServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        print(f"🎞️ Replay server listening on {self.url} ({len(self.session.deltas)} feed states)")
+        return self
+
+    def stop(self):
+        if self._thread:  # shutdown() waits for serve_forever, so it would hang on a server never started
+            self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+def run_replay_job(session: ReplaySession, query: Optional[str] = None, limit: int = 20,
+                   min_rating: float = 0.0, min_reviews: int = 0, requires_website=None,
+                   extraction_mode: str = "element", host: str = LOOPBACK_HOST) -> Dict[str, Any]:
+    """Run a full search_google_maps job against a replayed session and report throughput.
+
+    Leads are saved to a throwaway ReplayDatabase, and PageSpeed stays off.
+    """
+    from browser_automation import BrowserAutomation
+    from browser_recycling import RecyclePolicy
+    from job_management import create_job, update_job_status
+
+    job_id = create_job(None)
+    query = query or session.query or "replay"
+    update_job_status(job_id, "running", message="Replaying recorded session...", query=query, limit=limit)
+
+    with ReplayDatabase() as replay_db, ReplayServer(session, host=host) as server:
+        automation = BrowserAutomation(job_id=job_id, headless=True)
+        if not automation.setup_browser():
+            raise Exception("Failed to setup browser")
+        automation.search_engine.maps_url = server.url
+        automation.search_engine.save_lead = replay_db.save_lead
+        # RecyclePolicy() with no limits is disabled; a recycled browser would get a fresh engine without the replay URL or save hook
+        automation.recycle_policy = RecyclePolicy()
+        try:
+            start_time = time.time()
+            results = automation.search_google_maps(
+                query=query, limit=limit, min_rating=min_rating, min_reviews=min_reviews,
+                requires_website=requires_website, enable_click_through=False,
+                extraction_mode=extraction_mode, skip_known_places=False, checkpoint=False
+            )
+            elapsed = time.time() - start_time
+        finally:
+            automation.close()
+        saved_leads = replay_db.leads()
+
+    update_job_status(job_id, "completed", len(results), limit, "Replay completed")
+    return {
+        "job_id": job_id,
+        "leads": len(results),
+        "leads_saved": len(saved_leads),
+        "elapsed_seconds": round(elapsed, 2),
+        "leads_per_minute": round(len(results) / (elapsed / 60), 2) if elapsed else None,
+        "feed_states": len(session.deltas),
+        "requests_served": server.requests_served,
+    }
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Replay a recorded Maps session through MapsSearchEngine")
+    arg_parser.add_argument("recording_dir", nargs="?", help="Directory written by MapsSearchEngine.recording_dir")
+    arg_parser.add_argument("--fixtures", action="store_true", help="Replay the google-maps-reference fixtures")
+    arg_parser.add_argument("--query", help="Override the recorded query")
+    arg_parser.add_argument("--limit", type=int, default=20)
+    arg_parser.add_argument("--extraction-mode", default="element", choices=["element", "snapshot", "script"])
+    arg_parser.add_argument("--host", default=LOOPBACK_HOST,
+                            help="Bind address (0.0.0.0 when Selenium runs in another container)")
+    args = arg_parser.parse_args()
+
+    if args.fixtures:
+        replay_session = ReplaySession.from_fixtures()
+    elif args.recording_dir:
+        replay_session = ReplaySession.from_directory(args.recording_dir)
+    else:
+        arg_parser.error("Provide a recording directory or --fixtures")
+
+    report = run_replay_job(replay_session, query=args.query, limit=args.limit,
+                            extraction_mode=args.extraction_mode, host=args.host)
+    print(json.dumps(report, indent=2))
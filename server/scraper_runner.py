@@ -10,6 +10,10 @@ from schemas import BrowserAutomationRequest
 from job_management import update_job_status, add_job_log, job_threads
 
 
+# In-process restarts after a browser crash; each one resumes from the search checkpoint
+MAX_RESUME_ATTEMPTS = 2
+
+
 def run_scraper(job_id: str, params: BrowserAutomationRequest):
     """Run the browser automation scraper for a job"""
     
@@ -32,7 +36,10 @@ def run_scraper(job_id: str, params: BrowserAutomationRequest):
             
             # Import and initialize browser automation
             from browser_automation import BrowserAutomation
-            automation = BrowserAutomation(job_id=job_id)
+            from browser_pool import get_browser_pool
+            # Pooled sessions are headless, so only headless jobs can lease one
+            browser_pool = get_browser_pool() if params.headless and not params.use_profile else None
+            automation = BrowserAutomation(job_id=job_id, browser_pool=browser_pool)
             
             # Setup browser
             if not automation.setup_browser():
@@ -49,16 +56,26 @@ def run_scraper(job_id: str, params: BrowserAutomationRequest):
             # Perform the search
             update_job_status(job_id, "running", message="Searching for businesses...")
             
-            results = automation.search_google_maps(
-                query=search_query,
-                limit=params.limit,
-                min_rating=params.min_rating,
-                min_reviews=params.min_reviews,
-                requires_website=params.requires_website,
-                recent_review_months=params.recent_review_months,
-                enable_pagespeed=params.enable_pagespeed,
-                max_pagespeed_score=params.max_pagespeed_score
-            )
+            if params.tiled_search and params.tile_workers > 1:
+                # Extra browsers pull tiles from the same planner; this session is worker 0
+                from parallel_job_executor import parallel_executor
+                results = parallel_executor.execute_tiled_search(job_id, params, search_query, automation)
+            else:
+                search_kwargs = params.search_kwargs(search_query, job_id)
+                results = automation.search_google_maps(**search_kwargs)
+                
+                # A dead browser leaves a checkpoint behind - restart it and carry on from there
+                resume_attempts = 0
+                while automation.session_lost and resume_attempts < MAX_RESUME_ATTEMPTS:
+                    if job_statuses.get(job_id, {}).get("status") == "cancelled":
+                        break
+                    resume_attempts += 1
+                    add_job_log(job_id, f"♻️ Browser session lost - restarting and resuming ({resume_attempts}/{MAX_RESUME_ATTEMPTS})")
+                    automation.close()
+                    automation = BrowserAutomation(job_id=job_id, browser_pool=browser_pool)
+                    if not automation.setup_browser():
+                        raise Exception("Failed to restart browser for resume")
+                    results = automation.search_google_maps(**search_kwargs)
             
             # Clean up
             automation.close()
@@ -11,12 +11,14 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
+from page_waits import PageWaiter
 
 
 class ScreenshotManager:
-    def __init__(self, driver, job_id=None):
+    def __init__(self, driver, job_id=None, page_waiter=None):
         self.driver = driver
         self.job_id = job_id
+        self.waiter = page_waiter or PageWaiter(driver)
         self.screenshots_dir = Path("screenshots")
         self.screenshots_dir.mkdir(exist_ok=True)
 
@@ -59,7 +61,7 @@ class ScreenshotManager:
                     "arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});",
                     business_element
                 )
-                time.sleep(0.5)
+                self.waiter.wait_for_element_in_view(business_element)
                 
                 # Get original style to restore later
                 original_style = business_element.get_attribute('style')
@@ -71,8 +73,6 @@ class ScreenshotManager:
                     arguments[0].style.boxShadow = '0 0 15px rgba(255, 107, 53, 0.5)';
                     arguments[0].style.backgroundColor = 'rgba(255, 107, 53, 0.1)';
                 """, business_element)
-                
-                time.sleep(0.5)  # Brief pause to ensure highlight is applied
             
             # Clean business name for filename
             clean_name = ''.join(c for c in business_name if c.isalnum() or c in (' ', '-', '_')).strip()
@@ -10,25 +10,59 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from job_management import add_job_log
+from job_logger import DEBUG, INFO, get_job_logger
+from page_waits import PageWaiter
+
+
+# Non-blocking: starts the lazy load of the next results page and returns the current card count
+PREFETCH_SCROLL_SCRIPT = """
+var feed = document.querySelector("[role='feed']");
+if (!feed) { return -1; }
+var length = feed.querySelectorAll("a[href*='/maps/place/']").length;
+feed.scrollTop = feed.scrollHeight;
+return length;
+"""
+
+
+# Trailing location phrases, tried in order; the first one that matches is removed
+LOCATION_PATTERNS = [
+    r'\s+in\s+[^,]+(?:,\s*[^,]+)*$',  # "in City, State" at end
+    r'\s+near\s+[^,]+(?:,\s*[^,]+)*$',  # "near City, State" at end  
+    r',\s*[^,]+(?:,\s*[^,]+)*$',  # ", City, State" at end
+    r'\s+[A-Z][a-z]+(?:,\s*[A-Z]{2})?$',  # "CityName" or "CityName, ST" at end
+]
+
+
+def strip_location_from_query(query):
+    """The query without its trailing location, or the query unchanged if none is found"""
+    for pattern in LOCATION_PATTERNS:
+        new_query = re.sub(pattern, '', query, flags=re.IGNORECASE).strip()
+        if new_query and new_query != query:
+            return new_query
+    return query
 
 
 class SearchAreaManager:
-    def __init__(self, driver, job_id=None):
+    def __init__(self, driver, job_id=None, page_waiter=None):
         self.driver = driver
         self.job_id = job_id
+        self.logger = get_job_logger(job_id)
+        self.waiter = page_waiter or PageWaiter(driver)
     
-    def _log(self, message):
-        """Log message to both console and job logs for WebSocket"""
-        print(message)  # Keep console output for debugging
-        if self.job_id:
-            add_job_log(self.job_id, message)
+    def _log(self, message, *args, level=INFO):
+        """Log to the job's ring buffer for WebSocket/log readers (echoed to console unless JOB_LOG_ECHO=0).
+
+        Pass %-style args on hot paths: they are only formatted when the level is kept.
+        """
+        self.logger.log(level, message, *args)
 
     def expand_search_area(self, expansion_number, evaluated_businesses, original_query=None):
         """Expand the search area by modifying query, zooming out, and submitting with Enter"""
         try:
             self._log(f"\n🗺️ Attempting search area expansion #{expansion_number}")
             self._log(f"    📊 Already evaluated {len(evaluated_businesses)} businesses")
+            # The old feed stays on screen until the expanded search replaces it
+            previous_feed_state = self.waiter.feed_state()
             
             # Step 1: Modify the search query to remove location
             if original_query:
@@ -47,10 +81,10 @@ class SearchAreaManager:
                 self._log(f"    ⚠️ Could not zoom out, but continuing with Enter key submission")
             
             # Wait for map to update
-            time.sleep(2)
+            self.waiter.wait_for_network_idle('map_update')
             
             # Step 3: Submit search with Enter/Return key instead of clicking button
-            return self._submit_search_with_enter()
+            return self._submit_search_with_enter(previous_feed_state)
             
         except Exception as e:
             self._log(f"    ❌ Error in search area expansion #{expansion_number}: {str(e)}")
@@ -115,7 +149,6 @@ class SearchAreaManager:
             
             actions.click(map_element)
             actions.send_keys('-')
-            time.sleep(0.5)
             actions.perform()
             
             self._log(f"    ✅ Zoomed out {zoom_steps} steps using keyboard")
@@ -138,7 +171,6 @@ class SearchAreaManager:
                 try:
                     zoom_button = self.driver.find_element(By.CSS_SELECTOR, selector)
                     self.driver.execute_script("arguments[0].click();", zoom_button)
-                    time.sleep(0.5)
                     self._log(f"    ✅ Zoomed out {zoom_steps} times using button: {selector}")
                     return True
                 except:
@@ -190,22 +222,7 @@ class SearchAreaManager:
     def _remove_location_from_query(self, original_query, expansion_number):
         """Remove location from search query for broader search"""
         try:
-            # Common location patterns to remove
-            location_patterns = [
-                r'\s+in\s+[^,]+(?:,\s*[^,]+)*$',  # "in City, State" at end
-                r'\s+near\s+[^,]+(?:,\s*[^,]+)*$',  # "near City, State" at end  
-                r',\s*[^,]+(?:,\s*[^,]+)*$',  # ", City, State" at end
-                r'\s+[A-Z][a-z]+(?:,\s*[A-Z]{2})?$',  # "CityName" or "CityName, ST" at end
-            ]
-            
-            import re
-            modified_query = original_query
-            
-            for pattern in location_patterns:
-                new_query = re.sub(pattern, '', modified_query, flags=re.IGNORECASE).strip()
-                if new_query and new_query != modified_query:
-                    modified_query = new_query
-                    break
+            modified_query = strip_location_from_query(original_query)
             
             # If no location was removed, just return the original query
             if modified_query == original_query:
@@ -246,7 +263,7 @@ class SearchAreaManager:
             self._log(f"    ❌ Error updating search query: {str(e)}")
             return False
 
-    def _submit_search_with_enter(self):
+    def _submit_search_with_enter(self, previous_feed_state=None):
         """Submit the search using Enter/Return key instead of clicking button"""
         try:
             from selenium.webdriver.common.keys import Keys
@@ -269,7 +286,8 @@ class SearchAreaManager:
                     
                     # Wait for results to load
                     self._log(f"    ⏳ Waiting for new results to load...")
-                    time.sleep(3)
+                    self.waiter.wait_for_network_idle()
+                    self.waiter.wait_for_results('expansion_results', previous_feed_state)
                     
                     return True
                 except:
@@ -282,6 +300,22 @@ class SearchAreaManager:
             self._log(f"    ❌ Error submitting search with Enter: {str(e)}")
             return False
 
+    def prefetch_next_page(self):
+        """Scroll the results feed to the bottom without waiting, so Maps starts loading the next page.
+
+        Returns the feed length before the scroll (pass it to PageWaiter.wait_for_feed_growth
+        once the current batch is processed), or None when there is no feed to scroll.
+        """
+        try:
+            length = self.driver.execute_script(PREFETCH_SCROLL_SCRIPT)
+        except Exception as e:
+            self._log("    ⚠️ Could not prefetch next page: %s", str(e)[:100], level=DEBUG)
+            return None
+        if length is None or length < 0:
+            return None
+        self._log("    ⏩ Prefetching next page of results (%s cards loaded)", length, level=DEBUG)
+        return int(length)
+    
     def scroll_results_panel(self):
         """Scroll the results panel to load more businesses"""
         try:
@@ -366,14 +400,16 @@ class SearchAreaManager:
                     new_scroll_position = min(current_scroll + increment, scroll_height - client_height)
                     
                     self._log(f"    🔽 Scrolling from {current_scroll} to {new_scroll_position}")
+                    feed_length = self.waiter.feed_length()
                     
                     # Use simple scrollTop for more reliable scrolling
                     self.driver.execute_script(f"""
                         arguments[0].scrollTop = {new_scroll_position};
                     """, container)
                     
-                    # Wait for new content to load
-                    time.sleep(3)  # Increased wait time
+                    # Wait for new cards (or the end-of-list sentinel) instead of a fixed delay
+                    if self.waiter.wait_for_feed_growth(feed_length):
+                        feed_length = self.waiter.feed_length()
                     
                     # Check if scroll actually happened
                     new_scroll = self.driver.execute_script("return arguments[0].scrollTop;", container)
@@ -385,7 +421,7 @@ class SearchAreaManager:
                         # Send Page Down key to trigger more results
                         from selenium.webdriver.common.keys import Keys
                         container.send_keys(Keys.PAGE_DOWN)
-                        time.sleep(2)
+                        self.waiter.wait_for_feed_growth(feed_length)
                     
                     return True
                     
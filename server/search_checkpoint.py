@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Checkpoint and resume for long-running searches.
+The search engine periodically writes its traversal state (processed element
+IDs, scroll depth, expansions, results so far) to checkpoints/<job_id>.json.
+A retried or restarted job with the same job ID and query restores that
+state, fast-forwards the results feed, and carries on instead of starting over.
+
+Under Docker the checkpoints live on the /app/db volume that every Celery
+worker and celery-beat mount, so a retry picked up by another worker replica
+still finds the checkpoint. A CHECKPOINT_DIR outside a shared volume limits
+resume to the worker that wrote it.
+"""
+
+import os
+import json
+import time
+import threading
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+
+CHECKPOINT_VERSION = 1
+DEFAULT_CHECKPOINT_INTERVAL = 30  # Seconds between checkpoint writes during a search
+MAX_CHECKPOINT_AGE = 24 * 3600  # Older checkpoints are ignored and pruned
+
+
+class CheckpointStore:
+    """JSON checkpoint files, written atomically so a crash mid-write never corrupts one"""
+
+    def __init__(self, directory: str = "checkpoints"):
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+
+    def _path(self, job_id: str) -> Path:
+        return self.directory / f"{job_id}.json"
+
+    def save(self, job_id: str, state: Dict[str, Any]):
+        state = {**state, "version": CHECKPOINT_VERSION, "job_id": job_id, "saved_at": time.time()}
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            temp_path = self._path(job_id).with_suffix(".tmp")
+            with open(temp_path, "w") as f:
+                json.dump(state, f, default=str)
+            os.replace(temp_path, self._path(job_id))
+
+    def load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """The job's checkpoint, or None when missing, unreadable, stale or from another format"""
+        try:
+            with open(self._path(job_id)) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if state.get("version") != CHECKPOINT_VERSION:
+            return None
+        if time.time() - state.get("saved_at", 0) > MAX_CHECKPOINT_AGE:
+            return None
+        return state
+
+    def delete(self, job_id: str):
+        try:
+            self._path(job_id).unlink()
+        except FileNotFoundError:
+            pass
+
+    def prune(self, max_age_seconds: int = MAX_CHECKPOINT_AGE) -> int:
+        """Remove checkpoints of jobs that were never resumed"""
+        removed = 0
+        cutoff = time.time() - max_age_seconds
+        for path in self.directory.glob("*.json"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                continue
+        return removed
+
+
+_checkpoint_store: Optional[CheckpointStore] = None
+_store_lock = threading.Lock()
+
+
+def default_checkpoint_dir() -> str:
+    """CHECKPOINT_DIR, else the shared /app/db volume under Docker, else ./checkpoints"""
+    return os.environ.get("CHECKPOINT_DIR") or ('/app/db/checkpoints' if os.getenv('USE_DOCKER') else 'checkpoints')
+
+
+def get_checkpoint_store() -> CheckpointStore:
+    """Shared store under default_checkpoint_dir()"""
+    global _checkpoint_store
+    with _store_lock:
+        if _checkpoint_store is None:
+            _checkpoint_store = CheckpointStore(default_checkpoint_dir())
+        return _checkpoint_store
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Geographic tiling search planner.
+Splits the area around the initial search viewport into a spiral of
+viewport-sized tiles, hands tiles to one or more search workers, tracks
+coverage and new-lead yield per tile, and stops once yield dries up.
+"""
+
+import re
+import math
+import threading
+from urllib.parse import quote_plus
+from typing import Optional, Dict, List, Any, Tuple
+
+from search_area_manager import strip_location_from_query
+
+
+VIEWPORT_PATTERN = re.compile(r'/@(-?\d+(?:\.\d+)?),(-?\d+(?:\.\d+)?),(\d+(?:\.\d+)?)z')
+
+# Map area covered by one tile, in screen pixels at the tile zoom (results panel excluded)
+TILE_WIDTH_PX = 1000
+TILE_HEIGHT_PX = 800
+
+
+def parse_viewport(url: Optional[str]) -> Optional[Tuple[float, float, float]]:
+    """(lat, lng, zoom) from a Maps URL like .../@41.2565,-95.9345,12z/..."""
+    match = VIEWPORT_PATTERN.search(url or "")
+    if not match:
+        return None
+    return float(match.group(1)), float(match.group(2)), float(match.group(3))
+
+
+def spiral_offsets(max_rings: int) -> List[Tuple[int, int]]:
+    """(row, col) grid offsets from the center outward, ring by ring"""
+    offsets = [(0, 0)]
+    for ring in range(1, max_rings + 1):
+        for col in range(-ring, ring + 1):
+            offsets.append((-ring, col))
+        for row in range(-ring + 1, ring + 1):
+            offsets.append((row, ring))
+        for col in range(ring - 1, -ring - 1, -1):
+            offsets.append((ring, col))
+        for row in range(ring - 1, -ring, -1):
+            offsets.append((row, -ring))
+    return offsets
+
+
+class Tile:
+    """One viewport-sized search area and its coverage"""
+
+    def __init__(self, row: int, col: int, lat: float, lng: float, zoom: float):
+        self.row = row
+        self.col = col
+        self.lat = lat
+        self.lng = lng
+        self.zoom = zoom
+        self.status = "pending"  # pending, searching, done
+        self.evaluated = 0
+        self.new_leads = 0
+
+    @property
+    def ring(self) -> int:
+        return max(abs(self.row), abs(self.col))
+
+    def url(self, maps_url: str, query: str) -> str:
+        return f"{maps_url.rstrip('/')}/search/{quote_plus(query)}/@{self.lat:.6f},{self.lng:.6f},{self.zoom:g}z"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "row": self.row, "col": self.col, "lat": round(self.lat, 6), "lng": round(self.lng, 6),
+            "zoom": self.zoom, "status": self.status, "evaluated": self.evaluated, "new_leads": self.new_leads,
+        }
+
+
+class TilePlanner:
+    """
+    Thread-safe tile scheduler shared by the search workers of one job.
+
+    Tiles are handed out center-first in spiral order. Once `patience`
+    consecutive finished tiles each yield fewer than `min_new_leads` new
+    leads, or the lead limit is reached, no further tiles are scheduled.
+    """
+
+    def __init__(self, query: str, maps_url: str = "https://www.google.com/maps", max_rings: int = 3,
+                 min_new_leads: int = 1, patience: int = 3, lead_limit: Optional[int] = None):
+        self.query = query
+        # The tile viewport sets the area; a location left in the query makes Maps re-center on it
+        self.tile_query = strip_location_from_query(query)
+        self.maps_url = maps_url
+        self.max_rings = max_rings
+        self.min_new_leads = min_new_leads
+        self.patience = patience
+        self.lead_limit = lead_limit
+        self.tiles: List[Tile] = []
+        self.low_yield_streak = 0
+        self.stop_reason = None
+        self._next_index = 0
+        self._reserved = 0
+        self._lock = threading.Lock()
+        self._origin_ready = threading.Event()
+
+    def set_origin(self, lat: float, lng: float, zoom: float) -> Optional[Tile]:
+        """Lay out tiles around the initial viewport; the first caller gets the center tile"""
+        with self._lock:
+            if self.tiles:
+                return None
+            lng_span = 360.0 * TILE_WIDTH_PX / (256 * 2 ** zoom)
+            lat_span = 360.0 * TILE_HEIGHT_PX / (256 * 2 ** zoom) * math.cos(math.radians(lat))
+            for row, col in spiral_offsets(self.max_rings):
+                # Rows grow southwards on screen
+                self.tiles.append(Tile(row, col, lat - row * lat_span, lng + col * lng_span, zoom))
+            center = self.tiles[0]
+            center.status = "searching"
+            self._next_index = 1
+        self._origin_ready.set()
+        return center
+
+    def tile_url(self, tile: Tile) -> str:
+        return tile.url(self.maps_url, self.tile_query)
+
+    def set_origin_from_url(self, url: str) -> Optional[Tile]:
+        viewport = parse_viewport(url)
+        if not viewport:
+            return None
+        return self.set_origin(*viewport)
+
+    def has_origin(self) -> bool:
+        return self._origin_ready.is_set()
+
+    def wait_for_origin(self, timeout: float = 120) -> bool:
+        """Block a secondary worker until the first worker has located the search area"""
+        return self._origin_ready.wait(timeout)
+
+    def stop(self, reason: str):
+        """Stop scheduling tiles and release any workers waiting for the origin"""
+        with self._lock:
+            self.stop_reason = self.stop_reason or reason
+        self._origin_ready.set()
+
+    def record(self, tile: Tile, evaluated: int = 0, new_leads: int = 0):
+        with self._lock:
+            tile.evaluated += evaluated
+            tile.new_leads += new_leads
+
+    def total_new_leads(self) -> int:
+        with self._lock:
+            return sum(tile.new_leads for tile in self.tiles)
+
+    def reserve_lead(self) -> bool:
+        """Claim one lead of the job quota before saving; False once the quota is handed out"""
+        with self._lock:
+            if self.lead_limit is not None and self._reserved >= self.lead_limit:
+                return False
+            self._reserved += 1
+            return True
+
+    def release_lead(self):
+        """Return a claimed lead whose save did not go through"""
+        with self._lock:
+            self._reserved = max(0, self._reserved - 1)
+
+    def limit_reached(self) -> bool:
+        if self.lead_limit is None:
+            return False
+        with self._lock:
+            reserved = self._reserved
+        return max(reserved, self.total_new_leads()) >= self.lead_limit
+
+    def complete(self, tile: Tile):
+        """Mark a tile searched and update the low-yield streak"""
+        with self._lock:
+            tile.status = "done"
+            if tile.new_leads < self.min_new_leads:
+                self.low_yield_streak += 1
+            else:
+                self.low_yield_streak = 0
+
+    def next_tile(self) -> Optional[Tile]:
+        """Next unsearched tile, or None when yield has dropped off or tiles are exhausted"""
+        if self.limit_reached():
+            self.stop_reason = self.stop_reason or "lead limit reached"
+            return None
+        with self._lock:
+            if self.stop_reason:
+                return None
+            if self.low_yield_streak >= self.patience:
+                self.stop_reason = self.stop_reason or (
+                    f"{self.low_yield_streak} consecutive tiles yielded fewer than {self.min_new_leads} new leads"
+                )
+                return None
+            if self._next_index >= len(self.tiles):
+                self.stop_reason = self.stop_reason or "all tiles searched"
+                return None
+            tile = self.tiles[self._next_index]
+            self._next_index += 1
+            tile.status = "searching"
+            return tile
+
+    def get_coverage(self) -> Dict[str, Any]:
+        """Per-tile coverage summary for job status"""
+        with self._lock:
+            done = [tile for tile in self.tiles if tile.status == "done"]
+            return {
+                "tiles_total": len(self.tiles),
+                "tiles_searched": len(done),
+                "new_leads": sum(tile.new_leads for tile in self.tiles),
+                "evaluated": sum(tile.evaluated for tile in self.tiles),
+                "stop_reason": self.stop_reason,
+                "tiles": [tile.to_dict() for tile in self.tiles if tile.status != "pending"],
+            }
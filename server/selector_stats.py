@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Adaptive selector ordering for the extraction chains.
+Each (field, listing type) pair keeps a decaying success score per selector.
+Chains are tried best-score first, so a card usually resolves on its first
+remote call instead of walking the whole fallback list. Every attempt moves
+the score toward 1 (hit) or 0 (miss), so when Google's markup changes the old
+winner keeps missing, decays below the selector that now works, and gives up
+its place without a restart.
+"""
+
+import threading
+from typing import Dict, List, Tuple, Any, Optional
+
+
+DEFAULT_DECAY = 0.8  # Weight kept by the old score on each attempt (lower adapts faster)
+
+
+class SelectorStats:
+    """Per-process success scores for selector chains"""
+
+    def __init__(self, decay: float = DEFAULT_DECAY):
+        self.decay = decay
+        self._scores: Dict[Tuple[str, str], Dict[str, float]] = {}
+        self._counts: Dict[Tuple[str, str], Dict[str, List[int]]] = {}  # selector -> [hits, misses]
+        self._lock = threading.Lock()
+
+    def ordered(self, field: str, listing_type: str, selectors: List[str], fixed_tail: int = 0) -> List[str]:
+        """Selectors best-score first; ties (and never-tried selectors) keep their original order.
+
+        The last `fixed_tail` selectors are broad fallbacks (bare div/span scans) that
+        match almost anything, so they stay at the end instead of being promoted.
+        """
+        ranked, tail = (selectors[:-fixed_tail], selectors[-fixed_tail:]) if fixed_tail else (selectors, [])
+        with self._lock:
+            scores = self._scores.get((field, listing_type))
+            if not scores:
+                return list(selectors)
+            ranked = sorted(ranked, key=lambda s: -scores.get(s, 0.0))  # sorted() is stable
+        return ranked + list(tail)
+
+    def record(self, field: str, listing_type: str, selector: str, hit: bool):
+        key = (field, listing_type)
+        with self._lock:
+            scores = self._scores.setdefault(key, {})
+            scores[selector] = scores.get(selector, 0.0) * self.decay + (1 - self.decay) * (1.0 if hit else 0.0)
+            counts = self._counts.setdefault(key, {}).setdefault(selector, [0, 0])
+            counts[0 if hit else 1] += 1
+
+    def record_chain(self, field: str, listing_type: str, tried: List[str], winner: Optional[str]):
+        """Record one walk of a chain: every selector tried before the winner missed"""
+        for selector in tried:
+            self.record(field, listing_type, selector, selector == winner)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                f"{field}/{listing_type}": [
+                    {"selector": selector, "score": round(self._scores[(field, listing_type)][selector], 3),
+                     "hits": hits, "misses": misses}
+                    for selector, (hits, misses) in sorted(
+                        counts.items(), key=lambda item: -self._scores[(field, listing_type)][item[0]])
+                ]
+                for (field, listing_type), counts in self._counts.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._scores.clear()
+            self._counts.clear()
+
+
+_selector_stats: Optional[SelectorStats] = None
+_stats_lock = threading.Lock()
+
+
+def get_selector_stats() -> SelectorStats:
+    """Shared across every search in the process"""
+    global _selector_stats
+    with _stats_lock:
+        if _selector_stats is None:
+            _selector_stats = SelectorStats()
+        return _selector_stats
@@ -14,6 +14,7 @@ from datetime import datetime
 
 from ..models import Lead, LeadStatus
 from ..database import engine
+from ..lead_writer import run_write
 
 class AdminService:
     """
@@ -26,22 +27,26 @@ class AdminService:
     
     def delete_all_leads(self) -> int:
         """Delete all leads from the database."""
-        count = self.db.query(Lead).count()
-        self.db.query(Lead).delete()
-        self.db.commit()
-        return count
+        def write(db):
+            count = db.query(Lead).count()
+            db.query(Lead).delete()
+            return count
+        
+        return run_write(write)
     
     def delete_mock_leads(self) -> int:
         """Delete mock/test leads identified by specific patterns."""
-        mock_query = self.db.query(Lead).filter(
-            Lead.business_name.like('%MOCK%') |
-            Lead.business_name.like('%TEST%') |
-            Lead.business_name.like('%DEMO%')
-        )
-        count = mock_query.count()
-        mock_query.delete(synchronize_session=False)
-        self.db.commit()
-        return count
+        def write(db):
+            mock_query = db.query(Lead).filter(
+                Lead.business_name.like('%MOCK%') |
+                Lead.business_name.like('%TEST%') |
+                Lead.business_name.like('%DEMO%')
+            )
+            count = mock_query.count()
+            mock_query.delete(synchronize_session=False)
+            return count
+        
+        return run_write(write)
     
     def cleanup_containers(self) -> Dict[str, str]:
         """Clean up Docker containers and resources."""
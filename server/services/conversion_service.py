@@ -11,6 +11,7 @@ from datetime import datetime
 import logging
 
 from ..models import Lead, LeadStatus
+from ..lead_writer import run_write
 
 logger = logging.getLogger(__name__)
 
@@ -49,13 +50,16 @@ class ConversionService:
             Lead.status.in_([LeadStatus.NEW, LeadStatus.INTERESTED])
         ).all()
         
-        scored_count = 0
-        for lead in leads:
-            score = self._calculate_lead_score(lead)
-            lead.conversion_score = score
-            scored_count += 1
+        updates = [
+            {"id": lead.id, "conversion_score": self._calculate_lead_score(lead)}
+            for lead in leads
+        ]
+        scored_count = len(updates)
         
-        self.db.commit()
+        # Scores are committed by the single database writer
+        self.db.rollback()
+        if updates:
+            run_write(lambda db: db.bulk_update_mappings(Lead, updates))
         
         return {
             "total_scored": scored_count,
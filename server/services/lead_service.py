@@ -11,6 +11,7 @@ from datetime import datetime, timedelta
 import logging
 
 from ..models import Lead, LeadTimelineEntry, CallLog
+from ..lead_writer import run_write
 from ..schemas import LeadCreate, LeadUpdate, PaginatedResponse
 
 logger = logging.getLogger(__name__)
@@ -25,6 +26,12 @@ class LeadService:
     def __init__(self, db: Session):
         self.db = db
     
+    def _write(self, write):
+        """Commit write(db) on the single database writer, then end this session's read transaction"""
+        result = run_write(write)
+        self.db.rollback()
+        return result
+    
     def get_paginated_leads(
         self,
         page: int = 1,
@@ -86,34 +93,40 @@ class LeadService:
     
     def create_lead(self, lead_data: LeadCreate) -> Lead:
         """Create a new lead."""
-        lead = Lead(**lead_data.dict())
-        self.db.add(lead)
-        self.db.commit()
-        self.db.refresh(lead)
-        return lead
+        def write(db):
+            lead = Lead(**lead_data.dict())
+            db.add(lead)
+            db.flush()
+            return lead.id
+        
+        return self.get_lead_by_id(self._write(write))
     
     def update_lead(self, lead_id: str, lead_data: LeadUpdate) -> Optional[Lead]:
         """Update an existing lead."""
-        lead = self.get_lead_by_id(lead_id)
-        if not lead:
-            return None
+        def write(db):
+            lead = db.query(Lead).filter(Lead.id == lead_id).first()
+            if not lead:
+                return False
+            
+            for key, value in lead_data.dict(exclude_unset=True).items():
+                setattr(lead, key, value)
+            return True
         
-        for key, value in lead_data.dict(exclude_unset=True).items():
-            setattr(lead, key, value)
-        
-        self.db.commit()
-        self.db.refresh(lead)
-        return lead
+        if not self._write(write):
+            return None
+        return self.get_lead_by_id(lead_id)
     
     def delete_lead(self, lead_id: str) -> bool:
         """Delete a lead and all related data."""
-        lead = self.get_lead_by_id(lead_id)
-        if not lead:
-            return False
+        def write(db):
+            lead = db.query(Lead).filter(Lead.id == lead_id).first()
+            if not lead:
+                return False
+            
+            db.delete(lead)
+            return True
         
-        self.db.delete(lead)
-        self.db.commit()
-        return True
+        return self._write(write)
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get lead statistics grouped by status."""
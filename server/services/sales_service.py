@@ -11,6 +11,7 @@ import uuid
 from datetime import datetime
 
 from ..models import SalesPitch, EmailTemplate, Lead
+from ..lead_writer import run_write
 from ..schemas import (
     SalesPitchCreate, SalesPitchUpdate,
     EmailTemplateCreate, EmailTemplateUpdate
@@ -26,65 +27,72 @@ class SalesService:
     def __init__(self, db: Session):
         self.db = db
     
+    def _write(self, write):
+        """Commit write(db) on the single database writer, then end this session's read transaction"""
+        result = run_write(write)
+        self.db.rollback()
+        return result
+    
     def get_all_pitches(self) -> List[SalesPitch]:
         """Get all sales pitches."""
         return self.db.query(SalesPitch).order_by(SalesPitch.name).all()
     
     def create_pitch(self, pitch_data: SalesPitchCreate) -> SalesPitch:
         """Create a new sales pitch."""
-        pitch = SalesPitch(
-            id=str(uuid.uuid4()),
-            **pitch_data.dict()
-        )
-        self.db.add(pitch)
-        self.db.commit()
-        self.db.refresh(pitch)
-        return pitch
+        pitch_id = str(uuid.uuid4())
+        self._write(lambda db: db.add(SalesPitch(id=pitch_id, **pitch_data.dict())))
+        return self.db.get(SalesPitch, pitch_id)
     
     def update_pitch(
         self, pitch_id: str, pitch_data: SalesPitchUpdate
     ) -> Optional[SalesPitch]:
         """Update an existing sales pitch."""
-        pitch = self.db.query(SalesPitch).filter(
-            SalesPitch.id == pitch_id
-        ).first()
-        if not pitch:
-            return None
-        
-        for key, value in pitch_data.dict(exclude_unset=True).items():
-            setattr(pitch, key, value)
+        def write(db):
+            pitch = db.query(SalesPitch).filter(
+                SalesPitch.id == pitch_id
+            ).first()
+            if not pitch:
+                return False
+            
+            for key, value in pitch_data.dict(exclude_unset=True).items():
+                setattr(pitch, key, value)
+            return True
         
-        self.db.commit()
-        self.db.refresh(pitch)
-        return pitch
+        if not self._write(write):
+            return None
+        return self.db.get(SalesPitch, pitch_id)
     
     def delete_pitch(self, pitch_id: str) -> bool:
         """Delete a sales pitch."""
-        pitch = self.db.query(SalesPitch).filter(
-            SalesPitch.id == pitch_id
-        ).first()
-        if not pitch:
-            return False
+        def write(db):
+            pitch = db.query(SalesPitch).filter(
+                SalesPitch.id == pitch_id
+            ).first()
+            if not pitch:
+                return False
+            
+            db.delete(pitch)
+            return True
         
-        self.db.delete(pitch)
-        self.db.commit()
-        return True
+        return self._write(write)
     
     def assign_pitch_to_lead(
         self, lead_id: str, pitch_id: str
     ) -> bool:
         """Assign a sales pitch to a lead."""
-        lead = self.db.query(Lead).filter(Lead.id == lead_id).first()
-        pitch = self.db.query(SalesPitch).filter(
-            SalesPitch.id == pitch_id
-        ).first()
-        
-        if not lead or not pitch:
-            return False
+        def write(db):
+            lead = db.query(Lead).filter(Lead.id == lead_id).first()
+            pitch = db.query(SalesPitch).filter(
+                SalesPitch.id == pitch_id
+            ).first()
+            
+            if not lead or not pitch:
+                return False
+            
+            lead.sales_pitch_id = pitch_id
+            return True
         
-        lead.sales_pitch_id = pitch_id
-        self.db.commit()
-        return True
+        return self._write(write)
     
     def get_pitch_analytics(self) -> Dict[str, Any]:
         """Get analytics for sales pitches."""
@@ -122,40 +130,46 @@ class SalesService:
         self, template_data: EmailTemplateCreate
     ) -> EmailTemplate:
         """Create a new email template."""
-        template = EmailTemplate(
-            id=str(uuid.uuid4()),
+        template_id = str(uuid.uuid4())
+        self._write(lambda db: db.add(EmailTemplate(
+            id=template_id,
             **template_data.dict(),
             created_at=datetime.utcnow()
-        )
-        self.db.add(template)
-        self.db.commit()
-        self.db.refresh(template)
-        return template
+        )))
+        return self.get_template_by_id(template_id)
     
     def update_template(
         self, template_id: str, template_data: EmailTemplateUpdate
     ) -> Optional[EmailTemplate]:
         """Update an email template."""
-        template = self.get_template_by_id(template_id)
-        if not template:
-            return None
-        
-        for key, value in template_data.dict(exclude_unset=True).items():
-            setattr(template, key, value)
+        def write(db):
+            template = db.query(EmailTemplate).filter(
+                EmailTemplate.id == template_id
+            ).first()
+            if not template:
+                return False
+            
+            for key, value in template_data.dict(exclude_unset=True).items():
+                setattr(template, key, value)
+            return True
         
-        self.db.commit()
-        self.db.refresh(template)
-        return template
+        if not self._write(write):
+            return None
+        return self.get_template_by_id(template_id)
     
     def delete_template(self, template_id: str) -> bool:
         """Delete an email template."""
-        template = self.get_template_by_id(template_id)
-        if not template:
-            return False
+        def write(db):
+            template = db.query(EmailTemplate).filter(
+                EmailTemplate.id == template_id
+            ).first()
+            if not template:
+                return False
+            
+            db.delete(template)
+            return True
         
-        self.db.delete(template)
-        self.db.commit()
-        return True
+        return self._write(write)
     
     def initialize_default_templates(self) -> int:
         """Initialize default email templates."""
@@ -172,19 +186,20 @@ class SalesService:
             }
         ]
         
-        count = 0
-        for template_data in defaults:
-            existing = self.db.query(EmailTemplate).filter(
-                EmailTemplate.name == template_data["name"]
-            ).first()
-            if not existing:
-                template = EmailTemplate(
-                    id=str(uuid.uuid4()),
-                    **template_data,
-                    created_at=datetime.utcnow()
-                )
-                self.db.add(template)
-                count += 1
+        def write(db):
+            count = 0
+            for template_data in defaults:
+                existing = db.query(EmailTemplate).filter(
+                    EmailTemplate.name == template_data["name"]
+                ).first()
+                if not existing:
+                    template = EmailTemplate(
+                        id=str(uuid.uuid4()),
+                        **template_data,
+                        created_at=datetime.utcnow()
+                    )
+                    db.add(template)
+                    count += 1
+            return count
         
-        self.db.commit()
-        return count
\ No newline at end of file
+        return self._write(write)
\ No newline at end of file
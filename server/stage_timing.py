@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Per-stage timing spans for the scrape pipeline.
+Spans nest: a span's self time excludes its child spans, so the flame summary
+shows where a job actually spent its time (Google, Selenium, SQLite or
+screenshots) while the inclusive totals stay available per stage.
+"""
+
+import time
+import threading
+from collections import OrderedDict, deque
+from contextlib import contextmanager, nullcontext
+from typing import Optional, Dict, Any
+
+
+STAGES = (
+    "search",
+    "scroll",
+    "extract",
+    "click_through",
+    "review_check",
+    "screenshot",
+    "blacklist_check",
+    "save",
+)
+
+# Durations kept per stage for percentiles; counts and totals stay exact beyond this
+MAX_SAMPLES_PER_STAGE = 5000
+MAX_TRACKED_JOBS = 50
+
+
+def _percentile(sorted_values, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class StageTimer:
+    """Collects span durations for one job; safe to share between worker threads"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stages: Dict[str, Dict[str, Any]] = {}
+        self.started_at = time.time()
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def span(self, stage: str):
+        """Time a block; time spent in nested spans is excluded from this span's self time"""
+        stack = self._stack()
+        frame = [0.0]  # Child time accumulated while this span is open
+        stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            stack.pop()
+            if stack:
+                stack[-1][0] += duration
+            self.record(stage, duration, duration - frame[0])
+
+    def record(self, stage: str, duration: float, self_time: Optional[float] = None):
+        with self._lock:
+            entry = self._stages.get(stage)
+            if entry is None:
+                entry = self._stages[stage] = {
+                    "count": 0, "total": 0.0, "self": 0.0, "max": 0.0,
+                    "samples": deque(maxlen=MAX_SAMPLES_PER_STAGE),
+                }
+            entry["count"] += 1
+            entry["total"] += duration
+            entry["self"] += duration if self_time is None else self_time
+            entry["max"] = max(entry["max"], duration)
+            entry["samples"].append(duration)
+
+    def get_profile(self) -> Dict[str, Any]:
+        """Per-stage count, inclusive/self seconds and p50/p95/max in milliseconds"""
+        with self._lock:
+            snapshot = {stage: dict(entry, samples=sorted(entry["samples"])) for stage, entry in self._stages.items()}
+        instrumented = sum(entry["self"] for entry in snapshot.values())
+        stages = {}
+        for stage, entry in snapshot.items():
+            stages[stage] = {
+                "count": entry["count"],
+                "total_seconds": round(entry["total"], 3),
+                "self_seconds": round(entry["self"], 3),
+                "share_pct": round(100 * entry["self"] / instrumented, 1) if instrumented else 0.0,
+                "p50_ms": round(_percentile(entry["samples"], 0.50) * 1000, 1),
+                "p95_ms": round(_percentile(entry["samples"], 0.95) * 1000, 1),
+                "max_ms": round(entry["max"] * 1000, 1),
+            }
+        return {
+            "wall_seconds": round(time.time() - self.started_at, 3),
+            "instrumented_seconds": round(instrumented, 3),
+            "stages": stages,
+        }
+
+    def get_flame_summary(self) -> Dict[str, Any]:
+        """Stages ordered by self time - the compact view embedded in job status"""
+        profile = self.get_profile()
+        ranked = sorted(profile["stages"].items(), key=lambda item: item[1]["self_seconds"], reverse=True)
+        return {
+            "instrumented_seconds": profile["instrumented_seconds"],
+            "stages": [
+                {"stage": stage, "self_seconds": stats["self_seconds"], "share_pct": stats["share_pct"]}
+                for stage, stats in ranked
+            ],
+        }
+
+
+_job_timers: "OrderedDict[str, StageTimer]" = OrderedDict()
+_timers_lock = threading.Lock()
+_active = threading.local()
+
+
+def get_job_timer(job_id: str) -> StageTimer:
+    """Timer shared by every engine working on the job (e.g. tile workers)"""
+    with _timers_lock:
+        timer = _job_timers.get(job_id)
+        if timer is None:
+            timer = _job_timers[job_id] = StageTimer()
+            while len(_job_timers) > MAX_TRACKED_JOBS:
+                _job_timers.popitem(last=False)
+        return timer
+
+
+def get_job_profile(job_id: str) -> Optional[Dict[str, Any]]:
+    with _timers_lock:
+        timer = _job_timers.get(job_id)
+    return timer.get_profile() if timer else None
+
+
+def get_job_flame_summary(job_id: str) -> Optional[Dict[str, Any]]:
+    with _timers_lock:
+        timer = _job_timers.get(job_id)
+    return timer.get_flame_summary() if timer else None
+
+
+def set_active_timer(timer: Optional[StageTimer]):
+    """Bind a timer to the current thread so helpers outside the engine can add spans"""
+    _active.timer = timer
+
+
+def span(stage: str):
+    """Span on the current thread's active timer; a no-op when none is bound"""
+    timer = getattr(_active, "timer", None)
+    return timer.span(stage) if timer else nullcontext()
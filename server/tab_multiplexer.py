@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Multi-tab concurrency inside one Chrome session.
+Several scrape jobs share one WebDriver session, each in its own tab and
+thread. Every WebDriver command (including WebElement calls, which route
+through driver.execute) is serialized and preceded by a switch to the
+calling thread's tab when needed. Waits and polling sleeps run outside the
+lock, and page loads are started without blocking, so one tab works while
+another waits on the network.
+"""
+
+import os
+import time
+import threading
+from typing import Optional, Dict, Any, List, Tuple
+
+from selenium.webdriver.remote.command import Command
+
+from browser_setup import BrowserSetup
+
+
+# Page load polling for navigations started by a tab (keeps the command lock free while loading)
+NAVIGATION_TIMEOUT = 30
+NAVIGATION_POLL_INTERVAL = 0.1
+
+START_NAVIGATION_SCRIPT = "window.__tabNavigationPending = true; window.location.assign(arguments[0]);"
+NAVIGATION_DONE_SCRIPT = "return !window.__tabNavigationPending && document.readyState === 'complete';"
+
+
+class TabMultiplexer:
+    """Routes each thread's WebDriver commands to that thread's tab"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self._lock = threading.RLock()
+        self._original_execute = driver.execute
+        self._thread_tabs: Dict[int, str] = {}
+        self._current_handle = self._original_execute(Command.W3C_GET_CURRENT_WINDOW_HANDLE)["value"]
+        self.main_handle = self._current_handle
+        self.stats = {"commands": 0, "tab_switches": 0, "navigations": 0}
+        # WebElements call their parent driver's execute, so this covers element commands too
+        driver.execute = self._execute
+
+    def _switch_to(self, handle: str):
+        if handle != self._current_handle:
+            self._original_execute(Command.SWITCH_TO_WINDOW, {"handle": handle})
+            self._current_handle = handle
+            self.stats["tab_switches"] += 1
+
+    def _run(self, handle: Optional[str], command: str, params: Optional[Dict[str, Any]] = None):
+        with self._lock:
+            if handle:
+                self._switch_to(handle)
+            self.stats["commands"] += 1
+            response = self._original_execute(command, params)
+            if command == Command.SWITCH_TO_WINDOW:
+                self._current_handle = (params or {}).get("handle", self._current_handle)
+            return response
+
+    def _execute(self, command: str, params: Optional[Dict[str, Any]] = None):
+        handle = self._thread_tabs.get(threading.get_ident())
+        if command == Command.GET and handle:
+            return self._navigate(handle, params["url"])
+        return self._run(handle, command, params)
+
+    def _navigate(self, handle: str, url: str):
+        """driver.get() for a tab: start the load, then poll for it without holding the lock"""
+        self.stats["navigations"] += 1
+        self._run(handle, Command.W3C_EXECUTE_SCRIPT, {"script": START_NAVIGATION_SCRIPT, "args": [url]})
+        deadline = time.time() + NAVIGATION_TIMEOUT
+        while time.time() < deadline:
+            time.sleep(NAVIGATION_POLL_INTERVAL)
+            try:
+                if self._run(handle, Command.W3C_EXECUTE_SCRIPT, {"script": NAVIGATION_DONE_SCRIPT, "args": []})["value"]:
+                    break
+            except Exception:
+                continue  # Document swapped mid-script; poll again
+        return {"value": None}
+
+    def open_tab(self) -> str:
+        """Open a blank tab and bind it to the calling thread"""
+        with self._lock:
+            handle = self._original_execute(Command.NEW_WINDOW, {"type": "tab"})["value"]["handle"]
+        self._thread_tabs[threading.get_ident()] = handle
+        return handle
+
+    def close_tab(self, handle: str):
+        """Close a tab and unbind every thread that was using it"""
+        for ident, bound in list(self._thread_tabs.items()):
+            if bound == handle:
+                del self._thread_tabs[ident]
+        with self._lock:
+            try:
+                self._switch_to(handle)
+                self._original_execute(Command.CLOSE)
+            finally:
+                self._current_handle = None
+                self._switch_to(self.main_handle)
+
+    def restore(self):
+        """Put the driver's own execute back (before the session is reused or closed)"""
+        self.driver.execute = self._original_execute
+
+
+class TabbedBrowser:
+    """One Chrome session hosting up to `max_tabs` concurrent jobs"""
+
+    def __init__(self, max_tabs: int = 3, browser_pool=None, headless: bool = True):
+        self.max_tabs = max_tabs
+        self.browser_pool = browser_pool
+        self.headless = headless
+        self.pooled_session = None
+        self.browser_setup = None
+        self.multiplexer = None
+        self.open_handles: List[str] = []
+
+    @property
+    def driver(self):
+        return self.multiplexer.driver if self.multiplexer else None
+
+    def start(self) -> "TabbedBrowser":
+        if self.browser_pool:
+            self.pooled_session = self.browser_pool.lease()
+            self.browser_setup = self.pooled_session.browser_setup
+        else:
+            self.browser_setup = BrowserSetup(use_profile=False, headless=self.headless)
+            self.browser_setup.setup_browser()
+        self.multiplexer = TabMultiplexer(self.browser_setup.driver)
+        return self
+
+    def has_capacity(self) -> bool:
+        return len(self.open_handles) < self.max_tabs
+
+    def open_tab(self) -> str:
+        handle = self.multiplexer.open_tab()
+        self.open_handles.append(handle)
+        # Request blocking is per tab in CDP; the tab is bound now, so this applies to it
+        blocker = getattr(self.browser_setup, "network_blocker", None)
+        if blocker:
+            blocker.apply()
+        return handle
+
+    def close_tab(self, handle: str):
+        if handle in self.open_handles:
+            self.open_handles.remove(handle)
+        try:
+            self.multiplexer.close_tab(handle)
+        except Exception as e:
+            print(f"⚠️ Could not close browser tab: {str(e)}")
+
+    def shutdown(self):
+        self.multiplexer.restore()
+        if self.pooled_session:
+            self.browser_pool.release(self.pooled_session)
+            self.pooled_session = None
+        else:
+            self.browser_setup.close()
+
+
+class TabbedBrowserGroup:
+    """Hands out tabs, starting another Chrome session only when every session is full"""
+
+    def __init__(self, tabs_per_browser: int = 3, browser_pool=None, headless: bool = True):
+        self.tabs_per_browser = max(1, tabs_per_browser)
+        self.browser_pool = browser_pool
+        self.headless = headless
+        self.browsers: List[TabbedBrowser] = []
+        self._lock = threading.Lock()
+        self.stats = {"browsers_started": 0, "tabs_opened": 0}
+
+    def acquire_tab(self) -> Tuple[TabbedBrowser, str]:
+        """Open a tab for the calling thread; returns the hosting browser and the tab handle"""
+        with self._lock:
+            browser = next((b for b in self.browsers if b.has_capacity()), None)
+            if browser is None:
+                browser = TabbedBrowser(self.tabs_per_browser, self.browser_pool, self.headless).start()
+                self.browsers.append(browser)
+                self.stats["browsers_started"] += 1
+            handle = browser.open_tab()
+            self.stats["tabs_opened"] += 1
+            return browser, handle
+
+    def release_tab(self, browser: TabbedBrowser, handle: str):
+        """Close the tab; the Chrome session goes once its last tab is closed"""
+        with self._lock:
+            browser.close_tab(handle)
+            if browser.open_handles:
+                return
+            self.browsers.remove(browser)
+        browser.shutdown()
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "tabs_per_browser": self.tabs_per_browser,
+                "browsers": len(self.browsers),
+                "open_tabs": sum(len(b.open_handles) for b in self.browsers),
+                **self.stats,
+            }
+
+
+def tabs_per_browser_from_env() -> int:
+    """TABS_PER_BROWSER: concurrent jobs per Chrome session for parallel jobs (1 = one Chrome per job)"""
+    return max(1, int(os.environ.get("TABS_PER_BROWSER", "1")))
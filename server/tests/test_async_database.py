@@ -0,0 +1,106 @@
+"""
+Unit tests for running database work off the event loop.
+Pattern: AAA (Arrange-Act-Assert).
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+import async_database
+from fastapi import HTTPException
+
+from async_database import run_db, run_blocking, run_db_write
+from lead_writer import LeadWriter
+
+
+@pytest.fixture
+def session(monkeypatch):
+    db = Mock()
+    monkeypatch.setattr(async_database, "SessionLocal", Mock(return_value=db))
+    return db
+
+
+class TestRunDb:
+    """run_db hands work a session on a worker thread and always closes it."""
+
+    def test_runs_off_the_loop_thread_and_closes_session(self, session):
+        loop_thread = threading.get_ident()
+
+        result = asyncio.run(run_db(lambda db, x: (db, x, threading.get_ident()), 7))
+
+        assert result[:2] == (session, 7)
+        assert result[2] != loop_thread
+        session.close.assert_called_once()
+
+    def test_errors_propagate_and_session_is_closed(self, session):
+        def broken(db):
+            raise ValueError("bad query")
+
+        with pytest.raises(ValueError):
+            asyncio.run(run_db(broken))
+        session.close.assert_called_once()
+
+    def test_slow_query_does_not_block_other_coroutines(self, session):
+        ticks = []
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.02)
+
+        async def main():
+            await asyncio.gather(run_db(lambda db: time.sleep(0.3)), ticker())
+
+        started = time.monotonic()
+        asyncio.run(main())
+
+        assert len(ticks) == 5
+        assert ticks[-1] - started < 0.25
+
+
+class TestRunBlocking:
+    """run_blocking forwards arguments to self-contained helpers."""
+
+    def test_forwards_args_and_kwargs(self):
+        result = asyncio.run(run_blocking(lambda a, b=None: (a, b), 1, b=2))
+
+        assert result == (1, 2)
+
+
+class TestRunDbWrite:
+    """run_db_write never blocks the loop on the writer's queue and bounds the wait."""
+
+    @pytest.fixture
+    def stalled_writer(self, monkeypatch):
+        release = threading.Event()
+        writer = LeadWriter(Mock(), batch_size=1, flush_interval_ms=1, max_queue=1)
+        monkeypatch.setattr(async_database, "get_lead_writer", lambda: writer)
+        writer.submit(lambda db: release.wait(5))
+        time.sleep(0.05)  # writer thread is now stuck inside the first write
+        yield writer, release
+        release.set()
+        writer.close()
+
+    def test_full_queue_returns_503(self, stalled_writer):
+        writer, _ = stalled_writer
+        writer.submit(lambda db: None)
+
+        with pytest.raises(HTTPException) as busy:
+            asyncio.run(run_db_write(lambda db: None, timeout=0.1))
+
+        assert busy.value.status_code == 503
+
+    def test_timed_out_write_is_dropped(self, stalled_writer):
+        writer, release = stalled_writer
+        late_write = Mock()
+
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(run_db_write(late_write, timeout=0.1))
+        release.set()
+        writer.close()
+
+        late_write.assert_not_called()
@@ -0,0 +1,94 @@
+"""
+Unit tests for the in-memory blacklist index.
+Pattern: AAA (Arrange-Act-Assert).
+"""
+
+from unittest.mock import Mock, patch
+
+from blacklist_manager import BlacklistIndex, BlacklistManager, normalize_business_name
+
+
+ENTRIES = [
+    ("Walmart", "too_big"),
+    ("McDonald's", "franchise"),
+    ("H&R Block", "franchise"),
+    ("Shell", "franchise"),
+    ("Target", "too_big"),
+    ("Subway", "franchise"),
+    ("Burger King", "franchise"),
+    ("Joe's Plumbing", "did_not_convert"),
+]
+
+
+class TestBlacklistIndex:
+    """Normalized exact and chain-variant matching."""
+
+    def setup_method(self):
+        self.index = BlacklistIndex()
+        self.index.load(ENTRIES)
+
+    def test_normalization(self):
+        assert normalize_business_name("McDonald’s") == "mcdonalds"
+        assert normalize_business_name("  H&R   Block ") == "h and r block"
+
+    def test_exact_names_match_case_and_punctuation_insensitively(self):
+        assert self.index.is_blacklisted("MCDONALDS")
+        assert self.index.is_blacklisted("H & R Block")
+        assert self.index.is_blacklisted("joes plumbing")
+
+    def test_branch_suffixes_match(self):
+        assert self.index.is_blacklisted("Walmart Supercenter")
+        assert self.index.is_blacklisted("McDonald's - 72nd St")
+        assert self.index.is_blacklisted("Joe's Plumbing (Papillion)")
+
+    def test_unrelated_businesses_sharing_a_word_do_not_match(self):
+        assert not self.index.is_blacklisted("Shell Roofing & Siding")
+        assert not self.index.is_blacklisted("Joe's Plumbing Supply Co")
+        assert not self.index.is_blacklisted("Walmartian Painting")
+        assert not self.index.is_blacklisted("")
+
+    def test_one_word_chains_take_only_their_own_suffixes(self):
+        assert self.index.is_blacklisted("Shell Gas Station")
+        assert self.index.is_blacklisted("Target Optical")
+        assert not self.index.is_blacklisted("Shell Auto Care Center")
+        assert not self.index.is_blacklisted("Target Market Cafe")
+        assert not self.index.is_blacklisted("Subway Cafe")
+        assert not self.index.is_blacklisted("Walmart of the Plains")
+
+    def test_multi_word_chains_take_descriptors_but_not_stopwords(self):
+        assert self.index.is_blacklisted("Burger King Restaurant")
+        assert not self.index.is_blacklisted("Burger King of the Hill")
+
+    def test_invalidate_reloads_from_database(self):
+        self.index._load_entries = Mock(return_value=[("Shlee Painting", "did_not_convert")])
+
+        self.index.invalidate()
+
+        assert self.index.is_blacklisted("Shlee Painting")
+        assert not self.index.is_blacklisted("Walmart")
+        self.index._load_entries.assert_called_once()
+
+    def test_lookups_do_not_query_database_once_loaded(self):
+        self.index._load_entries = Mock()
+
+        for _ in range(100):
+            self.index.is_blacklisted("Papillion Barbers")
+
+        self.index._load_entries.assert_not_called()
+
+
+class TestBlacklistWritesRefreshIndex:
+    """BlacklistManager writes invalidate the shared index."""
+
+    def test_add_and_remove_invalidate(self):
+        session = Mock()
+        session.query.return_value.filter.return_value.first.return_value = None
+        session.query.return_value.filter.return_value.delete.return_value = 1
+        index = Mock()
+        manager = BlacklistManager(session)
+
+        with patch("blacklist_manager.get_blacklist_index", return_value=index):
+            manager.add_to_blacklist("Shlee Painting", "did_not_convert")
+            manager.remove_from_blacklist("Shlee Painting")
+
+        assert index.invalidate.call_count == 2
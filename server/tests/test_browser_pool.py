@@ -0,0 +1,125 @@
+"""
+Unit tests for the pre-warmed browser session pool.
+Pattern: AAA (Arrange-Act-Assert) with BrowserSetup replaced by mocks.
+"""
+
+import time
+from unittest.mock import Mock
+
+import pytest
+
+import browser_pool
+from browser_pool import BrowserPool
+from browser_automation import BrowserAutomation
+
+
+class FakeBrowserSetup:
+    """Stands in for BrowserSetup; every instance owns a fresh mock driver"""
+
+    instances = []
+
+    def __init__(self, use_profile=False, headless=False):
+        self.driver = None
+        self.closed = False
+        FakeBrowserSetup.instances.append(self)
+
+    def setup_browser(self):
+        self.driver = Mock()
+        self.driver.window_handles = ["main"]
+        self.driver.execute_script.return_value = "complete"
+        return self.driver
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def fake_browser_setup(monkeypatch):
+    FakeBrowserSetup.instances = []
+    monkeypatch.setattr(browser_pool, "BrowserSetup", FakeBrowserSetup)
+
+
+def wait_for_idle(pool, count, timeout=2.0):
+    deadline = time.time() + timeout
+    while pool.get_status()["idle"] < count and time.time() < deadline:
+        time.sleep(0.01)
+
+
+class TestBrowserPool:
+    """Leasing, releasing and health checks."""
+
+    def test_start_prewarms_sessions_on_maps(self):
+        pool = BrowserPool(size=2).start()
+
+        wait_for_idle(pool, 2)
+
+        assert pool.get_status()["idle"] == 2
+        for setup in FakeBrowserSetup.instances:
+            setup.driver.get.assert_called_with(browser_pool.MAPS_URL)
+
+    def test_lease_reuses_released_session(self):
+        pool = BrowserPool(size=1).start()
+        wait_for_idle(pool, 1)
+
+        first = pool.lease()
+        pool.release(first)
+        wait_for_idle(pool, 1)
+        second = pool.lease()
+
+        assert pool.get_status()["warm_leases"] == 2
+        assert pool.get_status()["cold_leases"] == 0
+
+    def test_empty_pool_falls_back_to_cold_session(self):
+        pool = BrowserPool(size=0)
+
+        session = pool.lease()
+
+        assert session.driver is not None
+        assert pool.get_status()["cold_leases"] == 1
+
+    def test_unhealthy_session_is_discarded(self):
+        pool = BrowserPool(size=1).start()
+        wait_for_idle(pool, 1)
+        stale = pool._idle[0]
+        stale.driver.execute_script.side_effect = Exception("invalid session id")
+
+        session = pool.lease()
+
+        assert session is not stale
+        assert stale.browser_setup.closed is True
+        assert pool.get_status()["discarded"] >= 1
+
+    def test_failed_reset_closes_session(self):
+        pool = BrowserPool(size=1)
+        session = pool.lease()
+        session.driver.get.side_effect = Exception("tab crashed")
+
+        pool.release(session)
+
+        assert session.browser_setup.closed is True
+        assert pool.get_status()["released"] == 0
+        assert pool.get_status()["discarded"] == 1
+
+    def test_release_beyond_size_closes_session(self):
+        pool = BrowserPool(size=0)
+        session = pool.lease()
+
+        pool.release(session)
+
+        assert session.browser_setup.closed is True
+
+
+class TestBrowserAutomationPooling:
+    """BrowserAutomation leases from and returns to the pool."""
+
+    def test_setup_and_close_use_pool(self):
+        pool = Mock()
+        session = Mock()
+        pool.lease.return_value = session
+        automation = BrowserAutomation(headless=True, browser_pool=pool)
+
+        assert automation.setup_browser() is True
+        automation.close()
+
+        assert automation.search_engine.driver is session.driver
+        pool.release.assert_called_once_with(session)
@@ -0,0 +1,207 @@
+"""
+Unit tests for mid-job browser recycling.
+Pattern: AAA (Arrange-Act-Assert).
+"""
+
+from unittest.mock import Mock
+
+import browser_recycling
+from browser_recycling import RecyclePolicy, request_recycle, recycle_generation
+from browser_automation import BrowserAutomation
+from maps_search_engine import MapsSearchEngine
+from search_checkpoint import CheckpointStore
+
+
+class FakeRedis:
+    """The two keys of the shared recycle signal, as another worker process would see them"""
+
+    def __init__(self):
+        self.values = {}
+
+    def mget(self, *keys):
+        return [self.values.get(key) for key in keys]
+
+    def pipeline(self):
+        return self
+
+    def incr(self, key):
+        self.values[key] = str(int(self.values.get(key, 0)) + 1).encode()
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value.encode()
+        return True
+
+    def execute(self):
+        pass
+
+
+def heap_driver(heap_mb):
+    driver = Mock(spec=["execute_cdp_cmd"])
+    driver.execute_cdp_cmd.return_value = {"metrics": [{"name": "JSHeapTotalSize", "value": heap_mb * 1024 * 1024}]}
+    return driver
+
+
+class TestRecyclePolicy:
+    """Thresholds and process-wide recycle requests."""
+
+    def test_disabled_by_default(self, monkeypatch):
+        monkeypatch.delenv("BROWSER_RECYCLE_BUSINESSES", raising=False)
+        monkeypatch.delenv("BROWSER_RECYCLE_MEMORY_MB", raising=False)
+
+        assert RecyclePolicy.from_env().enabled is False
+
+    def test_business_threshold(self):
+        policy = RecyclePolicy(max_businesses=100)
+
+        assert policy.check(Mock(), 99, recycle_generation()) is None
+        assert "100 businesses" in policy.check(Mock(), 100, recycle_generation())
+
+    def test_renderer_memory_threshold_over_cdp(self):
+        policy = RecyclePolicy(max_renderer_mb=500)
+
+        assert policy.check(heap_driver(200), 0, recycle_generation()) is None
+        assert "renderer memory 800 MB" in policy.check(heap_driver(800), 0, recycle_generation())
+
+    def test_unreadable_memory_never_recycles(self):
+        driver = Mock(spec=["execute_cdp_cmd"])
+        driver.execute_cdp_cmd.side_effect = Exception("no CDP")
+
+        assert RecyclePolicy(max_renderer_mb=1).check(driver, 0, recycle_generation()) is None
+
+    def test_request_recycle_reaches_running_searches(self, monkeypatch):
+        monkeypatch.delenv("REDIS_URL", raising=False)
+        policy = RecyclePolicy(max_businesses=1000)
+        generation = recycle_generation()
+
+        request_recycle("system memory at 91%")
+
+        assert policy.check(Mock(), 0, generation) == "system memory at 91%"
+        assert policy.check(Mock(), 0, recycle_generation()) is None
+
+    def test_recycle_request_reaches_other_processes_through_redis(self, monkeypatch):
+        redis = FakeRedis()
+        monkeypatch.setenv("REDIS_URL", "redis://redis:6379")
+        monkeypatch.setattr(browser_recycling, "_redis_client", redis)
+        monkeypatch.setattr(browser_recycling, "_shared", {"generation": 0, "reason": None, "read_at": 0.0})
+        monkeypatch.setattr(browser_recycling, "SHARED_POLL_SECONDS", 0)
+        policy = RecyclePolicy(max_businesses=1000)
+        generation = recycle_generation()
+
+        # Published by the memory check running in another worker process
+        redis.incr(browser_recycling.SHARED_GENERATION_KEY)
+        redis.set(browser_recycling.SHARED_REASON_KEY, "system memory at 93%")
+        monkeypatch.setattr(browser_recycling, "_pressure_reason", None)
+
+        assert policy.check(Mock(), 0, generation) == "system memory at 93%"
+        assert policy.check(Mock(), 0, recycle_generation()) is None
+
+        request_recycle("system memory at 95%")
+
+        assert redis.values[browser_recycling.SHARED_GENERATION_KEY] == b"2"
+
+    def test_pressure_requests_wait_for_the_cooldown(self, monkeypatch):
+        redis = FakeRedis()
+        monkeypatch.setenv("REDIS_URL", "redis://redis:6379")
+        monkeypatch.setattr(browser_recycling, "_redis_client", redis)
+
+        first = request_recycle("system memory at 85%", cooldown=600)
+        repeated = request_recycle("system memory at 86%", cooldown=600)  # Next beat, still high
+        del redis.values[browser_recycling.SHARED_COOLDOWN_KEY]  # Cooldown key expired
+        after_cooldown = request_recycle("system memory at 87%", cooldown=600)
+
+        assert (first, repeated, after_cooldown) == (True, False, True)
+        assert redis.values[browser_recycling.SHARED_GENERATION_KEY] == b"2"
+
+    def test_cooldown_without_redis_is_per_process(self, monkeypatch):
+        monkeypatch.delenv("REDIS_URL", raising=False)
+        monkeypatch.setattr(browser_recycling, "_cooldown_until", 0.0)
+        generation = recycle_generation()
+
+        assert request_recycle("system memory at 85%", cooldown=600) is True
+        assert request_recycle("system memory at 86%", cooldown=600) is False
+        assert recycle_generation() == generation + 1
+
+
+class TestEngineRecycling:
+    """The engine checkpoints and stops when the policy fires."""
+
+    def test_search_stops_and_keeps_checkpoint(self, tmp_path):
+        engine = MapsSearchEngine(Mock(), None, Mock(), job_id="job-recycle")
+        engine.waiter = Mock()
+        engine.checkpoint_store = CheckpointStore(str(tmp_path))
+        engine.recycle_policy = RecyclePolicy(max_businesses=2)
+        engine.recycle_generation = recycle_generation()
+        engine.search_started_at = 0
+        engine.search_area_manager.prefetch_next_page.return_value = None
+        engine._get_business_elements = Mock(return_value=[Mock()])
+
+        def process(*args):
+            engine.business_counter += 1
+            return 1
+
+        engine._process_business_elements = Mock(side_effect=process)
+
+        engine._iterate_through_results([], set(), set(), "painters", 50, 0.0, 0, None, None, None, None, False)
+        engine._finish_checkpoint("painters", [], set(), set())
+
+        assert engine._process_business_elements.call_count == 2
+        assert "2 businesses" in engine.recycle_reason
+        assert engine.checkpoint_store.load("job-recycle")["query"] == "painters"
+
+
+    def test_resume_over_memory_limit_stops_memory_recycling(self, tmp_path):
+        store = CheckpointStore(str(tmp_path))
+        first = MapsSearchEngine(Mock(), None, Mock(), job_id="job-heavy")
+        first.checkpoint_store = store
+        first.search_started_at = 0
+        first.scroll_depth = 40
+        first._save_checkpoint("painters", [], set(), set())
+        resumed = MapsSearchEngine(heap_driver(900), None, Mock(), job_id="job-heavy")
+        resumed.checkpoint_store = store
+        resumed.recycle_policy = RecyclePolicy(max_businesses=100, max_renderer_mb=500)
+        resumed.recycle_generation = recycle_generation()
+
+        resumed._resume_from_checkpoint("painters", [], set(), set(), 0)
+
+        assert resumed.memory_recycle is False
+        assert resumed._should_recycle() is False
+        resumed.business_counter = 100
+        assert resumed._should_recycle() is True
+        assert "100 businesses" in resumed.recycle_reason
+
+
+class TestAutomationRecycling:
+    """BrowserAutomation restarts the browser and runs the search again."""
+
+    def test_recycled_search_resumes_in_fresh_browser(self, monkeypatch):
+        monkeypatch.setattr("browser_automation.BrowserSetup", Mock())
+        monkeypatch.setattr("browser_automation.add_job_log", Mock())
+        automation = BrowserAutomation(job_id="job-fresh")
+        first = Mock(recycle_reason="100 businesses evaluated in this browser")
+        first.search_google_maps.return_value = [{"name": "a"}]
+        second = Mock(recycle_reason=None)
+        second.search_google_maps.return_value = [{"name": "a"}, {"name": "b"}]
+        automation.search_engine = first
+
+        def setup_browser():
+            automation.search_engine = second
+            return True
+
+        automation.setup_browser = setup_browser
+
+        results = automation.search_google_maps("painters", recycle_after_businesses=100)
+
+        assert len(results) == 2
+        assert automation.recycles == 1
+        assert second.recycle_policy.max_businesses == 100
+        assert second.checkpoint_store is not None
+
+    def test_tabs_never_recycle(self):
+        automation = BrowserAutomation(job_id="job-tab", tab_group=Mock())
+        automation.search_engine = Mock(recycle_reason=None)
+
+        automation.search_google_maps("painters", recycle_after_businesses=10)
+
+        assert automation.search_engine.recycle_policy is None
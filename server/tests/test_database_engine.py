@@ -0,0 +1,42 @@
+"""
+Unit tests for the shared tuned database engine and its benchmark.
+Pattern: AAA (Arrange-Act-Assert).
+"""
+
+from sqlalchemy import text
+
+import database
+from database_core.config import DatabaseConfig
+from database_core.connection_pool import ConnectionPool
+from benchmark_database import run_benchmark
+
+
+class TestTunedEngine:
+    """database.py's engine applies the DatabaseConfig pragma profile."""
+
+    def test_pragmas_applied_on_connect(self, tmp_path):
+        config = DatabaseConfig(database_url=f"sqlite:///{tmp_path / 'tuned.db'}",
+                                sqlite_pragmas=dict(database.db_config.sqlite_pragmas))
+        pool = ConnectionPool(config)
+
+        with pool.get_engine().connect() as conn:
+            pragma = lambda name: conn.execute(text(f"PRAGMA {name}")).scalar()
+            settings = {name: pragma(name) for name in ("journal_mode", "busy_timeout", "synchronous", "foreign_keys")}
+        pool.dispose()
+
+        assert settings == {"journal_mode": "wal", "busy_timeout": 30000, "synchronous": 1, "foreign_keys": 0}
+
+    def test_session_local_uses_the_pool_engine(self):
+        assert database.SessionLocal.kw["bind"] is database.connection_pool.get_engine()
+        assert set(database.get_pool_status()) == {"size", "checked_in", "checked_out", "overflow", "total"}
+
+
+class TestDatabaseBenchmark:
+    """Both configurations save every lead without lock errors on a small workload."""
+
+    def test_small_run_completes(self):
+        reports = run_benchmark(writers=2, leads_per_writer=5, readers=1)
+
+        for name in ("baseline", "tuned"):
+            assert reports[name]["saved"] == reports[name]["expected"] == 10
+            assert reports[name]["locked_errors"] == 0
@@ -0,0 +1,38 @@
+"""
+Tests for the offline extraction benchmark harness.
+Pattern: AAA (Arrange-Act-Assert) against the golden fixture results.
+"""
+
+from selenium.webdriver.common.by import By
+from bs4 import BeautifulSoup
+
+from benchmark_extraction import CallCounter, OfflineElement, run_benchmark
+
+
+class TestOfflineElement:
+    """WebElement stand-in used by the benchmark."""
+
+    def test_counts_every_remote_operation(self):
+        counter = CallCounter()
+        element = OfflineElement(BeautifulSoup('<div><a href="/x" aria-label="A">Name</a></div>', "html.parser"), counter)
+
+        link = element.find_element(By.CSS_SELECTOR, "a[aria-label]")
+        link.get_attribute("href")
+        link.text
+
+        assert counter.calls == 3
+
+
+class TestExtractionBenchmark:
+    """Every extraction mode must match the golden results."""
+
+    def test_all_fixtures_match_golden(self):
+        reports = run_benchmark(iterations=1)
+
+        assert reports, "No fixtures with golden results found"
+        for report in reports:
+            assert report["element"]["errors"] == [], report["fixture"]
+            assert report["snapshot"]["errors"] == [], report["fixture"]
+            assert report["snapshot"]["webdriver_calls_per_card"] < report["element"]["webdriver_calls_per_card"]
+            assert report["script"]["errors"] == [], report["fixture"]
+            assert report["script"]["webdriver_calls_per_card"] < report["element"]["webdriver_calls_per_card"]
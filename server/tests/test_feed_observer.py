@@ -0,0 +1,90 @@
+"""
+Unit tests for FeedObserver and the engine's incremental feed mode.
+Pattern: AAA (Arrange-Act-Assert) with a mocked driver.
+"""
+
+from unittest.mock import Mock
+
+from feed_observer import FeedObserver, INSTALL_OBSERVER_SCRIPT, DRAIN_QUEUE_SCRIPT
+from maps_search_engine import MapsSearchEngine
+
+
+def queued_card(place, element_id):
+    element = Mock()
+    element.id = element_id
+    return {'element': element, 'url': f"https://www.google.com/maps/place/{place}/data=!4m7?authuser=0"}
+
+
+class TestFeedObserver:
+    """Draining the in-page card queue."""
+
+    def setup_method(self):
+        self.driver = Mock()
+        self.observer = FeedObserver(self.driver)
+
+    def test_drain_returns_elements_with_place_keys(self):
+        self.driver.execute_script.return_value = [
+            queued_card("Shlee+Painting", "e1"),
+            {'element': Mock(), 'url': "https://www.google.com/search?q=painters"},
+        ]
+
+        cards = self.observer.drain()
+
+        self.driver.execute_script.assert_called_once_with(DRAIN_QUEUE_SCRIPT)
+        assert [element_id for _, element_id, _ in cards] == ["Shlee+Painting"]
+        assert cards[0][0].id == "e1"
+
+    def test_missing_observer_is_reinstalled(self):
+        self.driver.execute_script.side_effect = [None, True, [queued_card("Papillion+Barbers", "e2")]]
+
+        cards = self.observer.drain()
+
+        scripts = [call.args[0] for call in self.driver.execute_script.call_args_list]
+        assert scripts == [DRAIN_QUEUE_SCRIPT, INSTALL_OBSERVER_SCRIPT, DRAIN_QUEUE_SCRIPT]
+        assert [element_id for _, element_id, _ in cards] == ["Papillion+Barbers"]
+
+
+class TestIncrementalFeedMode:
+    """MapsSearchEngine wiring for incremental_feed."""
+
+    def setup_method(self):
+        self.driver = Mock()
+        self.engine = MapsSearchEngine(self.driver, None, None)
+        self.engine.incremental_feed = True
+
+    def test_drained_cards_cache_identifiers(self):
+        self.driver.execute_script.return_value = [queued_card("Shlee+Painting", "e1")]
+
+        elements = self.engine._drain_new_business_elements()
+
+        assert [e.id for e in elements] == ["e1"]
+        assert self.engine._get_element_identifier(elements[0]) == "Shlee+Painting"
+        self.driver.find_elements.assert_not_called()
+
+    def test_observer_failure_falls_back_to_full_scan(self):
+        self.driver.execute_script.side_effect = Exception("javascript error")
+        self.driver.find_elements.return_value = []
+
+        elements = self.engine._drain_new_business_elements()
+
+        assert elements == []
+        assert self.engine.incremental_feed is False
+        self.driver.find_elements.assert_called()
+
+    def test_empty_drain_after_scroll_keeps_scrolling(self):
+        self.engine.search_area_manager = Mock()
+        self.engine.search_area_manager.expand_search_area.return_value = False
+        self.engine.search_area_manager.scroll_results_panel.return_value = True
+        self.engine.screenshot_manager = Mock()
+        self.engine.waiter = Mock()
+        self.engine._process_business_elements = Mock(return_value=0)
+        self.engine._drain_new_business_elements = Mock(side_effect=[[Mock()]] + [[]] * 10)
+
+        self.engine._iterate_through_results(
+            [], set(), set(), "painters", 5, 0.0, 0, None, None, None, None, False
+        )
+
+        # Empty drains count towards no-new-results and expansion instead of ending the search
+        assert self.engine._drain_new_business_elements.call_count > 3
+        assert self.engine.search_area_manager.expand_search_area.call_count == 3
+        self.engine._process_business_elements.assert_called_once()
@@ -0,0 +1,90 @@
+"""
+Unit tests for pruning processed cards from the results feed.
+Pattern: AAA (Arrange-Act-Assert).
+"""
+
+from unittest.mock import Mock
+
+from feed_pruner import FeedPruner
+from maps_search_engine import MapsSearchEngine
+
+
+def card(element_id):
+    return Mock(id=element_id)
+
+
+class TestFeedPruner:
+    """Batching, held-back anchor cards and duplicates."""
+
+    def test_newest_cards_are_held_back_as_anchor(self):
+        driver = Mock()
+        driver.execute_script.return_value = 2
+        pruner = FeedPruner(driver, keep_recent=3)
+        cards = [card(f"e{i}") for i in range(5)]
+
+        removed = pruner.prune(cards)
+
+        assert removed == 2
+        assert driver.execute_script.call_args.args[1] == cards[:2]
+        assert pruner.pending == cards[2:]
+
+    def test_held_back_cards_are_pruned_with_next_batch(self):
+        driver = Mock()
+        driver.execute_script.return_value = 0
+        pruner = FeedPruner(driver, keep_recent=2)
+        first = [card("e1"), card("e2")]
+        second = [card("e3")]
+
+        pruner.prune(first)
+        pruner.prune(second)
+
+        driver.execute_script.assert_called_once()
+        assert driver.execute_script.call_args.args[1] == [first[0]]
+
+    def test_rescanned_pending_cards_are_not_duplicated(self):
+        driver = Mock()
+        driver.execute_script.return_value = 1
+        pruner = FeedPruner(driver, keep_recent=1)
+        held = card("e1")
+        pruner.pending = [held]
+
+        pruner.prune([held, card("e2")])
+
+        assert driver.execute_script.call_args.args[1] == [held]
+
+
+class TestEnginePruning:
+    """The engine prunes each processed batch when prune_feed is on."""
+
+    def setup_method(self):
+        self.engine = MapsSearchEngine(Mock(), None, Mock())
+        self.engine.waiter = Mock()
+        self.engine.search_area_manager.prefetch_next_page.return_value = None
+        self.engine.search_area_manager.scroll_results_panel.return_value = True
+        self.engine._process_business_elements = Mock(return_value=1)
+        self.batches = [[card("e1"), card("e2")], [card("e3")], []]
+        self.engine._get_business_elements = Mock(side_effect=self.batches)
+
+    def iterate(self):
+        self.engine._iterate_through_results(
+            [], set(), set(), "painters", 5, 0.0, 0, None, None, None, None, False
+        )
+
+    def test_processed_batches_are_pruned(self):
+        self.engine.prune_feed = True
+        self.engine.feed_pruner = FeedPruner(self.engine.driver, keep_recent=0)
+        self.engine.driver.execute_script.return_value = 1
+
+        self.iterate()
+
+        pruned = [call.args[1] for call in self.engine.driver.execute_script.call_args_list]
+        assert pruned == self.batches[:2]
+
+    def test_pruning_failure_disables_pruning(self):
+        self.engine.prune_feed = True
+        self.engine.feed_pruner = Mock(prune=Mock(side_effect=Exception("stale element")))
+
+        self.iterate()
+
+        assert self.engine.prune_feed is False
+        assert self.engine._process_business_elements.call_count == 2
@@ -0,0 +1,124 @@
+"""
+Unit tests for FeedScriptExtractor and the engine's script extraction mode.
+Pattern: AAA (Arrange-Act-Assert) with a mocked driver.
+"""
+
+from unittest.mock import Mock
+
+import pytest
+from pydantic import ValidationError
+
+from schemas import BrowserAutomationRequest
+from feed_script_extractor import FeedScriptExtractor, FEED_EXTRACTION_SCRIPT
+from maps_search_engine import MapsSearchEngine
+
+
+def raw_card(name, place, element_id, website=None, actions=None, rating_label=None):
+    element = Mock()
+    element.id = element_id
+    return {
+        'element': element,
+        'url': f"https://www.google.com/maps/place/{place}/data=!4m7?authuser=0",
+        'aria_label': name,
+        'headline': name,
+        'rating_label': rating_label,
+        'rating_text': None,
+        'reviews_text': None,
+        'phone': "(402) 555-0100",
+        'website': website,
+        'action_buttons': actions or [],
+        'photo_count': 2,
+        'description_parts': ["Painter · 123 Main St", "Open 24 hours today"],
+    }
+
+
+class TestFeedScriptExtractor:
+    """Normalization of the in-page script payload."""
+
+    def setup_method(self):
+        self.driver = Mock()
+        self.extractor = FeedScriptExtractor()
+
+    def test_single_remote_call_for_all_cards(self):
+        self.driver.execute_script.return_value = [
+            raw_card("Shlee Painting", "Shlee+Painting", "e1", website="https://shlee.example",
+                     actions=["Website", "Directions"], rating_label="5.0 stars 26 Reviews"),
+            raw_card("Papillion Barbers · Visited link", "Papillion+Barbers", "e2"),
+        ]
+
+        businesses = self.extractor.extract(self.driver)
+
+        self.driver.execute_script.assert_called_once_with(FEED_EXTRACTION_SCRIPT)
+        assert [b['element_id'] for b in businesses] == ["Shlee+Painting", "Papillion+Barbers"]
+        standard, compact = businesses
+        assert standard['has_website'] is True
+        assert standard['rating'] == 5.0
+        assert standard['reviews'] == 26
+        assert standard['listing_type'] == 'standard'
+        assert compact['name'] == "Papillion Barbers"
+        assert compact['listing_type'] == 'compact'
+        assert compact['_needs_click_check'] is True
+        assert compact['rating'] == "0"
+
+    def test_duplicate_places_are_dropped(self):
+        self.driver.execute_script.return_value = [
+            raw_card("Shlee Painting", "Shlee+Painting", "e1"),
+            raw_card("Shlee Painting", "Shlee+Painting", "e2"),
+        ]
+
+        assert len(self.extractor.extract(self.driver)) == 1
+
+    def test_visible_text_rating_fallback(self):
+        raw = raw_card("Shlee Painting", "Shlee+Painting", "e1")
+        raw['rating_text'] = "4.7"
+        raw['reviews_text'] = "(1,204)"
+
+        details = self.extractor.normalize(raw)
+
+        assert details['rating'] == 4.7
+        assert details['reviews'] == 1204
+
+
+class TestEngineScriptMode:
+    """MapsSearchEngine wiring for extraction_mode='script'."""
+
+    def setup_method(self):
+        self.driver = Mock()
+        self.engine = MapsSearchEngine(self.driver, None, None)
+        self.engine.extraction_mode = "script"
+
+    def test_elements_and_identifiers_come_from_one_call(self):
+        self.driver.execute_script.return_value = [
+            raw_card("Shlee Painting", "Shlee+Painting", "e1", actions=["Directions"]),
+        ]
+
+        elements = self.engine._get_business_elements_via_script()
+
+        assert len(elements) == 1
+        assert self.engine._get_element_identifier(elements[0]) == "Shlee+Painting"
+        elements[0].find_element.assert_not_called()
+        details = self.engine._get_snapshot_details("Shlee+Painting", enable_click_through=True)
+        assert details['name'] == "Shlee Painting"
+        assert 'element' not in details
+        assert 'action_buttons' not in details
+
+    def test_script_failure_falls_back_to_find_elements(self):
+        self.driver.execute_script.side_effect = Exception("script error")
+        self.driver.find_elements.return_value = []
+
+        assert self.engine._get_business_elements_via_script() == []
+        assert self.engine.feed_snapshot == {}
+        self.driver.find_elements.assert_called()
+
+
+class TestExtractionModeValidation:
+    """Request validation of extraction_mode."""
+
+    def test_known_mode_accepted(self):
+        request = BrowserAutomationRequest(industry="painter", location="Omaha", extraction_mode="script")
+
+        assert request.extraction_mode == "script"
+
+    def test_unknown_mode_rejected(self):
+        with pytest.raises(ValidationError):
+            BrowserAutomationRequest(industry="painter", location="Omaha", extraction_mode="scirpt")
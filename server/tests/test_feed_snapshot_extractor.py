@@ -0,0 +1,126 @@
+"""
+Unit tests for FeedSnapshotExtractor.
+Pattern: AAA (Arrange-Act-Assert) against the google-maps-reference fixtures.
+"""
+
+from pathlib import Path
+from unittest.mock import Mock
+
+from feed_snapshot_extractor import FeedSnapshotExtractor
+from maps_search_engine import MapsSearchEngine
+
+REFERENCE_DIR = Path(__file__).resolve().parent.parent / "google-maps-reference"
+
+
+def load_reference(name: str) -> str:
+    return (REFERENCE_DIR / name).read_text(encoding="utf-8")
+
+
+class TestFeedSnapshotExtractor:
+    """Offline parsing of feed snapshots."""
+
+    def setup_method(self):
+        self.extractor = FeedSnapshotExtractor()
+
+    def test_parses_mixed_standard_listings(self):
+        """Three standard cards are parsed once each with website detection."""
+        html = load_reference("standard-businesses_website-nowebsite-website.html")
+
+        businesses = self.extractor.parse(html)
+
+        by_name = {b['name']: b for b in businesses}
+        assert list(by_name) == ["Straight Line Painting Omaha", "Perceptive Painting LLC", "The Rosy Clay Co."]
+        assert by_name["Straight Line Painting Omaha"]['has_website'] is True
+        assert by_name["Straight Line Painting Omaha"]['website'].startswith("http")
+        assert by_name["Perceptive Painting LLC"]['has_website'] is False
+        assert by_name["Perceptive Painting LLC"]['website'] is None
+        assert by_name["Perceptive Painting LLC"]['phone'] == "(402) 812-9182"
+        assert by_name["Perceptive Painting LLC"]['rating'] == 5.0
+        assert by_name["Perceptive Painting LLC"]['reviews'] == 18
+        assert all(b['listing_type'] == 'standard' for b in businesses)
+
+    def test_compact_listing_flags_click_check(self):
+        """Compact cards have no action buttons and need a click-through for the website."""
+        html = load_reference("compact-business-listing.html")
+
+        businesses = self.extractor.parse(html)
+
+        assert len(businesses) == 1
+        business = businesses[0]
+        assert business['name'] == "Papillion Barbers"
+        assert business['listing_type'] == 'compact'
+        assert business['_needs_click_check'] is True
+        assert business['rating'] == 4.8
+        assert business['reviews'] == 114
+
+    def test_parse_by_id_uses_element_identifier(self):
+        """Snapshot entries are keyed by the same identifier the engine tracks."""
+        html = load_reference("standard-business-listing-with-website.html")
+
+        snapshot = self.extractor.parse_by_id(html)
+
+        assert list(snapshot) == ["Shlee+Painting"]
+        assert snapshot["Shlee+Painting"]['url'].startswith("https://www.google.com/maps/place/")
+
+    def test_empty_snapshot(self):
+        """Empty or missing HTML yields no businesses."""
+        assert self.extractor.parse("") == []
+        assert self.extractor.parse(None) == []
+
+
+class TestSnapshotDetailsLookup:
+    """MapsSearchEngine use of snapshot entries."""
+
+    def setup_method(self):
+        self.engine = MapsSearchEngine(Mock(), None, None)
+        self.engine.feed_snapshot = FeedSnapshotExtractor().parse_by_id(
+            load_reference("compact-business-listing.html")
+            + load_reference("standard-business-listing-without-website.html")
+        )
+
+    def test_standard_listing_served_from_snapshot(self):
+        details = self.engine._get_snapshot_details("Perceptive+Painting+LLC", enable_click_through=True)
+
+        assert details['name'] == "Perceptive Painting LLC"
+        assert 'listing_type' not in details
+        assert 'element_id' not in details
+
+    def test_compact_listing_requires_live_extraction_with_click_through(self):
+        assert self.engine._get_snapshot_details("Papillion+Barbers", enable_click_through=True) is None
+        assert self.engine._get_snapshot_details("Papillion+Barbers", enable_click_through=False)['name'] == "Papillion Barbers"
+
+    def test_unknown_element(self):
+        assert self.engine._get_snapshot_details("missing", enable_click_through=False) is None
+
+
+class TestEngineSnapshotMode:
+    """Snapshot mode keys cards from the same call that captures the feed."""
+
+    def setup_method(self):
+        self.driver = Mock()
+        self.engine = MapsSearchEngine(self.driver, None, None)
+        self.engine.extraction_mode = "snapshot"
+
+    def test_cards_are_keyed_without_per_card_calls(self):
+        html = load_reference("standard-business-listing-without-website.html")
+        card = Mock()
+        card.id = "e1"
+        self.driver.execute_script.return_value = {
+            "html": html,
+            "cards": [{"element": card, "url": "https://www.google.com/maps/place/Perceptive+Painting+LLC/data=!4m7"}],
+        }
+
+        elements = self.engine._get_business_elements_via_snapshot()
+
+        assert elements == [card]
+        assert self.engine._get_element_identifier(card) == "Perceptive+Painting+LLC"
+        card.find_element.assert_not_called()
+        self.driver.find_elements.assert_not_called()
+        assert self.engine._get_snapshot_details("Perceptive+Painting+LLC", enable_click_through=True)['name'] == "Perceptive Painting LLC"
+
+    def test_capture_failure_falls_back_to_find_elements(self):
+        self.driver.execute_script.side_effect = Exception("script error")
+        self.driver.find_elements.return_value = []
+
+        assert self.engine._get_business_elements_via_snapshot() == []
+        assert self.engine.feed_snapshot == {}
@@ -0,0 +1,123 @@
+"""
+Unit tests for the level-gated job logger and its ring buffer.
+Pattern: AAA (Arrange-Act-Assert).
+"""
+
+from unittest.mock import Mock
+
+import job_logger
+from job_logger import (
+    DEBUG, INFO, WARNING, JobLogBuffer, JobLogger,
+    get_job_logger, get_job_logs, set_thread_logger, current_logger,
+)
+from job_management import add_job_log, job_statuses
+from maps_search_engine import MapsSearchEngine
+
+
+class ExplodingArg:
+    """Formatting this argument fails the test - it must never be formatted."""
+
+    def __str__(self):
+        raise AssertionError("message below level was formatted")
+
+
+class TestJobLogBuffer:
+    """Ring buffer eviction and sequence numbers."""
+
+    def test_buffer_keeps_newest_entries_with_contiguous_seq(self):
+        buffer = JobLogBuffer(maxlen=3)
+
+        for i in range(5):
+            buffer.append(INFO, f"line {i}")
+
+        assert len(buffer) == 3
+        assert [entry["seq"] for entry in buffer.since(0)] == [3, 4, 5]
+        assert buffer.since(0)[0]["message"] == "line 2"
+
+    def test_since_returns_only_newer_entries(self):
+        buffer = JobLogBuffer(maxlen=10)
+        for i in range(4):
+            buffer.append(INFO, f"line {i}")
+
+        newer = buffer.since(2)
+
+        assert [entry["message"] for entry in newer] == ["line 2", "line 3"]
+        assert buffer.since(4) == []
+
+    def test_since_after_eviction_returns_what_is_left(self):
+        buffer = JobLogBuffer(maxlen=2)
+        for i in range(6):
+            buffer.append(INFO, f"line {i}")
+
+        assert [entry["seq"] for entry in buffer.since(1)] == [5, 6]
+
+
+class TestJobLogger:
+    """Level gating, lazy formatting and console echo."""
+
+    def test_below_level_message_is_never_formatted(self):
+        logger = JobLogger("job-gate", level=INFO, echo=False)
+
+        logger.debug("html: %s", ExplodingArg())
+        logger.info("kept %s", 42)
+
+        assert [entry["message"] for entry in logger.buffer.since(0)] == ["kept 42"]
+
+    def test_engine_log_formats_lazily(self):
+        engine = MapsSearchEngine(Mock(), None, None)
+        engine.logger = JobLogger("job-engine", level=INFO, echo=False)
+
+        engine._log("✂️ Pruned %s cards", ExplodingArg(), level=DEBUG)
+        engine._log("🏢 [%s] Evaluating: %s", 1, "Bob's Painting")
+
+        assert [entry["message"] for entry in engine.logger.buffer.since(0)] == ["🏢 [1] Evaluating: Bob's Painting"]
+
+    def test_entries_carry_level_name(self):
+        logger = JobLogger("job-levels", level=DEBUG, echo=False)
+
+        logger.debug("d")
+        logger.warning("w")
+
+        assert [entry["level"] for entry in logger.buffer.since(0)] == ["DEBUG", "WARNING"]
+
+    def test_echo_off_prints_nothing(self, capsys):
+        quiet = JobLogger("job-quiet", level=INFO, echo=False)
+        loud = JobLogger("job-loud", level=INFO, echo=True)
+
+        quiet.info("hidden")
+        loud.info("shown")
+
+        output = capsys.readouterr().out
+        assert "hidden" not in output
+        assert "[JOB job-loud] shown" in output
+
+    def test_level_from_env(self, monkeypatch):
+        monkeypatch.setenv("JOB_LOG_LEVEL", "warning")
+
+        assert job_logger.level_from_env() == WARNING
+
+
+class TestJobLogRegistry:
+    """Per-job registry, add_job_log routing and the thread-bound logger."""
+
+    def test_add_job_log_writes_to_job_buffer(self):
+        add_job_log("job-routed", "first")
+        add_job_log("job-routed", "second")
+
+        entries = get_job_logs("job-routed")
+        assert [entry["message"] for entry in entries][-2:] == ["first", "second"]
+        assert "logs" not in job_statuses["job-routed"]
+        assert get_job_logs("job-routed", since_seq=entries[-1]["seq"]) == []
+        assert get_job_logs("job-routed", tail=1)[0]["message"] == "second"
+
+    def test_current_logger_follows_thread_binding(self):
+        logger = get_job_logger("job-bound")
+
+        set_thread_logger(logger)
+        try:
+            bound = current_logger()
+        finally:
+            set_thread_logger(None)
+
+        assert bound is logger
+        assert current_logger().job_id is None
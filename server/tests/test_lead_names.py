@@ -0,0 +1,88 @@
+"""
+Unit tests for the normalized business-name key used by lead dedupe.
+Pattern: AAA (Arrange-Act-Assert).
+"""
+
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from database import Base
+from models import Lead
+from lead_names import lead_name_key
+from database_operations import _write_lead
+from migrate_normalized_names import migrate_database
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+class TestLeadNameKey:
+    """Case, punctuation, accents and legal suffixes collapse to one key."""
+
+    @pytest.mark.parametrize("name", [
+        "Bob's Painting, LLC", "BOBS PAINTING", "bobs painting", "Bob’s Painting L.L.C.", "Bob's Painting Inc.",
+        "Bobs  Painting Co., Inc.",
+    ])
+    def test_variants_share_a_key(self, name):
+        assert lead_name_key(name) == "bobs painting"
+
+    def test_suffix_is_only_stripped_at_the_end(self):
+        assert lead_name_key("Inc Painting") == "inc painting"
+
+    def test_never_strips_to_empty(self):
+        assert lead_name_key("Company") == "company"
+        assert lead_name_key("") == ""
+
+
+class TestLeadDedupe:
+    """_write_lead matches existing leads on the indexed normalized_name."""
+
+    def test_suffix_variant_is_a_duplicate(self, db):
+        first = _write_lead(db, {"name": "Bob's Painting, LLC", "location": "Omaha"})
+        db.commit()
+
+        second = _write_lead(db, {"name": "bobs painting", "location": "Lincoln"})
+
+        assert first["created"] is True
+        assert second == {"lead_id": first["lead_id"], "created": False}
+        assert db.query(Lead).one().normalized_name == "bobs painting"
+
+    def test_renaming_a_lead_updates_its_key(self, db):
+        lead = Lead(business_name="Old Name LLC", phone="No phone", location="Omaha")
+
+        lead.business_name = "New Name Inc"
+
+        assert lead.normalized_name == "new name"
+
+
+class TestNormalizedNameMigration:
+    """The migration adds, backfills and indexes the column on an existing database."""
+
+    def test_backfills_existing_leads(self, tmp_path):
+        db_path = str(tmp_path / "leads.db")
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE leads (id VARCHAR PRIMARY KEY, business_name VARCHAR, location VARCHAR)")
+        conn.executemany("INSERT INTO leads VALUES (?, ?, ?)", [("1", "Acme Roofing, Inc.", "Omaha"), ("2", "ACME roofing", "Omaha")])
+        conn.commit()
+        conn.close()
+
+        migrate_database(db_path)
+        migrate_database(db_path)
+
+        conn = sqlite3.connect(db_path)
+        keys = conn.execute("SELECT normalized_name FROM leads ORDER BY id").fetchall()
+        indexes = [row[1] for row in conn.execute("PRAGMA index_list(leads)")]
+        conn.close()
+        assert keys == [("acme roofing",), ("acme roofing",)]
+        assert "ix_leads_normalized_name_location" in indexes
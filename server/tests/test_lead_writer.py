@@ -0,0 +1,237 @@
+"""
+Unit tests for the batched single database writer.
+Pattern: AAA (Arrange-Act-Assert).
+"""
+
+import threading
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from database import Base
+from models import Lead, LeadTimelineEntry
+from lead_writer import LeadWriter, run_write
+from database_operations import _write_lead, save_lead_to_database
+from lead_management import update_lead, delete_lead_by_id
+from schemas import LeadUpdate
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    factory.commits = 0
+
+    @event.listens_for(factory, "after_commit")
+    def count_commit(session):
+        factory.commits += 1
+
+    yield factory
+    engine.dispose()
+
+
+def lead_write(name):
+    details = {"name": name, "location": "Omaha", "industry": "painter", "rating": 4.5, "reviews": 12}
+    return lambda db: _write_lead(db, details)
+
+
+class TestLeadWriter:
+    """Coalescing, in-batch dedupe and failure isolation."""
+
+    def test_concurrent_saves_share_transactions(self, session_factory):
+        writer = LeadWriter(session_factory, batch_size=50, flush_interval_ms=100)
+        results = []
+
+        def save(i):
+            results.append(writer.submit(lead_write(f"Painter {i}")).result(5))
+
+        threads = [threading.Thread(target=save, args=(i,)) for i in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        writer.close()
+
+        db = session_factory()
+        assert db.query(Lead).count() == 20
+        assert db.query(LeadTimelineEntry).count() == 20
+        db.close()
+        assert len({result["lead_id"] for result in results}) == 20
+        assert session_factory.commits < 20
+        assert writer.get_stats()["writes"] == 20
+
+    def test_duplicate_within_one_batch_resolves_to_same_lead(self, session_factory):
+        writer = LeadWriter(session_factory, batch_size=2, flush_interval_ms=1000)
+
+        first = writer.submit(lead_write("Bob's Painting"))
+        second = writer.submit(lead_write("BOB'S PAINTING"))
+
+        assert first.result(5)["created"] is True
+        assert second.result(5) == {"lead_id": first.result()["lead_id"], "created": False}
+        assert session_factory.commits == 1
+        writer.close()
+
+    def test_failing_write_does_not_sink_the_batch(self, session_factory):
+        writer = LeadWriter(session_factory, batch_size=3, flush_interval_ms=1000)
+
+        def broken(db):
+            raise ValueError("bad row")
+
+        good = writer.submit(lead_write("Good Painter"))
+        bad = writer.submit(broken)
+        other = writer.submit(lead_write("Other Painter"))
+
+        assert good.result(5)["created"] is True
+        assert other.result(5)["created"] is True
+        with pytest.raises(ValueError):
+            bad.result(5)
+        assert writer.get_stats()["fallback_batches"] == 1
+        writer.close()
+
+
+class TestSaveLeadToDatabase:
+    """save_lead_to_database goes through the writer and returns the lead ID."""
+
+    def test_returns_lead_id_for_new_and_duplicate(self, session_factory, monkeypatch):
+        writer = LeadWriter(session_factory, batch_size=10, flush_interval_ms=10)
+        monkeypatch.setattr("lead_writer.get_lead_writer", lambda: writer)
+        monkeypatch.setattr("place_seen_set.get_place_seen_set", Mock())
+        monkeypatch.setattr("websocket_manager.pagespeed_websocket_manager", Mock())
+
+        lead_id = save_lead_to_database({"name": "Shlee Painting", "url": "https://maps/place/1"}, job_id="job-w")
+        duplicate_id = save_lead_to_database({"name": "shlee painting"}, job_id="job-w")
+
+        assert lead_id is not None
+        assert duplicate_id == lead_id
+        writer.close()
+
+
+class TestWriteQueueMetrics:
+    """Queue depth and wait time are reported; writes cannot queue writes."""
+
+    def test_reports_queue_wait_and_depth(self, session_factory):
+        writer = LeadWriter(session_factory, batch_size=5, flush_interval_ms=100)
+
+        futures = [writer.submit(lead_write(f"Waiting Painter {i}")) for i in range(5)]
+        for future in futures:
+            future.result(5)
+        stats = writer.get_stats()
+        writer.close()
+
+        assert stats["peak_queue_depth"] >= 1
+        assert stats["max_wait_ms"] >= stats["avg_wait_ms"] > 0
+        assert "wait_ms_total" not in stats
+
+    def test_nested_submit_fails_instead_of_deadlocking(self, session_factory):
+        writer = LeadWriter(session_factory, batch_size=1, flush_interval_ms=10)
+
+        nested = writer.submit(lambda db: writer.submit(lead_write("Nested Painter")))
+
+        with pytest.raises(RuntimeError):
+            nested.result(5)
+        writer.close()
+
+
+class TestSharedWriterCallers:
+    """run_write and the lead_management API edits commit through the shared writer."""
+
+    @pytest.fixture
+    def writer(self, session_factory, monkeypatch):
+        writer = LeadWriter(session_factory, batch_size=10, flush_interval_ms=10)
+        monkeypatch.setattr("lead_writer.get_lead_writer", lambda: writer)
+        yield writer
+        writer.close()
+
+    def test_update_lead_returns_response_with_new_timeline_entry(self, session_factory, writer):
+        lead_id = run_write(lead_write("Status Painter"))["lead_id"]
+
+        response = update_lead(lead_id, LeadUpdate(status="called"))
+
+        assert response.status == "called"
+        assert any(entry.title == "Status changed to CALLED" for entry in response.timeline)
+        assert writer.get_stats()["writes"] == 2
+
+    def test_delete_lead_through_writer(self, session_factory, writer):
+        lead_id = run_write(lead_write("Doomed Painter"))["lead_id"]
+
+        assert delete_lead_by_id(lead_id) is True
+        assert delete_lead_by_id(lead_id) is False
+        db = session_factory()
+        assert db.query(Lead).count() == 0
+        db.close()
+
+    def test_run_write_without_writer_commits_directly(self, session_factory, monkeypatch):
+        monkeypatch.setattr("lead_writer.get_lead_writer", lambda: None)
+        monkeypatch.setattr("database.SessionLocal", session_factory)
+
+        saved = run_write(lead_write("Direct Painter"))
+
+        assert saved["created"] is True
+        assert session_factory.commits == 1
+
+
+class TestBlacklistInWriterBatch:
+    """A failing blacklist insert inside a batch must not roll back other writes."""
+
+    def test_flush_error_is_raised_not_rolled_back(self, session_factory):
+        from blacklist_manager import BlacklistManager
+
+        db = session_factory()
+        _write_lead(db, {"name": "Batch Neighbour", "location": "Omaha"})
+        manager = BlacklistManager(db)
+        db.flush = Mock(side_effect=ValueError("flush failed"))
+
+        with pytest.raises(ValueError):
+            manager.add_to_blacklist("Bad Business", commit=False)
+
+        del db.flush
+        db.commit()
+        db.close()
+        check = session_factory()
+        assert check.query(Lead).filter(Lead.business_name == "Batch Neighbour").count() == 1
+        check.close()
+
+
+class TestApiWritesThroughWriter:
+    """main.py's edit endpoints commit on the shared writer and reject without sinking its batch."""
+
+    @pytest.fixture
+    def writer(self, session_factory, monkeypatch):
+        writer = LeadWriter(session_factory, batch_size=10, flush_interval_ms=10)
+        monkeypatch.setattr("lead_writer.get_lead_writer", lambda: writer)
+        yield writer
+        writer.close()
+
+    def test_sales_pitch_rejection_is_returned_not_rolled_back(self, session_factory, writer):
+        import main
+        from fastapi import HTTPException
+        from schemas import SalesPitchCreate
+
+        pitch = main.create_sales_pitch(SalesPitchCreate(name="Speed", content="Your site is slow"))
+        main.create_sales_pitch(SalesPitchCreate(name="Reviews", content="Great reviews"))
+
+        with pytest.raises(HTTPException) as rejected:
+            main.delete_sales_pitch(pitch.id)
+
+        assert rejected.value.status_code == 400
+        assert pitch.name == "Speed"
+        stats = writer.get_stats()
+        assert stats["fallback_batches"] == 0
+        assert stats["failed_writes"] == 0
+
+    def test_blacklist_endpoints_commit_through_writer(self, session_factory, writer):
+        import main
+        from models import BlacklistedBusiness
+
+        assert main.add_to_blacklist("Big Chain Painting")["success"] is True
+        assert main.add_to_blacklist("Big Chain Painting")["success"] is False
+        assert main.remove_from_blacklist("Big Chain Painting")["success"] is True
+
+        db = session_factory()
+        assert db.query(BlacklistedBusiness).count() == 0
+        db.close()
+        assert writer.get_stats()["writes"] == 3
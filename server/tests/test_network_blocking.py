@@ -0,0 +1,123 @@
+"""
+Unit tests for CDP network request blocking profiles and savings reporting.
+Pattern: AAA (Arrange-Act-Assert) with a mocked driver.
+"""
+
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from browser_setup import BrowserSetup
+from network_blocking import NetworkBlocker, BLOCKING_PROFILES, ESTIMATED_BYTES_BY_TYPE, execute_cdp
+
+
+def perf_entry(method, **params):
+    return {"message": json.dumps({"message": {"method": method, "params": params}})}
+
+
+class TestBlockingProfiles:
+    """Profile contents and application over CDP."""
+
+    def test_profiles_keep_feed_requests(self):
+        from fnmatch import fnmatch
+        feed_urls = [
+            "https://www.google.com/search?tbm=map&authuser=0&hl=en&pb=!4m12!1m3!1d5",
+            "https://www.google.com/maps/preview/place?authuser=0&hl=en&pb=!1m17",
+        ]
+        for profile, patterns in BLOCKING_PROFILES.items():
+            for url in feed_urls:
+                assert not any(fnmatch(url, pattern) for pattern in patterns), (profile, url)
+
+    def test_apply_sets_blocked_urls_on_remote_session(self):
+        driver = Mock(spec=["execute", "command_executor"])
+        driver.command_executor._commands = {}
+        driver.execute.return_value = {"value": {}}
+
+        applied = NetworkBlocker(driver, "lean").apply()
+
+        assert applied is True
+        assert "executeCdpCommand" in driver.command_executor._commands
+        driver.execute.assert_called_with(
+            "executeCdpCommand", {"cmd": "Network.setBlockedURLs", "params": {"urls": BLOCKING_PROFILES["lean"]}}
+        )
+
+    def test_local_driver_uses_execute_cdp_cmd(self):
+        driver = Mock()
+
+        execute_cdp(driver, "Network.enable")
+
+        driver.execute_cdp_cmd.assert_called_once_with("Network.enable", {})
+
+    def test_default_profile_only_blocks_tracking(self, monkeypatch):
+        monkeypatch.delenv("BROWSER_BLOCKING_PROFILE", raising=False)
+
+        assert BrowserSetup().blocking_profile == "tracking"
+        assert BrowserSetup(use_profile=True).blocking_profile == "tracking"
+        assert BrowserSetup(blocking_profile="standard").blocking_profile == "standard"
+
+    def test_unknown_profile_rejected(self):
+        with pytest.raises(ValueError):
+            NetworkBlocker(Mock()).apply("everything")
+
+
+class TestSavingsReport:
+    """Performance log tallying."""
+
+    def test_blocked_and_loaded_requests_are_counted(self):
+        driver = Mock()
+        driver.get_log.return_value = [
+            perf_entry("Network.requestWillBeSent", requestId="1", type="Font"),
+            perf_entry("Network.loadingFailed", requestId="1", blockedReason="inspector"),
+            perf_entry("Network.requestWillBeSent", requestId="2", type="XHR"),
+            perf_entry("Network.loadingFinished", requestId="2", encodedDataLength=4096),
+            perf_entry("Network.loadingFailed", requestId="3", type="Image", blockedReason="inspector"),
+            perf_entry("Network.loadingFailed", requestId="4", errorText="net::ERR_ABORTED"),
+            {"message": "not json"},
+        ]
+        blocker = NetworkBlocker(driver, "standard")
+
+        stats = blocker.collect()
+
+        assert stats["requests_blocked"] == 2
+        assert stats["blocked_by_type"] == {"Font": 1, "Image": 1}
+        assert stats["estimated_bytes_saved"] == ESTIMATED_BYTES_BY_TYPE["Font"] + ESTIMATED_BYTES_BY_TYPE["Image"]
+        assert stats["requests_loaded"] == 1
+        assert stats["bytes_loaded"] == 4096
+
+    def test_reset_starts_a_new_job_from_zero(self):
+        driver = Mock()
+        driver.get_log.return_value = [perf_entry("Network.loadingFailed", requestId="1", type="Ping", blockedReason="inspector")]
+        blocker = NetworkBlocker(driver, "standard")
+        blocker.collect()
+
+        blocker.reset_stats()
+
+        assert blocker.get_stats()["requests_blocked"] == 0
+        assert blocker.get_stats()["profile"] == "standard"
+
+    def test_log_is_drained_periodically_across_requests_in_flight(self):
+        driver = Mock()
+        driver.get_log.side_effect = [
+            [perf_entry("Network.requestWillBeSent", requestId="1", type="Font")],
+            [perf_entry("Network.loadingFailed", requestId="1", blockedReason="inspector")],
+        ]
+        blocker = NetworkBlocker(driver)
+
+        blocker.collect_if_due(interval=60)
+        blocker.collect_if_due(interval=0)
+        blocker.collect_if_due(interval=0)
+
+        assert driver.get_log.call_count == 2
+        assert blocker.get_stats()["blocked_by_type"] == {"Font": 1}
+
+    def test_tabs_sharing_a_blocker_drain_once_per_interval(self):
+        driver = Mock()
+        driver.get_log.return_value = []
+        blocker = NetworkBlocker(driver)
+        blocker.last_collected_at = 0
+
+        for _ in range(3):  # One call per tab's search iteration
+            blocker.collect_if_due(interval=60)
+
+        assert driver.get_log.call_count == 1
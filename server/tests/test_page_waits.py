@@ -0,0 +1,116 @@
+"""
+Unit tests for PageWaiter condition-driven waits.
+Pattern: AAA (Arrange-Act-Assert) with a mocked driver.
+"""
+
+import time
+from unittest.mock import Mock
+
+from page_waits import PageWaiter, WAIT_CEILINGS, FEED_LENGTH_SCRIPT, FEED_STATE_SCRIPT, END_OF_LIST_SCRIPT
+from screenshot_manager import ScreenshotManager
+
+
+def scripted_driver(feed_lengths, end_of_list=False):
+    """Driver whose feed grows through feed_lengths on successive polls"""
+    lengths = iter(feed_lengths)
+    last = {'length': 0}
+
+    def execute_script(script, *args):
+        if script == FEED_LENGTH_SCRIPT:
+            last['length'] = next(lengths, last['length'])
+            return last['length']
+        if script == END_OF_LIST_SCRIPT:
+            return end_of_list
+        return None
+
+    driver = Mock()
+    driver.execute_script.side_effect = execute_script
+    return driver
+
+
+class TestPageWaiter:
+    """Ceilings, early return and metrics."""
+
+    def test_feed_growth_returns_as_soon_as_cards_arrive(self):
+        waiter = PageWaiter(scripted_driver([10, 10, 13]))
+
+        start = time.perf_counter()
+        grew = waiter.wait_for_feed_growth(10)
+
+        assert grew is True
+        assert time.perf_counter() - start < 1.0
+        assert waiter.get_metrics()['feed_growth']['count'] == 1
+        assert waiter.get_metrics()['feed_growth']['timeouts'] == 0
+
+    def test_end_of_list_sentinel_ends_feed_wait(self):
+        waiter = PageWaiter(scripted_driver([20], end_of_list=True))
+
+        assert waiter.wait_for_feed_growth(20) is True
+
+    def test_ceiling_bounds_wait_and_counts_timeout(self):
+        waiter = PageWaiter(scripted_driver([5]), ceilings={'feed_growth': 0.3})
+
+        start = time.perf_counter()
+        grew = waiter.wait_for_feed_growth(5)
+        elapsed = time.perf_counter() - start
+
+        assert grew is False
+        assert 0.3 <= elapsed < 1.5
+        metrics = waiter.get_metrics()['feed_growth']
+        assert metrics['timeouts'] == 1
+        assert metrics['max_seconds'] >= 0.3
+
+    def test_configure_overrides_only_given_ceilings(self):
+        waiter = PageWaiter(Mock())
+
+        waiter.configure({'results': 1})
+
+        assert waiter.ceilings['results'] == 1.0
+        assert waiter.ceilings['feed_growth'] == WAIT_CEILINGS['feed_growth']
+
+    def test_script_errors_count_as_empty_feed(self):
+        driver = Mock()
+        driver.execute_script.side_effect = Exception("no such window")
+
+        assert PageWaiter(driver).feed_length() == 0
+
+    def test_results_wait_ignores_the_stale_feed_after_an_expansion(self):
+        states = iter(["20|place/a|place/t", "20|place/a|place/t", "20|place/u|place/z"])
+        driver = Mock()
+        driver.execute_script.side_effect = lambda script, *args: (
+            next(states) if script == FEED_STATE_SCRIPT else 20 if script == FEED_LENGTH_SCRIPT else False
+        )
+        waiter = PageWaiter(driver)
+
+        loaded = waiter.wait_for_results('expansion_results', previous_state="20|place/a|place/t")
+
+        assert loaded is True
+        feed_state_polls = [call for call in driver.execute_script.call_args_list if call.args[0] == FEED_STATE_SCRIPT]
+        assert len(feed_state_polls) == 3
+
+    def test_results_wait_times_out_while_feed_is_unchanged(self):
+        driver = Mock()
+        driver.execute_script.side_effect = lambda script, *args: (
+            "20|place/a|place/t" if script == FEED_STATE_SCRIPT else 20 if script == FEED_LENGTH_SCRIPT else False
+        )
+        waiter = PageWaiter(driver, ceilings={'expansion_results': 0.2})
+
+        assert waiter.wait_for_results('expansion_results', previous_state="20|place/a|place/t") is False
+
+
+class TestScreenshotWaits:
+    """take_business_screenshot waits on the element instead of sleeping."""
+
+    def test_business_screenshot_waits_for_element_in_view(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        driver = Mock()
+        driver.save_screenshot.return_value = True
+        waiter = Mock()
+        manager = ScreenshotManager(driver, page_waiter=waiter)
+        element = Mock()
+        element.get_attribute.return_value = ""
+
+        filename = manager.take_business_screenshot("Shlee Painting", element)
+
+        waiter.wait_for_element_in_view.assert_called_once_with(element)
+        assert "business_shlee_painting" in filename
@@ -0,0 +1,89 @@
+"""
+Unit tests for pipelined scrolling (next page prefetched while a batch is processed).
+Pattern: AAA (Arrange-Act-Assert).
+"""
+
+from unittest.mock import Mock
+
+from feed_pruner import FeedPruner
+from maps_search_engine import MapsSearchEngine
+from search_area_manager import SearchAreaManager
+
+
+class TestPrefetchNextPage:
+    """SearchAreaManager.prefetch_next_page."""
+
+    def test_returns_feed_length_before_scroll(self):
+        driver = Mock()
+        driver.execute_script.return_value = 20
+
+        assert SearchAreaManager(driver, page_waiter=Mock()).prefetch_next_page() == 20
+
+    def test_returns_none_without_feed(self):
+        driver = Mock()
+        driver.execute_script.return_value = -1
+
+        assert SearchAreaManager(driver, page_waiter=Mock()).prefetch_next_page() is None
+
+    def test_script_error_returns_none(self):
+        driver = Mock()
+        driver.execute_script.side_effect = Exception("no such window")
+
+        assert SearchAreaManager(driver, page_waiter=Mock()).prefetch_next_page() is None
+
+
+class TestPipelinedIteration:
+    """_iterate_through_results overlaps the next page load with processing."""
+
+    def setup_method(self):
+        self.engine = MapsSearchEngine(Mock(), None, Mock())
+        self.engine.pipelined_scroll = True
+        self.engine.waiter = Mock()
+        self.engine._get_business_elements = Mock(side_effect=[[Mock()], [Mock()], []])
+        self.calls = []
+        self.engine.search_area_manager.prefetch_next_page.side_effect = lambda: self.calls.append("prefetch") or 20
+        self.engine.search_area_manager.scroll_results_panel.return_value = True
+        self.engine._process_business_elements = Mock(side_effect=lambda *args: self.calls.append("process") or 1)
+
+    def iterate(self):
+        self.engine._iterate_through_results(
+            [], set(), set(), "painters", 5, 0.0, 0, None, None, None, None, False
+        )
+
+    def test_prefetch_starts_before_batch_is_processed(self):
+        self.engine.waiter.wait_for_feed_growth.return_value = True
+
+        self.iterate()
+
+        assert self.calls[:2] == ["prefetch", "process"]
+        self.engine.waiter.wait_for_feed_growth.assert_called_with(20)
+        self.engine.search_area_manager.scroll_results_panel.assert_not_called()
+
+    def test_falls_back_to_scroll_when_feed_did_not_grow(self):
+        self.engine.waiter.wait_for_feed_growth.return_value = False
+
+        self.iterate()
+
+        assert self.engine.search_area_manager.scroll_results_panel.call_count == 2
+
+    def test_pipeline_is_opt_in(self):
+        assert MapsSearchEngine(Mock(), None, Mock()).pipelined_scroll is False
+
+    def test_disabled_pipeline_only_scrolls(self):
+        self.engine.pipelined_scroll = False
+
+        self.iterate()
+
+        self.engine.search_area_manager.prefetch_next_page.assert_not_called()
+        assert self.engine.search_area_manager.scroll_results_panel.call_count == 2
+
+    def test_prefetched_growth_is_measured_after_pruning(self):
+        self.engine.prune_feed = True
+        self.engine.feed_pruner = FeedPruner(self.engine.driver, keep_recent=0)
+        self.engine.driver.execute_script.return_value = 1  # One card pruned per batch
+        self.engine.waiter.wait_for_feed_growth.return_value = True
+
+        self.iterate()
+
+        self.engine.waiter.wait_for_feed_growth.assert_called_with(19)
+        self.engine.search_area_manager.scroll_results_panel.assert_not_called()
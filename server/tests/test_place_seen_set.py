@@ -0,0 +1,93 @@
+"""
+Unit tests for the place-ID seen-set and the engine's known-place skip.
+Pattern: AAA (Arrange-Act-Assert).
+"""
+
+from unittest.mock import Mock, patch
+
+from business_extractor_utils import BusinessExtractorUtils
+from place_seen_set import BloomFilter, PlaceSeenSet
+from maps_search_engine import MapsSearchEngine
+
+
+KNOWN_URL = ("https://www.google.com/maps/place/Papillion+Barbers/data=!4m7!3m6!1s0x87938ae6c037ff95:0xac31e8497c63f57d"
+             "!8m2!3d41.1566151!4d-96.0427488!16s%2Fg%2F1tp2_wny!19sChIJlf83wOaKk4cRffVjfEnoMaw?authuser=0&hl=en")
+NEW_URL = ("https://www.google.com/maps/place/Shlee+Painting/data=!4m7!3m6!1s0x87938d3e9c2b1a01:0x5d1c2b3a4e5f6071"
+           "!8m2!3d41.2!4d-96.1!19sChIJAQEbLJyNk4cRcWBfTjorHF0?authuser=0&hl=en")
+
+
+class TestPlaceIds:
+    """Canonical place ID parsing."""
+
+    def test_feature_id_preferred(self):
+        assert BusinessExtractorUtils.get_place_id(KNOWN_URL) == "0x87938ae6c037ff95:0xac31e8497c63f57d"
+
+    def test_chij_fallback_and_non_place_urls(self):
+        assert BusinessExtractorUtils.get_place_id(
+            "https://www.google.com/maps/place/X/data=!19sChIJlf83wOaKk4cRffVjfEnoMaw") == "ChIJlf83wOaKk4cRffVjfEnoMaw"
+        assert BusinessExtractorUtils.get_place_id("https://www.google.com/search?q=x") is None
+        assert BusinessExtractorUtils.get_place_id(None) is None
+
+
+class TestPlaceSeenSet:
+    """Bloom filter plus exact set."""
+
+    def test_bloom_has_no_false_negatives(self):
+        bloom = BloomFilter(capacity=1000)
+        values = [f"0x{i:x}:0x{i * 7:x}" for i in range(1000)]
+
+        for value in values:
+            bloom.add(value)
+
+        assert all(value in bloom for value in values)
+
+    def test_known_places_from_profile_urls(self):
+        seen = PlaceSeenSet()
+
+        seen.load([KNOWN_URL, None, "https://example.com"])
+
+        assert len(seen) == 1
+        assert seen.contains(BusinessExtractorUtils.get_place_id(KNOWN_URL)) is True
+        assert seen.contains(BusinessExtractorUtils.get_place_id(NEW_URL)) is False
+        assert seen.contains(None) is False
+
+    def test_added_leads_become_known(self):
+        seen = PlaceSeenSet()
+        seen.load([])
+
+        seen.add_url(NEW_URL)
+
+        assert seen.contains(BusinessExtractorUtils.get_place_id(NEW_URL)) is True
+
+
+class TestEngineSkipsKnownPlaces:
+    """MapsSearchEngine checks the seen-set before extraction."""
+
+    def card(self, href):
+        element = Mock()
+        element.find_element.return_value.get_attribute.return_value = href
+        return element
+
+    def test_known_place_skipped_before_extraction(self):
+        engine = MapsSearchEngine(Mock(), None, None)
+        engine.seen_places = PlaceSeenSet()
+        engine.seen_places.load([KNOWN_URL])
+        results = []
+
+        with patch("business_extractor.extract_business_details") as extract:
+            engine._process_business_elements(
+                [self.card(KNOWN_URL)], results, set(), set(), "barbers", 5, 0.0, 0,
+                None, None, None, None, False
+            )
+
+        extract.assert_not_called()
+        assert results == []
+        assert engine.known_places_skipped == 1
+
+    def test_skip_can_be_disabled(self):
+        engine = MapsSearchEngine(Mock(), None, None)
+        engine.seen_places = PlaceSeenSet()
+        engine.seen_places.load([KNOWN_URL])
+        engine.skip_known_places = False
+
+        assert engine._is_known_place(engine._get_element_identifier(self.card(KNOWN_URL))) is False
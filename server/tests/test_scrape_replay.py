@@ -0,0 +1,140 @@
+"""
+Tests for the scrape replay server and feed-state recording.
+Pattern: AAA (Arrange-Act-Assert) over a real local HTTP server.
+"""
+
+import urllib.request
+import urllib.error
+from unittest.mock import Mock
+
+import pytest
+
+from scrape_replay import ReplaySession, ReplayServer, ReplayDatabase
+from maps_search_engine import MapsSearchEngine
+
+
+def feed(*names):
+    cards = "".join(
+        f'<div><div class="Nv2PK"><a class="hfpxzc" aria-label="{name}" '
+        f'href="https://www.google.com/maps/place/{name.replace(" ", "+")}/data=x"></a></div></div>'
+        for name in names
+    )
+    return f'<div role="feed" aria-label="Results">{cards}</div>'
+
+
+class TestReplaySession:
+    """Conversion of recorded feed states to scroll deltas."""
+
+    def test_cumulative_states_become_deltas(self):
+        session = ReplaySession([feed("A Plumbing"), feed("A Plumbing", "B Plumbing", "C Plumbing")])
+
+        assert [len(delta) for delta in session.deltas] == [1, 2]
+        assert "B Plumbing" in session.deltas[1][0]
+
+    def test_fixture_session_loads(self):
+        session = ReplaySession.from_fixtures()
+
+        assert len(session.deltas) == 4
+        assert all(session.deltas)
+
+    def test_recording_round_trip(self, tmp_path):
+        driver = Mock()
+        feed_element = Mock()
+        driver.find_element.return_value = feed_element
+        engine = MapsSearchEngine(driver, None, None)
+        engine.recording_dir = str(tmp_path)
+
+        feed_element.get_attribute.return_value = feed("A Plumbing")
+        engine._record_feed_state(1, "plumbers in Omaha")
+        feed_element.get_attribute.return_value = feed("A Plumbing", "B Plumbing")
+        engine._record_feed_state(2, "plumbers in Omaha")
+        session = ReplaySession.from_directory(tmp_path)
+
+        assert session.query == "plumbers in Omaha"
+        assert [len(delta) for delta in session.deltas] == [1, 1]
+
+    def test_empty_recording_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            ReplaySession.from_directory(tmp_path)
+
+
+class TestReplayServer:
+    """HTTP endpoints used by the replay shell page."""
+
+    def setup_method(self):
+        session = ReplaySession([feed("A Plumbing"), feed("A Plumbing", "B Plumbing")])
+        self.server = ReplayServer(session, host="127.0.0.1", public_host="127.0.0.1").start()
+
+    def teardown_method(self):
+        self.server.stop()
+
+    def fetch(self, path):
+        base = self.server.url.rsplit("/maps", 1)[0]
+        with urllib.request.urlopen(base + path, timeout=5) as response:
+            return response.read().decode("utf-8")
+
+    def test_shell_page_has_search_box_and_feed(self):
+        page = self.fetch("/maps")
+
+        assert 'id="searchboxinput"' in page
+        assert "role=\"feed\"" in page
+        assert "var totalStates = 2;" in page
+
+    def test_feed_states_serve_only_new_cards(self):
+        assert "A Plumbing" in self.fetch("/feed/1")
+        second = self.fetch("/feed/2")
+        assert "B Plumbing" in second
+        assert "A Plumbing" not in second
+
+    def test_unknown_state_is_404(self):
+        with pytest.raises(urllib.error.HTTPError):
+            self.fetch("/feed/3")
+
+
+class TestReplayIsolation:
+    """Replays stay on loopback and out of the leads table."""
+
+    def test_server_binds_loopback_by_default(self, monkeypatch):
+        monkeypatch.setenv("REPLAY_PUBLIC_HOST", "10.0.0.5")
+        server = ReplayServer(ReplaySession([feed("A Plumbing")]))
+        try:
+            assert server._httpd.server_address[0] == "127.0.0.1"
+            assert server.url.startswith("http://127.0.0.1:")
+        finally:
+            server.stop()
+
+    def test_explicit_host_uses_public_host(self, monkeypatch):
+        monkeypatch.setenv("REPLAY_PUBLIC_HOST", "10.0.0.5")
+        server = ReplayServer(ReplaySession([feed("A Plumbing")]), host="0.0.0.0")
+        try:
+            assert server.url.startswith("http://10.0.0.5:")
+        finally:
+            server.stop()
+
+    def test_replay_saves_through_the_real_save_path(self, monkeypatch):
+        names = iter(["A Plumbing", "A Plumbing LLC", "B Plumbing"])
+        engine = MapsSearchEngine(Mock(), None, None)
+        engine.waiter = Mock()
+        engine._get_element_identifier = Mock(side_effect=lambda element: element.name)
+        engine._get_snapshot_details = Mock(side_effect=lambda element, element_id: {
+            "name": next(names), "rating": 4.8, "reviews": 20, "location": "Omaha"})
+        monkeypatch.setattr("lead_writer.get_lead_writer", Mock(side_effect=AssertionError("used the shared writer")))
+        monkeypatch.setattr("maps_search_engine.get_blacklist_index", Mock(return_value=Mock(is_blacklisted=Mock(return_value=False))))
+        elements = [Mock(), Mock(), Mock()]
+        for index, element in enumerate(elements):
+            element.name = f"card-{index}"
+        results = []
+
+        with ReplayDatabase() as replay_db:
+            engine.save_lead = replay_db.save_lead
+            engine._process_business_elements(
+                elements, results, set(), set(), "plumbers in Omaha", 10, 0, 0, None,
+                None, None, None, False
+            )
+            saved = replay_db.leads()
+
+        by_name = {lead["business_name"]: lead for lead in saved}
+        assert sorted(by_name) == ["A Plumbing", "B Plumbing"]
+        assert by_name["A Plumbing"]["normalized_name"] == "a plumbing"
+        assert all(lead["timeline_entries"] == 1 for lead in saved)
+        assert results[1]["lead_id"] == by_name["A Plumbing"]["id"]
@@ -0,0 +1,165 @@
+"""
+Unit tests for search checkpoints and resume.
+Pattern: AAA (Arrange-Act-Assert) with checkpoints in a temp directory.
+"""
+
+import inspect
+import json
+import time
+from unittest.mock import Mock, PropertyMock
+
+import pytest
+
+import search_checkpoint
+from search_checkpoint import CheckpointStore
+from maps_search_engine import MapsSearchEngine
+from browser_automation import BrowserAutomation
+from schemas import BrowserAutomationRequest
+
+
+QUERY = "painters in Omaha"
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CheckpointStore(str(tmp_path / "checkpoints"))
+
+
+def make_engine(store, job_id="job-1"):
+    engine = MapsSearchEngine(Mock(), None, Mock(), job_id)
+    engine.checkpoint_store = store
+    engine.search_started_at = time.time()
+    return engine
+
+
+class TestCheckpointStore:
+    """Atomic JSON persistence."""
+
+    def test_round_trip_and_delete(self, store):
+        store.save("job-1", {"query": QUERY, "scroll_depth": 4})
+
+        state = store.load("job-1")
+        store.delete("job-1")
+
+        assert state["scroll_depth"] == 4
+        assert state["job_id"] == "job-1"
+        assert store.load("job-1") is None
+        assert not list(store.directory.glob("*.tmp"))
+
+    def test_stale_or_foreign_checkpoints_are_ignored(self, store):
+        store.save("old", {"query": QUERY})
+        state = json.loads((store.directory / "old.json").read_text())
+        state["saved_at"] -= 2 * search_checkpoint.MAX_CHECKPOINT_AGE
+        (store.directory / "old.json").write_text(json.dumps(state))
+        (store.directory / "foreign.json").write_text(json.dumps({"version": 99}))
+        (store.directory / "broken.json").write_text("{not json")
+
+        assert store.load("old") is None
+        assert store.load("foreign") is None
+        assert store.load("broken") is None
+
+    def test_docker_default_is_the_shared_db_volume(self, monkeypatch):
+        monkeypatch.delenv("CHECKPOINT_DIR", raising=False)
+        monkeypatch.setenv("USE_DOCKER", "1")
+
+        assert search_checkpoint.default_checkpoint_dir() == "/app/db/checkpoints"
+
+    def test_checkpoint_dir_overrides_default(self, monkeypatch):
+        monkeypatch.setenv("CHECKPOINT_DIR", "/shared/checkpoints")
+        monkeypatch.setenv("USE_DOCKER", "1")
+
+        assert search_checkpoint.default_checkpoint_dir() == "/shared/checkpoints"
+
+
+class TestEngineResume:
+    """Saving traversal state and restoring it in a fresh engine."""
+
+    def test_resume_restores_state_and_fast_forwards(self, store):
+        first = make_engine(store)
+        first.processed_element_ids = {"Bob's Painting", "Ace Painters"}
+        first.last_processed_element_id = "Ace Painters"
+        first.business_counter = 2
+        first.scroll_depth, first.expansions_done = 5, 1
+        first._save_checkpoint(QUERY, [{"name": "Bob's Painting", "lead_id": "1"}], {"Bob's Painting"},
+                               {"Bob's Painting", "Ace Painters"})
+
+        second = make_engine(store)
+        results, processed_names, evaluated = [], set(), set()
+        start_time = second._resume_from_checkpoint(QUERY, results, processed_names, evaluated, time.time())
+
+        assert results == [{"name": "Bob's Painting", "lead_id": "1"}]
+        assert evaluated == {"Bob's Painting", "Ace Painters"}
+        assert second.processed_element_ids == {"Bob's Painting", "Ace Painters"}
+        assert second.last_processed_element_id == "Ace Painters"
+        assert second.business_counter == 2
+        assert second.resume_position == (5, 1)
+        assert second.search_area_manager.expand_search_area.call_count == 1
+        assert second.search_area_manager.scroll_results_panel.call_count == 5
+        assert start_time <= time.time()
+
+    def test_different_query_starts_fresh(self, store):
+        make_engine(store)._save_checkpoint("plumbers in Omaha", [], set(), set())
+        engine = make_engine(store)
+        results = []
+
+        engine._resume_from_checkpoint(QUERY, results, set(), set(), time.time())
+
+        assert results == []
+        assert engine.resume_position == (0, 0)
+        engine.search_area_manager.scroll_results_panel.assert_not_called()
+
+    def test_clean_finish_deletes_checkpoint(self, store):
+        engine = make_engine(store)
+        engine._save_checkpoint(QUERY, [], set(), set())
+
+        engine._finish_checkpoint(QUERY, [], set(), set())
+
+        assert engine.session_lost is False
+        assert store.load("job-1") is None
+
+    def test_lost_session_keeps_checkpoint(self, store):
+        engine = make_engine(store)
+        type(engine.driver).current_url = PropertyMock(side_effect=Exception("invalid session id"))
+
+        engine._finish_checkpoint(QUERY, [{"name": "Bob's Painting"}], {"Bob's Painting"}, {"Bob's Painting"})
+
+        assert engine.session_lost is True
+        assert store.load("job-1")["results"] == [{"name": "Bob's Painting"}]
+
+    def test_checkpoint_written_at_most_once_per_interval(self, store):
+        engine = make_engine(store)
+        engine.checkpoint_interval = 60
+        store.save = Mock()
+
+        engine._maybe_checkpoint(QUERY, [], set(), set())
+        engine._maybe_checkpoint(QUERY, [], set(), set())
+
+        assert store.save.call_count == 1
+
+
+class TestJobSearchKwargs:
+    """Every job runner, including the Celery retry path, forwards the same search options."""
+
+    def test_request_covers_every_search_option(self):
+        params = BrowserAutomationRequest(industry="painters", location="Omaha")
+        accepted = set(inspect.signature(BrowserAutomation.search_google_maps).parameters)
+
+        kwargs = params.search_kwargs("painters in Omaha", "job-1")
+
+        # Click-through and the tile planner are runtime choices, not request options
+        assert set(kwargs) == accepted - {"self", "enable_click_through", "tile_planner"}
+
+    def test_checkpoint_default_matches_search_default(self):
+        params = BrowserAutomationRequest(industry="painters", location="Omaha")
+        default = inspect.signature(BrowserAutomation.search_google_maps).parameters["checkpoint"].default
+
+        assert params.search_kwargs("q")["checkpoint"] is default is True
+
+    def test_record_session_records_under_job_id(self):
+        params = BrowserAutomationRequest(industry="painters", location="Omaha", record_session=True,
+                                          min_photos=3, incremental_feed=True, wait_ceilings={"feed_growth": 2.5})
+
+        kwargs = params.search_kwargs("q", "job-1")
+
+        assert kwargs["recording_dir"] == "recordings/job-1"
+        assert (kwargs["min_photos"], kwargs["incremental_feed"], kwargs["wait_ceilings"]) == (3, True, {"feed_growth": 2.5})
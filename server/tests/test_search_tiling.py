@@ -0,0 +1,216 @@
+"""
+Unit tests for the geographic tiling search planner.
+Pattern: AAA (Arrange-Act-Assert).
+"""
+
+import threading
+from unittest.mock import Mock
+
+from search_tiling import TilePlanner, parse_viewport, spiral_offsets
+from maps_search_engine import MapsSearchEngine
+
+
+SEARCH_URL = "https://www.google.com/maps/search/painters+near+Omaha/@41.2565,-95.9345,12z/data=!3m1!4b1"
+
+
+class TestViewportAndLayout:
+    """Viewport parsing and spiral tile layout."""
+
+    def test_parse_viewport(self):
+        assert parse_viewport(SEARCH_URL) == (41.2565, -95.9345, 12.0)
+        assert parse_viewport("https://www.google.com/maps") is None
+        assert parse_viewport(None) is None
+
+    def test_spiral_is_center_first_and_unique(self):
+        offsets = spiral_offsets(2)
+
+        assert offsets[0] == (0, 0)
+        assert len(offsets) == 25
+        assert len(set(offsets)) == 25
+        assert all(max(abs(r), abs(c)) == 1 for r, c in offsets[1:9])
+
+    def test_tile_url_targets_tile_center(self):
+        planner = TilePlanner("painters near Omaha", max_rings=1)
+        planner.set_origin(41.25, -95.93, 12)
+
+        tile = planner.next_tile()
+
+        assert planner.tile_url(tile).startswith("https://www.google.com/maps/search/painters/@")
+        assert planner.tile_url(tile).endswith(",12z")
+        assert (tile.lat, tile.lng) != (41.25, -95.93)
+
+    def test_tile_url_leaves_location_out_of_query(self):
+        planner = TilePlanner("house painters in Omaha, NE", max_rings=1)
+        planner.set_origin(41.25, -95.93, 12)
+
+        url = planner.tile_url(planner.next_tile())
+
+        assert "/search/house+painters/@" in url
+        assert "Omaha" not in url
+
+
+class TestTilePlanner:
+    """Scheduling, yield tracking and stop conditions."""
+
+    def test_first_caller_claims_center_tile(self):
+        planner = TilePlanner("q", max_rings=1)
+
+        center = planner.set_origin_from_url(SEARCH_URL)
+        second = planner.set_origin(0, 0, 10)
+
+        assert (center.row, center.col) == (0, 0)
+        assert center.status == "searching"
+        assert second is None
+        assert len(planner.tiles) == 9
+        assert planner.wait_for_origin(timeout=0)
+
+    def test_stops_after_low_yield_streak(self):
+        planner = TilePlanner("q", max_rings=2, patience=3)
+        tile = planner.set_origin(41.0, -96.0, 13)
+
+        visited = 0
+        while tile is not None:
+            planner.record(tile, evaluated=20, new_leads=0)
+            planner.complete(tile)
+            visited += 1
+            tile = planner.next_tile()
+
+        assert visited == 3
+        assert "consecutive tiles" in planner.stop_reason
+
+    def test_productive_tile_resets_streak(self):
+        planner = TilePlanner("q", max_rings=1, patience=2)
+        center = planner.set_origin(41.0, -96.0, 13)
+        planner.complete(center)
+        tile = planner.next_tile()
+
+        planner.record(tile, evaluated=10, new_leads=4)
+        planner.complete(tile)
+
+        assert planner.low_yield_streak == 0
+        assert planner.next_tile() is not None
+
+    def test_stops_at_shared_lead_limit(self):
+        planner = TilePlanner("q", max_rings=1, lead_limit=5)
+        center = planner.set_origin(41.0, -96.0, 13)
+
+        planner.record(center, evaluated=12, new_leads=5)
+
+        assert planner.limit_reached()
+        assert planner.next_tile() is None
+        assert planner.stop_reason == "lead limit reached"
+
+    def test_reservations_hand_out_remaining_quota(self):
+        planner = TilePlanner("q", max_rings=1, lead_limit=2)
+
+        claims = [planner.reserve_lead() for _ in range(3)]
+
+        assert claims == [True, True, False]
+        assert planner.limit_reached()
+
+    def test_released_reservation_can_be_claimed_again(self):
+        planner = TilePlanner("q", max_rings=1, lead_limit=1)
+        planner.reserve_lead()
+
+        planner.release_lead()
+
+        assert not planner.limit_reached()
+        assert planner.reserve_lead()
+
+    def test_concurrent_workers_never_share_a_tile(self):
+        planner = TilePlanner("q", max_rings=3, patience=100)
+        planner.set_origin(41.0, -96.0, 13)
+        claimed = []
+        lock = threading.Lock()
+
+        def worker():
+            while (tile := planner.next_tile()) is not None:
+                with lock:
+                    claimed.append((tile.row, tile.col))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(claimed) == 48
+        assert len(set(claimed)) == 48
+
+    def test_stop_releases_waiting_workers(self):
+        planner = TilePlanner("q")
+
+        planner.stop("initial search failed")
+
+        assert planner.wait_for_origin(timeout=0)
+        assert planner.next_tile() is None
+
+
+class TestEngineTileNavigation:
+    """The engine finishes a tile and navigates to the next one."""
+
+    def test_move_to_next_tile_navigates(self):
+        driver = Mock()
+        engine = MapsSearchEngine(driver, None, None)
+        engine.waiter = Mock()
+        engine.tile_planner = TilePlanner("painters", max_rings=1)
+        engine.current_tile = engine.tile_planner.set_origin(41.0, -96.0, 13)
+        engine.last_processed_element_id = "old"
+
+        moved = engine._move_to_next_tile()
+
+        assert moved is True
+        assert engine.tile_planner.tiles[0].status == "done"
+        assert engine.current_tile is engine.tile_planner.tiles[1]
+        driver.get.assert_called_once_with(engine.tile_planner.tile_url(engine.current_tile))
+        assert engine.last_processed_element_id is None
+
+
+class TestEngineTileQuota:
+    """Tile workers save no more leads than the shared job limit."""
+
+    def _engine(self, monkeypatch, planner, save_lead):
+        engine = MapsSearchEngine(Mock(), Mock(), None)
+        engine.waiter = Mock()
+        engine.tile_planner = planner
+        engine.current_tile = planner.set_origin(41.0, -96.0, 13)
+        engine._get_element_identifier = Mock(side_effect=lambda element: element.name)
+        engine._get_snapshot_details = Mock(side_effect=lambda name, click_through: {"name": name, "rating": 4.8, "reviews": 20})
+        engine.save_lead = save_lead
+        monkeypatch.setattr("maps_search_engine.get_blacklist_index", Mock(return_value=Mock(is_blacklisted=Mock(return_value=False))))
+        elements = []
+        for name in ["A Painting", "B Painting", "C Painting"]:
+            element = Mock()
+            element.name = name
+            elements.append(element)
+        return engine, elements
+
+    def test_worker_stops_saving_once_quota_is_claimed(self, monkeypatch):
+        planner = TilePlanner("painters", max_rings=1, lead_limit=2)
+        save_lead = Mock(return_value="lead-1")
+        engine, elements = self._engine(monkeypatch, planner, save_lead)
+        planner.reserve_lead()  # Another tile worker already claimed one lead
+        results = []
+
+        engine._process_business_elements(
+            elements, results, set(), set(), "painters in Omaha", 10, 0, 0, None,
+            None, None, None, False
+        )
+
+        assert save_lead.call_count == 1
+        assert [business["name"] for business in results] == ["A Painting"]
+        assert planner.limit_reached()
+
+    def test_failed_save_returns_its_reservation(self, monkeypatch):
+        planner = TilePlanner("painters", max_rings=1, lead_limit=1)
+        save_lead = Mock(side_effect=[None, "lead-2"])
+        engine, elements = self._engine(monkeypatch, planner, save_lead)
+        results = []
+
+        engine._process_business_elements(
+            elements, results, set(), set(), "painters in Omaha", 10, 0, 0, None,
+            None, None, None, False
+        )
+
+        assert save_lead.call_count == 2
+        assert [business["name"] for business in results] == ["B Painting"]
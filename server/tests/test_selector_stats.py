@@ -0,0 +1,84 @@
+"""
+Unit tests for adaptive selector ordering.
+Pattern: AAA (Arrange-Act-Assert).
+"""
+
+from unittest.mock import Mock
+
+import selector_stats
+from selector_stats import SelectorStats
+from business_extractor import StandardListingExtractor
+
+
+CHAIN = ["a[aria-label]", "div.qBF1Pd", "h3", "div", "span"]
+
+
+class TestSelectorStats:
+    """Ordering, decay and pinned fallbacks."""
+
+    def test_unknown_chain_keeps_original_order(self):
+        stats = SelectorStats()
+
+        assert stats.ordered("name", "standard", CHAIN) == CHAIN
+
+    def test_winner_moves_to_front(self):
+        stats = SelectorStats()
+
+        stats.record_chain("name", "standard", ["a[aria-label]", "div.qBF1Pd", "h3"], "h3")
+
+        assert stats.ordered("name", "standard", CHAIN)[0] == "h3"
+        assert stats.ordered("name", "compact", CHAIN) == CHAIN
+
+    def test_broad_fallbacks_stay_last(self):
+        stats = SelectorStats()
+
+        stats.record("name", "standard", "div", True)
+
+        assert stats.ordered("name", "standard", CHAIN, fixed_tail=2)[-2:] == ["div", "span"]
+
+    def test_stale_winner_decays_after_markup_change(self):
+        stats = SelectorStats(decay=0.8)
+        for _ in range(20):
+            stats.record("name", "standard", "div.qBF1Pd", True)
+
+        # Markup changed: the old winner now misses and h3 finds the name
+        rounds = 0
+        while stats.ordered("name", "standard", CHAIN)[0] != "h3":
+            stats.record_chain("name", "standard", ["div.qBF1Pd", "h3"], "h3")
+            rounds += 1
+
+        assert 0 < rounds <= 5
+
+    def test_stats_report_hits_and_misses(self):
+        stats = SelectorStats()
+
+        stats.record_chain("rating", "standard", ["span[role='img']", "[data-rating]"], "[data-rating]")
+
+        entries = stats.get_stats()["rating/standard"]
+        assert entries[0] == {"selector": "[data-rating]", "score": 0.2, "hits": 1, "misses": 0}
+        assert entries[1]["misses"] == 1
+
+
+class TestExtractorUsesStats:
+    """_extract_basic_info records winners and tries them first."""
+
+    def test_second_card_starts_with_previous_winner(self, monkeypatch):
+        stats = SelectorStats()
+        monkeypatch.setattr(selector_stats, "_selector_stats", stats)
+        name_elem = Mock(text="Bob's Painting")
+
+        def find_elements(by, selector):
+            return [name_elem] if selector == "div.qBF1Pd" else []
+
+        element = Mock()
+        element.find_elements.side_effect = find_elements
+        element.find_element.side_effect = Exception("missing")
+        extractor = StandardListingExtractor()
+
+        extractor._extract_basic_info(element)
+        element.find_elements.reset_mock()
+        details = extractor._extract_basic_info(element)
+
+        first_selector = element.find_elements.call_args_list[0].args[1]
+        assert details["name"] == "Bob's Painting"
+        assert first_selector == "div.qBF1Pd"
@@ -0,0 +1,122 @@
+"""
+Unit tests for per-stage timing spans and job profiles.
+Pattern: AAA (Arrange-Act-Assert).
+"""
+
+import time
+import threading
+from unittest.mock import Mock
+
+import stage_timing
+from stage_timing import StageTimer, get_job_timer, get_job_profile, get_job_flame_summary
+from maps_search_engine import MapsSearchEngine
+
+
+class TestStageTimer:
+    """Span recording, nesting and percentiles."""
+
+    def test_span_records_count_and_duration(self):
+        timer = StageTimer()
+
+        for _ in range(3):
+            with timer.span("save"):
+                time.sleep(0.01)
+
+        stats = timer.get_profile()["stages"]["save"]
+        assert stats["count"] == 3
+        assert stats["total_seconds"] >= 0.03
+        assert stats["p50_ms"] >= 10
+
+    def test_nested_span_excluded_from_parent_self_time(self):
+        timer = StageTimer()
+
+        with timer.span("extract"):
+            with timer.span("click_through"):
+                time.sleep(0.05)
+
+        stages = timer.get_profile()["stages"]
+        assert stages["extract"]["total_seconds"] >= 0.05
+        assert stages["extract"]["self_seconds"] < 0.02
+        assert stages["click_through"]["self_seconds"] >= 0.05
+
+    def test_percentiles_over_recorded_samples(self):
+        timer = StageTimer()
+
+        for ms in range(1, 101):
+            timer.record("scroll", ms / 1000)
+
+        stats = timer.get_profile()["stages"]["scroll"]
+        assert stats["p50_ms"] in (50.0, 51.0)
+        assert stats["p95_ms"] in (95.0, 96.0)
+        assert stats["max_ms"] == 100.0
+
+    def test_span_records_even_when_block_raises(self):
+        timer = StageTimer()
+
+        try:
+            with timer.span("screenshot"):
+                raise RuntimeError("stale element")
+        except RuntimeError:
+            pass
+
+        assert timer.get_profile()["stages"]["screenshot"]["count"] == 1
+
+    def test_flame_summary_orders_by_self_time(self):
+        timer = StageTimer()
+        timer.record("save", 0.1)
+        timer.record("search", 0.9)
+
+        summary = timer.get_flame_summary()
+
+        assert [entry["stage"] for entry in summary["stages"]] == ["search", "save"]
+        assert summary["stages"][0]["share_pct"] == 90.0
+
+
+class TestJobTimers:
+    """Process-wide per-job registry and the thread-bound span helper."""
+
+    def test_job_timer_is_shared_across_threads(self):
+        def work():
+            with get_job_timer("job-shared").span("extract"):
+                pass
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert get_job_profile("job-shared")["stages"]["extract"]["count"] == 4
+        assert get_job_flame_summary("unknown-job") is None
+
+    def test_module_span_uses_active_timer(self):
+        timer = StageTimer()
+
+        stage_timing.set_active_timer(timer)
+        try:
+            with stage_timing.span("click_through"):
+                pass
+        finally:
+            stage_timing.set_active_timer(None)
+        with stage_timing.span("click_through"):
+            pass
+
+        assert timer.get_profile()["stages"]["click_through"]["count"] == 1
+
+    def test_engine_times_blacklist_check_and_save(self, monkeypatch):
+        engine = MapsSearchEngine(Mock(), Mock(), None)
+        engine.waiter = Mock()
+        engine._get_element_identifier = Mock(return_value="Bob's Painting")
+        engine._get_snapshot_details = Mock(return_value={"name": "Bob's Painting", "rating": 4.8, "reviews": 20})
+        monkeypatch.setattr("maps_search_engine.save_lead_to_database", Mock(return_value="lead-1"))
+        monkeypatch.setattr("maps_search_engine.get_blacklist_index", Mock(return_value=Mock(is_blacklisted=Mock(return_value=False))))
+        results = []
+
+        engine._process_business_elements(
+            [Mock()], results, set(), set(), "painters in Omaha", 10, 0, 0, None,
+            None, None, None, False
+        )
+
+        stages = engine.timer.get_profile()["stages"]
+        assert len(results) == 1
+        assert {"extract", "blacklist_check", "screenshot", "save"} <= set(stages)
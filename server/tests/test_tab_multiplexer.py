@@ -0,0 +1,193 @@
+"""
+Unit tests for multi-tab concurrency inside one Chrome session.
+Pattern: AAA (Arrange-Act-Assert) with a fake WebDriver command endpoint.
+"""
+
+import threading
+from unittest.mock import Mock
+
+import pytest
+from selenium.webdriver.remote.command import Command
+
+import tab_multiplexer
+from tab_multiplexer import TabMultiplexer, TabbedBrowserGroup, NAVIGATION_DONE_SCRIPT
+from browser_automation import BrowserAutomation
+
+
+class FakeDriver:
+    """Records which tab each WebDriver command ran in"""
+
+    def __init__(self):
+        self.handles = ["main"]
+        self.current = "main"
+        self.commands = []
+
+    def execute(self, command, params=None):
+        if command == Command.W3C_GET_CURRENT_WINDOW_HANDLE:
+            return {"value": self.current}
+        if command == Command.NEW_WINDOW:
+            handle = f"tab{len(self.handles)}"
+            self.handles.append(handle)
+            return {"value": {"handle": handle, "type": "tab"}}
+        if command == Command.SWITCH_TO_WINDOW:
+            self.current = params["handle"]
+            return {"value": None}
+        if command == Command.CLOSE:
+            self.handles.remove(self.current)
+            return {"value": None}
+        self.commands.append((self.current, command, params))
+        if command == Command.W3C_EXECUTE_SCRIPT and params["script"] == NAVIGATION_DONE_SCRIPT:
+            return {"value": True}
+        return {"value": None}
+
+    def find_element(self, by, value):
+        return self.execute(Command.FIND_ELEMENT, {"using": by, "value": value})
+
+    def get(self, url):
+        self.execute(Command.GET, {"url": url})
+
+
+class FakeBrowserSetup:
+    def __init__(self, use_profile=False, headless=False):
+        self.driver = FakeDriver()
+        self.closed = False
+
+    def setup_browser(self):
+        return self.driver
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def fake_browser_setup(monkeypatch):
+    monkeypatch.setattr(tab_multiplexer, "BrowserSetup", FakeBrowserSetup)
+
+
+def run_in_thread(target):
+    thread = threading.Thread(target=target)
+    thread.start()
+    thread.join()
+
+
+class TestTabMultiplexer:
+    """Per-thread command routing."""
+
+    def test_thread_commands_run_in_its_tab(self):
+        driver = FakeDriver()
+        multiplexer = TabMultiplexer(driver)
+        tabs = {}
+
+        def worker(name):
+            tabs[name] = multiplexer.open_tab()
+            driver.find_element("css selector", name)
+
+        run_in_thread(lambda: worker("a"))
+        run_in_thread(lambda: worker("b"))
+
+        assert driver.commands[0][0] == tabs["a"]
+        assert driver.commands[1][0] == tabs["b"]
+        assert multiplexer.stats["tab_switches"] == 2
+
+    def test_interleaved_threads_never_cross_tabs(self):
+        driver = FakeDriver()
+        multiplexer = TabMultiplexer(driver)
+        owners = {}
+
+        def worker(name):
+            handle = multiplexer.open_tab()
+            owners[handle] = name
+            for _ in range(50):
+                driver.find_element("css selector", name)
+
+        threads = [threading.Thread(target=worker, args=(name,)) for name in ("a", "b", "c")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(driver.commands) == 150
+        assert all(owners[tab] == params["value"] for tab, _, params in driver.commands)
+
+    def test_tab_navigation_does_not_block_on_page_load(self):
+        driver = FakeDriver()
+        multiplexer = TabMultiplexer(driver)
+
+        def worker():
+            multiplexer.open_tab()
+            driver.get("https://www.google.com/maps")
+
+        run_in_thread(worker)
+
+        sent = [command for _, command, _ in driver.commands]
+        assert Command.GET not in sent
+        assert driver.commands[0][2]["args"] == ["https://www.google.com/maps"]
+        assert multiplexer.stats["navigations"] == 1
+
+    def test_unbound_thread_keeps_plain_get(self):
+        driver = FakeDriver()
+        TabMultiplexer(driver)
+
+        driver.get("https://www.google.com/maps")
+
+        assert driver.commands == [("main", Command.GET, {"url": "https://www.google.com/maps"})]
+
+    def test_close_tab_returns_to_main_tab(self):
+        driver = FakeDriver()
+        multiplexer = TabMultiplexer(driver)
+        handle = multiplexer.open_tab()
+
+        multiplexer.close_tab(handle)
+        driver.find_element("css selector", "x")
+
+        assert handle not in driver.handles
+        assert driver.commands[-1][0] == "main"
+
+
+class TestTabbedBrowserGroup:
+    """Packing jobs into shared Chrome sessions."""
+
+    def test_starts_new_browser_only_when_full(self):
+        group = TabbedBrowserGroup(tabs_per_browser=2)
+
+        leases = [group.acquire_tab() for _ in range(3)]
+
+        assert group.get_status()["browsers"] == 2
+        assert leases[0][0] is leases[1][0]
+        assert leases[2][0] is not leases[0][0]
+
+    def test_browser_closed_after_last_tab(self):
+        group = TabbedBrowserGroup(tabs_per_browser=2)
+        (browser, first), (_, second) = group.acquire_tab(), group.acquire_tab()
+
+        group.release_tab(browser, first)
+        assert browser.browser_setup.closed is False
+        group.release_tab(browser, second)
+
+        assert browser.browser_setup.closed is True
+        assert group.get_status()["browsers"] == 0
+
+    def test_browser_automation_runs_in_a_tab(self):
+        group = Mock()
+        tabbed_browser = Mock()
+        group.acquire_tab.return_value = (tabbed_browser, "tab1")
+        automation = BrowserAutomation(headless=True, tab_group=group)
+
+        assert automation.setup_browser() is True
+        automation.close()
+
+        assert automation.search_engine.driver is tabbed_browser.driver
+        assert automation.network_blocker is None
+        group.release_tab.assert_called_once_with(tabbed_browser, "tab1")
+
+    def test_tabs_drain_the_shared_performance_log(self):
+        group = Mock()
+        tabbed_browser = Mock()
+        group.acquire_tab.return_value = (tabbed_browser, "tab1")
+        automation = BrowserAutomation(headless=True, tab_group=group)
+        automation.setup_browser()
+
+        automation._configure_engine({}, None, None)
+
+        assert automation.network_blocker is None
+        assert automation.search_engine.network_blocker is tabbed_browser.browser_setup.network_blocker
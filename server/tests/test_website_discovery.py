@@ -0,0 +1,170 @@
+"""
+Unit tests for concurrent compact-listing website discovery.
+Pattern: AAA (Arrange-Act-Assert) with a fake HTTP session.
+"""
+
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+import requests
+from pydantic import ValidationError
+
+from website_discovery import WebsiteResolver, extract_website_from_place_html
+from maps_search_engine import MapsSearchEngine
+from schemas import BrowserAutomationRequest
+
+
+PLACE_HTML = (
+    '<script>window.APP_INITIALIZATION_STATE=[[["0x87938ae6c037ff95:0xac31e8497c63f57d",'
+    '[\\"https://www.facebook.com/papillionbarbers\\",\\"facebook.com\\"],'
+    '[\\"http://www.papillionbarbers.com/\\",\\"papillionbarbers.com\\",null,\\"0ahUKEwi\\"]]]];</script>'
+)
+NO_WEBSITE_HTML = '<script>window.APP_INITIALIZATION_STATE=[[["0x1:0x2",[\\"Barber shop\\"]]]];</script>'
+# Generic Maps app shell served instead of the place (e.g. when Google degrades the response)
+SHELL_HTML = '<script>window.APP_INITIALIZATION_STATE=[[[2048,-95.9,41.2],[0,0,0],[1024,768],13.1]];</script>'
+
+
+class FakeResponse:
+    def __init__(self, text, status_code=200, url="https://www.google.com/maps/place/x"):
+        self.text = text
+        self.status_code = status_code
+        self.url = url
+
+
+class FakeSession:
+    """Serves canned place pages and records how many fetches overlapped"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.headers = {}
+        self.cookies = {}
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def get(self, url, timeout=None):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.05)
+        with self._lock:
+            self.active -= 1
+        page = self.pages.get(url)
+        if isinstance(page, Exception):
+            raise page
+        return page
+
+    def close(self):
+        pass
+
+
+class TestPlaceHtmlParsing:
+    """Reading the website out of embedded place data."""
+
+    def test_website_entry_matched_by_display_domain(self):
+        assert extract_website_from_place_html(PLACE_HTML) == "http://www.papillionbarbers.com/"
+
+    def test_no_website_returns_none(self):
+        assert extract_website_from_place_html(NO_WEBSITE_HTML) is None
+
+    def test_authority_link_is_unwrapped(self):
+        html = '<a data-item-id="authority" href="https://www.google.com/url?q=https://shleepainting.com/&amp;opi=1">'
+
+        assert extract_website_from_place_html(html) == "https://shleepainting.com/"
+
+
+class TestWebsiteResolver:
+    """Concurrent fetches and fallbacks."""
+
+    def test_batch_is_fetched_concurrently(self):
+        pages = {f"https://maps/place/{i}": FakeResponse(PLACE_HTML) for i in range(4)}
+        session = FakeSession(pages)
+        resolver = WebsiteResolver(max_workers=4, session=session)
+
+        websites = resolver.resolve_many({i: f"https://maps/place/{i}" for i in range(4)})
+
+        assert websites == {i: "http://www.papillionbarbers.com/" for i in range(4)}
+        assert session.max_active > 1
+        assert resolver.get_stats()["websites_found"] == 4
+
+    def test_unreadable_pages_are_left_for_click_through(self):
+        session = FakeSession({
+            "ok": FakeResponse(NO_WEBSITE_HTML),
+            "blocked": FakeResponse("<html>Before you continue</html>", url="https://consent.google.com/"),
+            "error": requests.ConnectionError("reset"),
+            "rate_limited": FakeResponse("", status_code=429),
+        })
+        resolver = WebsiteResolver(session=session)
+
+        websites = resolver.resolve_many({"ok": "ok", "blocked": "blocked", "error": "error", "rate_limited": "rate_limited"})
+
+        assert websites == {"ok": None}
+        assert resolver.get_stats()["unresolved"] == 3
+
+    def test_app_shell_without_place_data_is_unresolved(self):
+        place_url = "https://www.google.com/maps/place/Papillion+Barbers/data=!4m7!3m6!1s0x87938ae6c037ff95:0xac31e8497c63f57d"
+        other_place = '<script>window.APP_INITIALIZATION_STATE=[[["0x1:0x2"]]];</script>'
+        session = FakeSession({"shell": FakeResponse(SHELL_HTML), place_url: FakeResponse(other_place)})
+        resolver = WebsiteResolver(session=session)
+
+        websites = resolver.resolve_many({"shell": "shell", "wrong_place": place_url})
+
+        assert websites == {}
+        assert resolver.get_stats()["unresolved"] == 2
+
+    def test_shell_echoing_the_feature_id_is_unresolved(self):
+        place_url = "https://www.google.com/maps/place/Papillion+Barbers/data=!4m7!3m6!1s0x87938ae6c037ff95:0xac31e8497c63f57d"
+        shell = ('<script>window.APP_INITIALIZATION_STATE=[[[2048,-95.9,41.2]],'
+                 '\\"/maps/place/data=!1s0x87938ae6c037ff95:0xac31e8497c63f57d\\",'
+                 '[\\"0x87938ae6c037ff95:0xac31e8497c63f57d\\"]];</script>')
+        resolver = WebsiteResolver(session=FakeSession({place_url: FakeResponse(shell)}))
+
+        websites = resolver.resolve_many({"shell": place_url})
+
+        assert websites == {}
+        assert resolver.get_stats()["unresolved"] == 1
+
+
+class TestEngineWebsiteDiscovery:
+    """Resolved websites replace per-card click-through."""
+
+    def test_compact_listings_use_resolved_websites(self):
+        engine = MapsSearchEngine(Mock(), None, None)
+        engine.website_discovery = "http"
+        engine.feed_snapshot = {
+            "Papillion Barbers": {"name": "Papillion Barbers", "url": "https://maps/place/1", "listing_type": "compact",
+                                  "website": None, "has_website": False, "_needs_click_check": True},
+            "Shlee Painting": {"name": "Shlee Painting", "url": "https://maps/place/2", "listing_type": "standard",
+                               "website": "https://shleepainting.com/", "has_website": True},
+        }
+        engine.website_resolver = Mock()
+        engine.website_resolver.resolve_many.return_value = {"Papillion Barbers": "http://www.papillionbarbers.com/"}
+
+        engine._discover_websites()
+        details = engine._get_snapshot_details("Papillion Barbers", enable_click_through=True)
+
+        engine.website_resolver.resolve_many.assert_called_once_with({"Papillion Barbers": "https://maps/place/1"})
+        assert details["website"] == "http://www.papillionbarbers.com/"
+        assert details["has_website"] is True
+        assert "_needs_click_check" not in details
+
+    def test_unresolved_compact_listing_falls_back_to_click(self):
+        engine = MapsSearchEngine(Mock(), None, None)
+        engine.feed_snapshot = {"Papillion Barbers": {"name": "Papillion Barbers", "listing_type": "compact"}}
+
+        assert engine._get_snapshot_details("Papillion Barbers", enable_click_through=True) is None
+
+
+class TestWebsiteDiscoveryValidation:
+    """Request validation of website_discovery."""
+
+    def test_http_accepted(self):
+        request = BrowserAutomationRequest(industry="painter", location="Omaha", website_discovery="http")
+
+        assert request.website_discovery == "http"
+
+    def test_unknown_strategy_rejected(self):
+        with pytest.raises(ValidationError):
+            BrowserAutomationRequest(industry="painter", location="Omaha", website_discovery="https")
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Concurrent website discovery for compact listings.
+Compact cards hide the website behind a click into the place panel. Instead
+of clicking into each card in turn, the place pages for a whole batch are
+fetched over plain HTTP by a small thread pool. The website is read from
+each page's embedded place data, and the result is merged back into the
+business dict. Pages that cannot be read fall back to click-through.
+"""
+
+import re
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple, Any
+from urllib.parse import urlparse, parse_qs, unquote
+
+import requests
+
+
+REQUEST_HEADERS = {
+    "User-Agent": ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                   "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"),
+    "Accept-Language": "en-US,en;q=0.9",
+}
+# Skips the EU consent interstitial, which would otherwise replace the place page
+REQUEST_COOKIES = {"CONSENT": "YES+"}
+
+# Place data lists the website as ["<url>","<display domain>", ...]
+WEBSITE_ENTRY_PATTERN = re.compile(r'\["(https?://[^"\s]+)","((?:www\.)?[a-z0-9-]+(?:\.[a-z0-9-]+)*\.[a-z]{2,})"', re.IGNORECASE)
+AUTHORITY_LINK_PATTERN = re.compile(r'data-item-id="authority"[^>]*href="([^"]+)"')
+# Every Maps page, place or not, boots from APP_INITIALIZATION_STATE, and the app shell echoes the
+# requested feature id ("0x<hex>:0x<hex>") in URLs and bare strings, so neither proves anything.
+# A place page renders panel items, or carries the place record: the feature id followed by its data.
+FEATURE_ID_PATTERN = re.compile(r'0x[0-9a-f]+:0x[0-9a-f]+', re.IGNORECASE)
+PLACE_RECORD_PATTERN = re.compile(r'"(0x[0-9a-f]+:0x[0-9a-f]+)",\[', re.IGNORECASE)
+PLACE_PANEL_MARKER = 'data-item-id="'
+
+NON_WEBSITE_DOMAINS = (
+    "google.", "gstatic.com", "googleusercontent.com", "youtube.com", "facebook.com",
+    "instagram.com", "twitter.com", "x.com", "yelp.com", "tripadvisor.",
+)
+
+
+def _host(url: str) -> str:
+    host = (urlparse(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def _unwrap_redirect(url: str) -> str:
+    """Google wraps outbound links as /url?q=<target>"""
+    parsed = urlparse(url)
+    if parsed.path == "/url" and "google." in (parsed.hostname or ""):
+        target = parse_qs(parsed.query).get("q")
+        if target:
+            return target[0]
+    return url
+
+
+def _is_business_website(url: str) -> bool:
+    host = _host(url)
+    return bool(host) and not any(domain in host for domain in NON_WEBSITE_DOMAINS)
+
+
+def _unescape(html: str) -> str:
+    """Undo the JSON/HTML escaping around the embedded place data"""
+    return html.replace('\\"', '"').replace("\\u003d", "=").replace("\\u0026", "&").replace("&amp;", "&")
+
+
+def has_place_data(html: str, place_url: str = "") -> bool:
+    """True when the page carries the place's own data rather than just the Maps app shell"""
+    if PLACE_PANEL_MARKER in html:
+        return True
+    records = {feature_id.lower() for feature_id in PLACE_RECORD_PATTERN.findall(_unescape(html))}
+    if not records:
+        return False
+    # Place URLs name their feature id (!1s0x...:0x...); the record must then be that place's
+    expected = FEATURE_ID_PATTERN.search(unquote(place_url or ""))
+    return expected.group(0).lower() in records if expected else True
+
+
+def extract_website_from_place_html(html: str) -> Optional[str]:
+    """Business website from a place page's HTML, or None if it lists none"""
+    text = _unescape(html)
+
+    match = AUTHORITY_LINK_PATTERN.search(text)
+    if match:
+        url = _unwrap_redirect(match.group(1))
+        if _is_business_website(url):
+            return url
+
+    for match in WEBSITE_ENTRY_PATTERN.finditer(text):
+        url = _unwrap_redirect(match.group(1))
+        display = match.group(2).lower()
+        display = display[4:] if display.startswith("www.") else display
+        # The display domain must be the URL's own host - this is what sets the website entry apart
+        if _host(url) == display and _is_business_website(url):
+            return url
+    return None
+
+
+class WebsiteResolver:
+    """Bounded pool of place-page fetches shared by one search"""
+
+    def __init__(self, max_workers: int = 4, timeout: float = 8.0, session: Optional[requests.Session] = None):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        self.session.headers.update(REQUEST_HEADERS)
+        self.session.cookies.update(REQUEST_COOKIES)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._lock = threading.Lock()
+        self.stats = {"fetched": 0, "websites_found": 0, "unresolved": 0, "fetch_seconds": 0.0}
+
+    def fetch_website(self, place_url: str) -> Tuple[bool, Optional[str]]:
+        """(resolved, website); resolved is False unless the page carried the place's data,
+        so "no website" is only reported for a place payload that really lists none"""
+        start = time.perf_counter()
+        html, final_url = "", ""
+        try:
+            response = self.session.get(place_url, timeout=self.timeout)
+            if response.status_code == 200:
+                html, final_url = response.text, response.url or ""
+        except requests.RequestException:
+            pass
+        resolved = bool(html) and "consent." not in final_url and has_place_data(html, place_url)
+        website = extract_website_from_place_html(html) if resolved else None
+
+        with self._lock:
+            self.stats["fetched"] += 1
+            self.stats["fetch_seconds"] += time.perf_counter() - start
+            if not resolved:
+                self.stats["unresolved"] += 1
+            elif website:
+                self.stats["websites_found"] += 1
+        return resolved, website
+
+    def resolve_many(self, place_urls: Dict[Any, str]) -> Dict[Any, Optional[str]]:
+        """Fetch every place page concurrently; keys whose page could not be read are left out"""
+        futures = {key: self.executor.submit(self.fetch_website, url) for key, url in place_urls.items() if url}
+        websites = {}
+        for key, future in futures.items():
+            resolved, website = future.result()
+            if resolved:
+                websites[key] = website
+        return websites
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.stats, "fetch_seconds": round(self.stats["fetch_seconds"], 2)}
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+        self.session.close()
@@ -10,6 +10,7 @@ from pathlib import Path
 from datetime import datetime
 from fastapi import WebSocket, WebSocketDisconnect
 from job_management import job_statuses
+from job_logger import get_job_logs
 
 
 class JobWebSocketManager:
@@ -131,7 +132,7 @@ class JobWebSocketManager:
             await websocket.send_text(json.dumps(status_message))
         
         # Track last sent log index
-        last_log_index = 0
+        last_log_seq = 0
         
         try:
             # Keep connection alive and send periodic updates
@@ -151,17 +152,17 @@ class JobWebSocketManager:
                         await websocket.send_text(json.dumps(status_message))
                         
                         # Send any new logs
-                        logs = job_statuses[job_id].get('logs', [])
-                        if len(logs) > last_log_index:
-                            # Send new logs
-                            for log in logs[last_log_index:]:
-                                log_message = {
-                                    "type": "log",
-                                    "message": log.get("message", ""),
-                                    "timestamp": log.get("timestamp", "")
-                                }
-                                await websocket.send_text(json.dumps(log_message))
-                            last_log_index = len(logs)
+                        # (by sequence number, so ring buffer eviction never skips or repeats entries)
+                        for log in get_job_logs(job_id, since_seq=last_log_seq):
+                            log_message = {
+                                "type": "log",
+                                "message": log["message"],
+                                "level": log["level"],
+                                "seq": log["seq"],
+                                "timestamp": log["timestamp"]
+                            }
+                            await websocket.send_text(json.dumps(log_message))
+                            last_log_seq = log["seq"]
                 except:
                     break
                     